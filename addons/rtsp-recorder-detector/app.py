@@ -5,11 +5,15 @@ import io
 import time
 import threading
 import hashlib
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 
 import numpy as np
 from PIL import Image, ImageEnhance, ImageFilter
-from fastapi import FastAPI, UploadFile, File, Form
+from fastapi import FastAPI, UploadFile, File, Form, Header, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import tflite_runtime.interpreter as tflite
 
@@ -70,6 +74,9 @@ EDGETPU_OPTIONS = {"device": "usb"}
 DEFAULT_CONFIDENCE_THRESHOLD = 0.4
 DEFAULT_FACE_CONFIDENCE_THRESHOLD = 0.5
 MAX_IMAGE_SIZE_BYTES = 10 * 1024 * 1024  # 10MB max upload
+MAX_BATCH_FRAMES = 32  # Max frames per /detect_batch request
+# Raw frames handed over via shared memory must live in this directory (same-host transport)
+SHM_FRAME_DIR = os.environ.get("DETECTOR_SHM_DIR", "/dev/shm/rtsp_recorder")
 ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
 # Image magic bytes for validation
 IMAGE_MAGIC_BYTES = {
@@ -172,6 +179,162 @@ _inference_metrics = {
 MAX_INFERENCE_RETRIES = 2
 RETRY_DELAY_MS = 50  # Wait between retries
 
+# ===== Inference Executors (per device) =====
+# Inference must never run on the uvicorn event loop: a single slow CPU
+# inference would otherwise stall /health, /stats and every other request.
+# The Coral USB stick is a single device, so it gets exactly one worker
+# (jobs are serialized in submission order). CPU inference runs on a small
+# pool; each CPU worker thread owns its own interpreters because tflite
+# interpreters are not thread-safe.
+try:
+    CPU_INFERENCE_WORKERS = max(1, int(os.environ.get("DETECTOR_CPU_WORKERS", "2")))
+except ValueError:
+    CPU_INFERENCE_WORKERS = 2
+
+_inference_executors: Dict[str, ThreadPoolExecutor] = {
+    "coral_usb": ThreadPoolExecutor(max_workers=1, thread_name_prefix="infer-coral"),
+    "cpu": ThreadPoolExecutor(max_workers=CPU_INFERENCE_WORKERS, thread_name_prefix="infer-cpu"),
+}
+_EXECUTOR_SAMPLE_SIZE = 500  # Recent wait/service samples kept for percentiles
+
+# ===== Micro-Batching (object detection) =====
+# Concurrent single-frame /detect requests for the same device are collected
+# for up to BATCH_WINDOW_MS and run as one executor job. CPU interpreters get
+# a single batched invoke (resize_tensor_input); the EdgeTPU model is compiled
+# for batch 1, so Coral batches run back-to-back invokes in one job.
+# DETECTOR_BATCH_WINDOW_MS=0 disables batching.
+try:
+    BATCH_WINDOW_MS = max(0.0, float(os.environ.get("DETECTOR_BATCH_WINDOW_MS", "10")))
+except ValueError:
+    BATCH_WINDOW_MS = 10.0
+try:
+    BATCH_MAX_SIZE = max(1, int(os.environ.get("DETECTOR_BATCH_MAX_SIZE", "8")))
+except ValueError:
+    BATCH_MAX_SIZE = 8
+
+
+def _new_executor_metrics(workers: int) -> Dict[str, Any]:
+    return {
+        "workers": workers,
+        "queue_depth": 0,
+        "max_queue_depth": 0,
+        "in_flight": 0,
+        "submitted": 0,
+        "completed": 0,
+        "failed": 0,
+        "total_wait_ms": 0.0,
+        "total_service_ms": 0.0,
+        "max_wait_ms": 0.0,
+        "recent_wait_ms": deque(maxlen=_EXECUTOR_SAMPLE_SIZE),
+        "recent_service_ms": deque(maxlen=_EXECUTOR_SAMPLE_SIZE),
+    }
+
+
+_executor_metrics: Dict[str, Dict[str, Any]] = {
+    "coral_usb": _new_executor_metrics(1),
+    "cpu": _new_executor_metrics(CPU_INFERENCE_WORKERS),
+}
+print(f"[EXECUTOR] coral_usb workers=1, cpu workers={CPU_INFERENCE_WORKERS}, "
+      f"batch window={BATCH_WINDOW_MS}ms, max batch={BATCH_MAX_SIZE}")
+
+
+def _executor_key(device: str) -> str:
+    return "coral_usb" if device == "coral_usb" else "cpu"
+
+
+def _interpreter_cache_key(device: str) -> str:
+    """Cache key for interpreter caches.
+
+    The Coral worker is a single thread, so one interpreter per device is
+    enough. CPU workers each get their own interpreter instance.
+    """
+    if device == "coral_usb":
+        return device
+    return f"{device}:{threading.current_thread().name}"
+
+
+async def _submit_inference(device: str, func, *args, **kwargs):
+    """Run a blocking inference job on the executor for ``device`` and await it.
+
+    Records queue depth, queue wait time and service time per executor.
+    """
+    key = _executor_key(device)
+    enqueued = time.perf_counter()
+    with _metrics_lock:
+        m = _executor_metrics[key]
+        m["submitted"] += 1
+        m["queue_depth"] += 1
+        m["max_queue_depth"] = max(m["max_queue_depth"], m["queue_depth"])
+
+    def _job():
+        started = time.perf_counter()
+        wait_ms = (started - enqueued) * 1000
+        with _metrics_lock:
+            m = _executor_metrics[key]
+            m["queue_depth"] -= 1
+            m["in_flight"] += 1
+            m["total_wait_ms"] += wait_ms
+            m["max_wait_ms"] = max(m["max_wait_ms"], wait_ms)
+            m["recent_wait_ms"].append(wait_ms)
+        success = False
+        try:
+            result = func(*args, **kwargs)
+            success = True
+            return result
+        finally:
+            service_ms = (time.perf_counter() - started) * 1000
+            with _metrics_lock:
+                m = _executor_metrics[key]
+                m["in_flight"] -= 1
+                m["completed" if success else "failed"] += 1
+                m["total_service_ms"] += service_ms
+                m["recent_service_ms"].append(service_ms)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_inference_executors[key], _job)
+
+
+def _percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return round(ordered[idx], 2)
+
+
+def _executor_stats_snapshot() -> Dict[str, Dict[str, Any]]:
+    """Executor metrics as a JSON-friendly dict. Caller must hold _metrics_lock."""
+    snapshot = {}
+    for key, m in _executor_metrics.items():
+        done = m["completed"] + m["failed"]
+        started = m["submitted"] - m["queue_depth"]
+        snapshot[key] = {
+            "workers": m["workers"],
+            "queue_depth": m["queue_depth"],
+            "max_queue_depth": m["max_queue_depth"],
+            "in_flight": m["in_flight"],
+            "submitted": m["submitted"],
+            "completed": m["completed"],
+            "failed": m["failed"],
+            "avg_wait_ms": round(m["total_wait_ms"] / started, 2) if started > 0 else 0.0,
+            "p95_wait_ms": _percentile(m["recent_wait_ms"], 95),
+            "max_wait_ms": round(m["max_wait_ms"], 2),
+            "avg_service_ms": round(m["total_service_ms"] / done, 2) if done > 0 else 0.0,
+            "p95_service_ms": _percentile(m["recent_service_ms"], 95),
+        }
+    return snapshot
+
+
+def _reset_executor_metrics() -> None:
+    """Reset executor counters. Live queue depth / in-flight are preserved. Caller must hold _metrics_lock."""
+    for key, m in _executor_metrics.items():
+        fresh = _new_executor_metrics(m["workers"])
+        fresh["queue_depth"] = m["queue_depth"]
+        fresh["max_queue_depth"] = m["queue_depth"]
+        fresh["in_flight"] = m["in_flight"]
+        fresh["submitted"] = m["queue_depth"] + m["in_flight"]
+        _executor_metrics[key] = fresh
+
 
 # ===== Metrics & Logging Functions =====
 def _update_metrics(success: bool, inference_ms: float, device: str, retried: bool = False):
@@ -698,39 +861,43 @@ def _get_labels() -> Dict[int, str]:
     return _labels_cache
 
 
-def _get_cached_interpreter(device: str):
+def _get_cached_interpreter(device: str, variant: str = ""):
     """Get or create a cached interpreter for the device.
     
     CRITICAL: Creating a new interpreter for each request blocks the Coral USB.
     We must reuse interpreters like Frigate does.
     
     HIGH-004 Fix: Added error recovery for Coral USB disconnect/reconnect.
+    
+    ``variant`` selects a separate instance of the same model, e.g. "batch"
+    for the micro-batcher whose input tensor gets resized.
     """
     global _cached_interpreters
     
+    key = _interpreter_cache_key(device) + (f":{variant}" if variant else "")
     with _interpreter_lock:
-        if device in _cached_interpreters:
+        if key in _cached_interpreters:
             # Verify interpreter is still valid (HIGH-004 Fix)
             try:
                 # Quick sanity check - accessing input details should work
-                _cached_interpreters[device].get_input_details()
-                return _cached_interpreters[device]
+                _cached_interpreters[key].get_input_details()
+                return _cached_interpreters[key]
             except Exception as e:
                 print(f"Cached interpreter for {device} is invalid, recreating: {e}")
-                del _cached_interpreters[device]
+                del _cached_interpreters[key]
         
         try:
             model_path = _get_model(device)
             interpreter = _build_interpreter(model_path, device)
             interpreter.allocate_tensors()
-            _cached_interpreters[device] = interpreter
+            _cached_interpreters[key] = interpreter
             print(f"Created and cached interpreter for device: {device}")
             return interpreter
         except Exception as e:
             print(f"ERROR creating interpreter for {device}: {e}")
             # For Coral device errors, ensure cache is cleared for retry
-            if device in _cached_interpreters:
-                del _cached_interpreters[device]
+            if key in _cached_interpreters:
+                del _cached_interpreters[key]
             raise
 
 
@@ -755,26 +922,27 @@ def _get_cached_face_det_interpreter(device: str):
     HIGH-004 Fix: Added error recovery for device disconnect.
     """
     global _cached_face_det
+    key = _interpreter_cache_key(device)
     with _interpreter_lock:
-        if device in _cached_face_det:
+        if key in _cached_face_det:
             try:
-                _cached_face_det[device].get_input_details()
-                return _cached_face_det[device]
+                _cached_face_det[key].get_input_details()
+                return _cached_face_det[key]
             except Exception as e:
                 print(f"Cached face-det interpreter for {device} invalid, recreating: {e}")
-                del _cached_face_det[device]
+                del _cached_face_det[key]
         
         try:
             model_path = _get_face_det_model(device)
             interpreter = _build_interpreter(model_path, device)
             interpreter.allocate_tensors()
-            _cached_face_det[device] = interpreter
+            _cached_face_det[key] = interpreter
             print(f"Created and cached face-detector for device: {device}")
             return interpreter
         except Exception as e:
             print(f"ERROR creating face-det interpreter for {device}: {e}")
-            if device in _cached_face_det:
-                del _cached_face_det[device]
+            if key in _cached_face_det:
+                del _cached_face_det[key]
             raise
 
 
@@ -784,26 +952,27 @@ def _get_cached_face_embed_interpreter(device: str):
     HIGH-004 Fix: Added error recovery for device disconnect.
     """
     global _cached_face_embed
+    key = _interpreter_cache_key(device)
     with _interpreter_lock:
-        if device in _cached_face_embed:
+        if key in _cached_face_embed:
             try:
-                _cached_face_embed[device].get_input_details()
-                return _cached_face_embed[device]
+                _cached_face_embed[key].get_input_details()
+                return _cached_face_embed[key]
             except Exception as e:
                 print(f"Cached face-embed interpreter for {device} invalid, recreating: {e}")
-                del _cached_face_embed[device]
+                del _cached_face_embed[key]
         
         try:
             model_path = _get_face_embed_model(device)
             interpreter = _build_interpreter(model_path, device)
             interpreter.allocate_tensors()
-            _cached_face_embed[device] = interpreter
+            _cached_face_embed[key] = interpreter
             print(f"Created and cached face-embedding for device: {device}")
             return interpreter
         except Exception as e:
             print(f"ERROR creating face-embed interpreter for {device}: {e}")
-            if device in _cached_face_embed:
-                del _cached_face_embed[device]
+            if key in _cached_face_embed:
+                del _cached_face_embed[key]
             raise
 
 
@@ -860,6 +1029,11 @@ def _run_movenet_pose(img_bytes: bytes):
         - inference_ms: inference time
     """
     img = Image.open(io.BytesIO(img_bytes)).convert("RGB")
+    return _run_movenet_pose_image(img)
+
+
+def _run_movenet_pose_image(img: Image.Image):
+    """Run MoveNet pose estimation on an already decoded RGB image."""
     frame_width, frame_height = img.size
     
     interpreter = _get_cached_movenet_interpreter()
@@ -1048,18 +1222,32 @@ def _run_detection(img_bytes: bytes, labels: Dict[int, str], device: str, confid
     - Output 3: Count [1] - number of detections (always max, filter by score)
     """
     img = Image.open(io.BytesIO(img_bytes)).convert("RGB")
+    return _run_detection_image(img, labels, device, confidence)
+
+
+def _run_detection_image(img: Image.Image, labels: Dict[int, str], device: str, confidence: float):
+    """Run object detection on an already decoded RGB image."""
     frame_width, frame_height = img.size
+    input_shape = _get_cached_interpreter(device).get_input_details()[0]["shape"]
+    target_h, target_w = int(input_shape[1]), int(input_shape[2])
+    pixels = np.array(img.resize((target_w, target_h)), dtype=np.uint8)
+    return _run_detection_tensor(pixels, labels, device, confidence, frame_width, frame_height)
 
+
+def _run_detection_tensor(pixels: np.ndarray, labels: Dict[int, str], device: str, confidence: float,
+                          frame_width: int, frame_height: int):
+    """Run object detection on a model-sized uint8 RGB array (H, W, 3).
+    
+    Boxes are scaled to frame_width x frame_height, the size of the frame the
+    array was resized from.
+    """
     # Use cached interpreter (critical for Coral USB performance!)
     interpreter = _get_cached_interpreter(device)
 
     input_details = interpreter.get_input_details()
     output_details = interpreter.get_output_details()
 
-    input_shape = input_details[0]["shape"]
-    target_h, target_w = int(input_shape[1]), int(input_shape[2])
-    img_resized = img.resize((target_w, target_h))
-    input_data = np.expand_dims(np.array(img_resized, dtype=np.uint8), axis=0)
+    input_data = np.expand_dims(pixels, axis=0)
 
     interpreter.set_tensor(input_details[0]["index"], input_data)
     
@@ -1073,6 +1261,13 @@ def _run_detection(img_bytes: bytes, labels: Dict[int, str], device: str, confid
     classes = interpreter.get_tensor(output_details[1]["index"])[0]  # [N]
     scores = interpreter.get_tensor(output_details[2]["index"])[0]  # [N]
     
+    detections = _detections_from_outputs(boxes, classes, scores, labels, confidence, frame_width, frame_height)
+    return detections, frame_width, frame_height, inference_ms
+
+
+def _detections_from_outputs(boxes, classes, scores, labels: Dict[int, str], confidence: float,
+                             frame_width: int, frame_height: int) -> list:
+    """Convert one image's SSD outputs (boxes, classes, scores) to detection dicts."""
     detections = []
     for i in range(len(scores)):
         score = float(scores[i])
@@ -1090,8 +1285,310 @@ def _run_detection(img_bytes: bytes, labels: Dict[int, str], device: str, confid
             "score": round(score, 3),
             "box": {"x": x, "y": y, "w": w, "h": h}
         })
+    return detections
+
+
+# ===== Micro-Batching Scheduler =====
+_batch_unsupported: Dict[str, bool] = {}  # device -> batched invoke failed once, stay sequential
+_batch_metrics: Dict[str, Any] = {}
+
+
+def _new_batch_metrics() -> Dict[str, Any]:
+    return {
+        "batches": 0,
+        "frames": 0,
+        "batched_invokes": 0,
+        "sequential_batches": 0,
+        "size_histogram": {},
+        "total_queue_ms": 0.0,
+        "max_queue_ms": 0.0,
+        "recent_queue_ms": deque(maxlen=_EXECUTOR_SAMPLE_SIZE),
+    }
+
+
+_batch_metrics.update(_new_batch_metrics())
+
+
+class _BatchUnsupported(RuntimeError):
+    """The detection model does not take a batch dimension on this device."""
+
+
+def _run_detection_microbatch(contents: List[bytes], labels: Dict[int, str], device: str,
+                              confidences: List[float]) -> list:
+    """Run object detection for a micro-batch of frames in one executor job.
+
+    Returns one entry per frame: the ``_run_detection`` result tuple, or the
+    exception raised for that frame. On CPU the frames go through a single
+    batched invoke; if the model refuses a batch dimension, the device is
+    switched to sequential invokes for the rest of the process lifetime.
+    Any other failure of the batched invoke only runs this batch sequentially.
+    """
+    results: list = [None] * len(contents)
+    batched = len(contents) > 1 and device != "coral_usb" and not _batch_unsupported.get(device)
+
+    if batched:
+        try:
+            interpreter = _get_cached_interpreter(device, variant="batch")
+            input_details = interpreter.get_input_details()
+            output_details = interpreter.get_output_details()
+            input_shape = input_details[0]["shape"]
+            target_h, target_w = int(input_shape[1]), int(input_shape[2])
+
+            prepared = []
+            for i, content in enumerate(contents):
+                try:
+                    img = Image.open(io.BytesIO(content)).convert("RGB")
+                    arr = np.array(img.resize((target_w, target_h)), dtype=np.uint8)
+                    prepared.append((i, arr, img.size))
+                except Exception as e:
+                    results[i] = e
+
+            if prepared:
+                n = len(prepared)
+                if int(input_shape[0]) != n:
+                    try:
+                        interpreter.resize_tensor_input(input_details[0]["index"], [n, target_h, target_w, 3])
+                        interpreter.allocate_tensors()
+                    except Exception as e:
+                        raise _BatchUnsupported(f"cannot resize input to batch {n}: {e}") from e
+                interpreter.set_tensor(input_details[0]["index"], np.stack([p[1] for p in prepared]))
+
+                start = time.perf_counter()
+                interpreter.invoke()
+                per_frame_ms = (time.perf_counter() - start) * 1000 / n
+
+                boxes = interpreter.get_tensor(output_details[0]["index"])
+                classes = interpreter.get_tensor(output_details[1]["index"])
+                scores = interpreter.get_tensor(output_details[2]["index"])
+                if boxes.shape[0] != n:
+                    raise _BatchUnsupported(f"model returned batch {boxes.shape[0]} for input batch {n}")
+
+                for j, (i, _, (fw, fh)) in enumerate(prepared):
+                    dets = _detections_from_outputs(boxes[j], classes[j], scores[j], labels, confidences[i], fw, fh)
+                    results[i] = (dets, fw, fh, per_frame_ms)
+            with _metrics_lock:
+                _batch_metrics["batched_invokes"] += 1
+            return results
+        except _BatchUnsupported as e:
+            print(f"[BATCH] Batched invoke not supported on {device}, using sequential invokes: {e}")
+            _batch_unsupported[device] = True
+            results = [None] * len(contents)
+        except Exception as e:
+            print(f"[BATCH] Batched invoke failed on {device}, running this batch sequentially: {e}")
+            results = [None] * len(contents)
+
+    if len(contents) > 1:
+        with _metrics_lock:
+            _batch_metrics["sequential_batches"] += 1
+    for i, content in enumerate(contents):
+        try:
+            results[i] = _run_with_retry(_run_detection, content, labels, device, confidences[i],
+                                         max_retries=MAX_INFERENCE_RETRIES)
+        except Exception as e:
+            results[i] = e
+    return results
+
+
+class _DetectionBatcher:
+    """Collects single-frame detection requests for one device into micro-batches.
+
+    Lives on the event loop: requests are queued, flushed after the batch
+    window or as soon as BATCH_MAX_SIZE frames are waiting, then run as one
+    job on the device executor and fanned back out to the waiting requests.
+    """
+
+    def __init__(self, device: str, window_ms: float, max_size: int):
+        self.device = device
+        self.window_s = window_ms / 1000.0
+        self.max_size = max_size
+        self._pending: list = []
+        self._flush_handle = None
+
+    async def submit(self, content: bytes, labels: Dict[int, str], confidence: float):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((content, labels, confidence, future, time.perf_counter()))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window_s, self._flush)
+        result = await future
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch: list):
+        dispatched = time.perf_counter()
+        with _metrics_lock:
+            m = _batch_metrics
+            m["batches"] += 1
+            m["frames"] += len(batch)
+            m["size_histogram"][len(batch)] = m["size_histogram"].get(len(batch), 0) + 1
+            for _, _, _, _, enqueued in batch:
+                queue_ms = (dispatched - enqueued) * 1000
+                m["total_queue_ms"] += queue_ms
+                m["max_queue_ms"] = max(m["max_queue_ms"], queue_ms)
+                m["recent_queue_ms"].append(queue_ms)
+
+        labels = batch[0][1]
+        try:
+            results = await _submit_inference(
+                self.device, _run_detection_microbatch,
+                [item[0] for item in batch], labels, self.device, [item[2] for item in batch],
+            )
+        except Exception as e:
+            results = [e] * len(batch)
+        for item, result in zip(batch, results):
+            future = item[3]
+            if not future.done():
+                future.set_result(result)
+
+
+_detection_batchers: Dict[str, _DetectionBatcher] = {}
+
+
+async def _detect_frame(content: bytes, labels: Dict[int, str], device: str, confidence: float):
+    """Object detection for one frame, micro-batched with concurrent requests when enabled."""
+    if BATCH_WINDOW_MS <= 0 or BATCH_MAX_SIZE <= 1:
+        return await _submit_inference(
+            device, _run_with_retry, _run_detection, content, labels, device, confidence,
+            max_retries=MAX_INFERENCE_RETRIES,
+        )
+    batcher = _detection_batchers.get(device)
+    if batcher is None:
+        batcher = _detection_batchers[device] = _DetectionBatcher(device, BATCH_WINDOW_MS, BATCH_MAX_SIZE)
+    return await batcher.submit(content, labels, confidence)
+
+
+def _batch_stats_snapshot() -> Dict[str, Any]:
+    """Micro-batching metrics as a JSON-friendly dict. Caller must hold _metrics_lock."""
+    m = _batch_metrics
+    return {
+        "enabled": BATCH_WINDOW_MS > 0 and BATCH_MAX_SIZE > 1,
+        "window_ms": BATCH_WINDOW_MS,
+        "max_batch_size": BATCH_MAX_SIZE,
+        "batches": m["batches"],
+        "frames": m["frames"],
+        "avg_batch_size": round(m["frames"] / m["batches"], 2) if m["batches"] > 0 else 0.0,
+        "batch_size_histogram": {str(k): v for k, v in sorted(m["size_histogram"].items())},
+        "batched_invokes": m["batched_invokes"],
+        "sequential_batches": m["sequential_batches"],
+        "avg_queue_ms": round(m["total_queue_ms"] / m["frames"], 2) if m["frames"] > 0 else 0.0,
+        "p95_queue_ms": _percentile(m["recent_queue_ms"], 95),
+        "max_queue_ms": round(m["max_queue_ms"], 2),
+        "batched_unsupported": sorted(d for d, v in _batch_unsupported.items() if v),
+    }
+
+
+# ===== Motion Gate (per-stream frame differencing) =====
+# Clients may tag frames with a ``stream_id`` (one camera or recording). For
+# each stream the detector keeps a small grayscale copy of the last frame it
+# ran the model on; a frame that barely differs from it gets that frame's
+# detections back (flagged ``reused``) instead of an invoke. Static night
+# scenes and parked cars then cost a reduced-size JPEG decode, not an SSD run.
+# DETECTOR_MOTION_THRESHOLD is the fraction of reference pixels that must
+# change for a new inference; 0 (default) disables the gate.
+try:
+    MOTION_GATE_THRESHOLD = min(1.0, max(0.0, float(os.environ.get("DETECTOR_MOTION_THRESHOLD", "0"))))
+except ValueError:
+    MOTION_GATE_THRESHOLD = 0.0
+MOTION_GATE_SIZE = (64, 36)  # Reference thumbnail (W, H)
+MOTION_GATE_PIXEL_DELTA = 20  # Gray levels a pixel must change to count as changed
+MOTION_GATE_MAX_REUSE = 10  # Run the model again after this many reused frames
+MOTION_GATE_MAX_STREAMS = 64  # Least recently used stream contexts are dropped
+
+_motion_lock = threading.Lock()
+_motion_streams: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_motion_metrics: Dict[str, Any] = {}
+
+
+def _new_motion_metrics() -> Dict[str, Any]:
+    return {"frames": 0, "reused": 0}
+
+
+_motion_metrics.update(_new_motion_metrics())
+
+
+def _motion_gate_enabled(stream_id: str) -> bool:
+    return bool(stream_id) and MOTION_GATE_THRESHOLD > 0
 
-    return detections, frame_width, frame_height, inference_ms
+
+def _motion_thumbnail(content: bytes) -> Optional[np.ndarray]:
+    """Downscaled grayscale frame for differencing, None if undecodable.
+
+    ``draft`` lets libjpeg decode at 1/2..1/8 scale, so the full frame is
+    never decoded for the gate.
+    """
+    try:
+        img = Image.open(io.BytesIO(content))
+        img.draft("L", (MOTION_GATE_SIZE[0] * 2, MOTION_GATE_SIZE[1] * 2))
+        gray = img.convert("L").resize(MOTION_GATE_SIZE, Image.BILINEAR)
+        return np.asarray(gray, dtype=np.int16)
+    except Exception:
+        return None
+
+
+def _motion_score(reference: np.ndarray, thumbnail: np.ndarray) -> float:
+    """Fraction of pixels that changed by more than MOTION_GATE_PIXEL_DELTA."""
+    changed = np.count_nonzero(np.abs(thumbnail - reference) > MOTION_GATE_PIXEL_DELTA)
+    return changed / thumbnail.size
+
+
+def _motion_gate_lookup(stream_id: str, thumbnail: Optional[np.ndarray], confidence: float):
+    """Previous ``(detections, fw, fh)`` of the stream if the frame shows no motion, else None."""
+    with _motion_lock:
+        _motion_metrics["frames"] += 1
+        ctx = _motion_streams.get(stream_id)
+        if (thumbnail is None or ctx is None or ctx["confidence"] != confidence
+                or ctx["reused"] >= MOTION_GATE_MAX_REUSE):
+            return None
+        _motion_streams.move_to_end(stream_id)
+        if _motion_score(ctx["reference"], thumbnail) >= MOTION_GATE_THRESHOLD:
+            return None
+        ctx["reused"] += 1
+        _motion_metrics["reused"] += 1
+        return ctx["result"]
+
+
+def _motion_gate_store(stream_id: str, thumbnail: Optional[np.ndarray], confidence: float, result: tuple) -> None:
+    """Make an inferred frame the new reference of its stream."""
+    if thumbnail is None:
+        return
+    with _motion_lock:
+        _motion_streams[stream_id] = {
+            "reference": thumbnail,
+            "confidence": confidence,
+            "result": result,
+            "reused": 0,
+        }
+        _motion_streams.move_to_end(stream_id)
+        while len(_motion_streams) > MOTION_GATE_MAX_STREAMS:
+            _motion_streams.popitem(last=False)
+
+
+def _motion_gate_stats_snapshot() -> Dict[str, Any]:
+    """Motion gate metrics as a JSON-friendly dict. Caller must hold _metrics_lock."""
+    with _motion_lock:
+        m = dict(_motion_metrics)
+        streams = len(_motion_streams)
+    return {
+        "enabled": MOTION_GATE_THRESHOLD > 0,
+        "threshold": MOTION_GATE_THRESHOLD,
+        "streams": streams,
+        "frames": m["frames"],
+        "reused_frames": m["reused"],
+        "skip_ratio": round(m["reused"] / m["frames"], 3) if m["frames"] > 0 else 0.0,
+        # Reused frames times the average model run they did not need
+        "est_saved_ms": round(m["reused"] * _inference_metrics["avg_inference_ms"], 1),
+    }
 
 
 def _to_jsonable(value: Any):
@@ -1104,23 +1601,12 @@ def _to_jsonable(value: Any):
     return value
 
 
-def _run_face_detection(img_bytes: bytes, device: str, confidence: float, enhance: bool = True, multi_scale: bool = True):
-    """Run face detection with Ring camera optimizations.
-    
-    Args:
-        img_bytes: Raw image bytes
-        device: 'cpu' or 'coral_usb'
-        confidence: Minimum confidence threshold
-        enhance: Apply image enhancement (contrast, sharpness)
-        multi_scale: Run detection at multiple scales
+def _detect_faces_image(img: Image.Image, device: str, confidence: float, multi_scale: bool = True):
+    """Run face detection on an already decoded (and optionally enhanced) RGB image.
+
+    Returns (faces, frame_width, frame_height, inference_ms).
     """
-    img = Image.open(io.BytesIO(img_bytes)).convert("RGB")
     frame_width, frame_height = img.size
-
-    # Apply Ring camera optimizations
-    if enhance:
-        img = _enhance_image_for_face_detection(img)
-
     interpreter = _get_cached_face_det_interpreter(device)
     input_details = interpreter.get_input_details()
     output_details = interpreter.get_output_details()
@@ -1175,6 +1661,30 @@ def _run_face_detection(img_bytes: bytes, device: str, confidence: float, enhanc
                 "box": {"x": x, "y": y, "w": w, "h": h}
             })
 
+    return faces, frame_width, frame_height, inference_ms
+
+
+def _run_face_detection(img_bytes: bytes, device: str, confidence: float, enhance: bool = True, multi_scale: bool = True):
+    """Run face detection with Ring camera optimizations.
+    
+    Args:
+        img_bytes: Raw image bytes
+        device: 'cpu' or 'coral_usb'
+        confidence: Minimum confidence threshold
+        enhance: Apply image enhancement (contrast, sharpness)
+        multi_scale: Run detection at multiple scales
+    """
+    img = Image.open(io.BytesIO(img_bytes)).convert("RGB")
+    if enhance:
+        img = _enhance_image_for_face_detection(img)
+    faces, frame_width, frame_height, inference_ms = _detect_faces_image(
+        img, device, confidence, multi_scale=multi_scale
+    )
+
+    interpreter = _get_cached_face_det_interpreter(device)
+    input_details = interpreter.get_input_details()
+    output_details = interpreter.get_output_details()
+
     # Debug info
     max_score = None
     scores_dtype = None
@@ -1345,9 +1855,50 @@ def stats():
     - Inference timing (avg, last)
     - Device usage percentages
     - System resource usage
+    - Per-device executor queue depth, wait and service times
+    - Motion gate skip ratio (frames answered without a model run)
     
     This is the primary endpoint for the v1.1.0 dashboard stats display.
     """
+    # Get system stats (optional - psutil may not be available)
+    # Measured before taking _metrics_lock: cpu_percent blocks for 100ms and
+    # the inference workers need the lock to record executor metrics.
+    try:
+        import psutil
+        # v1.2.3: Use interval=0.1 for actual measurement (interval=None returns 0 on first call)
+        cpu_percent = psutil.cpu_percent(interval=0.1)
+        memory = psutil.virtual_memory()
+        memory_percent = memory.percent
+        memory_used_mb = round(memory.used / 1024 / 1024)
+        memory_total_mb = round(memory.total / 1024 / 1024)
+    except ImportError:
+        # psutil not installed, use /proc directly (Linux)
+        try:
+            with open('/proc/stat', 'r') as f:
+                cpu_line = f.readline().split()
+            cpu_percent = 0  # Would need two measurements for accurate %
+            
+            with open('/proc/meminfo', 'r') as f:
+                meminfo = {}
+                for line in f:
+                    parts = line.split()
+                    if len(parts) >= 2:
+                        meminfo[parts[0].rstrip(':')] = int(parts[1])
+            memory_total_mb = round(meminfo.get('MemTotal', 0) / 1024)
+            memory_free = meminfo.get('MemAvailable', meminfo.get('MemFree', 0))
+            memory_used_mb = round((meminfo.get('MemTotal', 0) - memory_free) / 1024)
+            memory_percent = round(memory_used_mb / memory_total_mb * 100, 1) if memory_total_mb > 0 else 0
+        except Exception:
+            cpu_percent = 0
+            memory_percent = 0
+            memory_used_mb = 0
+            memory_total_mb = 0
+    except Exception:
+        cpu_percent = 0
+        memory_percent = 0
+        memory_used_mb = 0
+        memory_total_mb = 0
+    
     with _metrics_lock:
         total = _inference_metrics["total_inferences"]
         coral = _inference_metrics["tpu_inferences"]
@@ -1373,43 +1924,6 @@ def stats():
         # Also calculate uptime for reference
         uptime = now - _startup_time if '_startup_time' in globals() else 0
         
-        # Get system stats (optional - psutil may not be available)
-        try:
-            import psutil
-            # v1.2.3: Use interval=0.1 for actual measurement (interval=None returns 0 on first call)
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            memory = psutil.virtual_memory()
-            memory_percent = memory.percent
-            memory_used_mb = round(memory.used / 1024 / 1024)
-            memory_total_mb = round(memory.total / 1024 / 1024)
-        except ImportError:
-            # psutil not installed, use /proc directly (Linux)
-            try:
-                with open('/proc/stat', 'r') as f:
-                    cpu_line = f.readline().split()
-                cpu_percent = 0  # Would need two measurements for accurate %
-                
-                with open('/proc/meminfo', 'r') as f:
-                    meminfo = {}
-                    for line in f:
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            meminfo[parts[0].rstrip(':')] = int(parts[1])
-                memory_total_mb = round(meminfo.get('MemTotal', 0) / 1024)
-                memory_free = meminfo.get('MemAvailable', meminfo.get('MemFree', 0))
-                memory_used_mb = round((meminfo.get('MemTotal', 0) - memory_free) / 1024)
-                memory_percent = round(memory_used_mb / memory_total_mb * 100, 1) if memory_total_mb > 0 else 0
-            except Exception:
-                cpu_percent = 0
-                memory_percent = 0
-                memory_used_mb = 0
-                memory_total_mb = 0
-        except Exception:
-            cpu_percent = 0
-            memory_percent = 0
-            memory_used_mb = 0
-            memory_total_mb = 0
-        
         return {
             "devices": _detect_devices(),
             "tpu_healthy": _tpu_healthy,
@@ -1427,6 +1941,9 @@ def stats():
                 "last_inference_timestamp": _last_inference_timestamp,
                 "seconds_since_last_inference": round(now - _last_inference_timestamp, 1) if _last_inference_timestamp > 0 else -1,
             },
+            "executor_stats": _executor_stats_snapshot(),
+            "batching_stats": _batch_stats_snapshot(),
+            "motion_gate_stats": _motion_gate_stats_snapshot(),
             "system_stats": {
                 "cpu_percent": cpu_percent,
                 "memory_percent": memory_percent,
@@ -1466,6 +1983,10 @@ def stats_reset():
         # Clear recent inference times
         _recent_inference_times.clear()
         _last_inference_timestamp = 0
+        _reset_executor_metrics()
+        _batch_metrics.update(_new_batch_metrics())
+        with _motion_lock:
+            _motion_metrics.update(_new_motion_metrics())
         
         # Reset startup time for uptime calculation
         _startup_time = time.time()
@@ -1491,6 +2012,8 @@ def metrics():
         - Average and last inference times
         - TPU health status
         - CPU fallback count
+        - Per-device executor queue depth, wait and service times
+        - Motion gate skip ratio
     """
     with _metrics_lock:
         return {
@@ -1498,6 +2021,9 @@ def metrics():
             "tpu_healthy": _tpu_healthy,
             "tpu_failure_count": _tpu_failure_count,
             "tpu_fallback_remaining_sec": max(0, round(_tpu_fallback_until - time.time(), 1)) if not _tpu_healthy else 0,
+            "executors": _executor_stats_snapshot(),
+            "batching": _batch_stats_snapshot(),
+            "motion_gate": _motion_gate_stats_snapshot(),
             "success_rate": round(
                 _inference_metrics["successful_inferences"] / _inference_metrics["total_inferences"] * 100, 1
             ) if _inference_metrics["total_inferences"] > 0 else 100.0
@@ -1531,6 +2057,7 @@ def tpu_reset():
         _cached_face_det.clear()
         _cached_face_embed.clear()
         _cached_movenet.clear()
+    _batch_unsupported.clear()
     
     # Re-detect devices
     global _available_devices
@@ -1629,7 +2156,14 @@ async def detect(
     objects: str = Form("[]"),
     device: str = Form("auto"),
     confidence: float = Form(DEFAULT_CONFIDENCE_THRESHOLD),
+    stream_id: str = Form(""),
 ):
+    """Run object detection on one frame.
+
+    With ``stream_id`` (and the motion gate enabled) a frame without motion
+    against the stream's last inferred frame returns that frame's detections
+    with ``reused: true``.
+    """
     content = await file.read()
     
     # MED-006 Fix: Validate image content
@@ -1649,38 +2183,46 @@ async def detect(
     inference_ms = 0
     retries = 0
     original_device = device
-    
-    try:
-        # Retry wrapper for resilience
-        def do_detection():
-            return _run_detection(content, labels, device, confidence)
-        
-        detections, fw, fh, inference_ms = _run_with_retry(do_detection, max_retries=MAX_INFERENCE_RETRIES)
-        
-        # Record success
-        if device == "coral_usb":
-            _record_tpu_success()
-        _update_metrics(True, inference_ms, device)
-        _log_inference("detect", device, inference_ms, True, f"{len(detections)} objects")
-        
-    except Exception as e:
-        # Record failure and try CPU fallback
-        if device == "coral_usb":
-            _record_tpu_failure(e)
-            # Try CPU fallback
-            try:
-                device = "cpu"
-                detections, fw, fh, inference_ms = _run_detection(content, labels, device, confidence)
-                _update_metrics(True, inference_ms, device, retried=True)
-                _log_inference("detect", device, inference_ms, True, f"CPU fallback after TPU fail")
-            except Exception as cpu_err:
+
+    thumbnail = None
+    reused = None
+    if _motion_gate_enabled(stream_id):
+        thumbnail = await asyncio.to_thread(_motion_thumbnail, content)
+        reused = _motion_gate_lookup(stream_id, thumbnail, confidence)
+
+    if reused is not None:
+        detections, fw, fh = reused
+    else:
+        try:
+            # Retry wrapper for resilience (micro-batched with concurrent requests)
+            detections, fw, fh, inference_ms = await _detect_frame(content, labels, device, confidence)
+            
+            # Record success
+            if device == "coral_usb":
+                _record_tpu_success()
+            _update_metrics(True, inference_ms, device)
+            _log_inference("detect", device, inference_ms, True, f"{len(detections)} objects")
+            
+        except Exception as e:
+            # Record failure and try CPU fallback
+            if device == "coral_usb":
+                _record_tpu_failure(e)
+                # Try CPU fallback
+                try:
+                    device = "cpu"
+                    detections, fw, fh, inference_ms = await _detect_frame(content, labels, device, confidence)
+                    _update_metrics(True, inference_ms, device, retried=True)
+                    _log_inference("detect", device, inference_ms, True, f"CPU fallback after TPU fail")
+                except Exception as cpu_err:
+                    _update_metrics(False, 0, device)
+                    _log_inference("detect", device, 0, False, str(cpu_err))
+                    raise
+            else:
                 _update_metrics(False, 0, device)
-                _log_inference("detect", device, 0, False, str(cpu_err))
+                _log_inference("detect", device, 0, False, str(e))
                 raise
-        else:
-            _update_metrics(False, 0, device)
-            _log_inference("detect", device, 0, False, str(e))
-            raise
+        if thumbnail is not None:
+            _motion_gate_store(stream_id, thumbnail, confidence, (detections, fw, fh))
 
     try:
         obj_filter = json.loads(objects or "[]")
@@ -1695,71 +2237,433 @@ async def detect(
         "frame_height": fh, 
         "device": device,
         "inference_ms": round(inference_ms, 1),
+        "reused": reused is not None,
         "tpu_healthy": _tpu_healthy
     }
 
 
-@app.post("/faces")
-async def faces(
-    file: UploadFile = File(...),
+def _run_detection_batch(contents: List[bytes], labels: Dict[int, str], device: str, confidence: float,
+                         stream_id: str = ""):
+    """Run object detection on several frames back-to-back on one executor slot.
+
+    Invalid frames are reported per frame and do not fail the batch.
+    Interpreter errors propagate so the caller can fall back to CPU.
+    With ``stream_id`` frames pass the motion gate in order, so each frame
+    is compared to the last inferred one, also within the batch.
+
+    Returns:
+        (results, inference_ms_total, frames_ok)
+    """
+    results = []
+    total_ms = 0.0
+    frames_ok = 0
+    gated = _motion_gate_enabled(stream_id)
+    for content in contents:
+        is_valid, error_msg = _validate_image_content(content)
+        if not is_valid:
+            results.append({"error": error_msg, "objects": []})
+            continue
+        thumbnail = None
+        if gated:
+            thumbnail = _motion_thumbnail(content)
+            reused = _motion_gate_lookup(stream_id, thumbnail, confidence)
+            if reused is not None:
+                detections, fw, fh = reused
+                results.append({
+                    "objects": detections,
+                    "frame_width": fw,
+                    "frame_height": fh,
+                    "inference_ms": 0.0,
+                    "reused": True,
+                })
+                continue
+        detections, fw, fh, inference_ms = _run_with_retry(
+            _run_detection, content, labels, device, confidence, max_retries=MAX_INFERENCE_RETRIES
+        )
+        if thumbnail is not None:
+            _motion_gate_store(stream_id, thumbnail, confidence, (detections, fw, fh))
+        total_ms += inference_ms
+        frames_ok += 1
+        results.append({
+            "objects": detections,
+            "frame_width": fw,
+            "frame_height": fh,
+            "inference_ms": round(inference_ms, 1),
+        })
+    return results, total_ms, frames_ok
+
+
+@app.post("/detect_batch")
+async def detect_batch(
+    files: List[UploadFile] = File(...),
+    objects: str = Form("[]"),
     device: str = Form("auto"),
-    confidence: float = Form(0.3),  # Lower default for Ring cameras
-    embed: str = Form("1"),
-    debug: str = Form("0"),
-    enhance: str = Form("1"),  # Enable image enhancement by default
-    multi_scale: str = Form("1"),  # Enable multi-scale detection by default
+    confidence: float = Form(DEFAULT_CONFIDENCE_THRESHOLD),
+    stream_id: str = Form(""),
 ):
-    """Detect faces in an image with Ring camera optimizations.
-    
+    """Run object detection on several frames in one request.
+
+    Accepts a multipart list of ``files`` and returns one result per frame,
+    in upload order. All frames share the cached interpreter and run as a
+    single job on the device executor.
+
     Args:
-        file: Image file to analyze
+        files: Frames to analyze (max MAX_BATCH_FRAMES)
+        objects: JSON list of labels to keep (empty = all)
         device: 'auto', 'cpu', or 'coral_usb'
-        confidence: Minimum confidence (0.0-1.0), default 0.3 for Ring cameras
-        embed: Generate face embeddings ('1' or '0')
-        debug: Include debug info ('1' or '0')
-        enhance: Apply image enhancement for better detection ('1' or '0')
-        multi_scale: Run detection at multiple scales ('1' or '0')
+        confidence: Minimum detection score
+        stream_id: Optional stream the frames belong to, in order; enables
+            the motion gate for them
     """
-    content = await file.read()
+    if len(files) > MAX_BATCH_FRAMES:
+        return {"error": f"Too many frames (max {MAX_BATCH_FRAMES})", "results": [], "device": "none"}
+
+    contents = [await f.read() for f in files]
+    labels = _get_labels()
     devices = _detect_devices()
 
-    # Use best device considering TPU health
     if device == "auto":
         device = _get_best_device()
     if device not in devices:
         device = "cpu"
 
-    enhance_enabled = str(enhance).lower() in ("1", "true", "yes", "on")
-    multi_scale_enabled = str(multi_scale).lower() in ("1", "true", "yes", "on")
-
     try:
-        def do_face_detection():
-            return _run_face_detection(
-                content, device, confidence, enhance=enhance_enabled, multi_scale=multi_scale_enabled
-            )
-        
-        faces_list, fw, fh, inference_ms, max_score, scores_dtype, output_info, input_info, input_details_raw, input_details_error = _run_with_retry(
-            do_face_detection, max_retries=MAX_INFERENCE_RETRIES
+        results, total_ms, frames_ok = await _submit_inference(
+            device, _run_detection_batch, contents, labels, device, confidence, stream_id
         )
-        
         if device == "coral_usb":
             _record_tpu_success()
-        _update_metrics(True, inference_ms, device)
-        _log_inference("faces", device, inference_ms, True, f"{len(faces_list)} faces")
-        
+        retried = False
     except Exception as e:
-        if device == "coral_usb":
-            _record_tpu_failure(e)
-            # Try CPU fallback
-            try:
-                device = "cpu"
-                faces_list, fw, fh, inference_ms, max_score, scores_dtype, output_info, input_info, input_details_raw, input_details_error = _run_face_detection(
-                    content, device, confidence, enhance=enhance_enabled, multi_scale=multi_scale_enabled
-                )
-                _update_metrics(True, inference_ms, device, retried=True)
-                _log_inference("faces", device, inference_ms, True, "CPU fallback")
-            except Exception as cpu_err:
-                _update_metrics(False, 0, device)
+        if device != "coral_usb":
+            _update_metrics(False, 0, device)
+            _log_inference("detect_batch", device, 0, False, str(e))
+            raise
+        _record_tpu_failure(e)
+        device = "cpu"
+        retried = True
+        try:
+            results, total_ms, frames_ok = await _submit_inference(
+                device, _run_detection_batch, contents, labels, device, confidence, stream_id
+            )
+        except Exception as cpu_err:
+            _update_metrics(False, 0, device)
+            _log_inference("detect_batch", device, 0, False, str(cpu_err))
+            raise
+
+    for r in results:
+        if "error" not in r and not r.get("reused"):
+            _update_metrics(True, r["inference_ms"], device, retried=retried)
+    reused_count = sum(1 for r in results if r.get("reused"))
+    _log_inference("detect_batch", device, total_ms, True,
+                   f"{frames_ok}/{len(contents)} frames"
+                   + (f", {reused_count} reused" if reused_count else "")
+                   + (" (CPU fallback)" if retried else ""))
+
+    try:
+        obj_filter = json.loads(objects or "[]")
+    except Exception:
+        obj_filter = []
+    if obj_filter:
+        for r in results:
+            r["objects"] = [d for d in r["objects"] if d["label"] in obj_filter]
+
+    return {
+        "results": results,
+        "device": device,
+        "inference_ms": round(total_ms, 1),
+        "tpu_healthy": _tpu_healthy,
+    }
+
+
+# ===== Raw Frame Transport =====
+# Same-host clients can skip JPEG encode/decode and resizing entirely: they
+# send frames already resized to the model input as uint8 RGB, either as the
+# request body or as a file in SHM_FRAME_DIR. /input_spec tells them the shape.
+
+_detection_input_specs: Dict[str, tuple] = {}
+
+
+class RawFrameMismatch(ValueError):
+    """Raw frames do not match the object detector's input tensor."""
+
+
+def _detection_input_spec(device: str) -> tuple:
+    """(H, W, C) and dtype name of the object detector input on this device."""
+    spec = _detection_input_specs.get(device)
+    if spec is None:
+        details = _get_cached_interpreter(device).get_input_details()[0]
+        spec = ([int(v) for v in details["shape"][1:]], np.dtype(details["dtype"]).name)
+        _detection_input_specs[device] = spec
+    return spec
+
+
+def _run_raw_detection_batch(frames: np.ndarray, labels: Dict[int, str], device: str, confidence: float,
+                             frame_width: int, frame_height: int):
+    """Run object detection on an (N, H, W, 3) uint8 array of model-sized frames.
+
+    Returns:
+        (results, inference_ms_total)
+    
+    Raises:
+        RawFrameMismatch: The frames do not fit the model input on this device
+    """
+    shape, dtype = _detection_input_spec(device)
+    if list(frames.shape[1:]) != shape or frames.dtype.name != dtype:
+        raise RawFrameMismatch(
+            f"expected {dtype} {shape}, got {frames.dtype.name} {list(frames.shape[1:])}"
+        )
+    results = []
+    total_ms = 0.0
+    for pixels in frames:
+        detections, fw, fh, inference_ms = _run_with_retry(
+            _run_detection_tensor, pixels, labels, device, confidence, frame_width, frame_height,
+            max_retries=MAX_INFERENCE_RETRIES,
+        )
+        total_ms += inference_ms
+        results.append({
+            "objects": detections,
+            "frame_width": fw,
+            "frame_height": fh,
+            "inference_ms": round(inference_ms, 1),
+        })
+    return results, total_ms
+
+
+def _raw_frame_error(message: str, device: str, expected=None) -> JSONResponse:
+    body = {"error": message, "results": [], "device": device}
+    if expected is not None:
+        body["expected_shape"], body["expected_dtype"] = expected
+    return JSONResponse(status_code=422, content=body)
+
+
+@app.get("/input_spec")
+async def input_spec(device: str = "auto"):
+    """Object detector input tensor for clients using /detect_raw."""
+    devices = _detect_devices()
+    if device == "auto":
+        device = _get_best_device()
+    if device not in devices:
+        device = "cpu"
+    shape, dtype = await _submit_inference(device, _detection_input_spec, device)
+    return {
+        "device": device,
+        "shape": shape,
+        "dtype": dtype,
+        "max_frames": MAX_BATCH_FRAMES,
+        "shm_dir": SHM_FRAME_DIR if os.path.isdir(SHM_FRAME_DIR) else None,
+    }
+
+
+@app.post("/detect_raw")
+async def detect_raw(
+    request: Request,
+    objects: str = "[]",
+    device: str = "auto",
+    confidence: float = DEFAULT_CONFIDENCE_THRESHOLD,
+    x_frame_shape: str = Header(...),
+    x_frame_dtype: str = Header("uint8"),
+    x_frame_size: Optional[str] = Header(None),
+    x_frame_shm: Optional[str] = Header(None),
+):
+    """Run object detection on pre-resized raw RGB frames.
+    
+    The body is ``application/octet-stream`` holding N frames of the model
+    input size (see /input_spec), or empty when ``X-Frame-Shm`` names a file
+    in SHM_FRAME_DIR with the same bytes. Options are query parameters.
+    
+    Headers:
+        X-Frame-Shape: "N,H,W,3" (or "H,W,3" for one frame)
+        X-Frame-Dtype: must be "uint8"
+        X-Frame-Size: "WxH" of the original frames, used to scale boxes
+        X-Frame-Shm: file name inside SHM_FRAME_DIR instead of a body
+    
+    Frames that do not match the model input are rejected with HTTP 422 and
+    the expected shape, so the client can fall back to /detect_batch.
+    """
+    devices = _detect_devices()
+    if device == "auto":
+        device = _get_best_device()
+    if device not in devices:
+        device = "cpu"
+
+    try:
+        dims = [int(v) for v in x_frame_shape.split(",")]
+    except ValueError:
+        return _raw_frame_error(f"Invalid X-Frame-Shape: {x_frame_shape}", device)
+    if len(dims) == 3:
+        dims = [1] + dims
+    if len(dims) != 4 or not 1 <= dims[0] <= MAX_BATCH_FRAMES or min(dims) < 1:
+        return _raw_frame_error(f"Invalid X-Frame-Shape: {x_frame_shape} (max {MAX_BATCH_FRAMES} frames)", device)
+    if x_frame_dtype != "uint8":
+        return _raw_frame_error(f"Unsupported X-Frame-Dtype: {x_frame_dtype}", device)
+
+    if x_frame_shm:
+        # Only bare file names inside SHM_FRAME_DIR, never arbitrary paths
+        if os.path.basename(x_frame_shm) != x_frame_shm or x_frame_shm in (".", ".."):
+            return _raw_frame_error("Invalid X-Frame-Shm name", device)
+        try:
+            payload = await asyncio.to_thread(
+                np.fromfile, os.path.join(SHM_FRAME_DIR, x_frame_shm), dtype=np.uint8
+            )
+        except OSError as e:
+            return _raw_frame_error(f"Shared memory frame not readable: {e}", device)
+    else:
+        payload = np.frombuffer(await request.body(), dtype=np.uint8)
+
+    n, h, w, c = dims
+    if payload.size != n * h * w * c:
+        return _raw_frame_error(f"Expected {n * h * w * c} bytes for shape {dims}, got {payload.size}", device)
+    frames = payload.reshape(dims)
+
+    frame_width, frame_height = w, h
+    if x_frame_size:
+        try:
+            frame_width, frame_height = (int(v) for v in x_frame_size.lower().split("x"))
+        except ValueError:
+            return _raw_frame_error(f"Invalid X-Frame-Size: {x_frame_size}", device)
+
+    labels = _get_labels()
+    retried = False
+    try:
+        results, total_ms = await _submit_inference(
+            device, _run_raw_detection_batch, frames, labels, device, confidence, frame_width, frame_height
+        )
+        if device == "coral_usb":
+            _record_tpu_success()
+    except RawFrameMismatch as e:
+        return _raw_frame_error(str(e), device, _detection_input_specs.get(device))
+    except Exception as e:
+        if device != "coral_usb":
+            _update_metrics(False, 0, device)
+            _log_inference("detect_raw", device, 0, False, str(e))
+            raise
+        _record_tpu_failure(e)
+        device = "cpu"
+        retried = True
+        try:
+            results, total_ms = await _submit_inference(
+                device, _run_raw_detection_batch, frames, labels, device, confidence, frame_width, frame_height
+            )
+        except RawFrameMismatch as mismatch:
+            return _raw_frame_error(str(mismatch), device, _detection_input_specs.get(device))
+        except Exception as cpu_err:
+            _update_metrics(False, 0, device)
+            _log_inference("detect_raw", device, 0, False, str(cpu_err))
+            raise
+
+    for r in results:
+        _update_metrics(True, r["inference_ms"], device, retried=retried)
+    _log_inference("detect_raw", device, total_ms, True,
+                   f"{n} frames{' via shm' if x_frame_shm else ''}" + (" (CPU fallback)" if retried else ""))
+
+    try:
+        obj_filter = json.loads(objects or "[]")
+    except Exception:
+        obj_filter = []
+    if obj_filter:
+        for r in results:
+            r["objects"] = [d for d in r["objects"] if d["label"] in obj_filter]
+
+    return {
+        "results": results,
+        "device": device,
+        "inference_ms": round(total_ms, 1),
+        "tpu_healthy": _tpu_healthy,
+    }
+
+
+def _embed_face_boxes(content: bytes, faces_list: list, fw: int, fh: int, device: str) -> float:
+    """Add embeddings to detected faces in place. Returns total embedding time in ms."""
+    img = Image.open(io.BytesIO(content)).convert("RGB")
+    return _embed_faces_in_image(img, faces_list, device)
+
+
+def _embed_faces_in_image(img: Image.Image, faces_list: list, device: str) -> float:
+    """Like _embed_face_boxes, for an already decoded image."""
+    embed_total_ms = 0.0
+    fw, fh = img.size
+    for face in faces_list:
+        box = face.get("box") or {}
+        x = max(int(box.get("x", 0)), 0)
+        y = max(int(box.get("y", 0)), 0)
+        w = max(int(box.get("w", 0)), 1)
+        h = max(int(box.get("h", 0)), 1)
+        x2 = min(x + w, fw)
+        y2 = min(y + h, fh)
+        crop = img.crop((x, y, x2, y2))
+        try:
+            emb, emb_ms, emb_source = _run_face_embedding(crop, device)
+            embed_total_ms += emb_ms
+            face["embedding"] = emb
+            face["embedding_source"] = emb_source
+        except Exception as e:
+            face["embedding_error"] = str(e)
+    return embed_total_ms
+
+
+@app.post("/faces")
+async def faces(
+    file: UploadFile = File(...),
+    device: str = Form("auto"),
+    confidence: float = Form(0.3),  # Lower default for Ring cameras
+    embed: str = Form("1"),
+    debug: str = Form("0"),
+    enhance: str = Form("1"),  # Enable image enhancement by default
+    multi_scale: str = Form("1"),  # Enable multi-scale detection by default
+):
+    """Detect faces in an image with Ring camera optimizations.
+    
+    Args:
+        file: Image file to analyze
+        device: 'auto', 'cpu', or 'coral_usb'
+        confidence: Minimum confidence (0.0-1.0), default 0.3 for Ring cameras
+        embed: Generate face embeddings ('1' or '0')
+        debug: Include debug info ('1' or '0')
+        enhance: Apply image enhancement for better detection ('1' or '0')
+        multi_scale: Run detection at multiple scales ('1' or '0')
+    """
+    content = await file.read()
+    devices = _detect_devices()
+
+    # Use best device considering TPU health
+    if device == "auto":
+        device = _get_best_device()
+    if device not in devices:
+        device = "cpu"
+
+    enhance_enabled = str(enhance).lower() in ("1", "true", "yes", "on")
+    multi_scale_enabled = str(multi_scale).lower() in ("1", "true", "yes", "on")
+
+    try:
+        def do_face_detection():
+            return _run_face_detection(
+                content, device, confidence, enhance=enhance_enabled, multi_scale=multi_scale_enabled
+            )
+        
+        faces_list, fw, fh, inference_ms, max_score, scores_dtype, output_info, input_info, input_details_raw, input_details_error = await _submit_inference(
+            device, _run_with_retry, do_face_detection, max_retries=MAX_INFERENCE_RETRIES
+        )
+        
+        if device == "coral_usb":
+            _record_tpu_success()
+        _update_metrics(True, inference_ms, device)
+        _log_inference("faces", device, inference_ms, True, f"{len(faces_list)} faces")
+        
+    except Exception as e:
+        if device == "coral_usb":
+            _record_tpu_failure(e)
+            # Try CPU fallback
+            try:
+                device = "cpu"
+                faces_list, fw, fh, inference_ms, max_score, scores_dtype, output_info, input_info, input_details_raw, input_details_error = await _submit_inference(
+                    device, _run_face_detection,
+                    content, device, confidence, enhance=enhance_enabled, multi_scale=multi_scale_enabled
+                )
+                _update_metrics(True, inference_ms, device, retried=True)
+                _log_inference("faces", device, inference_ms, True, "CPU fallback")
+            except Exception as cpu_err:
+                _update_metrics(False, 0, device)
                 _log_inference("faces", device, 0, False, str(cpu_err))
                 raise
         else:
@@ -1770,23 +2674,9 @@ async def faces(
     embed_enabled = str(embed).lower() in ("1", "true", "yes", "on")
     embed_total_ms = 0.0
     if embed_enabled and faces_list:
-        img = Image.open(io.BytesIO(content)).convert("RGB")
-        for face in faces_list:
-            box = face.get("box") or {}
-            x = max(int(box.get("x", 0)), 0)
-            y = max(int(box.get("y", 0)), 0)
-            w = max(int(box.get("w", 0)), 1)
-            h = max(int(box.get("h", 0)), 1)
-            x2 = min(x + w, fw)
-            y2 = min(y + h, fh)
-            crop = img.crop((x, y, x2, y2))
-            try:
-                emb, emb_ms, emb_source = _run_face_embedding(crop, device)
-                embed_total_ms += emb_ms
-                face["embedding"] = emb
-                face["embedding_source"] = emb_source
-            except Exception as e:
-                face["embedding_error"] = str(e)
+        embed_total_ms = await _submit_inference(
+            device, _embed_face_boxes, content, faces_list, fw, fh, device
+        )
 
     result = {
         "faces": faces_list,
@@ -1836,9 +2726,12 @@ async def embed_face(
     if device not in devices:
         device = "cpu"
 
-    try:
+    def do_embedding():
         img = Image.open(io.BytesIO(content)).convert("RGB")
-        emb, emb_ms, emb_source = _run_face_embedding(img, device)
+        return _run_face_embedding(img, device)
+
+    try:
+        emb, emb_ms, emb_source = await _submit_inference(device, do_embedding)
         return {
             "embedding": emb,
             "embedding_source": emb_source,
@@ -1853,36 +2746,8 @@ async def embed_face(
         }
 
 
-@app.post("/faces_from_person")
-async def faces_from_person(
-    file: UploadFile = File(...),
-    person_boxes: str = Form("[]"),  # JSON array of person boxes
-    device: str = Form("auto"),
-    confidence: float = Form(0.2),  # Very low confidence for head crops
-    embed: str = Form("1"),
-):
-    """Extract faces from person detection boxes.
-    
-    This endpoint is optimized for Ring/doorbell cameras where:
-    - Faces are small due to wide-angle lens
-    - Person detection works but face detection doesn't
-    - Head region needs to be extracted and analyzed separately
-    
-    Args:
-        file: Image file
-        person_boxes: JSON array of person boxes [{"x":0,"y":0,"w":100,"h":200}, ...]
-        device: 'auto', 'cpu', or 'coral_usb'
-        confidence: Minimum confidence for face detection
-        embed: Generate face embeddings
-    """
-    content = await file.read()
-    devices = _detect_devices()
-
-    if device == "auto":
-        device = "coral_usb" if "coral_usb" in devices else "cpu"
-    if device not in devices:
-        device = "cpu"
-
+def _faces_from_person_job(content: bytes, person_boxes: str, device: str, confidence: float, embed: str) -> dict:
+    """Blocking worker for /faces_from_person, runs on the device executor."""
     try:
         boxes = json.loads(person_boxes or "[]")
     except:
@@ -1974,37 +2839,27 @@ async def faces_from_person(
     }
 
 
-@app.post("/faces_ring")
-async def faces_ring(
+@app.post("/faces_from_person")
+async def faces_from_person(
     file: UploadFile = File(...),
+    person_boxes: str = Form("[]"),  # JSON array of person boxes
     device: str = Form("auto"),
-    person_confidence: float = Form(0.4),
-    face_confidence: float = Form(0.1),
+    confidence: float = Form(0.2),  # Very low confidence for head crops
     embed: str = Form("1"),
-    debug: str = Form("0"),
 ):
-    """All-in-one face detection optimized for Ring/doorbell cameras.
-    
-    This endpoint:
-    1. Runs person detection first
-    2. Extracts the head region from each detected person
-    3. Enhances and upscales the head region
-    4. Runs face detection on each head crop
-    5. Also runs standard face detection on the full enhanced image
-    6. Merges and deduplicates all results
+    """Extract faces from person detection boxes.
     
-    This approach is specifically designed for Ring cameras where:
+    This endpoint is optimized for Ring/doorbell cameras where:
     - Faces are small due to wide-angle lens
-    - IR/night vision reduces contrast
-    - Standard face detection often fails
+    - Person detection works but face detection doesn't
+    - Head region needs to be extracted and analyzed separately
     
     Args:
         file: Image file
+        person_boxes: JSON array of person boxes [{"x":0,"y":0,"w":100,"h":200}, ...]
         device: 'auto', 'cpu', or 'coral_usb'
-        person_confidence: Minimum confidence for person detection
-        face_confidence: Minimum confidence for face detection (very low recommended)
+        confidence: Minimum confidence for face detection
         embed: Generate face embeddings
-        debug: Include debug information
     """
     content = await file.read()
     devices = _detect_devices()
@@ -2014,6 +2869,14 @@ async def faces_ring(
     if device not in devices:
         device = "cpu"
 
+    return await _submit_inference(
+        device, _faces_from_person_job, content, person_boxes, device, confidence, embed
+    )
+
+
+def _faces_ring_job(content: bytes, device: str, person_confidence: float, face_confidence: float,
+                    embed: str, debug: str) -> dict:
+    """Blocking worker for /faces_ring, runs on the device executor."""
     img = Image.open(io.BytesIO(content)).convert("RGB")
     fw, fh = img.size
     embed_enabled = str(embed).lower() in ("1", "true", "yes", "on")
@@ -2025,7 +2888,7 @@ async def faces_ring(
     # STEP 1: Run person detection
     try:
         labels = _get_labels()
-        person_results, _, _, person_inference = _run_detection(content, labels, device, person_confidence)
+        person_results, _, _, person_inference = _run_detection_image(img, labels, device, person_confidence)
         person_boxes = [p for p in person_results if p.get("label") == "person"]
         if debug_enabled:
             debug_info["steps"].append({"step": "person_detection", "persons_found": len(person_boxes), "boxes": person_boxes})
@@ -2200,6 +3063,51 @@ async def faces_ring(
     return result
 
 
+@app.post("/faces_ring")
+async def faces_ring(
+    file: UploadFile = File(...),
+    device: str = Form("auto"),
+    person_confidence: float = Form(0.4),
+    face_confidence: float = Form(0.1),
+    embed: str = Form("1"),
+    debug: str = Form("0"),
+):
+    """All-in-one face detection optimized for Ring/doorbell cameras.
+    
+    This endpoint:
+    1. Runs person detection first
+    2. Extracts the head region from each detected person
+    3. Enhances and upscales the head region
+    4. Runs face detection on each head crop
+    5. Also runs standard face detection on the full enhanced image
+    6. Merges and deduplicates all results
+    
+    This approach is specifically designed for Ring cameras where:
+    - Faces are small due to wide-angle lens
+    - IR/night vision reduces contrast
+    - Standard face detection often fails
+    
+    Args:
+        file: Image file
+        device: 'auto', 'cpu', or 'coral_usb'
+        person_confidence: Minimum confidence for person detection
+        face_confidence: Minimum confidence for face detection (very low recommended)
+        embed: Generate face embeddings
+        debug: Include debug information
+    """
+    content = await file.read()
+    devices = _detect_devices()
+
+    if device == "auto":
+        device = "coral_usb" if "coral_usb" in devices else "cpu"
+    if device not in devices:
+        device = "cpu"
+
+    return await _submit_inference(
+        device, _faces_ring_job, content, device, person_confidence, face_confidence, embed, debug
+    )
+
+
 @app.post("/head_movenet")
 async def head_movenet(
     file: UploadFile = File(...),
@@ -2244,7 +3152,9 @@ async def head_movenet(
         def do_movenet():
             return _run_movenet_pose(content)
         
-        keypoints, head_box, fw, fh, inference_ms = _run_with_retry(do_movenet, max_retries=MAX_INFERENCE_RETRIES)
+        keypoints, head_box, fw, fh, inference_ms = await _submit_inference(
+            "coral_usb", _run_with_retry, do_movenet, max_retries=MAX_INFERENCE_RETRIES
+        )
         
         # Filter keypoints by confidence if requested
         if min_confidence > 0:
@@ -2278,3 +3188,276 @@ async def head_movenet(
             "tpu_healthy": _tpu_healthy
         }
 
+
+# ============================================================================
+# Combined Frame Pipeline (v1.2.0)
+# ============================================================================
+# /analyze_frame runs the per-frame cascade the integration used to drive over
+# HTTP (/detect -> /faces -> retry -> person crops -> /head_movenet ->
+# /embed_face) on a single decoded image. Person boxes from the object stage
+# are the ROIs for the crop fallback and for validating MoveNet heads.
+
+PIPELINE_CROP_PADDING = 0.1  # 10% padding around person boxes
+PIPELINE_MIN_CROP_SIZE = 40  # Skip person crops smaller than this (pixels)
+PIPELINE_MOVENET_MIN_CONFIDENCE = 0.3
+PIPELINE_MOVENET_MIN_KEYPOINTS = 3
+
+
+def _is_truthy(value) -> bool:
+    return str(value).lower() in ("1", "true", "yes", "on")
+
+
+def _faces_in_person_crops(img: Image.Image, persons: list, device: str, confidence: float,
+                           embed: bool) -> tuple[list, float]:
+    """Search padded person crops for faces, upscaling small crops.
+    
+    Returns (faces in frame coordinates, embedding time in ms).
+    """
+    frame_w, frame_h = img.size
+    found = []
+    embed_ms = 0.0
+    for person in persons:
+        box = person.get("box") or {}
+        x = max(int(box.get("x", 0)), 0)
+        y = max(int(box.get("y", 0)), 0)
+        w = max(int(box.get("w", 0)), 1)
+        h = max(int(box.get("h", 0)), 1)
+        pad = int(PIPELINE_CROP_PADDING * max(w, h))
+        x1 = max(x - pad, 0)
+        y1 = max(y - pad, 0)
+        x2 = min(x + w + pad, frame_w)
+        y2 = min(y + h + pad, frame_h)
+        if (x2 - x1) < PIPELINE_MIN_CROP_SIZE or (y2 - y1) < PIPELINE_MIN_CROP_SIZE:
+            continue
+        
+        crop = img.crop((x1, y1, x2, y2))
+        max_dim = max(crop.size)
+        # Native scale first, then 1.5x / 2x upscales with lower thresholds for small crops
+        attempts = [(1.0, confidence)]
+        if max_dim < 160:
+            attempts.append((1.5, max(0.15, confidence * 0.7)))
+        if max_dim < 120:
+            attempts.append((2.0, max(0.1, confidence * 0.6)))
+        
+        for scale, conf in attempts:
+            if scale == 1.0:
+                scaled = crop
+            else:
+                scaled = crop.resize((int(crop.width * scale), int(crop.height * scale)))
+            faces, _, _, _ = _detect_faces_image(_enhance_image_for_face_detection(scaled), device, conf)
+            if not faces:
+                continue
+            if embed:
+                embed_ms += _embed_faces_in_image(scaled, faces, device)
+            for face in faces:
+                fb = face["box"]
+                face["box"] = {
+                    "x": int(fb["x"] / scale) + x1,
+                    "y": int(fb["y"] / scale) + y1,
+                    "w": int(fb["w"] / scale),
+                    "h": int(fb["h"] / scale),
+                }
+            found.extend(faces)
+            break
+    return found, embed_ms
+
+
+def _analyze_frame_job(content: bytes, labels: Dict[int, str], device: str, confidence: float,
+                       face_enabled: bool, face_confidence: float, face_retry_confidence: float,
+                       multi_scale: bool, crop_fallback: bool, embed: bool):
+    """Blocking worker for /analyze_frame, runs on the device executor.
+    
+    Returns (result, decoded image, person detections) so the MoveNet stage
+    can reuse the decoded frame on the Coral executor.
+    """
+    timings = {}
+    t0 = time.perf_counter()
+    img = Image.open(io.BytesIO(content)).convert("RGB")
+    frame_width, frame_height = img.size
+    timings["decode_ms"] = (time.perf_counter() - t0) * 1000
+    
+    detections, _, _, objects_ms = _run_detection_image(img, labels, device, confidence)
+    timings["objects_ms"] = objects_ms
+    persons = [d for d in detections if d.get("label") == "person"]
+    
+    faces = []
+    face_stage = None
+    if face_enabled and persons:
+        t_face = time.perf_counter()
+        embed_ms = 0.0
+        enhanced = _enhance_image_for_face_detection(img)
+        faces, _, _, _ = _detect_faces_image(enhanced, device, face_confidence, multi_scale=multi_scale)
+        if not faces and 0 < face_retry_confidence < face_confidence:
+            faces, _, _, _ = _detect_faces_image(enhanced, device, face_retry_confidence, multi_scale=multi_scale)
+        if faces:
+            face_stage = "frame"
+            if embed:
+                embed_ms += _embed_faces_in_image(img, faces, device)
+        elif crop_fallback:
+            faces, crop_embed_ms = _faces_in_person_crops(img, persons, device, face_confidence, embed)
+            embed_ms += crop_embed_ms
+            if faces:
+                face_stage = "person_crop"
+        timings["faces_ms"] = (time.perf_counter() - t_face) * 1000 - embed_ms
+        timings["embedding_ms"] = embed_ms
+    
+    timings["total_ms"] = (time.perf_counter() - t0) * 1000
+    result = {
+        "objects": detections,
+        "faces": faces,
+        "face_stage": face_stage,
+        "frame_width": frame_width,
+        "frame_height": frame_height,
+        "timings": timings,
+    }
+    return result, img, persons
+
+
+def _movenet_head_face(img: Image.Image, persons: list):
+    """MoveNet head fallback, validated against the person boxes.
+    
+    Returns (face dict or None, inference_ms).
+    """
+    keypoints, _, fw, fh, inference_ms = _run_movenet_pose_image(img)
+    head = _calculate_head_box_from_keypoints(keypoints, fw, fh, PIPELINE_MOVENET_MIN_CONFIDENCE)
+    if not head or head.get("keypoints_used", 0) < PIPELINE_MOVENET_MIN_KEYPOINTS:
+        return None, inference_ms
+    
+    hbox = head["box"]
+    cx = hbox["x"] + hbox["w"] // 2
+    cy = hbox["y"] + hbox["h"] // 2
+    in_person = False
+    for person in persons:
+        pb = person.get("box") or {}
+        px, py = int(pb.get("x", 0)), int(pb.get("y", 0))
+        if px <= cx <= px + int(pb.get("w", 0)) and py <= cy <= py + int(pb.get("h", 0)):
+            in_person = True
+            break
+    if not in_person:
+        return None, inference_ms
+    
+    return {
+        "score": head.get("confidence", 0.5),
+        "box": hbox,
+        "method": "movenet",
+        "keypoints_used": head["keypoints_used"],
+    }, inference_ms
+
+
+@app.post("/analyze_frame")
+async def analyze_frame(
+    file: UploadFile = File(...),
+    objects: str = Form("[]"),
+    device: str = Form("auto"),
+    confidence: float = Form(DEFAULT_CONFIDENCE_THRESHOLD),
+    face: str = Form("1"),
+    face_confidence: float = Form(0.3),
+    face_retry_confidence: float = Form(0.0),
+    multi_scale: str = Form("1"),
+    crop_fallback: str = Form("1"),
+    movenet_fallback: str = Form("1"),
+    embed: str = Form("1"),
+):
+    """Run object detection and the face cascade on one frame in a single call.
+    
+    Stages (all on one decoded image):
+        1. Object detection
+        2. Face detection on the full frame if a person was found, retried
+           once at face_retry_confidence (0 disables the retry)
+        3. Face detection in padded person crops if the frame had no faces
+        4. MoveNet head estimate inside a person box (Coral only)
+        5. Embeddings for every face found
+    
+    Returns the /detect fields plus "faces", "face_stage" (which stage found
+    them) and per-stage "timings" in ms.
+    """
+    content = await file.read()
+    
+    # MED-006 Fix: Validate image content
+    is_valid, error_msg = _validate_image_content(content, file.content_type)
+    if not is_valid:
+        return {"error": error_msg, "objects": [], "faces": [], "device": "none"}
+    
+    labels = _get_labels()
+    devices = _detect_devices()
+    
+    if device == "auto":
+        device = _get_best_device()
+    if device not in devices:
+        device = "cpu"
+    
+    embed_enabled = _is_truthy(embed)
+    options = {
+        "face_enabled": _is_truthy(face),
+        "face_confidence": face_confidence,
+        "face_retry_confidence": face_retry_confidence,
+        "multi_scale": _is_truthy(multi_scale),
+        "crop_fallback": _is_truthy(crop_fallback),
+        "embed": embed_enabled,
+    }
+    
+    try:
+        result, img, persons = await _submit_inference(
+            device, _run_with_retry, _analyze_frame_job, content, labels, device, confidence,
+            max_retries=MAX_INFERENCE_RETRIES, **options
+        )
+        if device == "coral_usb":
+            _record_tpu_success()
+        retried = False
+    except Exception as e:
+        if device != "coral_usb":
+            _update_metrics(False, 0, device)
+            _log_inference("analyze_frame", device, 0, False, str(e))
+            raise
+        _record_tpu_failure(e)
+        try:
+            device = "cpu"
+            result, img, persons = await _submit_inference(
+                device, _analyze_frame_job, content, labels, device, confidence, **options
+            )
+            retried = True
+        except Exception as cpu_err:
+            _update_metrics(False, 0, device)
+            _log_inference("analyze_frame", device, 0, False, str(cpu_err))
+            raise
+    
+    timings = result["timings"]
+    faces_list = result["faces"]
+    if (not faces_list and persons and options["face_enabled"] and _is_truthy(movenet_fallback)
+            and "coral_usb" in devices and _check_tpu_health()):
+        try:
+            head_face, movenet_ms = await _submit_inference("coral_usb", _movenet_head_face, img, persons)
+            _record_tpu_success()
+            timings["movenet_ms"] = movenet_ms
+            if head_face:
+                if embed_enabled:
+                    timings["embedding_ms"] = timings.get("embedding_ms", 0.0) + await _submit_inference(
+                        device, _embed_faces_in_image, img, [head_face], device
+                    )
+                    if head_face.get("embedding"):
+                        head_face["embedding_source"] = "movenet"
+                faces_list.append(head_face)
+                result["face_stage"] = "movenet"
+        except Exception as e:
+            _record_tpu_failure(e)
+            _log_inference("analyze_frame", "coral_usb", 0, False, f"MoveNet fallback: {e}")
+    
+    inference_ms = timings["total_ms"] - timings["decode_ms"]
+    _update_metrics(True, inference_ms, device, retried=retried)
+    _log_inference("analyze_frame", device, inference_ms, True,
+                   f"{len(result['objects'])} objects, {len(faces_list)} faces ({result['face_stage'] or 'none'})")
+    
+    try:
+        obj_filter = json.loads(objects or "[]")
+    except Exception:
+        obj_filter = []
+    if obj_filter:
+        result["objects"] = [d for d in result["objects"] if d["label"] in obj_filter]
+    
+    result["timings"] = {k: round(v, 1) for k, v in timings.items()}
+    result.update({
+        "device": device,
+        "inference_ms": round(inference_ms, 1),
+        "tpu_healthy": _tpu_healthy,
+    })
+    return result
@@ -6,14 +6,25 @@ CONFIDENCE=$(bashio::config 'confidence')
 
 # SEC-002 Fix: Read CORS origins from config
 CORS_ORIGINS=$(bashio::config 'cors_origins' || echo "")
+CPU_WORKERS=$(bashio::config 'cpu_workers' || echo "2")
+BATCH_WINDOW_MS=$(bashio::config 'batch_window_ms' || echo "10")
+BATCH_MAX_SIZE=$(bashio::config 'batch_max_size' || echo "8")
+MOTION_THRESHOLD=$(bashio::config 'motion_threshold' || echo "0")
 
 export DETECTOR_DEVICE=${DEVICE}
 export DETECTOR_CONFIDENCE=${CONFIDENCE}
 export CORS_ORIGINS=${CORS_ORIGINS}
+export DETECTOR_CPU_WORKERS=${CPU_WORKERS}
+export DETECTOR_BATCH_WINDOW_MS=${BATCH_WINDOW_MS}
+export DETECTOR_BATCH_MAX_SIZE=${BATCH_MAX_SIZE}
+export DETECTOR_MOTION_THRESHOLD=${MOTION_THRESHOLD}
 
 bashio::log.info "Starting RTSP Recorder Detector..."
 bashio::log.info "  Device: ${DEVICE}"
 bashio::log.info "  Confidence: ${CONFIDENCE}"
+bashio::log.info "  CPU workers: ${CPU_WORKERS}"
+bashio::log.info "  Batch window: ${BATCH_WINDOW_MS}ms (max ${BATCH_MAX_SIZE} frames)"
+bashio::log.info "  Motion gate threshold: ${MOTION_THRESHOLD} (0 = off)"
 if [ -n "${CORS_ORIGINS}" ]; then
     bashio::log.info "  CORS Origins: ${CORS_ORIGINS}"
 else
@@ -14,6 +14,7 @@ import logging
 import os
 import re
 import traceback
+import uuid
 import asyncio
 import datetime
 from datetime import timedelta
@@ -22,6 +23,7 @@ from typing import Any
 
 import aiohttp
 from aiohttp import web
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components.frontend import add_extra_js_url, async_remove_panel
 from homeassistant.components.http import HomeAssistantView, StaticPathConfig
@@ -32,14 +34,27 @@ from homeassistant.helpers.event import async_track_state_change_event
 
 # Internal modules
 from .retention import cleanup_recordings, cleanup_analysis_data
+from .recording_catalog import (
+    catalog_recording,
+    cleanup_cataloged_recordings,
+    newest_recording_times,
+    parse_recording_name,
+    reconcile_recording_catalog,
+)
 from .analysis import detect_available_devices
 
 # Modularized Imports
 from .const import (
     DOMAIN,
     DEFAULT_MAX_CONCURRENT_ANALYSES,
+    DEFAULT_DETECTOR_BATCH_SIZE,
+    DEFAULT_DETECTOR_PIPELINE,
+    DEFAULT_DETECTOR_TRANSPORT,
+    DEFAULT_ANALYSIS_PIPELINE_WINDOW,
     DEFAULT_STORAGE_PATH,
     DEFAULT_SNAPSHOT_PATH,
+    DEFAULT_PRE_RECORD_MEMORY_MB,
+    MAX_PRE_RECORD_SECONDS,
 )
 from .helpers import (
     log_to_file,
@@ -55,7 +70,18 @@ from .people_db import (
     is_sqlite_enabled,
     log_recognition_event,  # v1.1.0: Movement profile
 )
-from .analysis_helpers import _find_analysis_for_video
+from .analysis_helpers import _find_analysis_for_video, _sync_analysis_index
+from .face_sidecar import resolve_face_thumb_path
+from .media_http import (
+    STREAM_CHUNK_SIZE,
+    file_etag,
+    http_date,
+    is_not_modified,
+    parse_range_header,
+    range_applies,
+)
+from .thumbnail_cache import ThumbnailCache, load_variant, thumbnail_content_type, variant_width
+from .pre_record import PreRecordManager
 
 # NEW: Modularized handlers (HIGH-001 Fix)
 from .websocket_handlers import register_websocket_handlers, register_people_websocket_handlers
@@ -66,7 +92,12 @@ _LOGGER = logging.getLogger(__name__)
 
 
 class ThumbnailView(HomeAssistantView):
-    """HTTP View to serve thumbnails from any configured path."""
+    """HTTP View to serve thumbnails from any configured path.
+    
+    v1.4.0: Served thumbnails are kept in an in-memory LRU and answered with
+    ETag / Last-Modified (304 on revalidation). ``?w=<width>`` returns a
+    downscaled WebP/JPEG variant that is cached on disk.
+    """
     
     url = "/api/rtsp_recorder/thumbnail/{camera}/{filename}"
     name = "api:rtsp_recorder:thumbnail"
@@ -75,6 +106,7 @@ class ThumbnailView(HomeAssistantView):
     def __init__(self, hass):
         """Initialize with hass instance to read path dynamically."""
         self._hass = hass
+        self._cache = ThumbnailCache()
     
     def _get_snapshot_path(self) -> str:
         """Get current snapshot path from config (dynamic lookup)."""
@@ -95,28 +127,89 @@ class ThumbnailView(HomeAssistantView):
         snapshot_path = self._get_snapshot_path()
         file_path = os.path.join(snapshot_path, camera, filename)
         
+        width = variant_width(request.query.get("w"))
+        image_format = "webp" if "image/webp" in request.headers.get("Accept", "") else "jpeg"
+        
+        def _stat_file():
+            return os.stat(file_path) if os.path.isfile(file_path) else None
+        
         # Read file in executor to avoid blocking the event loop
+        def _read_file():
+            variant = load_variant(file_path, width, image_format) if width else None
+            if variant is not None:
+                return variant
+            with open(file_path, "rb") as f:
+                return f.read(), thumbnail_content_type(filename)
+        
+        try:
+            stats = await self._hass.async_add_executor_job(_stat_file)
+            if stats is None:
+                return web.Response(status=404, text="Not found")
+            
+            etag = file_etag(stats)
+            if width:
+                etag = f'{etag[:-1]}-w{width}-{image_format}"'
+            headers = {
+                "ETag": etag,
+                "Last-Modified": http_date(stats.st_mtime),
+                "Cache-Control": "public, max-age=86400",
+            }
+            if width:
+                headers["Vary"] = "Accept"
+            if is_not_modified(request.headers, etag, stats.st_mtime):
+                return web.Response(status=304, headers=headers)
+            
+            cache_key = (file_path, width, image_format if width else None)
+            cached = self._cache.get(cache_key, etag)
+            if cached is None:
+                cached = await self._hass.async_add_executor_job(_read_file)
+                self._cache.put(cache_key, etag, *cached)
+            data, content_type = cached
+            return web.Response(body=data, content_type=content_type, headers=headers)
+        except FileNotFoundError:
+            return web.Response(status=404, text="Not found")
+        except Exception as e:
+            _LOGGER.error(f"Error reading thumbnail {file_path}: {e}")
+            return web.Response(status=500, text="Internal error")
+
+
+class AnalysisFaceView(HomeAssistantView):
+    """v1.4.0: HTTP View to serve face thumbnails stored next to analysis results."""
+    
+    url = "/api/rtsp_recorder/analysis_face/{job}/{filename}"
+    name = "api:rtsp_recorder:analysis_face"
+    requires_auth = False  # Same as thumbnails: <img> tags cannot send auth headers
+    
+    def __init__(self, hass):
+        """Initialize with hass instance to read path dynamically."""
+        self._hass = hass
+    
+    async def get(self, request: web.Request, job: str, filename: str) -> web.Response:
+        """Handle face thumbnail request."""
+        output_dir = self._hass.data.get(DOMAIN, {}).get("analysis_output_path")
+        # Security: only analysis_*/faces/<n>.jpg below the output path
+        file_path = resolve_face_thumb_path(output_dir, job, filename) if output_dir else None
+        if not file_path:
+            return web.Response(status=403, text="Forbidden")
+        
         def _read_file():
             if not os.path.isfile(file_path):
                 return None
             with open(file_path, "rb") as f:
                 return f.read()
         
-        # Determine content type
-        content_type = "image/jpeg"
-        if filename.lower().endswith(".png"):
-            content_type = "image/png"
-        elif filename.lower().endswith(".webp"):
-            content_type = "image/webp"
-        
         try:
-            loop = asyncio.get_event_loop()
-            data = await loop.run_in_executor(None, _read_file)
+            data = await self._hass.async_add_executor_job(_read_file)
             if data is None:
                 return web.Response(status=404, text="Not found")
-            return web.Response(body=data, content_type=content_type)
+            # Sidecar thumbnails never change once written
+            return web.Response(
+                body=data,
+                content_type="image/jpeg",
+                headers={"Cache-Control": "public, max-age=86400"},
+            )
         except Exception as e:
-            _LOGGER.error(f"Error reading thumbnail {file_path}: {e}")
+            _LOGGER.error(f"Error reading face thumbnail {file_path}: {e}")
             return web.Response(status=500, text="Internal error")
 
 
@@ -132,6 +225,13 @@ class VideoStreamView(HomeAssistantView):
     - HTTP 206 Partial Content for Range requests
     - Content-Range header for byte range responses
     - Correct Content-Type: video/mp4
+    
+    v1.4.0: Full files and single ranges are sent with aiohttp's FileResponse
+    (sendfile, nothing buffered), multi-range requests as multipart/byteranges
+    read in chunks. ETag (size + mtime) and Last-Modified allow 304 answers to
+    If-None-Match / If-Modified-Since; If-Range is honoured. Malformed Range
+    headers (or more than MAX_RANGES ranges) are ignored, unsatisfiable
+    ones get 416.
     """
     
     url = "/api/rtsp_recorder/video/{camera}/{filename}"
@@ -161,83 +261,111 @@ class VideoStreamView(HomeAssistantView):
         storage_path = self._get_storage_path()
         file_path = os.path.join(storage_path, camera, filename)
         
+        def _stat_file():
+            return os.stat(file_path) if os.path.isfile(file_path) else None
+        
         # Check file exists
-        if not os.path.isfile(file_path):
+        stats = await self._hass.async_add_executor_job(_stat_file)
+        if stats is None:
             return web.Response(status=404, text="Not found")
         
-        file_size = os.path.getsize(file_path)
+        file_size = stats.st_size
+        etag = file_etag(stats)
+        cache_headers = {
+            "ETag": etag,
+            "Last-Modified": http_date(stats.st_mtime),
+            "Accept-Ranges": "bytes",
+            "Cache-Control": "public, max-age=3600",
+        }
         
-        # Parse Range header
-        range_header = request.headers.get("Range")
+        if is_not_modified(request.headers, etag, stats.st_mtime):
+            return web.Response(status=304, headers=cache_headers)
         
-        if range_header:
-            # Parse "bytes=START-END"
-            try:
-                range_spec = range_header.replace("bytes=", "")
-                parts = range_spec.split("-")
-                start = int(parts[0]) if parts[0] else 0
-                end = int(parts[1]) if parts[1] else file_size - 1
-                
-                # Clamp to file size
-                end = min(end, file_size - 1)
-                length = end - start + 1
-                
-                response = web.StreamResponse(
-                    status=206,
-                    headers={
-                        "Content-Type": "video/mp4",
-                        "Content-Length": str(length),
-                        "Content-Range": f"bytes {start}-{end}/{file_size}",
-                        "Accept-Ranges": "bytes",
-                        "Cache-Control": "public, max-age=3600",
-                    }
+        range_header = request.headers.get("Range")
+        ranges = None
+        if range_header and range_applies(request.headers, etag, stats.st_mtime):
+            ranges = parse_range_header(range_header, file_size)
+            if ranges == []:
+                return web.Response(
+                    status=416,
+                    headers={"Content-Range": f"bytes */{file_size}", "Accept-Ranges": "bytes"},
+                    text="Invalid Range",
                 )
-                await response.prepare(request)
-                
-                # Stream the requested byte range
-                def _read_range():
-                    with open(file_path, "rb") as f:
-                        f.seek(start)
-                        return f.read(length)
-                
-                loop = asyncio.get_event_loop()
-                data = await loop.run_in_executor(None, _read_range)
-                await response.write(data)
-                return response
-                
-            except (ValueError, IndexError):
-                return web.Response(status=416, text="Invalid Range")
-        else:
-            # No Range header - serve full file with Accept-Ranges
-            response = web.StreamResponse(
-                status=200,
-                headers={
-                    "Content-Type": "video/mp4",
-                    "Content-Length": str(file_size),
-                    "Accept-Ranges": "bytes",
-                    "Cache-Control": "public, max-age=3600",
-                }
-            )
+        if range_header and ranges is None:
+            # Outdated If-Range or a malformed/unsupported Range: full file
+            # (FileResponse would answer the Range header itself)
+            response = web.StreamResponse(status=200, headers={
+                **cache_headers,
+                "Content-Type": "video/mp4",
+                "Content-Length": str(file_size),
+            })
             await response.prepare(request)
-            
-            # Stream in 256KB chunks to avoid memory issues
-            CHUNK_SIZE = 256 * 1024
-            
-            def _read_chunks():
-                chunks = []
-                with open(file_path, "rb") as f:
-                    while True:
-                        chunk = f.read(CHUNK_SIZE)
-                        if not chunk:
-                            break
-                        chunks.append(chunk)
-                return chunks
-            
-            loop = asyncio.get_event_loop()
-            chunks = await loop.run_in_executor(None, _read_chunks)
-            for chunk in chunks:
-                await response.write(chunk)
+            await self._write_file_parts(response, file_path, [(b"", 0, file_size - 1)])
             return response
+        if ranges and len(ranges) > 1:
+            return await self._send_multipart(request, file_path, file_size, ranges, cache_headers)
+        
+        # Full file or one range: streamed by sendfile, FileResponse answers
+        # the Range itself with 206
+        headers = dict(cache_headers)
+        headers["Content-Type"] = "video/mp4"
+        return web.FileResponse(file_path, chunk_size=STREAM_CHUNK_SIZE, headers=headers)
+    
+    async def _send_multipart(
+        self,
+        request: web.Request,
+        file_path: str,
+        file_size: int,
+        ranges: list[tuple[int, int]],
+        cache_headers: dict[str, str],
+    ) -> web.StreamResponse:
+        """Answer a multi-range request with multipart/byteranges."""
+        boundary = uuid.uuid4().hex
+        part_heads = [
+            (
+                f"\r\n--{boundary}\r\nContent-Type: video/mp4\r\n"
+                f"Content-Range: bytes {start}-{end}/{file_size}\r\n\r\n"
+            ).encode("ascii")
+            for start, end in ranges
+        ]
+        closing = f"\r\n--{boundary}--\r\n".encode("ascii")
+        length = sum(len(head) + end - start + 1 for head, (start, end) in zip(part_heads, ranges)) + len(closing)
+        
+        response = web.StreamResponse(status=206, headers={
+            **cache_headers,
+            "Content-Type": f"multipart/byteranges; boundary={boundary}",
+            "Content-Length": str(length),
+        })
+        await response.prepare(request)
+        await self._write_file_parts(
+            response, file_path, [(head, start, end) for head, (start, end) in zip(part_heads, ranges)]
+        )
+        await response.write(closing)
+        return response
+    
+    async def _write_file_parts(
+        self,
+        response: web.StreamResponse,
+        file_path: str,
+        parts: list[tuple[bytes, int, int]],
+    ) -> None:
+        """Write (head, start, end) byte ranges of a file in bounded chunks."""
+        run = self._hass.async_add_executor_job
+        f = await run(open, file_path, "rb")
+        try:
+            for head, start, end in parts:
+                if head:
+                    await response.write(head)
+                await run(f.seek, start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    chunk = await run(f.read, min(STREAM_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    await response.write(chunk)
+                    remaining -= len(chunk)
+        finally:
+            await run(f.close)
 
 
 async def _install_dashboard_card(hass) -> bool:
@@ -344,6 +472,12 @@ async def async_setup_entry(hass, entry: ConfigEntry) -> bool:
     analysis_max_concurrent = int(config_data.get("analysis_max_concurrent", DEFAULT_MAX_CONCURRENT_ANALYSES))
     analysis_detector_url = config_data.get("analysis_detector_url", "")
     analysis_detector_confidence = float(config_data.get("analysis_detector_confidence", 0.4))
+    analysis_detector_batch_size = int(config_data.get("analysis_detector_batch_size", DEFAULT_DETECTOR_BATCH_SIZE))
+    analysis_detector_pipeline = bool(config_data.get("analysis_detector_pipeline", DEFAULT_DETECTOR_PIPELINE))
+    analysis_detector_transport = config_data.get("analysis_detector_transport", DEFAULT_DETECTOR_TRANSPORT)
+    if analysis_detector_transport not in ("jpeg", "raw", "shm"):
+        analysis_detector_transport = DEFAULT_DETECTOR_TRANSPORT
+    analysis_pipeline_window = int(config_data.get("analysis_pipeline_window", DEFAULT_ANALYSIS_PIPELINE_WINDOW))
     analysis_face_enabled = bool(config_data.get("analysis_face_enabled", False))
     analysis_face_confidence = float(config_data.get("analysis_face_confidence", 0.2))
     analysis_face_match_threshold = float(config_data.get("analysis_face_match_threshold", 0.35))
@@ -371,16 +505,20 @@ async def async_setup_entry(hass, entry: ConfigEntry) -> bool:
     # Build override map for per-camera retention
     known_settings = [
         "storage_path", "snapshot_path", "retention_days", "snapshot_retention_days",
-        "retention_hours", "camera_filter", "analysis_enabled", "analysis_device",
+        "retention_hours", "rtsp_single_session", "pre_record_memory_mb", "max_clip_seconds",
+        "camera_filter", "analysis_enabled", "analysis_device",
         "analysis_objects", "analysis_output_path", "analysis_frame_interval",
         "analysis_max_concurrent",
-        "analysis_detector_url", "analysis_detector_confidence", "analysis_face_enabled",
+        "analysis_detector_url", "analysis_detector_confidence", "analysis_detector_batch_size",
+        "analysis_detector_pipeline", "analysis_detector_transport", "analysis_pipeline_window",
+        "analysis_face_enabled",
         "analysis_face_confidence", "analysis_face_match_threshold",
         "analysis_overlay_smoothing", "analysis_overlay_smoothing_alpha",
         "analysis_face_store_embeddings", "analysis_auto_enabled",
         "analysis_auto_mode", "analysis_auto_time", "analysis_auto_interval_hours",
         "analysis_auto_since_days", "analysis_auto_limit", "analysis_auto_skip_existing",
-        "analysis_auto_new", "analysis_auto_force_coral", "person_entities_enabled",
+        "analysis_auto_new", "analysis_live_enabled", "analysis_adaptive_sampling", "analysis_frame_budget",
+        "analysis_auto_force_coral", "person_entities_enabled",
         "analysis_perf_cpu_entity", "analysis_perf_igpu_entity", "analysis_perf_coral_entity",
     ]
     
@@ -419,9 +557,16 @@ async def async_setup_entry(hass, entry: ConfigEntry) -> bool:
         if not hass.data[DOMAIN].get("thumbnail_view_registered"):
             hass.http.register_view(ThumbnailView(hass))
             hass.data[DOMAIN]["thumbnail_view_registered"] = True
-            log_to_file(f"Registered thumbnail endpoint: /api/rtsp_recorder/thumbnail/")
+            log_to_file("Registered thumbnail endpoint: /api/rtsp_recorder/thumbnail/")
         else:
-            log_to_file(f"Thumbnail endpoint already registered, path updated dynamically")
+            log_to_file("Thumbnail endpoint already registered, path updated dynamically")
+        
+        # 2b'. Face thumbnails of analysis results (v1.4.0 sidecar files)
+        hass.data[DOMAIN]["analysis_output_path"] = analysis_output_path
+        if not hass.data[DOMAIN].get("analysis_face_view_registered"):
+            hass.http.register_view(AnalysisFaceView(hass))
+            hass.data[DOMAIN]["analysis_face_view_registered"] = True
+            log_to_file("Registered analysis face endpoint: /api/rtsp_recorder/analysis_face/")
         
         # 2c. Register HTTP endpoint for video streaming with Range support (v1.3.3)
         # Mobile browsers need Range requests for progressive MP4 playback
@@ -429,10 +574,10 @@ async def async_setup_entry(hass, entry: ConfigEntry) -> bool:
             hass.http.register_view(VideoStreamView(hass))
             hass.data[DOMAIN]["video_view_registered"] = True
             hass.data[DOMAIN]["storage_path"] = storage_path
-            log_to_file(f"Registered video stream endpoint: /api/rtsp_recorder/video/")
+            log_to_file("Registered video stream endpoint: /api/rtsp_recorder/video/")
         else:
             hass.data[DOMAIN]["storage_path"] = storage_path
-            log_to_file(f"Video stream endpoint already registered, path updated dynamically")
+            log_to_file("Video stream endpoint already registered, path updated dynamically")
 
         # 3. Initialize SQLite database backend (v1.1.0j: SQLite-only)
         log_to_file("Enabling SQLite backend for people database...")
@@ -444,6 +589,29 @@ async def async_setup_entry(hass, entry: ConfigEntry) -> bool:
         # Load people database from SQLite
         await _load_people_db()
 
+        # v1.4.0: Import existing analysis folders into the SQLite index in the
+        # background; lookups scan the folders until it has finished
+        hass.async_create_task(
+            hass.async_add_executor_job(_sync_analysis_index, analysis_output_path)
+        )
+
+        # v1.4.0: Same for the recording catalog; new recordings are added as
+        # they are saved, the scan picks up changes made outside the integration
+        hass.async_create_task(
+            hass.async_add_executor_job(reconcile_recording_catalog, storage_path)
+        )
+
+        async def _catalog_saved_recording(event):
+            video_path = event.data.get("video_path")
+            if video_path:
+                await hass.async_add_executor_job(
+                    catalog_recording, storage_path, video_path, event.data.get("duration")
+                )
+
+        entry.async_on_unload(
+            hass.bus.async_listen("rtsp_recorder_recording_saved", _catalog_saved_recording)
+        )
+
         # ===== Helper functions needed by services =====
         
         def _sensor_snapshot() -> dict[str, Any]:
@@ -616,6 +784,10 @@ async def async_setup_entry(hass, entry: ConfigEntry) -> bool:
             analysis_enabled=analysis_enabled,
             analysis_auto_new=analysis_auto_new,
             analysis_detector_confidence=analysis_detector_confidence,
+            analysis_detector_batch_size=analysis_detector_batch_size,
+            analysis_detector_pipeline=analysis_detector_pipeline,
+            analysis_detector_transport=analysis_detector_transport,
+            analysis_pipeline_window=analysis_pipeline_window,
             analysis_face_enabled=analysis_face_enabled,
             analysis_face_confidence=analysis_face_confidence,
             analysis_face_match_threshold=analysis_face_match_threshold,
@@ -700,6 +872,31 @@ async def async_setup_entry(hass, entry: ConfigEntry) -> bool:
                 log_to_file(f"Error setting up auto-record for {key}: {e}")
                 _LOGGER.error(f"Error setting up auto-record: {e}")
 
+        # ===== Pre-Record Buffers =====
+        # v1.4.0: Cameras with a pre-record time keep a segment ring buffer
+        # that handle_save_recording takes the clip from
+        pre_record_manager = PreRecordManager(
+            float(config_data.get("pre_record_memory_mb", DEFAULT_PRE_RECORD_MEMORY_MB))
+        )
+        for key, value in config_data.items():
+            if not key.startswith("pre_record_seconds_"):
+                continue
+            camera_target = key.replace("pre_record_seconds_", "")
+            rtsp_url = config_data.get(f"rtsp_url_{camera_target}", "")
+            try:
+                pre_seconds = min(float(value), MAX_PRE_RECORD_SECONDS)
+            except (TypeError, ValueError):
+                continue
+            if pre_seconds > 0 and isinstance(rtsp_url, str) and rtsp_url.strip():
+                log_to_file(f"Setup Pre-Record: {camera_target} ({pre_seconds}s)")
+                pre_record_manager.start_camera(camera_target, rtsp_url.strip(), pre_seconds)
+        hass.data[DOMAIN]["pre_record_manager"] = pre_record_manager
+
+        async def _stop_pre_record(event=None):
+            await pre_record_manager.async_stop()
+
+        entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _stop_pre_record))
+
         # ===== Schedule Retention Cleanup =====
         
         async def run_cleanup(now=None):
@@ -707,13 +904,35 @@ async def async_setup_entry(hass, entry: ConfigEntry) -> bool:
             log_to_file("Running scheduled retention cleanup...")
             
             # Cleanup old recordings
-            await hass.async_add_executor_job(
-                cleanup_recordings, 
-                storage_path, 
-                retention_days, 
+            # v1.4.0: Expired recordings come from the catalog; walk the
+            # storage tree only until the catalog is ready
+            cataloged = await hass.async_add_executor_job(
+                cleanup_cataloged_recordings,
+                storage_path,
+                retention_days,
                 retention_hours,
                 override_map
             )
+            if cataloged is None:
+                await hass.async_add_executor_job(
+                    cleanup_recordings, 
+                    storage_path, 
+                    retention_days, 
+                    retention_hours,
+                    override_map
+                )
+            else:
+                # Everything but the cataloged recordings (.tmp/.concat.txt
+                # left by killed recordings, analysis files, other files)
+                # still ages out by mtime
+                await hass.async_add_executor_job(
+                    cleanup_recordings,
+                    storage_path,
+                    retention_days,
+                    retention_hours,
+                    override_map,
+                    parse_recording_name,
+                )
             
             # Cleanup old snapshots
             await hass.async_add_executor_job(
@@ -731,6 +950,10 @@ async def async_setup_entry(hass, entry: ConfigEntry) -> bool:
                 retention_days,
                 retention_hours,
             )
+            
+            # v1.4.0: Drop index rows of removed analysis folders
+            await hass.async_add_executor_job(_sync_analysis_index, analysis_output_path)
+            await hass.async_add_executor_job(reconcile_recording_catalog, storage_path)
 
         # Run once on startup (after 30s delay)
         hass.loop.call_later(30, lambda: hass.async_create_task(run_cleanup()))
@@ -795,6 +1018,8 @@ async def async_setup_entry(hass, entry: ConfigEntry) -> bool:
             """Check if cameras are recording as expected."""
             try:
                 loop = asyncio.get_event_loop()
+                # v1.4.0: Newest recording per camera from the catalog
+                newest_by_camera = await hass.async_add_executor_job(newest_recording_times, storage_path)
                 
                 # v1.2.0: Get all configured cameras from motion sensors (both formats)
                 cameras_to_check = {}  # camera_name -> list of motion entities
@@ -816,7 +1041,12 @@ async def async_setup_entry(hass, entry: ConfigEntry) -> bool:
                     
                     # Find newest recording (run in executor to avoid blocking)
                     try:
-                        newest = await loop.run_in_executor(None, _get_newest_recording, cam_folder)
+                        newest = None
+                        if newest_by_camera is not None:
+                            if camera_name in newest_by_camera:
+                                camera_last_recording[camera_name] = newest_by_camera[camera_name]
+                        else:
+                            newest = await loop.run_in_executor(None, _get_newest_recording, cam_folder)
                         if newest:
                             # Parse timestamp from filename: CameraName_YYYYMMDD_HHMMSS.mp4
                             parts = newest.replace('.mp4', '').split('_')
@@ -893,6 +1123,7 @@ async def async_setup_entry(hass, entry: ConfigEntry) -> bool:
                     "cpu": system_stats.get("cpu_percent", 0),
                     "memory": system_stats.get("memory_percent", 0),
                 }
+                stats["pre_record"] = pre_record_manager.get_stats()
                 stats["timestamp"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
                 
                 # Fire event for frontend subscription
@@ -1003,6 +1234,10 @@ async def async_setup_entry(hass, entry: ConfigEntry) -> bool:
 
 async def async_unload_entry(hass, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    # v1.4.0: Stop the pre-record segmenters (setup starts new ones)
+    pre_record_manager = hass.data.get(DOMAIN, {}).pop("pre_record_manager", None)
+    if pre_record_manager is not None:
+        await pre_record_manager.async_stop()
     # v1.4.0: Remove the sidebar panel so the next setup (e.g. options-flow reload
     # via update_listener) can re-register it without an "Overwriting panel"
     # ValueError. The static path stays registered for the HA process lifetime
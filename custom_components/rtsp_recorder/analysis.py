@@ -28,7 +28,6 @@ import asyncio
 import json
 import logging
 import os
-import shutil
 import time
 import urllib.request
 import aiohttp
@@ -46,8 +45,17 @@ try:
         DEFAULT_ANALYSIS_FRAME_INTERVAL,
         DEFAULT_OVERLAY_SMOOTHING,
         DEFAULT_OVERLAY_SMOOTHING_ALPHA,
+        DEFAULT_DETECTOR_BATCH_SIZE,
+        DEFAULT_DETECTOR_PIPELINE,
+        DEFAULT_DETECTOR_TRANSPORT,
+        DEFAULT_ANALYSIS_PIPELINE_WINDOW,
+        DETECTOR_SHM_DIR,
     )
 
+    from .face_matching import FaceIndex
+    from .face_sidecar import externalize_face_data
+    from .frame_sampler import SamplingPlan, async_plan_sampling
+
     # Import database for analysis runs tracking
     from .database import get_database
 except ImportError:  # pragma: no cover - fallback for direct module import in tests
@@ -58,8 +66,17 @@ except ImportError:  # pragma: no cover - fallback for direct module import in t
         DEFAULT_ANALYSIS_FRAME_INTERVAL,
         DEFAULT_OVERLAY_SMOOTHING,
         DEFAULT_OVERLAY_SMOOTHING_ALPHA,
+        DEFAULT_DETECTOR_BATCH_SIZE,
+        DEFAULT_DETECTOR_PIPELINE,
+        DEFAULT_DETECTOR_TRANSPORT,
+        DEFAULT_ANALYSIS_PIPELINE_WINDOW,
+        DETECTOR_SHM_DIR,
     )
 
+    from face_matching import FaceIndex
+    from face_sidecar import externalize_face_data
+    from frame_sampler import SamplingPlan, async_plan_sampling
+
     from database import get_database
 
 # ===== Memory Management Constants (HIGH-005 Fix) =====
@@ -70,12 +87,26 @@ MAX_FACES_WITH_THUMBS = 50
 MAX_THUMB_SIZE = 80
 # JPEG quality for thumbnails (lower = smaller file)
 THUMB_JPEG_QUALITY = 70
+# Bytes read from the ffmpeg frame pipe per call
+FRAME_PIPE_READ_SIZE = 256 * 1024
+
+# v1.4.0: Frames a live analysis may have queued before it is abandoned in
+# favour of analyzing the finished file (~15 min of 1080p frames at 2 s)
+LIVE_FEED_MAX_BYTES = 64 * 1024 * 1024
+
+# Playback FPS of the annotated video when the source FPS is unknown
+DEFAULT_VIDEO_FPS = 15.0
+# v1.4.0: Longer side of the frames the object pass gets from a larger video
+# (detector inputs are 300-640 px); faces use full-resolution frames
+ANALYSIS_DETECT_MAX_SIDE = 640
 # Face retry confidence multiplier
 FACE_RETRY_CONFIDENCE_MULTIPLIER = 0.6
+# Failed face requests in a row before the remaining frames are skipped
+FACE_MAX_CONSECUTIVE_ERRORS = 3
 # ===== End Memory Management Constants =====
 
 from datetime import datetime
-from typing import Any
+from typing import Any, AsyncIterator, Awaitable, Callable
 
 # Lazy access to stats tracker from helpers module
 def _get_inference_stats() -> Any:
@@ -126,7 +157,53 @@ async def _get_video_fps(video_path: str) -> float:
             return float(fps_str)
     except Exception as e:
         _LOGGER.debug("Failed to get video FPS: %s", e)
-    return 15.0  # Fallback to 15 FPS
+    return DEFAULT_VIDEO_FPS
+
+
+async def _get_video_size(video_path: str) -> tuple[int, int] | None:
+    """Get the (width, height) of a video file using ffprobe, None on failure."""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "ffprobe",
+            "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "stream=width,height",
+            "-of", "csv=s=x:p=0",
+            video_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout, _ = await process.communicate()
+        width, height = stdout.decode().strip().split("x")[:2]
+        if int(width) > 0 and int(height) > 0:
+            return int(width), int(height)
+    except Exception as e:
+        _LOGGER.debug("Failed to get video size: %s", e)
+    return None
+
+
+async def _read_video_frame(video_path: str, time_s: float) -> bytes | None:
+    """Decode the full-resolution frame at time_s as JPEG, None on failure.
+    
+    Seeking on the input starts decoding at the preceding keyframe, so only
+    a few frames are decoded.
+    """
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "ffmpeg",
+            "-v", "error",
+            "-ss", f"{max(0.0, float(time_s)):g}",
+            "-i", video_path,
+            "-frames:v", "1",
+            "-f", "image2pipe", "-c:v", "mjpeg", "-q:v", "2", "pipe:1",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout, _ = await process.communicate()
+    except Exception as e:
+        _LOGGER.debug("Failed to read frame at %ss: %s", time_s, e)
+        return None
+    return stdout or None
 
 
 def _safe_mkdir(path: str) -> None:
@@ -136,14 +213,14 @@ def _safe_mkdir(path: str) -> None:
 def _write_json(path: str, data: dict) -> None:
     """Synchronous JSON write - use _write_json_async in async contexts."""
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
 
 
 async def _write_json_async(path: str, data: dict) -> None:
     """v1.1.1: Async JSON write to avoid blocking event loop."""
     def _write() -> None:
         with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
     await asyncio.get_event_loop().run_in_executor(None, _write)
 
 
@@ -196,43 +273,6 @@ def _cosine_similarity(a: list[float], b: list[float]) -> float:
     return dot / (na * nb)
 
 
-def _compute_centroid(embeddings: list) -> list[float] | None:
-    """Compute the centroid (average) of multiple embeddings."""
-    if not embeddings:
-        return None
-    
-    vectors = []
-    for emb in embeddings:
-        if isinstance(emb, dict):
-            emb = emb.get("vector", [])
-        emb_list = _safe_float_list(emb)
-        if emb_list:
-            vectors.append(emb_list)
-    
-    if not vectors:
-        return None
-    
-    # All vectors should have the same dimension
-    dim = len(vectors[0])
-    centroid = [0.0] * dim
-    
-    for vec in vectors:
-        if len(vec) != dim:
-            continue
-        for i in range(dim):
-            centroid[i] += vec[i]
-    
-    n = len(vectors)
-    centroid = [c / n for c in centroid]
-    
-    # Normalize the centroid
-    norm = sum(c * c for c in centroid) ** 0.5
-    if norm > 0:
-        centroid = [c / norm for c in centroid]
-    
-    return centroid
-
-
 def _check_negative_samples(embedding: list[float], person: dict[str, Any], neg_threshold: float = 0.75) -> bool:
     """Check if embedding matches any negative samples for this person.
     
@@ -294,62 +334,13 @@ def _match_face(embedding: list[float], people: list[dict[str, Any]], threshold:
     
     Also checks negative samples to prevent false matches.
     Checks global no_face_embeddings to filter out false positives.
+    
+    Builds a one-off FaceIndex; to match many faces build the index once
+    and call ``FaceIndex.match`` with all of them.
     """
     if not embedding or not people:
         return None
-    
-    # First check if this is a known false positive (not a real face)
-    if no_face_embeddings and _is_no_face(embedding, no_face_embeddings):
-        return {"is_no_face": True}  # Signal that this should be filtered out
-    
-    candidates = []
-    
-    for person in people:
-        p_id = person.get("id")
-        p_name = person.get("name")
-        
-        # Check negative samples first - if this face matches a "NOT this person" sample, skip
-        if _check_negative_samples(embedding, person):
-            continue  # Skip this person due to negative sample match
-        
-        # Try centroid first (faster, more robust)
-        centroid = person.get("centroid")
-        if centroid:
-            centroid_list = _safe_float_list(centroid)
-            if centroid_list:
-                score = _cosine_similarity(embedding, centroid_list)
-                if score >= threshold:
-                    candidates.append({
-                        "person_id": p_id, 
-                        "name": p_name, 
-                        "similarity": round(float(score), 4)
-                    })
-                continue  # Skip individual embeddings if centroid exists
-        
-        # Fallback: compare against all embeddings (old method)
-        best_emb_score = -1.0
-        for emb in person.get("embeddings", []) or []:
-            if isinstance(emb, dict):
-                emb = emb.get("vector", [])
-            emb_list = _safe_float_list(emb)
-            if not emb_list:
-                continue
-            score = _cosine_similarity(embedding, emb_list)
-            if score > best_emb_score:
-                best_emb_score = score
-        
-        if best_emb_score >= threshold:
-            candidates.append({
-                "person_id": p_id,
-                "name": p_name,
-                "similarity": round(float(best_emb_score), 4)
-            })
-    
-    # Return the best candidate (highest similarity)
-    if candidates:
-        candidates.sort(key=lambda x: x["similarity"], reverse=True)
-        return candidates[0]
-    return None
+    return FaceIndex(people, no_face_embeddings).match([embedding], threshold)[0]
 
 
 MODEL_DIR_NAME = "_models"
@@ -444,7 +435,7 @@ def _parse_outputs(output_details: list[dict[str, Any]], outputs: list[Any]) ->
 
 
 def _run_detection(
-    frame_path: str,
+    frame: bytes,
     interpreter,
     labels: dict[int, str],
     score_threshold: float,
@@ -455,7 +446,7 @@ def _run_detection(
     input_details = interpreter.get_input_details()
     output_details = interpreter.get_output_details()
 
-    img = Image.open(frame_path).convert("RGB")
+    img = Image.open(io.BytesIO(frame)).convert("RGB")
     frame_width, frame_height = img.size
 
     input_shape = input_details[0]["shape"]
@@ -490,11 +481,12 @@ def _run_detection(
     return detections, (frame_width, frame_height)
 
 
-def _annotate_frame(frame_path: str, detections: list[dict[str, Any]], out_path: str, faces: list[dict[str, Any]] = None) -> None:
+def _annotate_frame(frame: bytes, detections: list[dict[str, Any]], faces: list[dict[str, Any]] = None) -> bytes:
+    """Draw object and face boxes onto a JPEG frame and return the annotated JPEG."""
     if Image is None or ImageDraw is None:
         raise RuntimeError("Pillow not available")
 
-    img = Image.open(frame_path).convert("RGB")
+    img = Image.open(io.BytesIO(frame)).convert("RGB")
     draw = ImageDraw.Draw(img)
     img_w, img_h = img.size
 
@@ -558,7 +550,9 @@ def _annotate_frame(frame_path: str, detections: list[dict[str, Any]], out_path:
                 draw.rectangle([tx1, ty1, tx2, ty2], fill=(255, 165, 0))
                 draw.text((tx1 + 3, ty1 + 2), text, fill=(0, 0, 0))
 
-    img.save(out_path, "JPEG", quality=90)
+    buf = io.BytesIO()
+    img.save(buf, "JPEG", quality=90)
+    return buf.getvalue()
 
 
 def _bbox_iou(box_a: dict[str, Any], box_b: dict[str, Any]) -> float:
@@ -635,168 +629,310 @@ def _smooth_boxes(
     return smoothed
 
 
-def _smooth_detections_for_overlay(detections: list[dict[str, Any]], alpha: float) -> list[dict[str, Any]]:
-    """Apply EMA smoothing to object/face boxes for overlay rendering."""
-    if not detections:
-        return detections
-
-    smoothed: list[dict[str, Any]] = []
-    prev_objects: list[dict[str, Any]] = []
-    prev_faces: list[dict[str, Any]] = []
-
-    for det in detections:
-        objects = det.get("objects", []) or []
-        faces = det.get("faces", []) or []
-
-        smoothed_objects = _smooth_boxes(objects, prev_objects, alpha, match_label=True)
-        smoothed_faces = _smooth_boxes(faces, prev_faces, alpha, match_label=False)
-
-        det_copy = dict(det)
-        det_copy["objects"] = smoothed_objects
-        if "faces" in det_copy:
-            det_copy["faces"] = smoothed_faces
-
-        smoothed.append(det_copy)
-        prev_objects = smoothed_objects
-        prev_faces = smoothed_faces
+def _smooth_detection(
+    det: dict[str, Any],
+    previous: dict[str, Any] | None,
+    alpha: float,
+) -> dict[str, Any]:
+    """Apply EMA smoothing to one frame's object/face boxes for overlay rendering.
+    
+    ``previous`` is the smoothed result of the frame before, or None for the
+    first frame.
+    """
+    prev_objects = (previous or {}).get("objects", []) or []
+    prev_faces = (previous or {}).get("faces", []) or []
 
-    return smoothed
+    det_copy = dict(det)
+    det_copy["objects"] = _smooth_boxes(det.get("objects", []) or [], prev_objects, alpha, match_label=True)
+    if "faces" in det_copy:
+        det_copy["faces"] = _smooth_boxes(det.get("faces", []) or [], prev_faces, alpha, match_label=False)
+    return det_copy
 
 
-async def _render_annotated_video(
-    frames: list[str],
-    detections: list[dict[str, Any]],
-    output_dir: str,
-    interval_s: int,
-    video_path: str | None = None,
-) -> str:
-    """Render annotated video from frames with bounding boxes.
+class _AnnotatedVideoWriter:
+    """Render annotated video from frames with bounding boxes as they arrive.
     
     v1.1.2: Uses original video FPS for smooth playback.
     Frames are duplicated to match the original FPS, creating
     smooth transitions instead of 0.5 FPS stuttering.
+    
+    Annotated frames are piped to ffmpeg's stdin, nothing is written to disk
+    except the final video. ffmpeg starts with the first frame; frames must be
+    written in video order because overlay smoothing depends on the frame
+    before.
+    
+    v1.4.0: A live analysis only knows the recording's FPS once the file is
+    saved. With ``fps_source`` the annotated frames are spooled to an MJPEG
+    file instead and encoded on ``close`` at the FPS it returns.
     """
-    if not frames:
-        raise RuntimeError("No frames to annotate")
-    if Image is None or ImageDraw is None:
-        raise RuntimeError("Pillow not available")
 
-    annotated_dir = os.path.join(output_dir, "annotated")
-    _safe_mkdir(annotated_dir)
+    def __init__(
+        self,
+        output_dir: str,
+        interval_s: int,
+        output_fps: float,
+        smoothing_alpha: float | None = None,
+        fps_source: Callable[[], Awaitable[float]] | None = None,
+    ) -> None:
+        self.output_video = os.path.join(output_dir, "annotated.mp4")
+        self.fps_source = fps_source
+        self._spool_path = os.path.join(output_dir, "annotated.mjpeg")
+        self._spool = None
+        # Calculate input framerate (how often we extracted frames)
+        self.input_fps = 1 / max(1, int(interval_s))
+        # v1.2.3: Use original camera FPS for authentic realtime playback
+        self.output_fps = output_fps
+        self.smoothing_alpha = smoothing_alpha
+        self.frames_written = 0
+        self._previous: dict[str, Any] | None = None
+        self._process = None
+
+    async def _start(self) -> None:
+        if Image is None or ImageDraw is None:
+            raise RuntimeError("Pillow not available")
+        if self.fps_source is not None:
+            self._spool = await asyncio.to_thread(open, self._spool_path, "wb")
+            return
+        self._process = await self._encode("pipe:0")
+
+    async def _encode(self, source: str):
+        _LOGGER.debug("Annotated video rendering: output_fps=%.1f", self.output_fps)
+        # -framerate: input frame rate (our extracted frames)
+        # -r: output frame rate (capped for lower CPU usage)
+        # -preset ultrafast: Fastest encoding, ~5x less CPU
+        return await asyncio.create_subprocess_exec(
+            "ffmpeg",
+            "-y",
+            "-f", "image2pipe",
+            "-framerate", str(self.input_fps),
+            "-c:v", "mjpeg",
+            "-i", source,
+            "-c:v", "libx264",
+            "-preset", "ultrafast",
+            "-crf", "28",  # Slightly lower quality for faster encoding
+            "-r", str(self.output_fps),
+            "-pix_fmt", "yuv420p",
+            self.output_video,
+            stdin=asyncio.subprocess.PIPE if source == "pipe:0" else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
 
-    for idx, frame_path in enumerate(frames):
-        dets = detections[idx].get("objects", []) if idx < len(detections) else []
-        faces = detections[idx].get("faces", []) if idx < len(detections) else []
-        out_path = os.path.join(annotated_dir, f"frame_{idx:04d}.jpg")
-        await asyncio.to_thread(_annotate_frame, frame_path, dets, out_path, faces)
+    def _remove_spool(self) -> None:
+        if self._spool is not None:
+            self._spool.close()
+        self._spool = None
+        try:
+            os.remove(self._spool_path)
+        except OSError:
+            pass
 
-    output_video = os.path.join(output_dir, "annotated.mp4")
-    
-    # v1.1.2: Get original video FPS for smooth playback
-    original_fps = 15.0  # Default fallback
-    if video_path:
-        original_fps = await _get_video_fps(video_path)
-    
-    # Calculate input framerate (how often we extracted frames)
-    input_fps = 1 / max(1, int(interval_s))
-    
-    # v1.2.3: Use original camera FPS for authentic realtime playback
-    output_fps = original_fps
-    
-    _LOGGER.debug(
-        "Annotated video rendering: original_fps=%.1f, output_fps=%.1f",
-        original_fps, output_fps
-    )
-    
-    # Use ffmpeg to create video with selected FPS
-    # -framerate: input frame rate (our extracted frames)
-    # -r: output frame rate (capped for lower CPU usage)
-    # -preset ultrafast: Fastest encoding, ~5x less CPU
-    process = await asyncio.create_subprocess_exec(
-        "ffmpeg",
-        "-y",
-        "-framerate", str(input_fps),
-        "-i", os.path.join(annotated_dir, "frame_%04d.jpg"),
-        "-c:v", "libx264",
-        "-preset", "ultrafast",
-        "-crf", "28",  # Slightly lower quality for faster encoding
-        "-r", str(output_fps),
-        "-pix_fmt", "yuv420p",
-        output_video,
-        stdout=asyncio.subprocess.DEVNULL,
-        stderr=asyncio.subprocess.DEVNULL,
-    )
-    
-    try:
-        await process.wait()
-    except Exception:
-        # MED-002 Fix: Terminate FFmpeg process on error
-        if process.returncode is None:
+    async def write(self, frame: bytes, detection: dict[str, Any] | None, repeat: int = 1) -> None:
+        """Draw ``detection`` onto the next frame and feed it to ffmpeg.
+        
+        v1.4.0: ``repeat`` holds the frame for that many input frames
+        (adaptive sampling leaves gaps between frames).
+        """
+        if self._process is None and self._spool is None:
+            await self._start()
+        detection = detection or {}
+        if self.smoothing_alpha is not None:
+            detection = _smooth_detection(detection, self._previous, self.smoothing_alpha)
+            self._previous = detection
+        annotated = await asyncio.to_thread(
+            _annotate_frame, frame, detection.get("objects", []), detection.get("faces", [])
+        )
+        if self._spool is not None:
+            await asyncio.to_thread(self._spool.write, annotated * max(1, repeat))
+        else:
+            for _ in range(max(1, repeat)):
+                self._process.stdin.write(annotated)
+            await self._process.stdin.drain()
+        self.frames_written += 1
+
+    async def close(self) -> str:
+        """Finish encoding and return the video path."""
+        if self._spool is not None:
+            await asyncio.to_thread(self._spool.close)
             try:
-                process.terminate()
-                await asyncio.wait_for(process.wait(), timeout=5.0)
-            except Exception:
-                process.kill()
-        raise
+                self.output_fps = await self.fps_source()
+                self._process = await self._encode(self._spool_path)
+                await self._process.wait()
+            finally:
+                self._remove_spool()
+        elif self._process is None:
+            raise RuntimeError("No frames to annotate")
+        else:
+            self._process.stdin.close()
+            await self._process.wait()
+        if not os.path.exists(self.output_video):
+            raise RuntimeError("Annotated video not created")
+        return self.output_video
+
+    async def abort(self) -> None:
+        """MED-002 Fix: Terminate FFmpeg process on error."""
+        if self._spool is not None:
+            await asyncio.to_thread(self._remove_spool)
+        process = self._process
+        if process is None or process.returncode is not None:
+            return
+        try:
+            process.terminate()
+            await asyncio.wait_for(process.wait(), timeout=5.0)
+        except Exception:
+            process.kill()
+
+
+def _frame_name(idx: int) -> str:
+    """File name used when uploading frame ``idx`` to the detector."""
+    return f"frame_{idx + 1:04d}.jpg"
+
 
-    if not os.path.exists(output_video):
-        raise RuntimeError("Annotated video not created")
+def _split_mjpeg(buffer: bytearray, scan_from: int) -> tuple[list[bytes], int]:
+    """Cut complete JPEG images off the front of an MJPEG byte stream.
     
-    # v1.1.2: Clean up annotated frames after video creation to save disk space
-    # The video is the final output, individual frames are no longer needed
-    # Run blocking I/O in executor to avoid blocking event loop
-    try:
-        if os.path.isdir(annotated_dir):
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, shutil.rmtree, annotated_dir)
-    except OSError:
-        pass  # Best effort cleanup, don't fail if frames can't be deleted
+    0xFF bytes inside JPEG entropy-coded data are stuffed (FF 00), so the
+    EOI marker FF D9 only occurs at the end of an image.
     
-    return output_video
+    Returns:
+        Tuple of (complete images, offset to resume the EOI search from)
+    """
+    images = []
+    while True:
+        end = buffer.find(b"\xff\xd9", scan_from)
+        if end < 0:
+            return images, max(0, len(buffer) - 1)
+        start = buffer.find(b"\xff\xd8")
+        if 0 <= start < end:
+            images.append(bytes(buffer[start:end + 2]))
+        del buffer[:end + 2]
+        scan_from = 0
+
+
+async def read_mjpeg_frames(reader: asyncio.StreamReader) -> AsyncIterator[bytes]:
+    """Yield the JPEG images of an MJPEG pipe until EOF."""
+    buffer = bytearray()
+    scan_from = 0
+    while True:
+        chunk = await reader.read(FRAME_PIPE_READ_SIZE)
+        if not chunk:
+            return
+        buffer += chunk
+        images, scan_from = _split_mjpeg(buffer, scan_from)
+        for image in images:
+            yield image
+
+
+class LiveFrameFeed:
+    """Sampled frames a recording FFmpeg writes to stdout, for live analysis.
+    
+    v1.4.0: The pipe is drained continuously so a slow analysis never stalls
+    the recording. Frames wait in memory up to LIVE_FEED_MAX_BYTES; beyond
+    that the feed is marked ``overflowed`` and drops frames, and the caller
+    analyzes the finished file instead.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader) -> None:
+        self._reader = reader
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._queued_bytes = 0
+        self._task: asyncio.Task | None = None
+        self.overflowed = False
+        self.frames_read = 0
 
+    def start(self) -> None:
+        """Start draining the pipe."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._pump())
 
-async def extract_frames(video_path: str, output_dir: str, interval_s: int = 2) -> list[str]:
-    """Extract frames from a video using ffmpeg. Returns list of frame files.
+    async def _pump(self) -> None:
+        try:
+            async for image in read_mjpeg_frames(self._reader):
+                if self.overflowed:
+                    continue
+                if self._queued_bytes + len(image) > LIVE_FEED_MAX_BYTES:
+                    _LOGGER.warning("Live analysis fell behind the recording, dropping live frames")
+                    self.overflowed = True
+                    continue
+                self._queued_bytes += len(image)
+                self.frames_read += 1
+                self._queue.put_nowait(image)
+        except Exception as e:
+            _LOGGER.debug("Live frame feed stopped: %s", e)
+        finally:
+            self._queue.put_nowait(None)
+
+    async def frames(self) -> AsyncIterator[bytes]:
+        """Yield the frames in order until the recording ends."""
+        while (image := await self._queue.get()) is not None:
+            self._queued_bytes -= len(image)
+            yield image
+
+
+def _detection_frame_size(video_size: tuple[int, int]) -> tuple[int, int] | None:
+    """Frame size for the object pass, None if the video is not larger.
+    
+    The longer side is limited to ANALYSIS_DETECT_MAX_SIDE, both sides are
+    kept even for the scaler.
+    """
+    width, height = video_size
+    scale = ANALYSIS_DETECT_MAX_SIDE / max(width, height)
+    if scale >= 1:
+        return None
+    return max(2, int(round(width * scale / 2)) * 2), max(2, int(round(height * scale / 2)) * 2)
+
+
+async def stream_frames(
+    video_path: str,
+    interval_s: int = 2,
+    size: tuple[int, int] | None = None,
+    select: str | None = None,
+) -> AsyncIterator[bytes]:
+    """Yield one JPEG frame every ``interval_s`` seconds of video.
+    
+    ffmpeg writes MJPEG to a stdout pipe instead of ``frame_%04d.jpg`` files,
+    so frames go straight from the decoder into memory.
+    
+    v1.4.0: With ``size`` the frames are scaled in the same decode, so large
+    frames are never encoded to JPEG at full resolution. ``select`` keeps
+    only the matching frames of the interval grid (adaptive sampling).
     
     MED-002 Fix: Uses try/finally to ensure FFmpeg process is terminated on error.
     """
-    _safe_mkdir(output_dir)
-    pattern = os.path.join(output_dir, "frame_%04d.jpg")
     fps = 1 / max(1, int(interval_s))
+    video_filter = f"fps={fps}"
+    if select:
+        video_filter += f",select='{select}'"
+    if size:
+        video_filter += f",scale={int(size[0])}:{int(size[1])}"
 
     process = await asyncio.create_subprocess_exec(
         "ffmpeg",
-        "-y",
         "-i",
         video_path,
         "-vf",
-        f"fps={fps}",
-        pattern,
-        stdout=asyncio.subprocess.DEVNULL,
+        video_filter,
+        # Selected frames only, no duplicates filling the gaps
+        "-vsync", "vfr",
+        "-f", "image2pipe",
+        "-c:v", "mjpeg",
+        "pipe:1",
+        stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.DEVNULL,
     )
     
     try:
+        async for image in read_mjpeg_frames(process.stdout):
+            yield image
         await process.wait()
-    except Exception:
-        # MED-002 Fix: Terminate FFmpeg process on error
+    finally:
+        # MED-002 Fix: Terminate FFmpeg process on error or early exit
         if process.returncode is None:
             try:
                 process.terminate()
                 await asyncio.wait_for(process.wait(), timeout=5.0)
             except Exception:
                 process.kill()
-        raise
-
-    # v1.1.1 fix: Run blocking I/O in executor to avoid blocking event loop
-    def _list_frames() -> list[str]:
-        return sorted(
-            [os.path.join(output_dir, f) for f in os.listdir(output_dir) if f.startswith("frame_")]
-        )
-    
-    loop = asyncio.get_event_loop()
-    files = await loop.run_in_executor(None, _list_frames)
-    return files
 
 
 def _extract_camera_from_path(video_path: str) -> str:
@@ -955,48 +1091,38 @@ def _create_face_thumbnail(
         return None
 
 
-def _normalize_and_match_face(
-    face: dict[str, Any],
-    people_db: list[dict[str, Any]] | None,
+def _normalize_and_match_faces(
+    faces: list[dict[str, Any]],
+    face_index: FaceIndex | None,
     face_match_threshold: float,
-    no_face_embeddings: list[dict[str, Any]] | None,
     face_store_embeddings: bool,
     frame_img: Any,
     detections: list[dict[str, Any]],
-) -> tuple[dict[str, Any] | None, bool]:
-    """Normalize a detected face and attempt to match against people DB.
+) -> tuple[list[dict[str, Any]], int]:
+    """Normalize the faces of one frame and match them against the people DB.
+    
+    All embeddings of the frame are matched with one ``FaceIndex.match`` call.
     
     Args:
-        face: Raw face detection dict with box, score, embedding
-        people_db: List of known people with embeddings
+        faces: Raw face detection dicts with box, score, embedding
+        face_index: Index of known people and false positives, or None
         face_match_threshold: Minimum similarity for a match
-        no_face_embeddings: Embeddings of known false positives
         face_store_embeddings: Whether to store embeddings in output
         frame_img: PIL Image of the frame for thumbnail
         detections: Current detections list (for thumbnail count)
         
     Returns:
-        Tuple of (normalized face_item or None, was_matched)
+        Tuple of (normalized face items, number of matched faces)
     """
-    face_box = face.get("box") or {}
-    score = face.get("score", 0.0)
-    emb = face.get("embedding")
-    emb_source = (face.get("embedding_source") or "").lower()
-    
-    emb_list = _safe_float_list(emb) if isinstance(emb, list) else []
-    if emb_list:
-        emb_list = _normalize_embedding(emb_list)
+    embeddings = []
+    for face in faces:
+        emb = face.get("embedding")
+        emb_list = _safe_float_list(emb) if isinstance(emb, list) else []
+        embeddings.append(_normalize_embedding(emb_list) if emb_list else [])
     
-    match = None
-    was_matched = False
-    
-    if emb_list and people_db:
-        match = _match_face(emb_list, people_db, face_match_threshold, no_face_embeddings)
-        # Check if this is a known false positive (not a real face)
-        if match and match.get("is_no_face"):
-            return None, False  # Skip this face entirely
-        if match:
-            was_matched = True
+    matches: list[dict[str, Any] | None] = [None] * len(faces)
+    if face_index is not None and len(face_index) and any(embeddings):
+        matches = face_index.match(embeddings, face_match_threshold)
     
     # Count existing thumbnails
     total_thumbs_created = sum(
@@ -1005,31 +1131,45 @@ def _normalize_and_match_face(
         if f.get("thumb")
     )
     
-    # Create thumbnail if under limit
-    thumb_data = None
-    if total_thumbs_created < MAX_FACES_WITH_THUMBS:
-        thumb_data = _create_face_thumbnail(face_box, frame_img)
-    
-    face_item: dict[str, Any] = {
-        "score": round(float(score), 3),
-        "box": {
-            "x": int(face_box.get("x", 0)),
-            "y": int(face_box.get("y", 0)),
-            "w": int(face_box.get("w", 0)),
-            "h": int(face_box.get("h", 0)),
-        },
-    }
-    
-    if match:
-        face_item["match"] = match
-    if emb_list and face_store_embeddings:
-        face_item["embedding"] = emb_list
-    if emb_source:
-        face_item["embedding_source"] = emb_source
-    if thumb_data:
-        face_item["thumb"] = thumb_data
+    face_items: list[dict[str, Any]] = []
+    faces_matched = 0
+    for face, emb_list, match in zip(faces, embeddings, matches):
+        # Known false positive (not a real face), skip it entirely
+        if match and match.get("is_no_face"):
+            continue
+        if match:
+            faces_matched += 1
+        
+        face_box = face.get("box") or {}
+        score = face.get("score", 0.0)
+        emb_source = (face.get("embedding_source") or "").lower()
+        
+        # Create thumbnail if under limit
+        thumb_data = None
+        if total_thumbs_created < MAX_FACES_WITH_THUMBS:
+            thumb_data = _create_face_thumbnail(face_box, frame_img)
+        
+        face_item: dict[str, Any] = {
+            "score": round(float(score), 3),
+            "box": {
+                "x": int(face_box.get("x", 0)),
+                "y": int(face_box.get("y", 0)),
+                "w": int(face_box.get("w", 0)),
+                "h": int(face_box.get("h", 0)),
+            },
+        }
+        
+        if match:
+            face_item["match"] = match
+        if emb_list and face_store_embeddings:
+            face_item["embedding"] = emb_list
+        if emb_source:
+            face_item["embedding_source"] = emb_source
+        if thumb_data:
+            face_item["thumb"] = thumb_data
+        face_items.append(face_item)
     
-    return face_item, was_matched
+    return face_items, faces_matched
 
 
 async def _finalize_analysis_run(
@@ -1072,6 +1212,22 @@ async def _finalize_analysis_run(
         _LOGGER.warning("Could not update analysis_run: %s", db_err)
 
 
+def _index_analysis_result(output_root: str, job_dir: str, result: dict[str, Any]) -> None:
+    """Write the result summary to the SQLite analysis index (v1.4.0).
+    
+    Args:
+        output_root: Analysis output directory
+        job_dir: Analysis folder of this run
+        result: Current result dictionary
+    """
+    try:
+        db = get_database()
+        if db:
+            db.upsert_analysis_index(output_root, [(job_dir, result)])
+    except Exception as db_err:
+        _LOGGER.warning("Could not index analysis result: %s", db_err)
+
+
 def _update_analysis_run_error(
     analysis_run_id: int | None,
     status: str,
@@ -1098,27 +1254,6 @@ def _update_analysis_run_error(
         _LOGGER.debug("Failed to update analysis_run: %s", e)
 
 
-def _get_person_boxes(
-    detections: list[dict[str, Any]],
-    frame_idx: int,
-) -> list[dict[str, Any]]:
-    """Get person bounding boxes from detections for a specific frame.
-    
-    Args:
-        detections: List of detection results per frame
-        frame_idx: Frame index to get person boxes for
-        
-    Returns:
-        List of bounding box dicts for persons
-    """
-    if frame_idx >= len(detections):
-        return []
-    return [
-        o for o in (detections[frame_idx].get("objects") or [])
-        if o.get("label") == "person"
-    ]
-
-
 def _is_point_in_box(
     point_x: int,
     point_y: int,
@@ -1141,114 +1276,121 @@ def _is_point_in_box(
     return px <= point_x <= px + pw and py <= point_y <= py + ph
 
 
-async def _run_face_detection_loop(
-    session: Any,
-    face_url: str,
-    frames: list[str],
-    detections: list[dict[str, Any]],
-    device: str,
-    face_confidence: float,
-    face_store_embeddings: bool,
-    people_db: list[dict[str, Any]] | None,
-    face_match_threshold: float,
-    no_face_embeddings: list[dict[str, Any]] | None,
-    interval_s: int,
-    face_multiscale: bool = True,
-) -> tuple[int, int, int | None, int | None]:
-    """Run face detection on all frames with persons.
+class _RemoteFaceDetector:
+    """Face detection + embeddings for the frames of one analysis run.
     
-    Args:
-        session: aiohttp session
-        face_url: Face detection API URL
-        frames: List of frame file paths
-        detections: Detection results (modified in place)
-        device: Detection device
-        face_confidence: Minimum confidence threshold
-        face_store_embeddings: Whether to store embeddings
-        people_db: List of known people
-        face_match_threshold: Minimum similarity for match
-        no_face_embeddings: Known false positives
-        interval_s: Frame interval in seconds
-        face_multiscale: Enable multi-scale face detection (more accurate, more CPU)
-        
-    Returns:
-        Tuple of (faces_detected, faces_matched, frame_w, frame_h)
+    Only frames with a detected person are searched. After
+    FACE_MAX_CONSECUTIVE_ERRORS failed requests in a row the remaining frames
+    are skipped.
     """
-    faces_detected = 0
-    faces_matched = 0
-    consecutive_face_errors = 0
-    max_consecutive_errors = 3
-    frame_w = frame_h = None
-    
-    embed_flag = "1" if (face_store_embeddings or (people_db and len(people_db) > 0)) else "0"
-    
-    for idx, frame_path in enumerate(frames):
+
+    def __init__(
+        self,
+        session: Any,
+        face_url: str,
+        device: str,
+        face_confidence: float,
+        face_store_embeddings: bool,
+        people_db: list[dict[str, Any]] | None,
+        face_match_threshold: float,
+        no_face_embeddings: list[dict[str, Any]] | None,
+        face_multiscale: bool = True,
+        face_index: FaceIndex | None = None,
+    ) -> None:
+        self.session = session
+        self.face_url = face_url
+        self.device = device
+        self.face_confidence = float(face_confidence)
+        self.face_store_embeddings = face_store_embeddings
+        self.face_match_threshold = face_match_threshold
+        self.face_multiscale = face_multiscale
+        self.face_index = face_index if face_index is not None else FaceIndex(people_db, no_face_embeddings)
+        self.embed_flag = "1" if (face_store_embeddings or (people_db and len(people_db) > 0)) else "0"
+        self.faces_detected = 0
+        self.faces_matched = 0
+        self.frame_w: int | None = None
+        self.frame_h: int | None = None
+        self.consecutive_errors = 0
+        # Frames searched so far, for the thumbnail limit
+        self.detections: list[dict[str, Any]] = []
+
+    async def process(
+        self, idx: int, frame_bytes: bytes, entry: dict[str, Any], crops_only: bool = False
+    ) -> None:
+        """Search one frame for faces and store them in ``entry["faces"]``.
+        
+        Args:
+            idx: Frame index in the video
+            frame_bytes: JPEG frame
+            entry: Detection entry of the frame (modified in place)
+            crops_only: v1.4.0: Skip the whole-frame request and search the
+                person regions only (full-resolution frames)
+        """
         # Only run face detection when a person is detected in this frame
-        person_boxes = _get_person_boxes(detections, idx)
+        person_boxes = [o for o in (entry.get("objects") or []) if o.get("label") == "person"]
         if not person_boxes:
-            continue
+            return
 
         # Skip remaining frames if too many consecutive errors
-        if consecutive_face_errors >= max_consecutive_errors:
-            _LOGGER.warning("Face detection: Skipping remaining frames after %d consecutive errors", max_consecutive_errors)
-            break
-
-        try:
-            frame_bytes = await asyncio.to_thread(lambda p=frame_path: open(p, "rb").read())
-        except OSError as read_err:
-            _LOGGER.debug("Failed to read frame %d: %s", idx, read_err)
-            consecutive_face_errors += 1
-            continue
+        if self.consecutive_errors >= FACE_MAX_CONSECUTIVE_ERRORS:
+            if self.consecutive_errors == FACE_MAX_CONSECUTIVE_ERRORS:
+                _LOGGER.warning(
+                    "Face detection: Skipping remaining frames after %d consecutive errors",
+                    FACE_MAX_CONSECUTIVE_ERRORS,
+                )
+                self.consecutive_errors += 1
+            return
 
+        frame_name = _frame_name(idx)
         frame_img = None
         if Image is not None:
             try:
-                frame_img = Image.open(io.BytesIO(frame_bytes)).convert("RGB")
+                frame_img = await asyncio.to_thread(
+                    lambda: Image.open(io.BytesIO(frame_bytes)).convert("RGB")
+                )
             except (OSError, ValueError):
                 frame_img = None
 
-        try:
-            data, _detect_ms = await _detect_faces_with_retry(
-                session=session,
-                face_url=face_url,
-                frame_bytes=frame_bytes,
-                frame_path=frame_path,
-                device=device,
-                face_confidence=float(face_confidence),
-                embed_flag=embed_flag,
-                face_multiscale=face_multiscale,
-            )
-            _used_device = data.get("device", device)
-            _stats = _get_inference_stats()
-            if _stats:
-                _stats.record(_used_device, _detect_ms, 1)
-            consecutive_face_errors = 0
-        except Exception as face_req_err:
-            _LOGGER.debug("Face detection request failed for frame %d: %s", idx, face_req_err)
-            consecutive_face_errors += 1
-            time_s = idx * interval_s
-            if idx < len(detections):
-                detections[idx]["faces"] = []
-            else:
-                detections.append({"time_s": time_s, "faces": []})
-            continue
-
-        faces = data.get("faces", []) or []
-        fw = data.get("frame_width")
-        fh = data.get("frame_height")
-        if fw and fh:
-            frame_w, frame_h = fw, fh
+        faces: list[dict[str, Any]] = []
+        if not crops_only:
+            try:
+                data, _detect_ms = await _detect_faces_with_retry(
+                    session=self.session,
+                    face_url=self.face_url,
+                    frame_bytes=frame_bytes,
+                    frame_name=frame_name,
+                    device=self.device,
+                    face_confidence=self.face_confidence,
+                    embed_flag=self.embed_flag,
+                    face_multiscale=self.face_multiscale,
+                )
+                _used_device = data.get("device", self.device)
+                _stats = _get_inference_stats()
+                if _stats:
+                    _stats.record(_used_device, _detect_ms, 1)
+                self.consecutive_errors = 0
+            except Exception as face_req_err:
+                _LOGGER.debug("Face detection request failed for frame %d: %s", idx, face_req_err)
+                self.consecutive_errors += 1
+                entry["faces"] = []
+                return
+
+            faces = data.get("faces", []) or []
+            fw = data.get("frame_width")
+            fh = data.get("frame_height")
+            if fw and fh:
+                self.frame_w, self.frame_h = fw, fh
 
         # Try person crops if no faces found
-        if not faces and frame_img is not None and idx < len(detections):
+        if not faces and frame_img is not None:
             extra_faces = await _try_detect_faces_in_person_crops(
-                session=session,
-                face_url=face_url,
+                session=self.session,
+                face_url=self.face_url,
                 frame_img=frame_img,
                 person_boxes=person_boxes,
-                device=device,
-                face_confidence=float(face_confidence),
-                embed_flag=embed_flag,
+                device=self.device,
+                face_confidence=self.face_confidence,
+                embed_flag=self.embed_flag,
             )
             if extra_faces:
                 faces = extra_faces
@@ -1256,51 +1398,39 @@ async def _run_face_detection_loop(
         # MoveNet fallback
         if not faces:
             movenet_face = await _try_movenet_head_detection(
-                session=session,
-                face_url=face_url,
+                session=self.session,
+                face_url=self.face_url,
                 frame_bytes=frame_bytes,
-                frame_path=frame_path,
+                frame_name=frame_name,
                 frame_img=frame_img,
                 person_boxes=person_boxes,
-                device=device,
-                embed_flag=embed_flag,
+                device=self.device,
+                embed_flag=self.embed_flag,
             )
             if movenet_face:
                 faces.append(movenet_face)
 
         # Normalize and match faces
-        normed_faces = []
-        for face in faces:
-            face_item, was_matched = _normalize_and_match_face(
-                face=face,
-                people_db=people_db,
-                face_match_threshold=face_match_threshold,
-                no_face_embeddings=no_face_embeddings,
-                face_store_embeddings=face_store_embeddings,
-                frame_img=frame_img,
-                detections=detections,
-            )
-            if face_item is None:
-                continue
-            if was_matched:
-                faces_matched += 1
-            normed_faces.append(face_item)
-
-        faces_detected += len(normed_faces)
-        time_s = idx * interval_s
-        if idx < len(detections):
-            detections[idx]["faces"] = normed_faces
-        else:
-            detections.append({"time_s": time_s, "faces": normed_faces})
-    
-    return faces_detected, faces_matched, frame_w, frame_h
+        normed_faces, matched = _normalize_and_match_faces(
+            faces=faces,
+            face_index=self.face_index,
+            face_match_threshold=self.face_match_threshold,
+            face_store_embeddings=self.face_store_embeddings,
+            frame_img=frame_img,
+            detections=self.detections,
+        )
+        self.faces_matched += matched
+
+        self.faces_detected += len(normed_faces)
+        entry["faces"] = normed_faces
+        self.detections.append(entry)
 
 
 async def _try_movenet_head_detection(
     session: Any,
     face_url: str,
     frame_bytes: bytes,
-    frame_path: str,
+    frame_name: str,
     frame_img: Any,
     person_boxes: list[dict[str, Any]],
     device: str,
@@ -1316,7 +1446,7 @@ async def _try_movenet_head_detection(
         session: aiohttp session
         face_url: Face detection API URL
         frame_bytes: JPEG bytes of the frame
-        frame_path: Path to frame file
+        frame_name: File name sent with the upload
         frame_img: PIL Image of the frame
         person_boxes: List of detected person bounding boxes
         device: Detection device (coral_usb, cpu)
@@ -1332,7 +1462,7 @@ async def _try_movenet_head_detection(
         movenet_form = aiohttp.FormData()
         movenet_form.add_field(
             "file", frame_bytes,
-            filename=os.path.basename(frame_path),
+            filename=frame_name,
             content_type="image/jpeg"
         )
         movenet_form.add_field("min_confidence", "0.3")
@@ -1425,7 +1555,7 @@ async def _detect_faces_with_retry(
     session: Any,
     face_url: str,
     frame_bytes: bytes,
-    frame_path: str,
+    frame_name: str,
     device: str,
     face_confidence: float,
     embed_flag: str,
@@ -1437,7 +1567,7 @@ async def _detect_faces_with_retry(
         session: aiohttp session
         face_url: Face detection API URL
         frame_bytes: JPEG bytes of the frame
-        frame_path: Path to frame file
+        frame_name: File name sent with the upload
         device: Detection device
         face_confidence: Minimum confidence threshold
         embed_flag: "1" to generate embeddings
@@ -1451,7 +1581,7 @@ async def _detect_faces_with_retry(
     form = aiohttp.FormData()
     form.add_field(
         "file", frame_bytes,
-        filename=os.path.basename(frame_path),
+        filename=frame_name,
         content_type="image/jpeg"
     )
     form.add_field("device", device)
@@ -1475,7 +1605,7 @@ async def _detect_faces_with_retry(
         form_retry = aiohttp.FormData()
         form_retry.add_field(
             "file", frame_bytes,
-            filename=os.path.basename(frame_path),
+            filename=frame_name,
             content_type="image/jpeg"
         )
         form_retry.add_field("device", device)
@@ -1639,129 +1769,948 @@ async def _try_detect_faces_in_person_crops(
     return extra_faces
 
 
-async def _run_object_detection_remote(
+def _frames_to_tensor(frames: list[bytes], width: int, height: int) -> tuple[bytes, int, int]:
+    """Decode and resize frames into one uint8 RGB buffer of shape (N, height, width, 3).
+    
+    JPEG draft mode lets the decoder downscale while decoding, so large
+    frames are never fully decoded.
+    
+    Returns:
+        Tuple of (buffer, frame_width, frame_height) of the original frames
+    """
+    buf = bytearray()
+    frame_w = frame_h = None
+    for frame in frames:
+        with Image.open(io.BytesIO(frame)) as img:
+            if frame_w is None:
+                frame_w, frame_h = img.size
+            elif img.size != (frame_w, frame_h):
+                raise ValueError(f"Frame size changed within chunk: {img.size}")
+            img.draft("RGB", (width, height))
+            buf += img.convert("RGB").resize((width, height)).tobytes()
+    return bytes(buf), frame_w, frame_h
+
+
+def _write_shm_frames(buffer: bytes) -> str:
+    """Write a raw frame buffer to DETECTOR_SHM_DIR and return its path."""
+    os.makedirs(DETECTOR_SHM_DIR, exist_ok=True)
+    path = os.path.join(DETECTOR_SHM_DIR, f"frames_{os.getpid()}_{time.monotonic_ns()}.rgb")
+    with open(path, "wb") as f:
+        f.write(buffer)
+    return path
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+async def _get_detector_input_spec(session: Any, base_url: str, device: str) -> dict[str, Any] | None:
+    """Fetch the detector's object model input for raw frame transport.
+    
+    Returns:
+        Spec dict with shape [H, W, 3], max_frames and shm_dir, or None if the
+        detector does not support raw frames
+    """
+    try:
+        async with session.get(f"{base_url}/input_spec", params={"device": device}, timeout=30) as resp:
+            if resp.status != 200:
+                return None
+            spec = await resp.json()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+        _LOGGER.debug("Detector input spec unavailable: %s", err)
+        return None
+    shape = spec.get("shape") or []
+    if spec.get("dtype") != "uint8" or len(shape) != 3 or shape[2] != 3:
+        return None
+    return spec
+
+
+async def _post_raw_frames(
     session: Any,
-    detector_url: str,
-    frames: list[str],
+    base_url: str,
+    chunk: list[bytes],
+    spec: dict[str, Any],
     objects: list[str],
     device: str,
     detector_confidence: float,
-    interval_s: int,
-) -> tuple[list[dict[str, Any]], int | None, int | None]:
-    """Run object detection via remote detector API.
+    use_shm: bool,
+) -> dict[str, Any] | None:
+    """Send model-sized raw frames to ``/detect_raw``.
     
-    Args:
-        session: aiohttp session
-        detector_url: URL of the detector service
-        frames: List of frame file paths
-        objects: List of object labels to detect
-        device: Detection device
-        detector_confidence: Minimum confidence threshold
-        interval_s: Frame interval in seconds
-        
     Returns:
-        Tuple of (detections list, frame_width, frame_height)
+        Detector response, or None if the frames were rejected (HTTP 422) or
+        could not be written to shared memory
     """
-    detections: list[dict[str, Any]] = []
-    frame_w = frame_h = None
+    height, width, _ = spec["shape"]
+    buffer, frame_w, frame_h = await asyncio.to_thread(_frames_to_tensor, chunk, width, height)
+    headers = {
+        "Content-Type": "application/octet-stream",
+        "X-Frame-Shape": f"{len(chunk)},{height},{width},3",
+        "X-Frame-Size": f"{frame_w}x{frame_h}",
+    }
+    params = {"objects": json.dumps(objects), "device": device, "confidence": str(detector_confidence)}
+    shm_path = None
+    if use_shm:
+        try:
+            shm_path = await asyncio.to_thread(_write_shm_frames, buffer)
+        except OSError as err:
+            _LOGGER.info("Cannot write frames to %s: %s", DETECTOR_SHM_DIR, err)
+            return None
+        headers["X-Frame-Shm"] = os.path.basename(shm_path)
+        buffer = b""
+    try:
+        async with session.post(
+            f"{base_url}/detect_raw",
+            data=buffer,
+            headers=headers,
+            params=params,
+            timeout=30 + 5 * len(chunk)
+        ) as resp:
+            if resp.status == 422:
+                data = await resp.json()
+                _LOGGER.info("Detector rejected raw frames: %s", data.get("error"))
+                return None
+            if resp.status != 200:
+                raise RuntimeError(f"Detector error {resp.status}")
+            return await resp.json()
+    finally:
+        if shm_path:
+            await asyncio.to_thread(_remove_file, shm_path)
+
+
+def _filter_objects(dets: list[dict[str, Any]], objects: list[str]) -> list[dict[str, Any]]:
+    if objects:
+        return [d for d in dets if d.get("label") in objects]
+    return dets
+
+
+class _RemoteObjectDetector:
+    """Object detection via remote detector API for one analysis run.
+    
+    Frames are sent in chunks of ``batch_size`` to ``/detect_batch``. If the
+    detector add-on is too old to know that endpoint, the remaining frames
+    fall back to one ``/detect`` request per frame.
+    
+    With ``transport`` "raw" or "shm" the frames are resized to the model
+    input here and sent as uint8 RGB to ``/detect_raw`` (as request body or
+    as a file in DETECTOR_SHM_DIR), so the detector skips decoding and
+    resizing. Frames the detector rejects fall back from "shm" to "raw" and
+    from "raw" to JPEG uploads.
+    
+    Fallbacks are remembered for the rest of the run, so concurrent and
+    later chunks go straight to the endpoint that works.
     
-    for idx, frame_path in enumerate(frames):
-        frame_bytes = await asyncio.to_thread(lambda p=frame_path: open(p, "rb").read())
+    v1.4.0: JPEG uploads carry ``stream_id`` (one per recording); with the
+    add-on's motion gate enabled, frames without motion against the last
+    inferred frame of the stream are answered without a model run.
+    """
+
+    def __init__(
+        self,
+        session: Any,
+        detector_url: str,
+        objects: list[str],
+        device: str,
+        detector_confidence: float,
+        interval_s: int,
+        batch_size: int = DEFAULT_DETECTOR_BATCH_SIZE,
+        transport: str = DEFAULT_DETECTOR_TRANSPORT,
+        stream_id: str | None = None,
+    ) -> None:
+        self.session = session
+        self.base_url = detector_url.rstrip('/')
+        self.objects = objects
+        self.device = device
+        self.detector_confidence = detector_confidence
+        self.interval_s = interval_s
+        self.batch_size = max(1, int(batch_size or 1))
+        self.transport = transport
+        self.stream_id = stream_id
+        self.raw_spec: dict[str, Any] | None = None
+
+    @property
+    def chunk_size(self) -> int:
+        """Frames to pass to one ``detect`` call."""
+        if self.raw_spec:
+            return min(self.batch_size, int(self.raw_spec.get("max_frames") or self.batch_size))
+        return self.batch_size
+
+    async def open(self) -> None:
+        """Ask the detector whether it accepts raw frames."""
+        if self.transport in ("raw", "shm") and Image is not None:
+            self.raw_spec = await _get_detector_input_spec(self.session, self.base_url, self.device)
+            if self.raw_spec is None:
+                _LOGGER.info("Detector does not accept raw frames, using JPEG uploads")
+            elif self.transport == "shm" and not self.raw_spec.get("shm_dir"):
+                self.transport = "raw"
+
+    def _batch_entries(
+        self,
+        data: dict[str, Any],
+        indices: list[int],
+        detect_start: float,
+    ) -> tuple[list[dict[str, Any]], int | None, int | None]:
+        results = data.get("results") or []
+        if len(results) != len(indices):
+            raise RuntimeError(
+                data.get("error") or f"Detector returned {len(results)} results for {len(indices)} frames"
+            )
+        _detect_ms = (time.perf_counter() - detect_start) * 1000
+        _stats = _get_inference_stats()
+        if _stats:
+            _stats.record(data.get("device", self.device), _detect_ms, len(indices))
+
+        entries = []
+        frame_w = frame_h = None
+        for idx, frame_data in zip(indices, results):
+            dets = _filter_objects(frame_data.get("objects", []), self.objects)
+            entries.append({"time_s": idx * self.interval_s, "objects": dets})
+            if frame_data.get("frame_width"):
+                frame_w = frame_data.get("frame_width")
+                frame_h = frame_data.get("frame_height")
+        return entries, frame_w, frame_h
+
+    async def detect(
+        self,
+        frames: list[bytes],
+        indices: list[int],
+    ) -> tuple[list[dict[str, Any]], int | None, int | None]:
+        """Detect objects in a chunk of frames.
+        
+        Args:
+            frames: JPEG frames, at most ``chunk_size``
+            indices: Frame index in the video of each frame
+            
+        Returns:
+            Tuple of (one detection entry per frame, frame_width, frame_height)
+        """
+        while self.raw_spec:
+            spec = self.raw_spec
+            use_shm = self.transport == "shm"
+            _detect_start = time.perf_counter()
+            data = await _post_raw_frames(
+                self.session, self.base_url, frames, spec, self.objects, self.device,
+                self.detector_confidence, use_shm=use_shm,
+            )
+            if data is not None:
+                return self._batch_entries(data, indices, _detect_start)
+            if use_shm:
+                self.transport = "raw"
+            else:
+                self.raw_spec = None
+
+        if self.batch_size > 1:
+            form = aiohttp.FormData()
+            for idx, frame_bytes in zip(indices, frames):
+                form.add_field(
+                    "files", frame_bytes,
+                    filename=_frame_name(idx),
+                    content_type="image/jpeg"
+                )
+            form.add_field("objects", json.dumps(self.objects))
+            form.add_field("device", self.device)
+            form.add_field("confidence", str(self.detector_confidence))
+            if self.stream_id:
+                form.add_field("stream_id", self.stream_id)
+
+            data = None
+            _detect_start = time.perf_counter()
+            async with self.session.post(
+                f"{self.base_url}/detect_batch",
+                data=form,
+                timeout=30 + 5 * len(frames)
+            ) as resp:
+                if resp.status == 404:
+                    if self.batch_size > 1:
+                        _LOGGER.info("Detector has no /detect_batch endpoint, using per-frame requests")
+                    self.batch_size = 1
+                elif resp.status != 200:
+                    raise RuntimeError(f"Detector error {resp.status}")
+                else:
+                    data = await resp.json()
+            if data is not None:
+                return self._batch_entries(data, indices, _detect_start)
+
+        entries = []
+        frame_w = frame_h = None
+        for idx, frame_bytes in zip(indices, frames):
+            form = aiohttp.FormData()
+            form.add_field(
+                "file", frame_bytes,
+                filename=_frame_name(idx),
+                content_type="image/jpeg"
+            )
+            form.add_field("objects", json.dumps(self.objects))
+            form.add_field("device", self.device)
+            form.add_field("confidence", str(self.detector_confidence))
+            if self.stream_id:
+                form.add_field("stream_id", self.stream_id)
+
+            _detect_start = time.perf_counter()
+            async with self.session.post(
+                f"{self.base_url}/detect",
+                data=form,
+                timeout=30
+            ) as resp:
+                if resp.status != 200:
+                    raise RuntimeError(f"Detector error {resp.status}")
+                data = await resp.json()
+
+            _detect_ms = (time.perf_counter() - _detect_start) * 1000
+            _used_device = data.get("device", self.device)
+            _stats = _get_inference_stats()
+            if _stats:
+                _stats.record(_used_device, _detect_ms, 1)
+
+            dets = _filter_objects(data.get("objects", []), self.objects)
+            entries.append({"time_s": idx * self.interval_s, "objects": dets})
+            frame_w = data.get("frame_width")
+            frame_h = data.get("frame_height")
+        return entries, frame_w, frame_h
+
+
+class _LocalObjectDetector:
+    """Object detection using local TFLite interpreter."""
+
+    chunk_size = 1
+
+    def __init__(
+        self,
+        objects: list[str],
+        device: str,
+        detector_confidence: float,
+        interval_s: int,
+        output_root: str,
+    ) -> None:
+        self.objects = objects
+        self.device = device
+        self.detector_confidence = detector_confidence
+        self.interval_s = interval_s
+        self.output_root = output_root
+        self.interpreter = None
+        self.labels: dict[int, str] = {}
+        # The interpreter is not thread-safe, concurrent chunks run one at a time
+        self._lock = asyncio.Lock()
+
+    async def open(self) -> None:
+        """Download the model if needed and build the interpreter."""
+        if tflite is None or np is None or Image is None:
+            raise RuntimeError("Missing dependencies: tflite-runtime, numpy, Pillow")
+
+        model_path, self.labels = await asyncio.to_thread(_ensure_models, self.output_root, self.device)
+        self.interpreter = await asyncio.to_thread(
+            _build_interpreter,
+            model_path,
+            self.device if self.device in ("coral_usb",) else "cpu",
+        )
+        await asyncio.to_thread(self.interpreter.allocate_tensors)
+
+    async def detect(
+        self,
+        frames: list[bytes],
+        indices: list[int],
+    ) -> tuple[list[dict[str, Any]], int | None, int | None]:
+        """Detect objects in a chunk of frames, see ``_RemoteObjectDetector.detect``."""
+        entries = []
+        frame_w = frame_h = None
+        async with self._lock:
+            for idx, frame_bytes in zip(indices, frames):
+                _detect_start = time.perf_counter()
+                dets, (fw, fh) = await asyncio.to_thread(
+                    _run_detection,
+                    frame_bytes,
+                    self.interpreter,
+                    self.labels,
+                    score_threshold=self.detector_confidence,
+                )
+                _detect_ms = (time.perf_counter() - _detect_start) * 1000
+                _stats = _get_inference_stats()
+                if _stats:
+                    _stats.record(self.device, _detect_ms, 1)
+
+                entries.append({"time_s": idx * self.interval_s, "objects": _filter_objects(dets, self.objects)})
+                frame_w, frame_h = fw, fh
+        return entries, frame_w, frame_h
+
+
+class _RemoteFramePipeline:
+    """Object and face detection with one ``/analyze_frame`` call per frame.
+    
+    The detector runs the same cascade as ``_RemoteObjectDetector`` followed
+    by ``_RemoteFaceDetector`` (retry at lower confidence, person crops,
+    MoveNet head) on a single decoded frame, so each frame costs one round
+    trip instead of up to five or more.
+    
+    If the detector add-on has no ``/analyze_frame`` endpoint, ``detect``
+    hands the frames to ``fallback`` and leaves faces to the face stage.
+    """
+
+    def __init__(
+        self,
+        session: Any,
+        detector_url: str,
+        objects: list[str],
+        device: str,
+        detector_confidence: float,
+        face_confidence: float,
+        face_store_embeddings: bool,
+        people_db: list[dict[str, Any]] | None,
+        face_match_threshold: float,
+        no_face_embeddings: list[dict[str, Any]] | None,
+        interval_s: int,
+        face_multiscale: bool = True,
+        fallback: _RemoteObjectDetector | None = None,
+        face_index: FaceIndex | None = None,
+    ) -> None:
+        self.session = session
+        self.base_url = detector_url.rstrip('/')
+        self.objects = objects
+        self.device = device
+        self.detector_confidence = detector_confidence
+        self.face_confidence = face_confidence
+        self.face_store_embeddings = face_store_embeddings
+        self.face_match_threshold = face_match_threshold
+        self.interval_s = interval_s
+        self.face_multiscale = face_multiscale
+        self.fallback = fallback
+        self.face_index = face_index if face_index is not None else FaceIndex(people_db, no_face_embeddings)
+        # None until the first response tells whether the endpoint exists
+        self.supported: bool | None = None
+        self.faces_detected = 0
+        self.faces_matched = 0
+        # Frames with faces so far, for the thumbnail limit
+        self.detections: list[dict[str, Any]] = []
+
+        # Faces are only searched in frames with a person, as in _RemoteFaceDetector
+        self.face_flag = "1" if "person" in objects else "0"
+        self.embed_flag = "1" if (face_store_embeddings or (people_db and len(people_db) > 0)) else "0"
+        self.retry_conf = 0.0
+        if float(face_confidence) > 0.25:
+            self.retry_conf = max(DEFAULT_FACE_CONFIDENCE, float(face_confidence) * FACE_RETRY_CONFIDENCE_MULTIPLIER)
+
+    @property
+    def chunk_size(self) -> int:
+        """Frames to pass to one ``detect`` call."""
+        if self.supported is False and self.fallback is not None:
+            return self.fallback.chunk_size
+        return 1
+
+    async def open(self) -> None:
+        if self.fallback is not None:
+            await self.fallback.open()
+
+    async def analyze(
+        self,
+        frame_bytes: bytes,
+        idx: int,
+    ) -> tuple[dict[str, Any], int | None, int | None] | None:
+        """Run objects + faces on one frame.
+        
+        Returns:
+            Tuple of (detection entry, frame_width, frame_height), or None if
+            the detector add-on has no ``/analyze_frame`` endpoint.
+        """
         form = aiohttp.FormData()
         form.add_field(
             "file", frame_bytes,
-            filename=os.path.basename(frame_path),
+            filename=_frame_name(idx),
             content_type="image/jpeg"
         )
-        form.add_field("objects", json.dumps(objects))
-        form.add_field("device", device)
-        form.add_field("confidence", str(detector_confidence))
-        
+        form.add_field("objects", json.dumps(self.objects))
+        form.add_field("device", self.device)
+        form.add_field("confidence", str(self.detector_confidence))
+        form.add_field("face", self.face_flag)
+        form.add_field("face_confidence", str(self.face_confidence))
+        form.add_field("face_retry_confidence", str(self.retry_conf))
+        form.add_field("multi_scale", "1" if self.face_multiscale else "0")
+        form.add_field("embed", self.embed_flag)
+
         _detect_start = time.perf_counter()
-        async with session.post(
-            f"{detector_url.rstrip('/')}/detect",
+        async with self.session.post(
+            f"{self.base_url}/analyze_frame",
             data=form,
-            timeout=30
+            timeout=60
         ) as resp:
+            if resp.status == 404 and not self.supported:
+                if self.supported is None:
+                    _LOGGER.info("Detector has no /analyze_frame endpoint, using /detect + /faces")
+                self.supported = False
+                return None
             if resp.status != 200:
                 raise RuntimeError(f"Detector error {resp.status}")
             data = await resp.json()
-        
+        self.supported = True
+
         _detect_ms = (time.perf_counter() - _detect_start) * 1000
-        _used_device = data.get("device", device)
         _stats = _get_inference_stats()
         if _stats:
-            _stats.record(_used_device, _detect_ms, 1)
-        
-        dets = data.get("objects", [])
-        if objects:
-            dets = [d for d in dets if d.get("label") in objects]
-        
-        time_s = idx * interval_s
-        detections.append({"time_s": time_s, "objects": dets})
-        frame_w = data.get("frame_width")
-        frame_h = data.get("frame_height")
+            _stats.record(data.get("device", self.device), _detect_ms, 1)
+
+        dets = _filter_objects(data.get("objects", []), self.objects)
+        entry: dict[str, Any] = {"time_s": idx * self.interval_s, "objects": dets}
+
+        if self.face_flag == "1" and any(d.get("label") == "person" for d in dets):
+            raw_faces = data.get("faces") or []
+            frame_img = None
+            if raw_faces and Image is not None:
+                try:
+                    frame_img = await asyncio.to_thread(
+                        lambda: Image.open(io.BytesIO(frame_bytes)).convert("RGB")
+                    )
+                except (OSError, ValueError):
+                    frame_img = None
+
+            normed_faces, matched = _normalize_and_match_faces(
+                faces=raw_faces,
+                face_index=self.face_index,
+                face_match_threshold=self.face_match_threshold,
+                face_store_embeddings=self.face_store_embeddings,
+                frame_img=frame_img,
+                detections=self.detections,
+            )
+            self.faces_matched += matched
+            self.faces_detected += len(normed_faces)
+            entry["faces"] = normed_faces
+            self.detections.append(entry)
+
+        return entry, data.get("frame_width"), data.get("frame_height")
+
+    async def detect(
+        self,
+        frames: list[bytes],
+        indices: list[int],
+    ) -> tuple[list[dict[str, Any]], int | None, int | None]:
+        """Detect objects and faces in a chunk of frames, see ``_RemoteObjectDetector.detect``."""
+        entries = []
+        frame_w = frame_h = None
+        for pos, (idx, frame_bytes) in enumerate(zip(indices, frames)):
+            analyzed = await self.analyze(frame_bytes, idx) if self.supported is not False else None
+            if analyzed is None:
+                if self.fallback is None:
+                    raise RuntimeError("Detector error 404")
+                rest, fw, fh = await self.fallback.detect(frames[pos:], indices[pos:])
+                entries.extend(rest)
+                if fw:
+                    frame_w, frame_h = fw, fh
+                break
+            entry, fw, fh = analyzed
+            entries.append(entry)
+            if fw:
+                frame_w, frame_h = fw, fh
+        return entries, frame_w, frame_h
+
+
+class _StageStats:
+    """Busy/idle bookkeeping for one analysis pipeline stage.
+    
+    ``busy_s`` is summed over the stage's workers, ``idle_s`` is time spent
+    waiting for input and ``blocked_s`` time spent waiting for room in the
+    next stage's queue. The stage with the most busy time per worker is the
+    bottleneck; stages before it show blocked time, stages after it idle time.
+    """
+
+    def __init__(self, workers: int = 1) -> None:
+        self.workers = workers
+        self.items = 0
+        self.busy_s = 0.0
+        self.idle_s = 0.0
+        self.blocked_s = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "items": self.items,
+            "busy_s": round(self.busy_s, 3),
+            "idle_s": round(self.idle_s, 3),
+            "blocked_s": round(self.blocked_s, 3),
+        }
+
+
+async def _stage_get(queue: asyncio.Queue, stats: _StageStats, max_items: int = 1) -> list | None:
+    """Wait for the next item from ``queue``, None once the stage before is done.
     
-    return detections, frame_w, frame_h
+    Up to ``max_items`` already queued items are taken along, so batching
+    stages send what is ready instead of waiting for a full batch.
+    """
+    wait_start = time.perf_counter()
+    item = await queue.get()
+    stats.idle_s += time.perf_counter() - wait_start
+    items = []
+    while item is not None:
+        items.append(item)
+        if len(items) >= max_items or queue.empty():
+            return items
+        item = queue.get_nowait()
+    # Leave the end marker for the other workers of this stage
+    queue.put_nowait(None)
+    return items or None
+
+
+async def _stage_put(queue: asyncio.Queue, item: Any, stats: _StageStats) -> None:
+    wait_start = time.perf_counter()
+    await queue.put(item)
+    stats.blocked_s += time.perf_counter() - wait_start
+
+
+def _scale_boxes(detections: list[dict[str, Any]], scale_x: float, scale_y: float) -> None:
+    """Scale the object and face boxes of detection entries in place."""
+    for entry in detections:
+        for item in (entry.get("objects") or []) + (entry.get("faces") or []):
+            box = item.get("box")
+            if not box:
+                continue
+            item["box"] = {
+                "x": int(round(box.get("x", 0) * scale_x)),
+                "y": int(round(box.get("y", 0) * scale_y)),
+                "w": int(round(box.get("w", 0) * scale_x)),
+                "h": int(round(box.get("h", 0) * scale_y)),
+            }
 
 
-async def _run_object_detection_local(
-    frames: list[str],
-    objects: list[str],
-    device: str,
-    detector_confidence: float,
+async def _apply_full_resolution(
+    video_path: str,
+    outcome: dict[str, Any],
+    face_detector: _RemoteFaceDetector | None,
+    on_frame: Callable[[int, dict[str, Any]], None] | None = None,
+) -> None:
+    """Move the result of a substream analysis onto the recorded video.
+    
+    v1.4.0: Boxes found on the low-res analysis stream are mapped to the
+    resolution of video_path. Faces are then searched in person crops of
+    full-resolution frames, which are only decoded for frames with a person.
+    
+    Args:
+        video_path: Finished recording of the main stream
+        outcome: Result of ``_run_analysis_pipeline`` (modified in place)
+        face_detector: Face stage, or None
+        on_frame: Called again with (index, entry) for frames that got faces
+    """
+    low_w, low_h = outcome["frame_width"], outcome["frame_height"]
+    size = await _get_video_size(video_path)
+    if size is None or not low_w or not low_h:
+        # Boxes stay consistent with the substream frame size
+        _LOGGER.debug("Keeping substream coordinates for %s", video_path)
+        return
+    outcome["analysis_stream"] = {"frame_width": low_w, "frame_height": low_h}
+    _scale_boxes(outcome["detections"], size[0] / low_w, size[1] / low_h)
+    outcome["frame_width"], outcome["frame_height"] = size
+
+    if face_detector is None:
+        return
+    for idx, entry in enumerate(outcome["detections"]):
+        if not any(o.get("label") == "person" for o in (entry.get("objects") or [])):
+            continue
+        frame = await _read_video_frame(video_path, entry.get("time_s", 0))
+        if frame is None:
+            continue
+        try:
+            await face_detector.process(idx, frame, entry, crops_only=True)
+        except Exception as err:
+            outcome["errors"].setdefault("faces", str(err))
+            return
+        if on_frame is not None and entry.get("faces"):
+            try:
+                on_frame(idx, entry)
+            except Exception as err:
+                _LOGGER.debug("Frame callback failed: %s", err)
+
+
+async def _faces_from_full_resolution(
+    face_detector: _RemoteFaceDetector,
+    video_path: str,
+    idx: int,
+    entry: dict[str, Any],
+    scale_x: float,
+    scale_y: float,
+) -> None:
+    """Search the faces of a downscaled frame in its full-resolution frame.
+    
+    v1.4.0: The frame is only decoded when the object pass found a person.
+    The found faces are stored in ``entry["faces"]`` in the coordinates of
+    the downscaled frame, like its objects.
+    """
+    if not any(o.get("label") == "person" for o in (entry.get("objects") or [])):
+        return
+    frame = await _read_video_frame(video_path, entry.get("time_s", 0))
+    if frame is None:
+        return
+    full_entry = {**entry, "objects": [dict(o) for o in entry["objects"]]}
+    _scale_boxes([full_entry], scale_x, scale_y)
+    await face_detector.process(idx, frame, full_entry)
+    if "faces" in full_entry:
+        _scale_boxes([{"faces": full_entry["faces"]}], 1 / scale_x, 1 / scale_y)
+        entry["faces"] = full_entry["faces"]
+
+
+async def _sample_person_neighbors(
+    video_path: str,
+    outcome: dict[str, Any],
+    sampling: SamplingPlan,
+    detector: Any,
+    face_detector: _RemoteFaceDetector | None,
+) -> None:
+    """Analyze the unsampled grid slots next to frames with a person.
+    
+    v1.4.0: Second step of adaptive sampling, limited by what is left of the
+    frame budget. The frames are read by timestamp at full resolution, like
+    the mapped boxes of the result, and are not part of the annotated video.
+    """
+    times = sampling.person_neighbors(outcome["detections"])
+    added: list[dict[str, Any]] = []
+    chunk = max(1, detector.chunk_size)
+    for start in range(0, len(times), chunk):
+        pairs = []
+        for t in times[start:start + chunk]:
+            frame = await _read_video_frame(video_path, t)
+            if frame is not None:
+                pairs.append((t, frame))
+        if not pairs:
+            continue
+        indices = [outcome["frame_count"] + len(added) + i for i in range(len(pairs))]
+        try:
+            entries, _fw, _fh = await detector.detect([frame for _, frame in pairs], indices)
+        except Exception as err:
+            _LOGGER.debug("Detection of person neighbour frames failed: %s", err)
+            break
+        for (t, frame), idx, entry in zip(pairs, indices, entries):
+            entry["time_s"] = t
+            # Frames from /analyze_frame already carry their faces
+            if face_detector is not None and "faces" not in entry:
+                try:
+                    await face_detector.process(idx, frame, entry)
+                except Exception as err:
+                    _LOGGER.debug("Face detection of frame at %ss failed: %s", t, err)
+            added.append(entry)
+    if added:
+        outcome["detections"] = sorted(outcome["detections"] + added, key=lambda e: e.get("time_s", 0))
+        outcome["frame_count"] += len(added)
+    outcome["person_frames_added"] = len(added)
+
+
+async def _run_analysis_pipeline(
+    video_path: str,
     interval_s: int,
-    output_root: str,
-) -> tuple[list[dict[str, Any]], int | None, int | None]:
-    """Run object detection using local TFLite interpreter.
+    detector: Any | None,
+    face_detector: _RemoteFaceDetector | None,
+    writer: _AnnotatedVideoWriter | None,
+    window: int = DEFAULT_ANALYSIS_PIPELINE_WINDOW,
+    frames: AsyncIterator[bytes] | None = None,
+    on_frame: Callable[[int, dict[str, Any]], None] | None = None,
+    video_size: tuple[int, int] | None = None,
+    sampling: SamplingPlan | None = None,
+) -> dict[str, Any]:
+    """Run frame extraction, object detection, face detection and annotation
+    as overlapping stages.
+    
+    The stages are connected by bounded queues, so ffmpeg keeps decoding
+    while the detector works and only a few frames per stage are held in
+    memory. Object and face detection run ``window`` requests in flight
+    (a local interpreter runs one), extraction and annotation one worker
+    each. Annotation restores video order before drawing.
+    
+    A stage that fails records its error and drops or passes on the
+    remaining frames, so the other stages and the frame count still finish.
     
     Args:
-        frames: List of frame file paths
-        objects: List of object labels to detect
-        device: Detection device (coral_usb, cpu)
-        detector_confidence: Minimum confidence threshold
+        video_path: Video to analyze
         interval_s: Frame interval in seconds
-        output_root: Root directory for models
+        detector: Opened object detector, or None to only count frames
+        face_detector: Face stage, or None
+        writer: Annotated video writer, or None
+        window: In-flight requests per detection stage
+        frames: v1.4.0: Frame source instead of decoding video_path (live
+            frames of a running recording)
+        on_frame: Called with (index, entry) for every analyzed frame in
+            video order, as soon as it is complete
+        video_size: v1.4.0: Size of video_path; a larger video is extracted
+            downscaled for the object pass, faces are searched in
+            full-resolution frames and all boxes are mapped to this size
+        sampling: v1.4.0: Adaptive sample times instead of every interval_s
         
     Returns:
-        Tuple of (detections list, frame_width, frame_height)
+        Dict with frame_count, extract_sec, detections (in frame order),
+        frame_width, frame_height, annotated_video, errors (by stage) and
+        stages (per-stage busy/idle stats)
     """
-    if tflite is None or np is None or Image is None:
-        raise RuntimeError("Missing dependencies: tflite-runtime, numpy, Pillow")
-    
-    model_path, labels = await asyncio.to_thread(_ensure_models, output_root, device)
-    interpreter = await asyncio.to_thread(
-        _build_interpreter,
-        model_path,
-        device if device in ("coral_usb",) else "cpu",
-    )
-    await asyncio.to_thread(interpreter.allocate_tensors)
-    
-    detections: list[dict[str, Any]] = []
-    frame_w = frame_h = None
-    
-    for idx, frame_path in enumerate(frames):
-        _detect_start = time.perf_counter()
-        dets, (fw, fh) = await asyncio.to_thread(
-            _run_detection,
-            frame_path,
-            interpreter,
-            labels,
-            score_threshold=detector_confidence,
+    window = max(1, int(window or 1))
+    queue_size = window * max(1, detector.chunk_size if detector is not None else 1)
+    to_detect: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    to_faces: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    to_annotate: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    detect_workers = 1 if isinstance(detector, _LocalObjectDetector) else window
+    stats = {"extract": _StageStats()}
+    if detector is not None:
+        stats["detect"] = _StageStats(detect_workers)
+        stats["faces"] = _StageStats(window)
+        stats["annotate"] = _StageStats()
+    outcome: dict[str, Any] = {
+        "frame_count": 0,
+        "extract_sec": 0.0,
+        "detections": [],
+        "frame_width": None,
+        "frame_height": None,
+        "annotated_video": None,
+        "errors": {},
+    }
+    errors = outcome["errors"]
+    detect_size = _detection_frame_size(video_size) if video_size and frames is None else None
+
+    async def extract() -> None:
+        st = stats["extract"]
+        extract_start = time.monotonic()
+        if frames is not None:
+            source = frames
+        elif sampling is not None:
+            source = stream_frames(
+                video_path, sampling.step, size=detect_size, select=sampling.select_expression()
+            )
+        else:
+            source = stream_frames(video_path, interval_s, size=detect_size)
+        try:
+            while True:
+                decode_start = time.perf_counter()
+                try:
+                    frame = await anext(source)
+                except StopAsyncIteration:
+                    break
+                st.busy_s += time.perf_counter() - decode_start
+                if detector is not None:
+                    await _stage_put(to_detect, (st.items, frame, None), st)
+                st.items += 1
+        finally:
+            await source.aclose()
+        outcome["frame_count"] = st.items
+        outcome["extract_sec"] = round(time.monotonic() - extract_start, 2)
+        if detector is not None:
+            await _stage_put(to_detect, None, st)
+
+    async def detect_worker() -> None:
+        st = stats["detect"]
+        while (batch := await _stage_get(to_detect, st, detector.chunk_size)) is not None:
+            # After an error keep draining so extraction can finish
+            if "detect" in errors:
+                continue
+            busy_start = time.perf_counter()
+            try:
+                entries, fw, fh = await detector.detect(
+                    [frame for _, frame, _ in batch], [idx for idx, _, _ in batch]
+                )
+            except Exception as err:
+                errors.setdefault("detect", str(err))
+                continue
+            finally:
+                st.busy_s += time.perf_counter() - busy_start
+            st.items += len(batch)
+            if fw:
+                outcome["frame_width"], outcome["frame_height"] = fw, fh
+            for (idx, frame, _), entry in zip(batch, entries):
+                if sampling is not None and idx < len(sampling.times):
+                    entry["time_s"] = sampling.times[idx]
+                await _stage_put(to_faces, (idx, frame, entry), st)
+
+    async def face_worker() -> None:
+        st = stats["faces"]
+        while (batch := await _stage_get(to_faces, st)) is not None:
+            idx, frame, entry = batch[0]
+            # Frames from /analyze_frame already carry their faces
+            if face_detector is not None and "faces" not in entry and "faces" not in errors:
+                busy_start = time.perf_counter()
+                try:
+                    if detect_size is not None and outcome["frame_width"]:
+                        await _faces_from_full_resolution(
+                            face_detector, video_path, idx, entry,
+                            video_size[0] / outcome["frame_width"], video_size[1] / outcome["frame_height"],
+                        )
+                    else:
+                        await face_detector.process(idx, frame, entry)
+                    st.items += 1
+                except Exception as err:
+                    errors.setdefault("faces", str(err))
+                finally:
+                    st.busy_s += time.perf_counter() - busy_start
+            await _stage_put(to_annotate, (idx, frame, entry), st)
+
+    repeats = sampling.repeats() if sampling is not None else None
+
+    async def annotate() -> None:
+        st = stats["annotate"]
+        pending: dict[int, tuple[bytes, dict[str, Any]]] = {}
+        next_idx = 0
+        try:
+            while (batch := await _stage_get(to_annotate, st)) is not None:
+                idx, frame, entry = batch[0]
+                pending[idx] = (frame, entry)
+                while next_idx in pending:
+                    frame, entry = pending.pop(next_idx)
+                    next_idx += 1
+                    outcome["detections"].append(entry)
+                    if on_frame is not None:
+                        try:
+                            on_frame(next_idx - 1, entry)
+                        except Exception as err:
+                            _LOGGER.debug("Frame callback failed: %s", err)
+                    if writer is None or "annotate" in errors:
+                        continue
+                    busy_start = time.perf_counter()
+                    try:
+                        repeat = repeats[next_idx - 1] if repeats and next_idx <= len(repeats) else 1
+                        await writer.write(frame, entry, repeat=repeat)
+                        st.items += 1
+                    except Exception as err:
+                        errors["annotate"] = str(err)
+                        await writer.abort()
+                    finally:
+                        st.busy_s += time.perf_counter() - busy_start
+            if writer is None or "annotate" in errors:
+                return
+            if "detect" in errors or not writer.frames_written:
+                await writer.abort()
+                return
+            busy_start = time.perf_counter()
+            try:
+                outcome["annotated_video"] = await writer.close()
+            except Exception as err:
+                errors["annotate"] = str(err)
+            finally:
+                st.busy_s += time.perf_counter() - busy_start
+        except BaseException:
+            if writer is not None:
+                await writer.abort()
+            raise
+
+    async def run_workers(worker: Any, count: int, outbox: asyncio.Queue) -> None:
+        await asyncio.gather(*(worker() for _ in range(count)))
+        await outbox.put(None)
+
+    coros = [extract()]
+    if detector is not None:
+        coros += [
+            run_workers(detect_worker, detect_workers, to_faces),
+            run_workers(face_worker, window, to_annotate),
+            annotate(),
+        ]
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    if detect_size is not None and outcome["frame_width"]:
+        outcome["analysis_stream"] = {"frame_width": outcome["frame_width"], "frame_height": outcome["frame_height"]}
+        _scale_boxes(
+            outcome["detections"],
+            video_size[0] / outcome["frame_width"], video_size[1] / outcome["frame_height"],
         )
-        _detect_ms = (time.perf_counter() - _detect_start) * 1000
-        _stats = _get_inference_stats()
-        if _stats:
-            _stats.record(device, _detect_ms, 1)
-        
-        if objects:
-            dets = [d for d in dets if d["label"] in objects]
-        
-        time_s = idx * interval_s
-        detections.append({"time_s": time_s, "objects": dets})
-        frame_w, frame_h = fw, fh
-    
-    return detections, frame_w, frame_h
+        outcome["frame_width"], outcome["frame_height"] = video_size
+    outcome["stages"] = {name: st.as_dict() for name, st in stats.items()}
+    return outcome
 
 
 async def analyze_recording(
@@ -1783,6 +2732,16 @@ async def analyze_recording(
     overlay_smoothing: bool = DEFAULT_OVERLAY_SMOOTHING,
     overlay_smoothing_alpha: float = DEFAULT_OVERLAY_SMOOTHING_ALPHA,
     face_multiscale: bool = True,
+    detector_batch_size: int = DEFAULT_DETECTOR_BATCH_SIZE,
+    detector_pipeline: bool = DEFAULT_DETECTOR_PIPELINE,
+    detector_transport: str = DEFAULT_DETECTOR_TRANSPORT,
+    pipeline_window: int = DEFAULT_ANALYSIS_PIPELINE_WINDOW,
+    frames: AsyncIterator[bytes] | None = None,
+    on_frame: Callable[[int, dict[str, Any]], None] | None = None,
+    full_res_ready: Callable[[], Awaitable[bool]] | None = None,
+    frame_budget: int | None = None,
+    video_ready: Callable[[], Awaitable[bool]] | None = None,
+    face_index: FaceIndex | None = None,
 ) -> dict:
     """Offline analysis stub: extracts frames and writes a results JSON.
 
@@ -1790,12 +2749,39 @@ async def analyze_recording(
     
     LOW-003 Fix: Default values now sourced from const.py.
     v1.2.0 Refactor: Extracted helper functions to reduce cyclomatic complexity.
+    Extraction, object detection, face detection and annotation run as
+    overlapping stages, see ``_run_analysis_pipeline``.
+    
+    v1.4.0: With ``frames`` (a ``LiveFrameFeed`` of the recording) the
+    analysis runs while video_path is still being recorded; ``on_frame``
+    receives every frame result as soon as it is complete.
+    
+    v1.4.0: Objects of videos larger than ANALYSIS_DETECT_MAX_SIDE are
+    detected on frames scaled during decoding; faces are searched in
+    full-resolution frames read only for frames with a person.
+    
+    v1.4.0: With ``frame_budget`` a file is sampled adaptively (see
+    ``frame_sampler``): densely where the keyframes show motion and next to
+    persons, sparsely elsewhere, with at most frame_budget frames.
+    
+    v1.4.0: ``full_res_ready`` marks ``frames`` as the camera's low-res
+    substream. It is awaited after the last frame and returns whether
+    video_path was recorded; boxes are then mapped to the video's resolution
+    and faces are embedded from full-resolution person crops (frames that
+    get faces are passed to ``on_frame`` again).
+    
+    v1.4.0: ``video_ready`` is awaited after the last live frame and returns
+    whether video_path was saved; its FPS is then probed for video_fps and
+    the annotated video.
+    
+    v1.4.0: ``face_index`` is the shared index of people_db (see
+    ``people_db._load_people_index``); it is built here when omitted or when
+    extra no_face_embeddings are given.
     """
     _safe_mkdir(output_root)
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     job_dir = os.path.join(output_root, f"analysis_{timestamp}")
-    frames_dir = os.path.join(job_dir, "frames")
-    _safe_mkdir(frames_dir)
+    _safe_mkdir(job_dir)
 
     video_size_mb = None
     if os.path.exists(video_path):
@@ -1823,6 +2809,7 @@ async def analyze_recording(
 
     result_path = os.path.join(job_dir, "result.json")
     await _write_json_async(result_path, result)
+    _index_analysis_result(output_root, job_dir, result)
 
     # v1.2.0 Refactor: Use helper functions for camera extraction and DB tracking
     extracted_camera = _extract_camera_from_path(video_path)
@@ -1837,95 +2824,154 @@ async def analyze_recording(
 
     try:
         start_time = time.monotonic()
-        frames = await extract_frames(video_path, frames_dir, interval_s)
-        duration_sec = round(time.monotonic() - start_time, 2)
-        
+
         # v1.2.3: Get original video FPS and store it
-        video_fps = await _get_video_fps(video_path)
+        # (a live analysis starts before the file exists and probes it once
+        # the recording is saved)
+        video_fps = await _get_video_fps(video_path) if frames is None else DEFAULT_VIDEO_FPS
         result["video_fps"] = video_fps
-        
-        result["frames"] = frames
-        result["frame_count"] = len(frames)
-        result["duration_sec"] = duration_sec
-        result["status"] = "frames_extracted"
-        await _write_json_async(result_path, result)
-
-        detections: list[dict[str, Any]] = []
-
-        # Run object detection on extracted frames (optional)
-        if frames and objects:
-            try:
-                # v1.2.0 Refactor: Use helper functions for object detection
+        recorded_fps: float | None = None
+
+        async def recorded_video_fps() -> float:
+            nonlocal recorded_fps
+            if recorded_fps is None:
+                recorded_fps = DEFAULT_VIDEO_FPS
+                if video_ready is not None and await video_ready():
+                    recorded_fps = await _get_video_fps(video_path)
+                result["video_fps"] = recorded_fps
+            return recorded_fps
+
+        # v1.4.0: Objects of a large video are detected on downscaled frames,
+        # only frames with a person are decoded again at full resolution
+        video_size = await _get_video_size(video_path) if frames is None and objects else None
+        if video_size is not None and _detection_frame_size(video_size) is None:
+            video_size = None
+
+        # v1.4.0: Adaptive sampling; the fixed interval stays if the video
+        # cannot be probed
+        sampling = None
+        if frame_budget and frames is None and objects:
+            sampling = await async_plan_sampling(video_path, interval_s, frame_budget)
+            if sampling is not None:
+                result["frame_interval"] = sampling.step
+                result["sampling"] = sampling.as_dict()
+
+        async with aiohttp.ClientSession() as session:
+            detector = None
+            face_detector = None
+            writer = None
+            # One matrix index of the people DB for every face of this run
+            if not face_enabled:
+                face_index = None
+            elif face_index is None or no_face_embeddings:
+                face_index = await asyncio.to_thread(FaceIndex, people_db, no_face_embeddings)
+
+            # Run object detection on extracted frames (optional)
+            if objects:
                 if detector_url:
-                    async with aiohttp.ClientSession() as session:
-                        detections, frame_w, frame_h = await _run_object_detection_remote(
-                            session=session,
-                            detector_url=detector_url,
-                            frames=frames,
-                            objects=objects,
-                            device=device,
-                            detector_confidence=detector_confidence,
-                            interval_s=interval_s,
+                    detector = _RemoteObjectDetector(
+                        session, detector_url, objects, device, detector_confidence, interval_s,
+                        batch_size=detector_batch_size, transport=detector_transport,
+                        stream_id=os.path.basename(video_path),
+                    )
+                    # Objects + faces in one detector call when both go to the same add-on
+                    # (not on substream or downscaled frames, faces need full resolution)
+                    if (face_enabled and detector_pipeline and full_res_ready is None and video_size is None
+                            and face_detector_url in (None, "", detector_url)):
+                        detector = _RemoteFramePipeline(
+                            session, detector_url, objects, device, detector_confidence,
+                            face_confidence, face_store_embeddings, people_db, face_match_threshold,
+                            no_face_embeddings, interval_s, face_multiscale=face_multiscale,
+                            fallback=detector, face_index=face_index,
                         )
                 else:
-                    detections, frame_w, frame_h = await _run_object_detection_local(
-                        frames=frames,
-                        objects=objects,
-                        device=device,
-                        detector_confidence=detector_confidence,
-                        interval_s=interval_s,
-                        output_root=output_root,
-                    )
-
-                result["detections"] = detections
-                result["frame_width"] = frame_w
-                result["frame_height"] = frame_h
-
+                    detector = _LocalObjectDetector(objects, device, detector_confidence, interval_s, output_root)
                 try:
-                    overlay_detections = detections
-                    if overlay_smoothing and detections:
-                        alpha = max(0.05, min(float(overlay_smoothing_alpha or DEFAULT_OVERLAY_SMOOTHING_ALPHA), 0.95))
-                        overlay_detections = _smooth_detections_for_overlay(detections, alpha)
-                        result["overlay_smoothing_alpha"] = alpha
-                    annotated_video = await _render_annotated_video(frames, overlay_detections, job_dir, interval_s, video_path)
-                    result["annotated_video"] = annotated_video
+                    await detector.open()
                 except Exception as e:
-                    result["annotated_video_error"] = str(e)
-            except Exception as e:
-                result["detection_error"] = str(e)
+                    result["detection_error"] = str(e)
+                    detector = None
 
-        # Run face detection + embeddings (optional)
-        # v1.2.0 Refactor: Extracted to helper function
-        if frames and face_enabled:
-            try:
+            # Run face detection + embeddings (optional)
+            if detector is not None and face_enabled:
                 face_url = face_detector_url or detector_url
-                if not face_url:
-                    raise RuntimeError("face detector url missing")
-
-                async with aiohttp.ClientSession() as session:
-                    faces_detected, faces_matched, fw, fh = await _run_face_detection_loop(
-                        session=session,
-                        face_url=face_url,
-                        frames=frames,
-                        detections=detections,
-                        device=device,
-                        face_confidence=face_confidence,
-                        face_store_embeddings=face_store_embeddings,
-                        people_db=people_db,
-                        face_match_threshold=face_match_threshold,
-                        no_face_embeddings=no_face_embeddings,
-                        interval_s=interval_s,
-                        face_multiscale=face_multiscale,
+                if face_url:
+                    face_detector = _RemoteFaceDetector(
+                        session, face_url, device, face_confidence, face_store_embeddings,
+                        people_db, face_match_threshold, no_face_embeddings,
+                        face_multiscale=face_multiscale, face_index=face_index,
                     )
+                else:
+                    result["face_detection_error"] = "face detector url missing"
+
+            if detector is not None:
+                smoothing_alpha = None
+                if overlay_smoothing:
+                    smoothing_alpha = max(0.05, min(float(overlay_smoothing_alpha or DEFAULT_OVERLAY_SMOOTHING_ALPHA), 0.95))
+                    result["overlay_smoothing_alpha"] = smoothing_alpha
+                writer = _AnnotatedVideoWriter(
+                    job_dir, sampling.step if sampling is not None else interval_s, video_fps, smoothing_alpha,
+                    fps_source=recorded_video_fps if frames is not None else None,
+                )
 
-                if fw and fh:
-                    result["frame_width"] = fw
-                    result["frame_height"] = fh
-                result["detections"] = detections
+            outcome = await _run_analysis_pipeline(
+                video_path=video_path,
+                interval_s=interval_s,
+                detector=detector,
+                face_detector=face_detector if full_res_ready is None else None,
+                writer=writer,
+                window=pipeline_window,
+                frames=frames,
+                on_frame=on_frame,
+                video_size=video_size,
+                sampling=sampling,
+            )
+            if sampling is not None and detector is not None and "detect" not in outcome["errors"]:
+                await _sample_person_neighbors(video_path, outcome, sampling, detector, face_detector)
+                result["sampling"]["person_frames"] = outcome["person_frames_added"]
+            if (full_res_ready is not None and detector is not None
+                    and "detect" not in outcome["errors"] and await full_res_ready()):
+                await _apply_full_resolution(video_path, outcome, face_detector, on_frame)
+
+        if frames is not None:
+            await recorded_video_fps()
+        result["frame_count"] = outcome["frame_count"]
+        result["duration_sec"] = outcome["extract_sec"]
+        result["pipeline_window"] = max(1, int(pipeline_window or 1))
+        result["pipeline_stages"] = outcome["stages"]
+        if frames is not None:
+            result["live"] = True
+        if outcome.get("analysis_stream"):
+            result["analysis_stream"] = outcome["analysis_stream"]
+
+        errors = outcome["errors"]
+        if "detect" in errors:
+            result["detection_error"] = errors["detect"]
+        elif detector is not None:
+            result["detections"] = outcome["detections"]
+            result["frame_width"] = outcome["frame_width"]
+            result["frame_height"] = outcome["frame_height"]
+            if outcome["annotated_video"]:
+                result["annotated_video"] = outcome["annotated_video"]
+            if "annotate" in errors:
+                result["annotated_video_error"] = errors["annotate"]
+
+            faces_detected = faces_matched = 0
+            if isinstance(detector, _RemoteFramePipeline) and detector.supported:
+                result["detector_pipeline"] = True
+                faces_detected += detector.faces_detected
+                faces_matched += detector.faces_matched
+            if face_detector is not None:
+                if face_detector.frame_w and face_detector.frame_h:
+                    result["frame_width"] = face_detector.frame_w
+                    result["frame_height"] = face_detector.frame_h
+                faces_detected += face_detector.faces_detected
+                faces_matched += face_detector.faces_matched
+            if "faces" in errors:
+                result["face_detection_error"] = errors["faces"]
+            elif face_enabled:
                 result["faces_detected"] = faces_detected
                 result["faces_matched"] = faces_matched
-            except Exception as e:
-                result["face_detection_error"] = str(e)
 
         # Mark analysis as completed successfully
         result["status"] = "completed"
@@ -1935,18 +2981,15 @@ async def analyze_recording(
         # v1.1.2: Update analysis run in SQLite with final stats
         await _finalize_analysis_run(analysis_run_id, result)
         
-        # v1.1.0n: Cleanup frames after successful analysis to save disk space
-        # Frames are only needed during detection, not afterwards
-        # v1.1.1 fix: Run blocking I/O in executor to avoid blocking event loop
-        try:
-            if os.path.isdir(frames_dir):
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(None, shutil.rmtree, frames_dir)
-                result["frames_cleaned"] = True
-        except OSError as cleanup_err:
-            result["frames_cleanup_error"] = str(cleanup_err)
+        # v1.4.0: Embeddings/thumbnails go to faces.npy + faces/*.jpg sidecars
+        if result.get("detections"):
+            try:
+                await asyncio.to_thread(externalize_face_data, job_dir, result["detections"])
+            except OSError as e:
+                _LOGGER.warning("Keeping face data inline in %s: %s", result_path, e)
         
         await _write_json_async(result_path, result)
+        _index_analysis_result(output_root, job_dir, result)
         return result
     except asyncio.CancelledError:
         result["status"] = "cancelled"
@@ -1954,6 +2997,7 @@ async def analyze_recording(
         # v1.2.0: Use helper function for DB update
         _update_analysis_run_error(analysis_run_id, "cancelled", "analysis_cancelled")
         await _write_json_async(result_path, result)
+        _index_analysis_result(output_root, job_dir, result)
         raise
     except Exception as e:
         result["status"] = "error"
@@ -1961,4 +3005,5 @@ async def analyze_recording(
         # v1.2.0: Use helper function for DB update
         _update_analysis_run_error(analysis_run_id, "error", str(e))
         await _write_json_async(result_path, result)
+        _index_analysis_result(output_root, job_dir, result)
         return result
@@ -2,21 +2,114 @@
 
 This module contains utility functions for analysis results:
 - Reading and parsing analysis results
-- Building analysis index
+- Building analysis index (SQLite analysis_index, v1.4.0)
 - Summarizing analysis statistics
 - Re-matching faces after people DB updates
 """
 import asyncio
 import json
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
-from .face_matching import _match_face_simple
+from .database import get_database
+from .face_matching import FaceIndex
+from .face_rematch import get_face_history_store, rematch_job_files
+from .face_sidecar import apply_face_match_deltas, hydrate_face_data
+
+_LOGGER = logging.getLogger(__name__)
+
+# Parallel result.json readers used by the index importer
+ANALYSIS_INDEX_IMPORT_WORKERS = 8
+
+# Output directories whose analysis_index rows are complete. Until the startup
+# import has run for a directory, reads fall back to scanning the folders.
+_indexed_output_dirs: set[str] = set()
+
+
+def _get_index_db(output_dir: str):
+    """Database with a complete analysis index for output_dir, or None."""
+    if output_dir not in _indexed_output_dirs:
+        return None
+    try:
+        return get_database()
+    except Exception as e:
+        _LOGGER.debug("Analysis index unavailable: %s", e)
+        return None
+
+
+def _analysis_index_ready(output_dir: str) -> bool:
+    """Whether the analysis index of output_dir has been fully imported."""
+    return output_dir in _indexed_output_dirs
+
+
+def _load_result_json(result_path: str) -> dict[str, Any] | None:
+    """Load one result.json, None if missing or unreadable."""
+    try:
+        with open(result_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def _sync_analysis_index(output_dir: str, max_workers: int = ANALYSIS_INDEX_IMPORT_WORKERS) -> dict[str, int]:
+    """Bring the SQLite analysis index in line with the result folders.
+    
+    Imports folders that are not indexed yet (reading result.json files in
+    parallel) and drops rows whose folder is gone. The first run imports all
+    existing results; later runs only touch the difference.
+    
+    Args:
+        output_dir: Directory containing analysis_* subdirectories
+        max_workers: Parallel result.json readers
+        
+    Returns:
+        Dict with imported and pruned counts
+    """
+    try:
+        return _sync_analysis_index_unsafe(output_dir, max_workers)
+    except Exception as e:
+        _LOGGER.warning("Analysis index sync failed for %s: %s", output_dir, e)
+        return {"imported": 0, "pruned": 0}
+
+
+def _sync_analysis_index_unsafe(output_dir: str, max_workers: int) -> dict[str, int]:
+    """Body of _sync_analysis_index; raises on database errors."""
+    db = get_database()
+    on_disk = set()
+    if os.path.exists(output_dir):
+        for name in os.listdir(output_dir):
+            if name.startswith("analysis_"):
+                job_dir = os.path.join(output_dir, name)
+                if os.path.exists(os.path.join(job_dir, "result.json")):
+                    on_disk.add(job_dir)
+    
+    indexed = db.get_indexed_analysis_paths(output_dir)
+    stale = sorted(indexed - on_disk)
+    if stale:
+        db.delete_analysis_index_entries(stale)
+    
+    missing = sorted(on_disk - indexed)
+    imported = 0
+    if missing:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            loaded = pool.map(_load_result_json, [os.path.join(d, "result.json") for d in missing])
+            entries = [(job_dir, data) for job_dir, data in zip(missing, loaded) if isinstance(data, dict)]
+        imported = max(0, db.upsert_analysis_index(output_dir, entries))
+    
+    _indexed_output_dirs.add(output_dir)
+    if imported or stale:
+        _LOGGER.info("Analysis index synced: %d imported, %d pruned", imported, len(stale))
+    return {"imported": imported, "pruned": len(stale)}
 
 
 def _read_analysis_results(output_dir: str, limit: int = 50, page: int = 1, per_page: int = 0) -> dict[str, Any]:
     """Read analysis results from output directory with pagination support.
     
+    Served from the SQLite analysis index (summaries without per-frame
+    detections); scans the folders until the index has been imported.
+    
     Args:
         output_dir: Directory containing analysis_* subdirectories
         limit: Maximum number of results to return (legacy, ignored if per_page > 0)
@@ -26,6 +119,26 @@ def _read_analysis_results(output_dir: str, limit: int = 50, page: int = 1, per_
     Returns:
         Dict with items, total, page, per_page, total_pages keys
     """
+    db = _get_index_db(output_dir)
+    if db is not None:
+        try:
+            if per_page > 0:
+                total = db.get_analysis_index_page(output_dir, 0)[1]
+                total_pages = (total + per_page - 1) // per_page
+                page = max(1, min(page, total_pages)) if total_pages > 0 else 1
+                items, total = db.get_analysis_index_page(output_dir, per_page, (page - 1) * per_page)
+                return {
+                    "items": items,
+                    "total": total,
+                    "page": page,
+                    "per_page": per_page,
+                    "total_pages": total_pages
+                }
+            items, total = db.get_analysis_index_page(output_dir, limit)
+            return {"items": items, "total": total, "page": 1, "per_page": limit, "total_pages": 1}
+        except Exception as e:
+            _LOGGER.warning("Analysis index query failed, scanning folders: %s", e)
+    
     if not os.path.exists(output_dir):
         return {"items": [], "total": 0, "page": 1, "per_page": per_page or limit, "total_pages": 0}
     
@@ -87,21 +200,64 @@ def _read_analysis_results_legacy(output_dir: str, limit: int = 50) -> list[dict
     return result.get("items", [])
 
 
-def _find_analysis_for_video(output_dir: str, video_path: str) -> dict[str, Any] | None:
+def _find_analysis_for_video(output_dir: str, video_path: str, load_faces: bool = False) -> dict[str, Any] | None:
     """Find analysis result for a specific video file.
     
     Args:
         output_dir: Directory containing analysis results
         video_path: Path to the video file
+        load_faces: Restore face embeddings/thumbnails from the sidecar files
         
     Returns:
         Analysis result dict or None if not found
     """
-    result = _read_analysis_results(output_dir, limit=200)
-    for item in result.get("items", []):
-        if item.get("video_path") == video_path:
-            return item
-    return None
+    found = None
+    db = _get_index_db(output_dir)
+    if db is not None:
+        try:
+            stale = []
+            for job_dir in db.get_analysis_paths_for_video(output_dir, video_path):
+                data = _load_result_json(os.path.join(job_dir, "result.json"))
+                if data is None:
+                    stale.append(job_dir)
+                    continue
+                found = (job_dir, data)
+                break
+            if stale:
+                db.delete_analysis_index_entries(stale)
+            if found is None:
+                return None
+        except Exception as e:
+            _LOGGER.warning("Analysis index lookup failed, scanning folders: %s", e)
+    
+    if found is None:
+        found = _scan_analysis_for_video(output_dir, video_path)
+        if found is None:
+            return None
+    
+    job_dir, data = found
+    data.pop("frames", None)
+    apply_face_match_deltas(job_dir, data.get("detections") or [])
+    if load_faces:
+        hydrate_face_data(job_dir, data.get("detections") or [])
+    return data
+
+
+def _scan_analysis_for_video(output_dir: str, video_path: str) -> tuple[str, dict[str, Any]] | None:
+    """Newest (job_dir, result) of a video by reading every result.json."""
+    if not os.path.exists(output_dir):
+        return None
+    best = None
+    for name in os.listdir(output_dir):
+        if not name.startswith("analysis_"):
+            continue
+        job_dir = os.path.join(output_dir, name)
+        data = _load_result_json(os.path.join(job_dir, "result.json"))
+        if not isinstance(data, dict) or data.get("video_path") != video_path:
+            continue
+        if best is None or data.get("created_utc", "") > best[1].get("created_utc", ""):
+            best = (job_dir, data)
+    return best
 
 
 def _build_analysis_index(output_dir: str) -> set[str]:
@@ -113,6 +269,13 @@ def _build_analysis_index(output_dir: str) -> set[str]:
     Returns:
         Set of video file paths
     """
+    db = _get_index_db(output_dir)
+    if db is not None:
+        try:
+            return db.get_indexed_video_paths(output_dir)
+        except Exception as e:
+            _LOGGER.warning("Analysis index query failed, scanning folders: %s", e)
+    
     existing = set()
     result = _read_analysis_results(output_dir, limit=10000)
     for item in result.get("items", []):
@@ -156,100 +319,52 @@ async def _update_all_face_matches(
     output_dir: str, 
     people: list[dict[str, Any]], 
     threshold: float = 0.6,
-    max_analyses: int = 100
+    changed_person_ids: list[Any] | None = None,
+    face_index: FaceIndex | None = None,
 ) -> int:
-    """Re-match all faces in existing analysis results against updated people database.
+    """Re-match faces in existing analysis results against updated people database.
     
     This is called after adding/removing people or embeddings to update
     historical analysis results with correct face matches.
     
-    Optimizations:
-    - Only processes the most recent N analyses (configurable via max_analyses)
-    - Uses parallel file I/O for better performance
-    - Skips analyses with no faces
+    v1.4.0: Covers all results (not just the newest 100). The embeddings of
+    every result are kept in a shared FaceHistoryStore; only faces whose best
+    match could have changed through the edited people are re-matched, and
+    changes are written to small face_matches.json files instead of
+    rewriting result.json.
     
     Args:
         output_dir: Directory containing analysis results
         people: Current people database list
         threshold: Minimum similarity threshold for matches
-        max_analyses: Maximum number of analysis files to process (newest first)
+        changed_person_ids: Edited people (None re-matches every face)
+        face_index: Shared index of people (built per call when omitted)
     
     Returns:
-        The number of updated result files
+        The number of updated results
     """
     if not os.path.exists(output_dir):
         return 0
     
-    # Collect analysis directories with modification times
-    def _get_analysis_dirs():
-        dirs = []
-        for name in os.listdir(output_dir):
-            if not name.startswith("analysis_"):
-                continue
-            job_dir = os.path.join(output_dir, name)
-            result_path = os.path.join(job_dir, "result.json")
-            if os.path.exists(result_path):
-                try:
-                    mtime = os.path.getmtime(result_path)
-                    dirs.append((result_path, mtime))
-                except OSError:
-                    continue
-        # Sort by modification time (newest first) and limit
-        dirs.sort(key=lambda x: x[1], reverse=True)
-        return [d[0] for d in dirs[:max_analyses]]
+    job_dirs = await asyncio.to_thread(_list_analysis_dirs, output_dir)
+    store = get_face_history_store(output_dir)
+    if store is None:
+        return await asyncio.to_thread(rematch_job_files, job_dirs, people, threshold, face_index)
     
-    analysis_files = await asyncio.to_thread(_get_analysis_dirs)
-    
-    if not analysis_files:
-        return 0
-    
-    updated_count = 0
-    
-    def _process_single_file(result_path: str) -> bool:
-        """Process a single analysis file. Returns True if modified."""
+    await asyncio.to_thread(store.sync, job_dirs)
+    return await asyncio.to_thread(store.rematch, people, threshold, changed_person_ids, face_index)
+
+
+def _list_analysis_dirs(output_dir: str) -> list[str]:
+    """All analysis folders of output_dir (from the index when available)."""
+    db = _get_index_db(output_dir)
+    if db is not None:
         try:
-            with open(result_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            
-            modified = False
-            detections = data.get("detections", [])
-            
-            for detection in detections:
-                faces = detection.get("faces", [])
-                for face in faces:
-                    embedding = face.get("embedding")
-                    if not embedding or not isinstance(embedding, list):
-                        continue
-                    try:
-                        emb_list = [float(v) for v in embedding]
-                    except (TypeError, ValueError):
-                        continue
-                    
-                    # Re-match this face
-                    new_match = _match_face_simple(emb_list, people, threshold)
-                    old_match = face.get("match")
-                    
-                    # Update if match changed
-                    if new_match != old_match:
-                        if new_match:
-                            face["match"] = new_match
-                        elif "match" in face:
-                            del face["match"]
-                        modified = True
-            
-            if modified:
-                with open(result_path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
-                return True
-            return False
-                
-        except Exception:
-            return False
-    
-    # Process files (one at a time to avoid disk thrashing)
-    for result_path in analysis_files:
-        was_modified = await asyncio.to_thread(_process_single_file, result_path)
-        if was_modified:
-            updated_count += 1
-    
-    return updated_count
+            return sorted(db.get_indexed_analysis_paths(output_dir))
+        except Exception as e:
+            _LOGGER.debug("Analysis index unavailable, listing folders: %s", e)
+    return sorted(
+        os.path.join(output_dir, name)
+        for name in os.listdir(output_dir)
+        if name.startswith("analysis_")
+    )
@@ -40,6 +40,7 @@ from typing import Any, Iterable
 
 try:
     from .const import (
+        DEFAULT_ANALYSIS_FRAME_BUDGET,
         DEFAULT_ANALYSIS_FRAME_INTERVAL,
         DEFAULT_DETECTOR_CONFIDENCE,
         DEFAULT_FACE_CONFIDENCE,
@@ -49,6 +50,7 @@ try:
     )
 except ImportError:  # pragma: no cover - fallback for direct module import in tests
     from const import (
+        DEFAULT_ANALYSIS_FRAME_BUDGET,
         DEFAULT_ANALYSIS_FRAME_INTERVAL,
         DEFAULT_DETECTOR_CONFIDENCE,
         DEFAULT_FACE_CONFIDENCE,
@@ -92,7 +94,7 @@ class PerCameraField:
         prefix: The per-camera key prefix; the stored key is
             ``f"{prefix}{camera_key(name)}"`` (e.g. ``detector_confidence_Garten_vorne``).
         default: Default used when neither a per-camera nor a global value exists.
-        kind: One of ``"float"``, ``"int"``, ``"bool"``, ``"list"``.
+        kind: One of ``"float"``, ``"int"``, ``"bool"``, ``"list"``, ``"str"``.
         sentinel_zero_is_global: When True (legacy fields), a stored value of 0 / 0.0
             / empty means "fall back to global" and such a value is never written
             (the key is removed instead). New fields use explicit presence instead:
@@ -113,6 +115,8 @@ class PerCameraField:
 # The 4 legacy per-camera fields keep their exact prefixes and 0/empty=global
 # semantics (existing stored values must keep working). The 4 new fields use
 # explicit presence (absent key = use global) which avoids the ambiguous-zero bug.
+# v1.4.0: ``analysis_rtsp_url`` has no global value; an empty string means the
+# camera has no analysis substream.
 PER_CAMERA_FIELDS: tuple[PerCameraField, ...] = (
     # --- legacy (already had per-camera overrides) ---
     PerCameraField("analysis_objects", "analysis_objects_", ["person"], "list"),
@@ -130,6 +134,11 @@ PER_CAMERA_FIELDS: tuple[PerCameraField, ...] = (
                    DEFAULT_FACE_MULTISCALE, "bool"),
     PerCameraField("analysis_overlay_smoothing", "overlay_smoothing_",
                    DEFAULT_OVERLAY_SMOOTHING, "bool"),
+    # v1.4.0: low-res substream for live analysis and snapshots
+    PerCameraField("analysis_rtsp_url", "analysis_rtsp_url_", "", "str"),
+    # v1.4.0: frame budget per clip for adaptive sampling
+    PerCameraField("analysis_frame_budget", "frame_budget_",
+                   DEFAULT_ANALYSIS_FRAME_BUDGET, "int"),
 )
 
 # All per-camera key prefixes that belong to a camera and must be removed when a
@@ -245,6 +254,8 @@ def _is_unset(value: Any, field: PerCameraField) -> bool:
         return True
     if field.kind == "list":
         return not value  # empty list / empty == use global
+    if field.kind == "str":
+        return not str(value).strip()
     if field.sentinel_zero_is_global:
         try:
             return float(value) <= 0
@@ -261,6 +272,8 @@ def _coerce(value: Any, field: PerCameraField) -> Any:
         return float(value)
     if field.kind == "bool":
         return bool(value)
+    if field.kind == "str":
+        return str(value).strip()
     return value  # list / passthrough
 
 
@@ -280,7 +293,7 @@ def resolve(config: dict, global_key: str, camera: str) -> Any:
         return _coerce(cam_val, field)
 
     glob_val = config.get(global_key)
-    if glob_val is not None and not (field.kind == "list" and not glob_val):
+    if glob_val is not None and not (field.kind in ("list", "str") and not glob_val):
         return _coerce(glob_val, field)
 
     return field.default
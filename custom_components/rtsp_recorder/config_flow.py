@@ -189,6 +189,9 @@ class RtspRecorderOptionsFlow(config_entries.OptionsFlow):
                 self.config_cache["retention_days"] = user_input.get("retention_days", 7)
                 self.config_cache["snapshot_retention_days"] = user_input.get("snapshot_retention_days", 7)
                 self.config_cache["cleanup_interval_hours"] = user_input.get("cleanup_interval_hours", 24)
+                self.config_cache["rtsp_single_session"] = user_input.get("rtsp_single_session", True)
+                self.config_cache["pre_record_memory_mb"] = int(user_input.get("pre_record_memory_mb", 256))
+                self.config_cache["max_clip_seconds"] = int(user_input.get("max_clip_seconds", 900))
                 
                 selected = user_input.get("camera_selection")
                 analysis_configure = user_input.get("analysis_configure", False)
@@ -211,6 +214,9 @@ class RtspRecorderOptionsFlow(config_entries.OptionsFlow):
         vid_days = self.config_cache.get("retention_days", 7)
         snap_days = self.config_cache.get("snapshot_retention_days", 7)
         cleanup_interval = self.config_cache.get("cleanup_interval_hours", 24)
+        single_session = self.config_cache.get("rtsp_single_session", True)
+        pre_record_memory = self.config_cache.get("pre_record_memory_mb", 256)
+        max_clip = self.config_cache.get("max_clip_seconds", 900)
         
         # Check allowlist status for description
         is_allowed = self._check_allowlist(storage)
@@ -257,6 +263,21 @@ class RtspRecorderOptionsFlow(config_entries.OptionsFlow):
                     unit_of_measurement="Std"
                 )
             ),
+            vol.Optional("rtsp_single_session", default=single_session): selector.BooleanSelector(),
+            vol.Optional("pre_record_memory_mb", default=pre_record_memory): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=32, max=2048, step=32,
+                    mode=selector.NumberSelectorMode.BOX,
+                    unit_of_measurement="MB"
+                )
+            ),
+            vol.Optional("max_clip_seconds", default=max_clip): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=60, max=3600, step=60,
+                    mode=selector.NumberSelectorMode.BOX,
+                    unit_of_measurement="Sek"
+                )
+            ),
             vol.Optional("camera_selection", default="__NONE__"): selector.SelectSelector(
                 selector.SelectSelectorConfig(
                     options=cam_options,
@@ -290,6 +311,7 @@ class RtspRecorderOptionsFlow(config_entries.OptionsFlow):
         key_sensor_legacy = f"sensor_{safe_name}"  # Legacy single sensor
         key_duration = f"duration_{safe_name}"
         key_delay = f"snapshot_delay_{safe_name}"
+        key_pre_record = f"pre_record_seconds_{safe_name}"  # v1.4.0: Pre-Record-Puffer
         key_retention = f"retention_hours_{safe_name}"
         key_rtsp = f"rtsp_url_{safe_name}"
         key_objects = f"analysis_objects_{safe_name}"  # v1.0.6: Pro-Kamera Objekt-Filter
@@ -302,6 +324,8 @@ class RtspRecorderOptionsFlow(config_entries.OptionsFlow):
         key_face_enabled = f"face_enabled_{safe_name}"
         key_face_multiscale = f"face_multiscale_{safe_name}"
         key_overlay = f"overlay_smoothing_{safe_name}"
+        key_analysis_rtsp = f"analysis_rtsp_url_{safe_name}"  # v1.4.0: Analyse-Substream
+        key_frame_budget = f"frame_budget_{safe_name}"  # v1.4.0: adaptive Abtastung
 
         if user_input is not None:
             # Save sensors (list of trigger entities)
@@ -320,12 +344,26 @@ class RtspRecorderOptionsFlow(config_entries.OptionsFlow):
             # Save snapshot delay
             self.config_cache[key_delay] = int(user_input.get("snapshot_delay", 0))
 
+            # v1.4.0: Save pre-record time (only if > 0, needs an RTSP URL)
+            pre_record = int(user_input.get("pre_record_seconds", 0))
+            if pre_record > 0:
+                self.config_cache[key_pre_record] = pre_record
+            elif key_pre_record in self.config_cache:
+                del self.config_cache[key_pre_record]
+
             # Save RTSP URL override (optional)
             rtsp_url = (user_input.get("rtsp_url") or "").strip()
             if rtsp_url:
                 self.config_cache[key_rtsp] = rtsp_url
             elif key_rtsp in self.config_cache:
                 del self.config_cache[key_rtsp]
+
+            # v1.4.0: Save analysis substream URL (optional)
+            analysis_rtsp = (user_input.get("analysis_rtsp_url") or "").strip()
+            if analysis_rtsp:
+                self.config_cache[key_analysis_rtsp] = analysis_rtsp
+            elif key_analysis_rtsp in self.config_cache:
+                del self.config_cache[key_analysis_rtsp]
             
             # Save retention override (only if > 0)
             retention = float(user_input.get("camera_retention", 0))
@@ -370,6 +408,16 @@ class RtspRecorderOptionsFlow(config_entries.OptionsFlow):
             elif key_frame_interval in self.config_cache:
                 del self.config_cache[key_frame_interval]
 
+            # v1.4.0: Frame-Budget (0 = global, sonst gespeichert)
+            try:
+                fb = int(user_input.get("camera_frame_budget", 0) or 0)
+            except (TypeError, ValueError):
+                fb = 0
+            if fb > 0:
+                self.config_cache[key_frame_budget] = fb
+            elif key_frame_budget in self.config_cache:
+                del self.config_cache[key_frame_budget]
+
             # v1.4.0: 3-Status-Bool-Felder (global=loeschen, on/off=True/False)
             for _field, _key in (
                 ("camera_face_enabled", key_face_enabled),
@@ -400,8 +448,10 @@ class RtspRecorderOptionsFlow(config_entries.OptionsFlow):
         
         cur_duration = self.config_cache.get(key_duration, 120)
         cur_delay = self.config_cache.get(key_delay, 0)
+        cur_pre_record = self.config_cache.get(key_pre_record, 0)
         cur_retention = self.config_cache.get(key_retention, 0)
         cur_rtsp = self.config_cache.get(key_rtsp, "")
+        cur_analysis_rtsp = self.config_cache.get(key_analysis_rtsp, "")
         
         # v1.0.6: Camera-specific object filter (falls back to global)
         global_objects = self.config_cache.get("analysis_objects", ["person"])
@@ -413,6 +463,7 @@ class RtspRecorderOptionsFlow(config_entries.OptionsFlow):
         cur_face_threshold = self.config_cache.get(key_face_threshold, 0)
         # v1.4.0: aktuelle per-cam-Werte; Bool-Felder als 3-Status (global/on/off)
         cur_frame_interval = self.config_cache.get(key_frame_interval, 0)  # 0 = global
+        cur_frame_budget = self.config_cache.get(key_frame_budget, 0)  # 0 = global
         cur_face_enabled = ("on" if self.config_cache.get(key_face_enabled) else "off") if key_face_enabled in self.config_cache else "global"
         cur_face_multiscale = ("on" if self.config_cache.get(key_face_multiscale) else "off") if key_face_multiscale in self.config_cache else "global"
         cur_overlay = ("on" if self.config_cache.get(key_overlay) else "off") if key_overlay in self.config_cache else "global"
@@ -473,9 +524,19 @@ class RtspRecorderOptionsFlow(config_entries.OptionsFlow):
                     unit_of_measurement="Sek"
                 )
             ),
+            vol.Optional("pre_record_seconds", default=cur_pre_record): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0, max=30, step=1,
+                    mode=selector.NumberSelectorMode.SLIDER,
+                    unit_of_measurement="Sek"
+                )
+            ),
             vol.Optional("rtsp_url", default=cur_rtsp): selector.TextSelector(
                 selector.TextSelectorConfig(type=selector.TextSelectorType.TEXT)
             ),
+            vol.Optional("analysis_rtsp_url", default=cur_analysis_rtsp): selector.TextSelector(
+                selector.TextSelectorConfig(type=selector.TextSelectorType.TEXT)
+            ),
             vol.Optional("camera_retention", default=float(cur_retention)): selector.NumberSelector(
                 selector.NumberSelectorConfig(
                     min=0, max=168, step=0.5,
@@ -501,6 +562,9 @@ class RtspRecorderOptionsFlow(config_entries.OptionsFlow):
             vol.Optional("camera_frame_interval", default=cur_frame_interval): selector.NumberSelector(
                 selector.NumberSelectorConfig(min=0, max=10, step=1, mode=selector.NumberSelectorMode.SLIDER)
             ),
+            vol.Optional("camera_frame_budget", default=cur_frame_budget): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0, max=600, step=10, mode=selector.NumberSelectorMode.SLIDER)
+            ),
             vol.Optional("camera_face_enabled", default=cur_face_enabled): selector.SelectSelector(
                 selector.SelectSelectorConfig(options=tri_options, mode=selector.SelectSelectorMode.DROPDOWN)
             ),
@@ -662,6 +726,10 @@ class RtspRecorderOptionsFlow(config_entries.OptionsFlow):
                 self.config_cache["analysis_max_concurrent"] = int(user_input.get("analysis_max_concurrent", 2))
                 self.config_cache["analysis_detector_url"] = (user_input.get("analysis_detector_url") or "").strip()
                 self.config_cache["analysis_detector_confidence"] = float(user_input.get("analysis_detector_confidence", 0.4))
+                self.config_cache["analysis_detector_batch_size"] = int(user_input.get("analysis_detector_batch_size", 8))
+                self.config_cache["analysis_detector_pipeline"] = bool(user_input.get("analysis_detector_pipeline", True))
+                self.config_cache["analysis_detector_transport"] = user_input.get("analysis_detector_transport", "jpeg")
+                self.config_cache["analysis_pipeline_window"] = int(user_input.get("analysis_pipeline_window", 2))
                 # Face Detection Settings (v1.0.7)
                 self.config_cache["analysis_face_enabled"] = bool(user_input.get("analysis_face_enabled", False))
                 self.config_cache["analysis_face_confidence"] = float(user_input.get("analysis_face_confidence", 0.2))
@@ -679,6 +747,9 @@ class RtspRecorderOptionsFlow(config_entries.OptionsFlow):
                 self.config_cache["analysis_auto_limit"] = auto_limit
                 self.config_cache["analysis_auto_skip_existing"] = bool(user_input.get("analysis_auto_skip_existing", True))
                 self.config_cache["analysis_auto_new"] = auto_new
+                self.config_cache["analysis_live_enabled"] = bool(user_input.get("analysis_live_enabled", False))
+                self.config_cache["analysis_adaptive_sampling"] = bool(user_input.get("analysis_adaptive_sampling", False))
+                self.config_cache["analysis_frame_budget"] = int(user_input.get("analysis_frame_budget", 60))
                 self.config_cache["analysis_perf_cpu_entity"] = user_input.get("analysis_perf_cpu_entity")
                 self.config_cache["analysis_perf_igpu_entity"] = user_input.get("analysis_perf_igpu_entity")
                 self.config_cache["analysis_perf_coral_entity"] = user_input.get("analysis_perf_coral_entity")
@@ -756,11 +827,18 @@ class RtspRecorderOptionsFlow(config_entries.OptionsFlow):
         cur_auto_limit = int(self.config_cache.get("analysis_auto_limit", 50))
         cur_auto_skip_existing = bool(self.config_cache.get("analysis_auto_skip_existing", True))
         cur_auto_new = bool(self.config_cache.get("analysis_auto_new", False))
+        cur_live = bool(self.config_cache.get("analysis_live_enabled", False))
+        cur_adaptive = bool(self.config_cache.get("analysis_adaptive_sampling", False))
+        cur_frame_budget = int(self.config_cache.get("analysis_frame_budget", 60))
         cur_perf_cpu = self.config_cache.get("analysis_perf_cpu_entity")
         cur_perf_igpu = self.config_cache.get("analysis_perf_igpu_entity")
         cur_perf_coral = self.config_cache.get("analysis_perf_coral_entity")
         cur_detector_url = self.config_cache.get("analysis_detector_url", "")
         cur_detector_conf = float(self.config_cache.get("analysis_detector_confidence", 0.4))
+        cur_detector_batch = int(self.config_cache.get("analysis_detector_batch_size", 8))
+        cur_detector_pipeline = bool(self.config_cache.get("analysis_detector_pipeline", True))
+        cur_detector_transport = self.config_cache.get("analysis_detector_transport", "jpeg")
+        cur_pipeline_window = int(self.config_cache.get("analysis_pipeline_window", 2))
         # Face Detection Settings (v1.0.7)
         cur_face_enabled = bool(self.config_cache.get("analysis_face_enabled", False))
         cur_face_confidence = float(self.config_cache.get("analysis_face_confidence", 0.2))
@@ -784,6 +862,10 @@ class RtspRecorderOptionsFlow(config_entries.OptionsFlow):
             vol.Required("analysis_frame_interval", default=cur_interval): selector.NumberSelector(
                 selector.NumberSelectorConfig(min=1, max=10, step=1, mode=selector.NumberSelectorMode.SLIDER, unit_of_measurement="Sek")
             ),
+            vol.Optional("analysis_adaptive_sampling", default=cur_adaptive): selector.BooleanSelector(),
+            vol.Optional("analysis_frame_budget", default=cur_frame_budget): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=10, max=600, step=10, mode=selector.NumberSelectorMode.BOX)
+            ),
             vol.Required("analysis_max_concurrent", default=cur_max_concurrent): selector.NumberSelector(
                 selector.NumberSelectorConfig(min=1, max=10, step=1, mode=selector.NumberSelectorMode.SLIDER)
             ),
@@ -793,6 +875,23 @@ class RtspRecorderOptionsFlow(config_entries.OptionsFlow):
             vol.Required("analysis_detector_confidence", default=cur_detector_conf): selector.NumberSelector(
                 selector.NumberSelectorConfig(min=0.1, max=0.9, step=0.05, mode=selector.NumberSelectorMode.SLIDER)
             ),
+            vol.Required("analysis_detector_batch_size", default=cur_detector_batch): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=1, max=32, step=1, mode=selector.NumberSelectorMode.SLIDER)
+            ),
+            vol.Required("analysis_detector_pipeline", default=cur_detector_pipeline): selector.BooleanSelector(),
+            vol.Required("analysis_detector_transport", default=cur_detector_transport): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=[
+                        {"value": "jpeg", "label": "JPEG (Standard)"},
+                        {"value": "raw", "label": "Raw RGB (gleicher Host)"},
+                        {"value": "shm", "label": "Shared Memory (/dev/shm)"},
+                    ],
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            vol.Required("analysis_pipeline_window", default=cur_pipeline_window): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=1, max=8, step=1, mode=selector.NumberSelectorMode.SLIDER)
+            ),
             # Face Detection Settings (v1.0.7)
             vol.Required("analysis_face_enabled", default=cur_face_enabled): selector.BooleanSelector(),
             vol.Required("analysis_face_confidence", default=cur_face_confidence): selector.NumberSelector(
@@ -809,6 +908,7 @@ class RtspRecorderOptionsFlow(config_entries.OptionsFlow):
             vol.Required("person_entities_enabled", default=cur_person_entities): selector.BooleanSelector(),
             vol.Required("analysis_auto_enabled", default=cur_auto_enabled): selector.BooleanSelector(),
             vol.Required("analysis_auto_new", default=cur_auto_new): selector.BooleanSelector(),
+            vol.Optional("analysis_live_enabled", default=cur_live): selector.BooleanSelector(),
             vol.Required("analysis_auto_mode", default=cur_auto_mode): selector.SelectSelector(
                 selector.SelectSelectorConfig(
                     options=[
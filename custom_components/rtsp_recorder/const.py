@@ -30,6 +30,16 @@ MAX_PERSON_NAME_LENGTH = 100
 # Allow letters, numbers, spaces, hyphens, dots, apostrophes, German umlauts
 VALID_NAME_PATTERN = re.compile(r"^[\w\s\-\.'\u00e4\u00f6\u00fc\u00c4\u00d6\u00dc\u00df]+$")
 
+# ===== Recording =====
+# v1.4.0: Record, snapshot and timeline preview from one RTSP session
+DEFAULT_RTSP_SINGLE_SESSION = True
+# v1.4.0: Pre-record ring buffer (per camera seconds, shared memory budget)
+DEFAULT_PRE_RECORD_SECONDS = 0  # Disabled by default
+MAX_PRE_RECORD_SECONDS = 30
+DEFAULT_PRE_RECORD_MEMORY_MB = 256
+# v1.4.0: Motion re-triggers extend a running clip up to this length
+DEFAULT_MAX_CLIP_SECONDS = 900
+
 # ===== Analysis Defaults =====
 DEFAULT_STORAGE_PATH = "/media/rtsp_recordings"
 DEFAULT_SNAPSHOT_PATH = "/config/www/thumbnails"
@@ -37,6 +47,14 @@ DEFAULT_RETENTION_DAYS = 7
 DEFAULT_SNAPSHOT_RETENTION_DAYS = 7
 DEFAULT_ANALYSIS_FRAME_INTERVAL = 2
 DEFAULT_DETECTOR_CONFIDENCE = 0.4
+DEFAULT_DETECTOR_BATCH_SIZE = 8  # Frames per /detect_batch request (1 = one request per frame)
+DEFAULT_DETECTOR_PIPELINE = True  # Objects + faces in one /analyze_frame call per frame
+DEFAULT_DETECTOR_TRANSPORT = "jpeg"  # jpeg | raw | shm - raw/shm send model-sized RGB frames (same host)
+DEFAULT_ANALYSIS_PIPELINE_WINDOW = 2  # Detector requests in flight per analysis pipeline stage
+DEFAULT_ANALYSIS_LIVE_ENABLED = False  # v1.4.0: Analyze sampled frames of RTSP recordings while they record
+DEFAULT_ANALYSIS_ADAPTIVE_SAMPLING = False  # v1.4.0: Sample motion densely, quiet stretches sparsely
+DEFAULT_ANALYSIS_FRAME_BUDGET = 60  # v1.4.0: Max analyzed frames per clip with adaptive sampling
+DETECTOR_SHM_DIR = "/dev/shm/rtsp_recorder"  # Must match DETECTOR_SHM_DIR of the detector add-on
 DEFAULT_FACE_CONFIDENCE = 0.2
 DEFAULT_FACE_MATCH_THRESHOLD = 0.35
 DEFAULT_FACE_MULTISCALE = True  # v1.2.3: Multi-scale face detection (better accuracy, more CPU)
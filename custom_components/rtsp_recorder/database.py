@@ -10,9 +10,11 @@ Version: 1.0.9
 
 import sqlite3
 import json
+import math
 import os
 import logging
 import asyncio
+import struct
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Any, Tuple
 from pathlib import Path
@@ -21,7 +23,65 @@ import threading
 _LOGGER = logging.getLogger(__name__)
 
 # Database schema version for migrations
-SCHEMA_VERSION = 1
+# v1.4.0: v2 adds person_centroids, v3 adds analysis_index, v4 adds recordings
+SCHEMA_VERSION = 4
+
+# v1.4.0: Per-person running embedding sum and normalized centroid, kept in
+# step with face_embeddings by DatabaseManager so matching compares against
+# one vector per person instead of every stored embedding.
+CREATE_CENTROIDS_TABLE = """
+CREATE TABLE IF NOT EXISTS person_centroids (
+    person_id TEXT PRIMARY KEY,
+    dim INTEGER NOT NULL,
+    embedding_count INTEGER NOT NULL,
+    embedding_sum BLOB NOT NULL,  -- float64 running sum of the embeddings
+    centroid BLOB NOT NULL,       -- normalized mean, float32 like embeddings
+    updated_at TEXT NOT NULL,
+    FOREIGN KEY (person_id) REFERENCES people(id) ON DELETE CASCADE
+);
+"""
+
+# v1.4.0: Authoritative index of analysis result folders. Holds the summary
+# fields of each result.json so overview, lookup and skip-existing are indexed
+# queries instead of loading every result file.
+CREATE_ANALYSIS_INDEX_TABLE = """
+CREATE TABLE IF NOT EXISTS analysis_index (
+    analysis_path TEXT PRIMARY KEY,  -- analysis_* folder
+    output_dir TEXT NOT NULL,        -- configured analysis output path
+    video_path TEXT,
+    camera_name TEXT,
+    created_utc TEXT NOT NULL,       -- result.json created_utc (YYYYMMDD_HHMMSS)
+    status TEXT,
+    device TEXT,
+    frame_count INTEGER,
+    duration_sec REAL,
+    summary TEXT NOT NULL            -- JSON: result.json without frames/detections
+);
+CREATE INDEX IF NOT EXISTS idx_analysis_index_created ON analysis_index(output_dir, created_utc);
+CREATE INDEX IF NOT EXISTS idx_analysis_index_video ON analysis_index(video_path, created_utc);
+CREATE INDEX IF NOT EXISTS idx_analysis_index_camera ON analysis_index(camera_name, created_utc);
+"""
+
+# v1.4.0: Catalog of recorded videos, maintained on recording_saved, by the
+# delete services and by a reconciling scan, so batch analysis, retention and
+# the camera watchdog query it instead of walking the storage tree.
+CREATE_RECORDINGS_TABLE = """
+CREATE TABLE IF NOT EXISTS recordings (
+    path TEXT PRIMARY KEY,
+    storage_root TEXT NOT NULL,   -- configured storage path
+    camera TEXT NOT NULL,         -- top-level folder below storage_root
+    start_time TEXT,              -- YYYYMMDD_HHMMSS from {camera}_{start}.mp4
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL DEFAULT 0,
+    duration_sec REAL
+);
+CREATE INDEX IF NOT EXISTS idx_recordings_mtime ON recordings(storage_root, mtime);
+CREATE INDEX IF NOT EXISTS idx_recordings_camera ON recordings(storage_root, camera, mtime);
+CREATE INDEX IF NOT EXISTS idx_recordings_start ON recordings(storage_root, camera, start_time);
+"""
+
+# Per-frame data kept out of the analysis_index summary
+ANALYSIS_INDEX_EXCLUDED_KEYS = ("frames", "detections")
 
 # SQL statements for schema creation
 CREATE_SCHEMA = """
@@ -120,7 +180,66 @@ CREATE INDEX IF NOT EXISTS idx_analysis_runs_created ON analysis_runs(created_at
 CREATE INDEX IF NOT EXISTS idx_analysis_runs_status ON analysis_runs(status);
 -- Composite index for common queries (camera + date range)
 CREATE INDEX IF NOT EXISTS idx_analysis_runs_camera_date ON analysis_runs(camera_name, created_at);
-"""
+""" + CREATE_CENTROIDS_TABLE + CREATE_ANALYSIS_INDEX_TABLE + CREATE_RECORDINGS_TABLE
+
+
+def _write_centroid_row(conn: sqlite3.Connection, person_id: str, count: int,
+                        total: List[float]) -> None:
+    """Store a person's running sum and the centroid derived from it."""
+    norm = math.sqrt(sum(v * v for v in total))
+    centroid = [v / norm for v in total] if norm > 0 else list(total)
+    conn.execute(
+        """INSERT OR REPLACE INTO person_centroids
+           (person_id, dim, embedding_count, embedding_sum, centroid, updated_at)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        (person_id, len(total), count,
+         struct.pack(f'{len(total)}d', *total),
+         struct.pack(f'{len(centroid)}f', *centroid),
+         datetime.now().isoformat())
+    )
+
+
+def rebuild_person_centroids(conn: sqlite3.Connection, person_id: str = None) -> int:
+    """Recompute centroid rows from face_embeddings (backfill and repair).
+    
+    Like ``face_matching._compute_centroid`` the first embedding of a person
+    fixes the dimension; embeddings of another dimension are left out.
+    Does not commit.
+    
+    Args:
+        conn: Database connection
+        person_id: Only rebuild this person (None = everyone)
+        
+    Returns:
+        Number of centroid rows written
+    """
+    if person_id is None:
+        conn.execute("DELETE FROM person_centroids")
+        rows = conn.execute("SELECT person_id, embedding FROM face_embeddings ORDER BY id")
+    else:
+        conn.execute("DELETE FROM person_centroids WHERE person_id = ?", (person_id,))
+        rows = conn.execute(
+            "SELECT person_id, embedding FROM face_embeddings WHERE person_id = ? ORDER BY id",
+            (person_id,)
+        )
+    
+    sums: Dict[str, list] = {}
+    for pid, blob in rows.fetchall():
+        vector = struct.unpack(f'{len(blob) // 4}f', blob) if blob else ()
+        if not vector:
+            continue
+        entry = sums.get(pid)
+        if entry is None:
+            sums[pid] = [1, list(vector)]
+        elif len(vector) == len(entry[1]):
+            entry[0] += 1
+            total = entry[1]
+            for i, v in enumerate(vector):
+                total[i] += v
+    
+    for pid, (count, total) in sums.items():
+        _write_centroid_row(conn, pid, count, total)
+    return len(sums)
 
 
 class DatabaseManager:
@@ -136,6 +255,12 @@ class DatabaseManager:
         self._local = threading.local()
         self._lock = threading.Lock()
         self._initialized = False
+        # v1.4.0: Bumped after every committed write to people, embeddings,
+        # negatives or the ignore list so readers can cache snapshots.
+        self._people_generation = 0
+        self._generation_lock = threading.Lock()
+        # Serializes embedding writes with their read-modify-write of person_centroids
+        self._centroid_lock = threading.Lock()
         
         # Ensure directory exists
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
@@ -226,6 +351,20 @@ class DatabaseManager:
         # if from_version < 2:
         #     self.conn.execute("ALTER TABLE people ADD COLUMN notes TEXT")
         
+        if from_version < 2:
+            # v1.4.0: Persisted centroids, backfilled from existing embeddings
+            self.conn.executescript(CREATE_CENTROIDS_TABLE)
+            rebuilt = rebuild_person_centroids(self.conn)
+            _LOGGER.info(f"Backfilled centroids for {rebuilt} people")
+        
+        if from_version < 3:
+            # v1.4.0: Filled by analysis_helpers._sync_analysis_index
+            self.conn.executescript(CREATE_ANALYSIS_INDEX_TABLE)
+        
+        if from_version < 4:
+            # v1.4.0: Filled by recording_catalog.reconcile_recording_catalog
+            self.conn.executescript(CREATE_RECORDINGS_TABLE)
+        
         self.conn.execute(
             "INSERT INTO schema_version (version, applied_at) VALUES (?, ?)",
             (to_version, datetime.now().isoformat())
@@ -240,6 +379,16 @@ class DatabaseManager:
     
     # ==================== People Operations ====================
     
+    @property
+    def people_generation(self) -> int:
+        """Counter bumped after every committed people/embedding write."""
+        return self._people_generation
+    
+    def _bump_people_generation(self) -> None:
+        """Invalidate cached people snapshots (call after commit)."""
+        with self._generation_lock:
+            self._people_generation += 1
+    
     def add_person(self, person_id: str, name: str, metadata: dict = None) -> bool:
         """Add a new person to the database.
         
@@ -260,6 +409,7 @@ class DatabaseManager:
                 (person_id, name, now, now, json.dumps(metadata or {}))
             )
             self.conn.commit()
+            self._bump_people_generation()
             return True
         except Exception as e:
             _LOGGER.error(f"Failed to add person {name}: {e}")
@@ -328,6 +478,7 @@ class DatabaseManager:
                     (now, person_id)
                 )
             self.conn.commit()
+            self._bump_people_generation()
             return True
         except Exception as e:
             _LOGGER.error(f"Failed to update person {person_id}: {e}")
@@ -347,9 +498,11 @@ class DatabaseManager:
             if hard_delete:
                 # First delete all embeddings for this person
                 self.conn.execute("DELETE FROM face_embeddings WHERE person_id = ?", (person_id,))
+                self.conn.execute("DELETE FROM person_centroids WHERE person_id = ?", (person_id,))
                 # Then delete the person
                 cursor = self.conn.execute("DELETE FROM people WHERE id = ?", (person_id,))
                 self.conn.commit()
+                self._bump_people_generation()
                 return cursor.rowcount > 0
             else:
                 cursor = self.conn.execute(
@@ -357,6 +510,7 @@ class DatabaseManager:
                     (datetime.now().isoformat(), person_id)
                 )
                 self.conn.commit()
+                self._bump_people_generation()
                 return cursor.rowcount > 0
         except Exception as e:
             _LOGGER.error(f"Failed to delete person {person_id}: {e}")
@@ -381,19 +535,95 @@ class DatabaseManager:
             # Store embedding as binary blob for efficiency
             embedding_blob = self._embedding_to_blob(embedding)
             
-            cursor = self.conn.execute(
-                """INSERT INTO face_embeddings 
-                   (person_id, embedding, source_image, created_at, confidence)
-                   VALUES (?, ?, ?, ?, ?)""",
-                (person_id, embedding_blob, source_image, 
-                 datetime.now().isoformat(), confidence)
-            )
-            self.conn.commit()
+            with self._centroid_lock:
+                cursor = self.conn.execute(
+                    """INSERT INTO face_embeddings 
+                       (person_id, embedding, source_image, created_at, confidence)
+                       VALUES (?, ?, ?, ?, ?)""",
+                    (person_id, embedding_blob, source_image, 
+                     datetime.now().isoformat(), confidence)
+                )
+                self._update_centroid(person_id, self._blob_to_embedding(embedding_blob), 1)
+                self.conn.commit()
+            self._bump_people_generation()
             return cursor.lastrowid
         except Exception as e:
+            self.conn.rollback()
             _LOGGER.error(f"Failed to add embedding for {person_id}: {e}")
             return -1
     
+    def _update_centroid(self, person_id: str, vector: List[float], sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) one embedding from a person's centroid.
+        
+        O(dim) instead of re-reading every embedding. Runs inside the caller's
+        transaction under ``_centroid_lock``; does not commit.
+        """
+        row = self.conn.execute(
+            "SELECT dim, embedding_count, embedding_sum FROM person_centroids WHERE person_id = ?",
+            (person_id,)
+        ).fetchone()
+        if row is None:
+            if sign > 0 and vector:
+                _write_centroid_row(self.conn, person_id, 1, list(vector))
+            else:
+                rebuild_person_centroids(self.conn, person_id)
+            return
+        
+        dim, count, sum_blob = row[0], row[1], row[2]
+        if len(vector) != dim:
+            # Not part of the centroid (see rebuild_person_centroids)
+            return
+        count += sign
+        if count <= 0:
+            # Last embedding of this dimension gone: fall back to what is left
+            rebuild_person_centroids(self.conn, person_id)
+            return
+        total = list(struct.unpack(f'{dim}d', sum_blob))
+        for i, v in enumerate(vector):
+            total[i] += sign * v
+        _write_centroid_row(self.conn, person_id, count, total)
+    
+    def _delete_embedding_rows(self, embedding_ids: List[int]) -> int:
+        """Delete positive embeddings and update their centroids (no commit)."""
+        deleted = 0
+        for eid in embedding_ids:
+            row = self.conn.execute(
+                "SELECT person_id, embedding FROM face_embeddings WHERE id = ?",
+                (eid,)
+            ).fetchone()
+            if row is None:
+                continue
+            self.conn.execute("DELETE FROM face_embeddings WHERE id = ?", (eid,))
+            self._update_centroid(row[0], self._blob_to_embedding(row[1]), -1)
+            deleted += 1
+        return deleted
+    
+    def get_all_centroids(self) -> Dict[str, List[float]]:
+        """Get the stored centroid of every active person.
+        
+        Returns:
+            Dict mapping person_id to normalized centroid vector
+        """
+        cursor = self.conn.execute(
+            """SELECT pc.person_id, pc.centroid
+               FROM person_centroids pc
+               JOIN people p ON p.id = pc.person_id
+               WHERE p.is_active = 1"""
+        )
+        return {row[0]: self._blob_to_embedding(row[1]) for row in cursor.fetchall()}
+    
+    def rebuild_centroids(self) -> int:
+        """Recompute all stored centroids from the embeddings.
+        
+        Returns:
+            Number of people with a centroid
+        """
+        with self._centroid_lock:
+            count = rebuild_person_centroids(self.conn)
+            self.conn.commit()
+        self._bump_people_generation()
+        return count
+    
     def get_embeddings_for_person(self, person_id: str) -> List[List[float]]:
         """Get all embeddings for a person.
         
@@ -667,12 +897,22 @@ class DatabaseManager:
         success_count = 0
         failure_count = 0
         
+        if embedding_type == "positive":
+            # v1.4.0: One transaction, centroids updated per removed embedding
+            try:
+                with self._centroid_lock:
+                    deleted = self._delete_embedding_rows(embedding_ids)
+                    self.conn.commit()
+                self._bump_people_generation()
+                return {"success_count": deleted, "failure_count": len(embedding_ids) - deleted}
+            except Exception as e:
+                self.conn.rollback()
+                _LOGGER.error(f"Bulk delete of {len(embedding_ids)} embeddings failed: {e}")
+                return {"success_count": 0, "failure_count": len(embedding_ids)}
+        
         for eid in embedding_ids:
             try:
-                if embedding_type == "positive":
-                    result = self.delete_embedding(eid)
-                else:
-                    result = self.delete_negative_embedding(eid)
+                result = self.delete_negative_embedding(eid)
                 if result:
                     success_count += 1
                 else:
@@ -683,6 +923,26 @@ class DatabaseManager:
         
         return {"success_count": success_count, "failure_count": failure_count}
     
+    def get_embedding_owners(self, embedding_ids: List[int], embedding_type: str = "positive") -> List[str]:
+        """Get the people that own the given embeddings.
+
+        Args:
+            embedding_ids: List of embedding IDs
+            embedding_type: 'positive' or 'negative'
+
+        Returns:
+            Distinct person IDs
+        """
+        if not embedding_ids:
+            return []
+        table = "face_embeddings" if embedding_type == "positive" else "negative_embeddings"
+        placeholders = ",".join("?" * len(embedding_ids))
+        cursor = self.conn.execute(
+            f"SELECT DISTINCT person_id FROM {table} WHERE id IN ({placeholders})",
+            [int(eid) for eid in embedding_ids]
+        )
+        return [row[0] for row in cursor.fetchall()]
+
     def delete_positive_embedding(self, embedding_id: int) -> bool:
         """Delete a positive embedding by ID.
         
@@ -709,6 +969,7 @@ class DatabaseManager:
                 (embedding_id,)
             )
             self.conn.commit()
+            self._bump_people_generation()
             return cursor.rowcount > 0
         except Exception as e:
             _LOGGER.error(f"Failed to delete negative embedding {embedding_id}: {e}")
@@ -741,6 +1002,7 @@ class DatabaseManager:
                  datetime.now().isoformat(), source)
             )
             self.conn.commit()
+            self._bump_people_generation()
             return cursor.lastrowid
         except Exception as e:
             _LOGGER.error(f"Failed to add negative embedding for {person_id}: {e}")
@@ -770,6 +1032,24 @@ class DatabaseManager:
             for row in cursor.fetchall()
         ]
     
+    def get_all_negative_embeddings(self) -> Dict[str, List[List[float]]]:
+        """Get all negative embedding vectors grouped by person (no thumbnails).
+        
+        Returns:
+            Dict mapping person_id to list of negative embeddings
+        """
+        result = {}
+        cursor = self.conn.execute(
+            """SELECT ne.person_id, ne.embedding
+               FROM negative_embeddings ne
+               JOIN people p ON p.id = ne.person_id
+               WHERE p.is_active = 1
+               ORDER BY ne.created_at DESC"""
+        )
+        for row in cursor.fetchall():
+            result.setdefault(row[0], []).append(self._blob_to_embedding(row[1]))
+        return result
+    
     def get_negative_count_for_person(self, person_id: str) -> int:
         """Get count of negative embeddings for a person.
         
@@ -796,7 +1076,8 @@ class DatabaseManager:
             """SELECT p.id, p.name, fe.embedding 
                FROM people p 
                JOIN face_embeddings fe ON p.id = fe.person_id
-               WHERE p.is_active = 1"""
+               WHERE p.is_active = 1
+               ORDER BY fe.created_at DESC"""
         )
         for row in cursor.fetchall():
             person_id = row[0]
@@ -815,13 +1096,13 @@ class DatabaseManager:
             True if successful
         """
         try:
-            self.conn.execute(
-                "DELETE FROM face_embeddings WHERE id = ?",
-                (embedding_id,)
-            )
-            self.conn.commit()
+            with self._centroid_lock:
+                self._delete_embedding_rows([embedding_id])
+                self.conn.commit()
+            self._bump_people_generation()
             return True
         except Exception as e:
+            self.conn.rollback()
             _LOGGER.error(f"Failed to delete embedding {embedding_id}: {e}")
             return False
     
@@ -848,6 +1129,7 @@ class DatabaseManager:
                 (embedding_blob, reason, datetime.now().isoformat(), camera_name)
             )
             self.conn.commit()
+            self._bump_people_generation()
             return cursor.lastrowid
         except Exception as e:
             _LOGGER.error(f"Failed to add ignored embedding: {e}")
@@ -871,6 +1153,7 @@ class DatabaseManager:
         try:
             self.conn.execute("DELETE FROM ignored_embeddings")
             self.conn.commit()
+            self._bump_people_generation()
             return True
         except Exception as e:
             _LOGGER.error(f"Failed to clear ignored embeddings: {e}")
@@ -1357,6 +1640,250 @@ class DatabaseManager:
         if deleted:
             _LOGGER.info(f"Cleaned up {deleted} old analysis runs")
         return deleted
+    
+    # ==================== Analysis Result Index ====================
+    
+    def upsert_analysis_index(self, output_dir: str,
+                              entries: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """Insert or update index rows for analysis result folders.
+        
+        Args:
+            output_dir: Analysis output directory the folders belong to
+            entries: (analysis_path, result dict) pairs, one transaction
+            
+        Returns:
+            Number of rows written, -1 on failure
+        """
+        rows = []
+        for analysis_path, result in entries:
+            summary = {k: v for k, v in result.items() if k not in ANALYSIS_INDEX_EXCLUDED_KEYS}
+            video_path = result.get("video_path")
+            rows.append((
+                analysis_path,
+                output_dir,
+                video_path,
+                os.path.basename(os.path.dirname(video_path)) if video_path else None,
+                str(result.get("created_utc") or ""),
+                result.get("status"),
+                result.get("device"),
+                result.get("frame_count"),
+                result.get("duration_sec"),
+                json.dumps(summary, ensure_ascii=False),
+            ))
+        try:
+            self.conn.executemany(
+                """INSERT OR REPLACE INTO analysis_index
+                   (analysis_path, output_dir, video_path, camera_name, created_utc,
+                    status, device, frame_count, duration_sec, summary)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                rows
+            )
+            self.conn.commit()
+            return len(rows)
+        except Exception as e:
+            self.conn.rollback()
+            _LOGGER.error(f"Failed to index {len(rows)} analysis results: {e}")
+            return -1
+    
+    def get_analysis_index_page(self, output_dir: str, limit: int,
+                                offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """Get analysis summaries, newest first.
+        
+        Args:
+            output_dir: Analysis output directory
+            limit: Maximum number of summaries
+            offset: Number of summaries to skip
+            
+        Returns:
+            Tuple of (summary dicts, total count)
+        """
+        total = self.conn.execute(
+            "SELECT COUNT(*) FROM analysis_index WHERE output_dir = ?", (output_dir,)
+        ).fetchone()[0]
+        cursor = self.conn.execute(
+            """SELECT summary FROM analysis_index WHERE output_dir = ?
+               ORDER BY created_utc DESC, analysis_path DESC LIMIT ? OFFSET ?""",
+            (output_dir, limit, offset)
+        )
+        return [json.loads(row[0]) for row in cursor.fetchall()], total
+    
+    def get_analysis_paths_for_video(self, output_dir: str, video_path: str) -> List[str]:
+        """Get analysis folders of a video, newest first."""
+        cursor = self.conn.execute(
+            """SELECT analysis_path FROM analysis_index
+               WHERE video_path = ? AND output_dir = ?
+               ORDER BY created_utc DESC, analysis_path DESC""",
+            (video_path, output_dir)
+        )
+        return [row[0] for row in cursor.fetchall()]
+    
+    def get_indexed_video_paths(self, output_dir: str) -> set:
+        """Get every video path that has an indexed analysis."""
+        cursor = self.conn.execute(
+            "SELECT DISTINCT video_path FROM analysis_index WHERE output_dir = ? AND video_path IS NOT NULL",
+            (output_dir,)
+        )
+        return {row[0] for row in cursor.fetchall()}
+    
+    def get_indexed_analysis_paths(self, output_dir: str) -> set:
+        """Get every indexed analysis folder of an output directory."""
+        cursor = self.conn.execute(
+            "SELECT analysis_path FROM analysis_index WHERE output_dir = ?", (output_dir,)
+        )
+        return {row[0] for row in cursor.fetchall()}
+    
+    def delete_analysis_index_entries(self, analysis_paths: List[str]) -> int:
+        """Remove index rows of deleted analysis folders.
+        
+        Returns:
+            Number of deleted rows
+        """
+        try:
+            cursor = self.conn.executemany(
+                "DELETE FROM analysis_index WHERE analysis_path = ?",
+                [(path,) for path in analysis_paths]
+            )
+            self.conn.commit()
+            return cursor.rowcount
+        except Exception as e:
+            _LOGGER.error(f"Failed to delete analysis index entries: {e}")
+            return 0
+
+    # ==================== Recording Catalog (v1.4.0) ====================
+
+    def upsert_recordings(self, storage_root: str, entries: List[Dict[str, Any]]) -> int:
+        """Insert or update catalog rows for recorded videos.
+        
+        A known duration is kept when an entry has none.
+        
+        Args:
+            storage_root: Storage path the videos belong to
+            entries: Dicts with path, camera, start_time, mtime, size and
+                optional duration_sec, one transaction
+            
+        Returns:
+            Number of rows written, -1 on failure
+        """
+        rows = [
+            (e["path"], storage_root, e.get("camera") or "", e.get("start_time"),
+             float(e.get("mtime") or 0), int(e.get("size") or 0), e.get("duration_sec"))
+            for e in entries
+        ]
+        try:
+            self.conn.executemany(
+                """INSERT INTO recordings
+                   (path, storage_root, camera, start_time, mtime, size, duration_sec)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(path) DO UPDATE SET
+                       storage_root = excluded.storage_root,
+                       camera = excluded.camera,
+                       start_time = excluded.start_time,
+                       mtime = excluded.mtime,
+                       size = excluded.size,
+                       duration_sec = COALESCE(excluded.duration_sec, recordings.duration_sec)""",
+                rows
+            )
+            self.conn.commit()
+            return len(rows)
+        except Exception as e:
+            self.conn.rollback()
+            _LOGGER.error(f"Failed to catalog {len(rows)} recordings: {e}")
+            return -1
+
+    def get_recordings(self, storage_root: str, camera: str = None,
+                       since_mtime: float = None, unanalyzed_in: str = None,
+                       limit: int = None) -> List[Dict[str, Any]]:
+        """Get cataloged recordings, newest (by mtime) first.
+        
+        Args:
+            storage_root: Storage path
+            camera: Only recordings of this camera folder
+            since_mtime: Only recordings modified at or after this timestamp
+            unanalyzed_in: Skip recordings with an indexed analysis in this
+                analysis output directory
+            limit: Maximum number of recordings
+            
+        Returns:
+            List of recording dicts
+        """
+        query = """SELECT path, camera, start_time, mtime, size, duration_sec
+                     FROM recordings r WHERE storage_root = ?"""
+        params: List[Any] = [storage_root]
+        if camera:
+            query += " AND camera = ?"
+            params.append(camera)
+        if since_mtime is not None:
+            query += " AND mtime >= ?"
+            params.append(since_mtime)
+        if unanalyzed_in:
+            query += """ AND NOT EXISTS (SELECT 1 FROM analysis_index a
+                                         WHERE a.video_path = r.path AND a.output_dir = ?)"""
+            params.append(unanalyzed_in)
+        query += " ORDER BY mtime DESC, path DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(int(limit))
+        cursor = self.conn.execute(query, params)
+        return [dict(row) for row in cursor.fetchall()]
+
+    def get_recording_stats(self, storage_root: str) -> Dict[str, Tuple[float, int]]:
+        """Get (mtime, size) of every cataloged recording of a storage path."""
+        cursor = self.conn.execute(
+            "SELECT path, mtime, size FROM recordings WHERE storage_root = ?", (storage_root,)
+        )
+        return {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+    def get_expired_recordings(self, storage_root: str, cutoff: float,
+                               camera: str = None,
+                               exclude_cameras: List[str] = None) -> List[Tuple[str, int]]:
+        """Get recordings last modified before cutoff.
+        
+        Args:
+            storage_root: Storage path
+            cutoff: Timestamp, older recordings are returned
+            camera: Only this camera folder
+            exclude_cameras: Camera folders to leave out (own retention)
+            
+        Returns:
+            List of (path, size) tuples
+        """
+        query = "SELECT path, size FROM recordings WHERE storage_root = ? AND mtime < ?"
+        params: List[Any] = [storage_root, cutoff]
+        if camera is not None:
+            query += " AND camera = ?"
+            params.append(camera)
+        if exclude_cameras:
+            query += f" AND camera NOT IN ({','.join('?' * len(exclude_cameras))})"
+            params.extend(exclude_cameras)
+        cursor = self.conn.execute(query, params)
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+
+    def get_newest_recording_starts(self, storage_root: str) -> Dict[str, str]:
+        """Get the newest start_time (YYYYMMDD_HHMMSS) per camera folder."""
+        cursor = self.conn.execute(
+            """SELECT camera, MAX(start_time) FROM recordings
+               WHERE storage_root = ? AND start_time IS NOT NULL
+               GROUP BY camera""",
+            (storage_root,)
+        )
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
+    def delete_recordings(self, paths: List[str]) -> int:
+        """Remove catalog rows of deleted recordings.
+        
+        Returns:
+            Number of deleted rows
+        """
+        try:
+            cursor = self.conn.executemany(
+                "DELETE FROM recordings WHERE path = ?",
+                [(path,) for path in paths]
+            )
+            self.conn.commit()
+            return cursor.rowcount
+        except Exception as e:
+            _LOGGER.error(f"Failed to delete recording catalog entries: {e}")
+            return 0
 
     def get_db_stats(self) -> Dict[str, int]:
         """Get database statistics.
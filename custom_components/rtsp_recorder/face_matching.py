@@ -288,3 +288,245 @@ def _match_face_simple(
         candidates.sort(key=lambda x: x["similarity"], reverse=True)
         return candidates[0]
     return None
+
+
+def _vector_of(item: Any) -> Any:
+    """Embedding vector of a DB entry (dict with "vector"/"embedding" or a plain list)."""
+    if isinstance(item, dict):
+        return item.get("vector") or item.get("embedding")
+    return item
+
+
+def _as_unit_vector(values: Any, dim: int | None = None) -> Any:
+    """Convert an embedding to a unit-length float32 array, or None if unusable."""
+    if not isinstance(values, (list, tuple)) or not values:
+        return None
+    try:
+        vec = np.asarray(values, dtype=np.float32)
+    except (TypeError, ValueError):
+        return None
+    if vec.ndim != 1 or (dim is not None and vec.size != dim):
+        return None
+    norm = float(np.linalg.norm(vec))
+    if norm == 0 or not np.isfinite(norm):
+        return None
+    return vec / norm
+
+
+class FaceIndex:
+    """People database as L2-normalized float32 matrices for batch matching.
+    
+    Matching many embeddings against every person, negative sample and
+    ignored/no-face embedding becomes a few matrix products instead of one
+    Python loop per face and sample. The index is immutable, build a new one
+    when the people database changes.
+    
+    Matching follows ``_match_face_simple``: a person is compared by centroid
+    when it has one, otherwise by its best stored embedding, and is skipped
+    for a face that resembles one of its negative samples. Vectors whose
+    dimension differs from the first usable one are left out.
+    
+    Without NumPy the same questions are answered by the per-face loops.
+    """
+
+    def __init__(
+        self,
+        people: list[dict[str, Any]] | None = None,
+        no_face_embeddings: list[Any] | None = None,
+        ignored_embeddings: list[Any] | None = None,
+    ) -> None:
+        self._people = list(people or [])
+        self._no_face = list(no_face_embeddings or [])
+        self._ignored = list(ignored_embeddings or [])
+        self.dim: int | None = None
+        if not _HAS_NUMPY:
+            return
+
+        ref_rows, ref_owner = [], []
+        neg_rows, neg_owner = [], []
+        for pos, person in enumerate(self._people):
+            centroid = self._add_row(ref_rows, person.get("centroid"))
+            if centroid:
+                ref_owner.append(pos)
+            else:
+                for emb in person.get("embeddings") or []:
+                    if self._add_row(ref_rows, _vector_of(emb)):
+                        ref_owner.append(pos)
+            for neg in person.get("negative_embeddings") or []:
+                if self._add_row(neg_rows, _vector_of(neg)):
+                    neg_owner.append(pos)
+
+        # Reference rows are grouped by person, so a person's best score is a
+        # maximum over one contiguous block of columns
+        self._refs = self._stack(ref_rows)
+        owners = np.asarray(ref_owner, dtype=np.int64)
+        starts = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]]) if owners.size else owners
+        self._ref_starts = starts
+        self._ref_people = owners[starts] if owners.size else owners
+
+        self._negatives = self._stack(neg_rows)
+        # One-hot (samples x people), so "any negative hit per person" is a product
+        self._neg_owner = None
+        if neg_rows:
+            self._neg_owner = np.zeros((len(neg_rows), len(self._people)), dtype=np.float32)
+            self._neg_owner[np.arange(len(neg_rows)), neg_owner] = 1.0
+
+        no_face_rows: list[Any] = []
+        for item in self._no_face:
+            self._add_row(no_face_rows, _vector_of(item))
+        self._no_face_matrix = self._stack(no_face_rows)
+
+        ignored_rows: list[Any] = []
+        for item in self._ignored:
+            self._add_row(ignored_rows, _vector_of(item))
+        self._ignored_matrix = self._stack(ignored_rows)
+
+    def _add_row(self, rows: list[Any], values: Any) -> bool:
+        vec = _as_unit_vector(values, self.dim)
+        if vec is None:
+            return False
+        if self.dim is None:
+            self.dim = int(vec.size)
+        rows.append(vec)
+        return True
+
+    @staticmethod
+    def _stack(rows: list[Any]) -> Any:
+        return np.vstack(rows) if rows else None
+
+    def __len__(self) -> int:
+        return len(self._people)
+
+    def _queries(self, embeddings: list[Any]) -> tuple[Any, Any]:
+        """Query matrix (zero rows for unusable embeddings) and validity mask."""
+        queries = np.zeros((len(embeddings), self.dim or 0), dtype=np.float32)
+        valid = np.zeros(len(embeddings), dtype=bool)
+        for row, emb in enumerate(embeddings):
+            vec = _as_unit_vector(emb, self.dim)
+            if vec is not None:
+                queries[row] = vec
+                valid[row] = True
+        return queries, valid
+
+    def match(
+        self,
+        embeddings: list[Any],
+        threshold: float,
+        check_negatives: bool = True,
+        neg_threshold: float = 0.75,
+        no_face_threshold: float = 0.75,
+    ) -> list[dict[str, Any] | None]:
+        """Find the best matching person for each embedding.
+        
+        Args:
+            embeddings: Face embedding vectors to match
+            threshold: Minimum similarity score for a match
+            check_negatives: Whether to check negative samples
+            neg_threshold: Threshold for negative sample matching
+            no_face_threshold: Threshold for known false positives
+            
+        Returns:
+            One entry per embedding: match dict with person_id, name,
+            similarity, ``{"is_no_face": True}`` for a known false positive,
+            or None
+        """
+        results: list[dict[str, Any] | None] = [None] * len(embeddings)
+        if not self._people:
+            return results
+        if not _HAS_NUMPY:
+            return [self._match_one_loop(emb, threshold, check_negatives, neg_threshold, no_face_threshold)
+                    for emb in embeddings]
+        if self.dim is None:
+            return results
+
+        queries, valid = self._queries(embeddings)
+        no_face = np.zeros(len(embeddings), dtype=bool)
+        if self._no_face_matrix is not None:
+            no_face = (queries @ self._no_face_matrix.T >= no_face_threshold).any(axis=1) & valid
+
+        positions, scores = self.best_matches(queries, threshold, check_negatives, neg_threshold)
+        for row in range(len(embeddings)):
+            if no_face[row]:
+                results[row] = {"is_no_face": True}
+            elif valid[row] and positions[row] >= 0:
+                person = self._people[int(positions[row])]
+                results[row] = {
+                    "person_id": person.get("id"),
+                    "name": person.get("name"),
+                    "similarity": round(float(scores[row]), 4),
+                }
+        return results
+
+    def best_matches(
+        self,
+        queries: Any,
+        threshold: float,
+        check_negatives: bool = True,
+        neg_threshold: float = 0.75,
+    ) -> tuple[Any, Any]:
+        """Best person for each row of a unit-length float32 query matrix.
+        
+        Works on a prebuilt matrix so callers holding many embeddings (e.g. the
+        face re-match store) skip the per-embedding conversion of ``match``.
+        Requires NumPy.
+        
+        Args:
+            queries: (n, dim) float32 matrix of L2-normalized embeddings
+            threshold: Minimum similarity score for a match
+            check_negatives: Whether to check negative samples
+            neg_threshold: Threshold for negative sample matching
+            
+        Returns:
+            Tuple of person positions (index into the people list, -1 for no
+            match) and their similarity scores
+        """
+        count = len(queries)
+        positions = np.full(count, -1, dtype=np.int64)
+        scores = np.zeros(count, dtype=np.float32)
+        if not count or self._refs is None or queries.ndim != 2 or queries.shape[1] != self.dim:
+            return positions, scores
+
+        best = np.maximum.reduceat(queries @ self._refs.T, self._ref_starts, axis=1)
+        if check_negatives and self._negatives is not None:
+            hits = (queries @ self._negatives.T >= neg_threshold).astype(np.float32)
+            blocked = (hits @ self._neg_owner) > 0
+            best[blocked[:, self._ref_people]] = -np.inf
+        best_col = best.argmax(axis=1)
+        best_score = best[np.arange(count), best_col]
+        matched = best_score >= threshold
+        positions[matched] = self._ref_people[best_col[matched]]
+        scores[matched] = best_score[matched]
+        return positions, scores
+
+    def _match_one_loop(
+        self,
+        embedding: Any,
+        threshold: float,
+        check_negatives: bool,
+        neg_threshold: float,
+        no_face_threshold: float,
+    ) -> dict[str, Any] | None:
+        if not embedding:
+            return None
+        for item in self._no_face:
+            if _cosine_similarity_simple(embedding, _vector_of(item) or []) >= no_face_threshold:
+                return {"is_no_face": True}
+        return _match_face_simple(embedding, self._people, threshold, check_negatives, neg_threshold)
+
+    def is_ignored(self, embeddings: list[Any], threshold: float = 0.85) -> list[bool]:
+        """Check which embeddings resemble an ignored embedding."""
+        if not self._ignored:
+            return [False] * len(embeddings)
+        if not _HAS_NUMPY:
+            return [
+                bool(emb) and any(
+                    _cosine_similarity_simple(emb, _vector_of(item) or []) >= threshold
+                    for item in self._ignored
+                )
+                for emb in embeddings
+            ]
+        if self._ignored_matrix is None:
+            return [False] * len(embeddings)
+        queries, valid = self._queries(embeddings)
+        hits = (queries @ self._ignored_matrix.T >= threshold).any(axis=1) & valid
+        return hits.tolist()
@@ -0,0 +1,420 @@
+"""Incremental re-matching of historical analysis faces.
+
+v1.4.0: After a people DB edit, historical results used to be re-read one
+result.json at a time (newest 100 only), each embedding re-parsed into
+Python floats and the whole file rewritten. FaceHistoryStore keeps the face
+embeddings of all analysis results in one contiguous float32 matrix, next
+to each face's position and current match, so an edit of some people is:
+
+1. one batched matrix product of all history against the edited people,
+   selecting the faces whose best match could have changed (currently
+   matched to an edited person, or now scoring at least as high for one),
+2. a full match of only those faces against the whole people DB,
+3. small face_matches.json deltas for the results whose faces changed.
+
+The store is filled lazily on the first re-match and afterwards only loads
+new (or rewritten) results and drops deleted ones.
+"""
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from .face_matching import FaceIndex
+    from .face_sidecar import (
+        FACE_EMBEDDINGS_FILE,
+        face_position_key,
+        load_face_match_deltas,
+        write_face_match_deltas,
+    )
+except ImportError:
+    from face_matching import FaceIndex
+    from face_sidecar import (
+        FACE_EMBEDDINGS_FILE,
+        face_position_key,
+        load_face_match_deltas,
+        write_face_match_deltas,
+    )
+
+_LOGGER = logging.getLogger(__name__)
+
+# Parallel result readers when loading results into the store
+FACE_STORE_LOAD_WORKERS = 8
+
+_INITIAL_CAPACITY = 1024
+
+# Person codes for faces without a person match
+_NO_MATCH = -1
+_NO_FACE = -2
+
+# Similarities are stored rounded to 4 places, smaller differences are noise
+_SIMILARITY_EPSILON = 5e-5
+
+
+def _read_job_faces(job_dir: str) -> list[tuple[str, Any, Any]]:
+    """Faces with an embedding of one result as (position key, vector, match).
+
+    Embeddings come from faces.npy (or inline for older results), matches
+    from result.json with face_matches.json applied on top.
+    """
+    try:
+        with open(os.path.join(job_dir, "result.json"), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if not isinstance(data, dict):
+        return []
+
+    deltas = load_face_match_deltas(job_dir)
+    sidecar = None
+    faces = []
+    for det_idx, det in enumerate(data.get("detections") or []):
+        for face_idx, face in enumerate(det.get("faces") or []):
+            if not isinstance(face, dict):
+                continue
+            vector = None
+            row = face.get("embedding_idx")
+            if isinstance(row, int):
+                if sidecar is None:
+                    try:
+                        sidecar = np.load(os.path.join(job_dir, FACE_EMBEDDINGS_FILE))
+                    except (OSError, ValueError):
+                        sidecar = np.zeros((0, 0), dtype=np.float32)
+                if 0 <= row < sidecar.shape[0]:
+                    vector = sidecar[row]
+            elif isinstance(face.get("embedding"), list) and face["embedding"]:
+                vector = face["embedding"]
+            if vector is None:
+                continue
+            key = face_position_key(det_idx, face_idx)
+            match = deltas[key] if key in deltas else face.get("match")
+            faces.append((key, vector, match))
+    return faces
+
+
+def _result_mtime(job_dir: str) -> float | None:
+    try:
+        return os.path.getmtime(os.path.join(job_dir, "result.json"))
+    except OSError:
+        return None
+
+
+class FaceHistoryStore:
+    """All historical face embeddings of one output directory, for re-matching.
+
+    Row i of the embedding matrix belongs to the result in job slot
+    ``_job[i]`` at position ``_keys[i]``; ``_code``/``_name``/``_sim`` hold
+    its current match (person and name as interned codes). Rows of one
+    result are contiguous. Requires NumPy.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.dim: int | None = None
+        self._size = 0
+        self._rows = np.zeros((0, 0), dtype=np.float32)
+        self._job = np.zeros(0, dtype=np.int32)
+        self._code = np.zeros(0, dtype=np.int32)
+        self._name = np.zeros(0, dtype=np.int32)
+        self._sim = np.zeros(0, dtype=np.float32)
+        self._keys: list[str] = []
+        self._job_dirs: list[str] = []
+        self._job_slots: dict[str, int] = {}
+        self._job_mtimes: dict[str, float] = {}
+        self._codes: dict[Any, int] = {}
+        self._person_ids: list[Any] = []
+        self._name_codes: dict[Any, int] = {}
+        self._names: list[Any] = []
+        self._threshold: float | None = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _person_code(self, person_id: Any) -> int:
+        code = self._codes.get(person_id)
+        if code is None:
+            code = self._codes[person_id] = len(self._person_ids)
+            self._person_ids.append(person_id)
+        return code
+
+    def _name_code(self, name: Any) -> int:
+        code = self._name_codes.get(name)
+        if code is None:
+            code = self._name_codes[name] = len(self._names)
+            self._names.append(name)
+        return code
+
+    def sync(self, job_dirs: list[str], max_workers: int = FACE_STORE_LOAD_WORKERS) -> dict[str, int]:
+        """Load new or rewritten results and drop results that are gone.
+
+        Args:
+            job_dirs: All analysis folders of the output directory
+            max_workers: Parallel result readers
+
+        Returns:
+            Dict with loaded and dropped result counts
+        """
+        with self._lock:
+            wanted = {}
+            for job_dir in job_dirs:
+                mtime = _result_mtime(job_dir)
+                if mtime is not None:
+                    wanted[job_dir] = mtime
+            dropped = [
+                job_dir for job_dir in self._job_slots
+                if wanted.get(job_dir) != self._job_mtimes.get(job_dir)
+            ]
+            self._drop_jobs(dropped)
+            to_load = sorted(job_dir for job_dir in wanted if job_dir not in self._job_slots)
+            if to_load:
+                with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+                    for job_dir, faces in zip(to_load, pool.map(_read_job_faces, to_load)):
+                        self._append_job(job_dir, wanted[job_dir], faces)
+            return {"loaded": len(to_load), "dropped": len(dropped)}
+
+    def _drop_jobs(self, job_dirs: list[str]) -> None:
+        slots = [self._job_slots.pop(job_dir) for job_dir in job_dirs]
+        for job_dir in job_dirs:
+            self._job_mtimes.pop(job_dir, None)
+        if not slots or not self._size:
+            return
+        keep = ~np.isin(self._job[:self._size], slots)
+        count = int(keep.sum())
+        self._rows[:count] = self._rows[:self._size][keep]
+        for name in ("_job", "_code", "_name", "_sim"):
+            array = getattr(self, name)
+            array[:count] = array[:self._size][keep]
+        self._keys = [key for key, kept in zip(self._keys, keep) if kept]
+        self._size = count
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        capacity = len(self._job)
+        if needed <= capacity and self._rows.shape[1] == self.dim:
+            return
+        capacity = max(_INITIAL_CAPACITY, capacity)
+        while capacity < needed:
+            capacity *= 2
+        rows = np.zeros((capacity, self.dim), dtype=np.float32)
+        if self._size:
+            rows[:self._size] = self._rows[:self._size]
+        self._rows = rows
+        for name, dtype in (("_job", np.int32), ("_code", np.int32), ("_name", np.int32), ("_sim", np.float32)):
+            array = np.zeros(capacity, dtype=dtype)
+            array[:self._size] = getattr(self, name)[:self._size]
+            setattr(self, name, array)
+
+    def _append_job(self, job_dir: str, mtime: float, faces: list[tuple[str, Any, Any]]) -> None:
+        slot = len(self._job_dirs)
+        self._job_dirs.append(job_dir)
+        self._job_slots[job_dir] = slot
+        self._job_mtimes[job_dir] = mtime
+
+        usable = []
+        for key, vector, match in faces:
+            try:
+                vec = np.asarray(vector, dtype=np.float32)
+            except (TypeError, ValueError):
+                continue
+            if vec.ndim != 1 or not vec.size:
+                continue
+            if self.dim is None:
+                self.dim = int(vec.size)
+            norm = float(np.linalg.norm(vec))
+            if vec.size != self.dim or norm == 0 or not np.isfinite(norm):
+                continue
+            usable.append((key, vec / norm, match))
+        if not usable:
+            return
+
+        self._reserve(len(usable))
+        start = self._size
+        for offset, (key, vec, match) in enumerate(usable):
+            row = start + offset
+            self._rows[row] = vec
+            self._job[row] = slot
+            self._keys.append(key)
+            self._set_match(row, match)
+        self._size += len(usable)
+
+    def _set_match(self, row: int, match: Any) -> None:
+        if isinstance(match, dict) and match.get("is_no_face"):
+            code, name, sim = _NO_FACE, _NO_MATCH, 0.0
+        elif isinstance(match, dict) and match.get("person_id") is not None:
+            code = self._person_code(str(match.get("person_id")))
+            name = self._name_code(match.get("name"))
+            try:
+                sim = float(match.get("similarity") or 0.0)
+            except (TypeError, ValueError):
+                sim = 0.0
+        else:
+            code, name, sim = _NO_MATCH, _NO_MATCH, 0.0
+        self._code[row] = code
+        self._name[row] = name
+        self._sim[row] = sim
+
+    def _candidates(
+        self,
+        people: list[dict[str, Any]],
+        threshold: float,
+        changed_person_ids: list[Any] | None,
+    ) -> Any:
+        """Rows whose best match could differ after editing changed_person_ids."""
+        size = self._size
+        codes = self._code[:size]
+        eligible = codes != _NO_FACE
+        if changed_person_ids is None or self._threshold != threshold:
+            return np.flatnonzero(eligible)
+
+        changed = {str(pid) for pid in changed_person_ids}
+        affected = np.isin(codes, [self._codes[pid] for pid in changed if pid in self._codes])
+        edited = [p for p in people if str(p.get("id")) in changed]
+        if edited:
+            positions, scores = FaceIndex(edited).best_matches(self._rows[:size], threshold)
+            current = np.where(codes >= 0, self._sim[:size], -np.inf)
+            affected |= (positions >= 0) & (scores >= current - _SIMILARITY_EPSILON)
+        return np.flatnonzero(affected & eligible)
+
+    def rematch(
+        self,
+        people: list[dict[str, Any]],
+        threshold: float,
+        changed_person_ids: list[Any] | None = None,
+        face_index: FaceIndex | None = None,
+    ) -> int:
+        """Re-match stored faces after a people DB edit and write the deltas.
+
+        Args:
+            people: Current people database list
+            threshold: Minimum similarity threshold for matches
+            changed_person_ids: People that were added, edited, renamed or
+                deleted; None re-matches every face
+            face_index: Prebuilt index of people (built when omitted)
+
+        Returns:
+            Number of results whose face_matches.json was updated
+        """
+        with self._lock:
+            if not self._size:
+                self._threshold = threshold
+                return 0
+            candidates = self._candidates(people, threshold, changed_person_ids)
+            self._threshold = threshold
+            if not candidates.size:
+                return 0
+
+            face_index = face_index if face_index is not None else FaceIndex(people)
+            positions, scores = face_index.best_matches(self._rows[candidates], threshold)
+            matched = positions >= 0
+            person_codes = np.asarray(
+                [self._person_code(str(p.get("id"))) for p in people] or [0], dtype=np.int32
+            )
+            name_codes = np.asarray(
+                [self._name_code(p.get("name")) for p in people] or [0], dtype=np.int32
+            )
+            safe_positions = np.where(matched, positions, 0)
+            new_code = np.where(matched, person_codes[safe_positions], _NO_MATCH)
+            new_name = np.where(matched, name_codes[safe_positions], _NO_MATCH)
+            new_sim = np.where(matched, np.round(scores, 4), 0.0).astype(np.float32)
+
+            differs = (new_code != self._code[candidates]) | (new_name != self._name[candidates])
+            differs |= matched & (np.abs(new_sim - self._sim[candidates]) > _SIMILARITY_EPSILON)
+            changed_rows = candidates[differs]
+            if not changed_rows.size:
+                return 0
+
+            changes: dict[int, dict[str, Any]] = {}
+            for row, pos, sim in zip(changed_rows, positions[differs], new_sim[differs]):
+                match = None
+                if pos >= 0:
+                    person = people[int(pos)]
+                    match = {
+                        "person_id": person.get("id"),
+                        "name": person.get("name"),
+                        "similarity": round(float(sim), 4),
+                    }
+                changes.setdefault(int(self._job[row]), {})[self._keys[row]] = match
+            self._code[changed_rows] = new_code[differs]
+            self._name[changed_rows] = new_name[differs]
+            self._sim[changed_rows] = new_sim[differs]
+
+            updated = 0
+            for slot, job_changes in changes.items():
+                job_dir = self._job_dirs[slot]
+                try:
+                    write_face_match_deltas(job_dir, job_changes)
+                    updated += 1
+                except OSError as e:
+                    _LOGGER.warning("Failed to write face match changes for %s: %s", job_dir, e)
+            _LOGGER.debug(
+                "Face re-match: %d candidates, %d changed faces in %d results",
+                candidates.size, changed_rows.size, updated,
+            )
+            return updated
+
+
+def rematch_job_files(
+    job_dirs: list[str],
+    people: list[dict[str, Any]],
+    threshold: float,
+    face_index: FaceIndex | None = None,
+) -> int:
+    """Re-match faces result by result (fallback without NumPy).
+
+    Without NumPy there are no faces.npy sidecars, so only inline embeddings
+    are matched; changes are still written as face_matches.json deltas.
+    """
+    face_index = face_index if face_index is not None else FaceIndex(people)
+    updated = 0
+    for job_dir in job_dirs:
+        try:
+            with open(os.path.join(job_dir, "result.json"), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        deltas = load_face_match_deltas(job_dir)
+        keys, embeddings, old_matches = [], [], []
+        for det_idx, det in enumerate(data.get("detections") or []):
+            for face_idx, face in enumerate(det.get("faces") or []):
+                if isinstance(face, dict) and isinstance(face.get("embedding"), list) and face["embedding"]:
+                    key = face_position_key(det_idx, face_idx)
+                    keys.append(key)
+                    embeddings.append(face["embedding"])
+                    old_matches.append(deltas[key] if key in deltas else face.get("match"))
+        if not keys:
+            continue
+        changes = {
+            key: new for key, new, old in zip(keys, face_index.match(embeddings, threshold), old_matches)
+            if new != old
+        }
+        if changes:
+            try:
+                write_face_match_deltas(job_dir, changes)
+                updated += 1
+            except OSError as e:
+                _LOGGER.warning("Failed to write face match changes for %s: %s", job_dir, e)
+    return updated
+
+
+# One store per analysis output directory
+_stores: dict[str, FaceHistoryStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_face_history_store(output_dir: str) -> FaceHistoryStore | None:
+    """Shared FaceHistoryStore of an output directory, None without NumPy."""
+    if np is None:
+        return None
+    with _stores_lock:
+        store = _stores.get(output_dir)
+        if store is None:
+            store = _stores[output_dir] = FaceHistoryStore()
+        return store
@@ -0,0 +1,244 @@
+"""Binary sidecar storage for face data of analysis results.
+
+v1.4.0: Face embeddings and thumbnails used to be inlined in result.json as
+JSON float lists and base64 data URLs, which made result files several MB
+and every reader parsed all of it. They now live next to result.json:
+
+- faces.npy: float32 matrix, one row per stored embedding
+  (face["embedding_idx"] is the row)
+- faces/<n>.jpg: face thumbnails (face["thumb_file"] is the file name),
+  served by the analysis face view
+- face_matches.json: match changes from re-matching after people DB edits,
+  keyed by "<detection>/<face>" position, applied on top of result.json
+
+Readers that need the data (result viewer, re-matching) load it lazily with
+``hydrate_face_data`` / ``load_embedding_rows``. Results without sidecars
+(older analyses, or no NumPy) keep the inline fields and are read unchanged.
+"""
+import base64
+import json
+import logging
+import os
+import re
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_LOGGER = logging.getLogger(__name__)
+
+FACE_EMBEDDINGS_FILE = "faces.npy"
+FACE_THUMBS_DIR = "faces"
+FACE_MATCHES_FILE = "face_matches.json"
+
+# URL of the HTTP view serving face thumbnails: {job} is the analysis folder name
+ANALYSIS_FACE_URL_PREFIX = "/api/rtsp_recorder/analysis_face/"
+
+_DATA_URL_PREFIX = "data:image/jpeg;base64,"
+_THUMB_FILE_RE = re.compile(r"^\d+\.jpg$")
+_JOB_NAME_RE = re.compile(r"^analysis_[\w-]+$")
+
+
+def _iter_faces(detections: list[dict[str, Any]]):
+    """Yield every face dict of a detections list."""
+    for det in detections or []:
+        for face in det.get("faces") or []:
+            if isinstance(face, dict):
+                yield face
+
+
+def externalize_face_data(job_dir: str, detections: list[dict[str, Any]]) -> dict[str, int]:
+    """Move inline embeddings and thumbnails of detections into sidecar files.
+
+    Modifies the face dicts in place: "embedding" becomes "embedding_idx" and
+    "thumb" becomes "thumb_file". Embeddings whose dimension differs from the
+    first one, or all of them without NumPy, stay inline.
+
+    Args:
+        job_dir: Analysis folder (contains result.json)
+        detections: Result detections list
+
+    Returns:
+        Dict with the number of externalized embeddings and thumbnails
+    """
+    vectors: list[list[float]] = []
+    vector_faces: list[dict[str, Any]] = []
+    thumbs = 0
+    thumbs_dir = os.path.join(job_dir, FACE_THUMBS_DIR)
+
+    for face in _iter_faces(detections):
+        thumb = face.get("thumb")
+        if isinstance(thumb, str) and thumb.startswith(_DATA_URL_PREFIX):
+            try:
+                data = base64.b64decode(thumb[len(_DATA_URL_PREFIX):])
+            except ValueError:
+                data = None
+            if data:
+                os.makedirs(thumbs_dir, exist_ok=True)
+                filename = f"{thumbs}.jpg"
+                with open(os.path.join(thumbs_dir, filename), "wb") as f:
+                    f.write(data)
+                face["thumb_file"] = filename
+                del face["thumb"]
+                thumbs += 1
+
+        emb = face.get("embedding")
+        if np is not None and isinstance(emb, list) and emb:
+            if not vectors or len(emb) == len(vectors[0]):
+                vectors.append(emb)
+                vector_faces.append(face)
+
+    if vectors:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        tmp_path = os.path.join(job_dir, FACE_EMBEDDINGS_FILE + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, matrix)
+        os.replace(tmp_path, os.path.join(job_dir, FACE_EMBEDDINGS_FILE))
+        for idx, face in enumerate(vector_faces):
+            face["embedding_idx"] = idx
+            del face["embedding"]
+
+    return {"embeddings": len(vectors), "thumbs": thumbs}
+
+
+def face_position_key(det_idx: int, face_idx: int) -> str:
+    """Key of a face in face_matches.json."""
+    return f"{det_idx}/{face_idx}"
+
+
+def load_face_match_deltas(job_dir: str) -> dict[str, Any]:
+    """Read a result's face_matches.json, empty if missing or unreadable."""
+    path = os.path.join(job_dir, FACE_MATCHES_FILE)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        _LOGGER.warning("Failed to read %s: %s", path, e)
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def write_face_match_deltas(job_dir: str, changes: dict[str, Any]) -> None:
+    """Merge match changes into a result's face_matches.json.
+    
+    Args:
+        job_dir: Analysis folder
+        changes: Position key -> new match dict, or None for "no match"
+    """
+    if not changes:
+        return
+    deltas = load_face_match_deltas(job_dir)
+    deltas.update(changes)
+    path = os.path.join(job_dir, FACE_MATCHES_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(deltas, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def apply_face_match_deltas(job_dir: str, detections: list[dict[str, Any]]) -> None:
+    """Apply face_matches.json to the faces of a result (in place)."""
+    deltas = load_face_match_deltas(job_dir)
+    if not deltas:
+        return
+    for det_idx, det in enumerate(detections or []):
+        for face_idx, face in enumerate(det.get("faces") or []):
+            key = face_position_key(det_idx, face_idx)
+            if key not in deltas or not isinstance(face, dict):
+                continue
+            if deltas[key]:
+                face["match"] = deltas[key]
+            else:
+                face.pop("match", None)
+
+
+def load_embedding_rows(job_dir: str, indices: list[int]) -> list[list[float] | None]:
+    """Read selected rows of a result's faces.npy (memory-mapped).
+
+    Args:
+        job_dir: Analysis folder
+        indices: Row numbers (embedding_idx values)
+
+    Returns:
+        One embedding list per index, None where unavailable
+    """
+    if not indices:
+        return []
+    path = os.path.join(job_dir, FACE_EMBEDDINGS_FILE)
+    if np is None or not os.path.exists(path):
+        return [None] * len(indices)
+    try:
+        matrix = np.load(path, mmap_mode="r")
+    except (OSError, ValueError) as e:
+        _LOGGER.warning("Failed to read %s: %s", path, e)
+        return [None] * len(indices)
+    rows: list[list[float] | None] = []
+    for idx in indices:
+        if isinstance(idx, int) and 0 <= idx < matrix.shape[0]:
+            rows.append(matrix[idx].tolist())
+        else:
+            rows.append(None)
+    return rows
+
+
+def face_thumb_url(job_dir: str, thumb_file: str) -> str:
+    """URL of a sidecar thumbnail served by the analysis face view."""
+    return f"{ANALYSIS_FACE_URL_PREFIX}{os.path.basename(job_dir)}/{thumb_file}"
+
+
+def hydrate_face_data(job_dir: str, detections: list[dict[str, Any]]) -> None:
+    """Restore "embedding" and "thumb" on faces that point at sidecar files.
+
+    Embeddings are read from faces.npy; thumbnails become view URLs so the
+    image bytes are only fetched when the browser shows them.
+
+    Args:
+        job_dir: Analysis folder
+        detections: Result detections list (modified in place)
+    """
+    with_embedding = []
+    for face in _iter_faces(detections):
+        thumb_file = face.pop("thumb_file", None)
+        if thumb_file and "thumb" not in face:
+            face["thumb"] = face_thumb_url(job_dir, thumb_file)
+        if "embedding_idx" in face:
+            with_embedding.append(face)
+
+    rows = load_embedding_rows(job_dir, [face.pop("embedding_idx") for face in with_embedding])
+    for face, row in zip(with_embedding, rows):
+        if row is not None:
+            face["embedding"] = row
+
+
+def resolve_face_thumb_path(output_dir: str, job: str, filename: str) -> str | None:
+    """Map a face view request to a file inside output_dir, None if invalid."""
+    if not _JOB_NAME_RE.match(job or "") or not _THUMB_FILE_RE.match(filename or ""):
+        return None
+    return os.path.join(output_dir, job, FACE_THUMBS_DIR, filename)
+
+
+def inline_face_thumb(output_dir: str, thumb: str | None) -> str | None:
+    """Turn an analysis face view URL back into a data URL.
+
+    People DB thumbnails must outlive the analysis folder (retention), so a
+    face picked from an analysis result is stored self-contained.
+
+    Args:
+        output_dir: Analysis output directory
+        thumb: Thumbnail as sent by the card
+
+    Returns:
+        Data URL for view URLs that resolve to a file, otherwise thumb unchanged
+    """
+    if not thumb or not thumb.startswith(ANALYSIS_FACE_URL_PREFIX):
+        return thumb
+    job, _, filename = thumb[len(ANALYSIS_FACE_URL_PREFIX):].partition("/")
+    path = resolve_face_thumb_path(output_dir, job, filename)
+    if not path or not os.path.isfile(path):
+        return thumb
+    with open(path, "rb") as f:
+        return _DATA_URL_PREFIX + base64.b64encode(f.read()).decode("ascii")
@@ -0,0 +1,202 @@
+"""Completion notifications for recording files.
+
+v1.4.0: Waiting for HA camera.record used to sleep for the clip duration and
+then poll for the file, and auto-analysis polled the size until it was
+stable, which added seconds of dead time between clip end and results.
+``FileWatcher`` uses Linux inotify (through ctypes, no extra dependency) in
+a background thread and resolves a waiter as soon as its file is renamed
+into place (``.tmp`` -> ``.mp4``) or closed after writing.
+
+Where inotify is not available (non-Linux, exhausted watch limit)
+``expect`` returns None and callers keep their polling fallback.
+"""
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+
+_LOGGER = logging.getLogger(__name__)
+
+# inotify constants (linux/inotify.h)
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_IGNORED = 0x00008000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO
+
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+def _load_libc():
+    """libc with inotify support, None if unavailable."""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1") or not hasattr(libc, "inotify_add_watch"):
+        return None
+    return libc
+
+
+def parse_events(buffer: bytes) -> list[tuple[int, int, str]]:
+    """Split a read from the inotify descriptor into (wd, mask, name)."""
+    events = []
+    offset = 0
+    while offset + _EVENT_HEADER.size <= len(buffer):
+        wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buffer, offset)
+        offset += _EVENT_HEADER.size
+        name = buffer[offset:offset + length].split(b"\0", 1)[0].decode("utf-8", errors="surrogateescape")
+        offset += length
+        events.append((wd, mask, name))
+    return events
+
+
+class FileWatcher:
+    """Resolve futures when files in watched folders are finished.
+
+    ``expect`` and ``wait`` run on the event loop; the reader thread hands
+    finished paths back with ``call_soon_threadsafe``.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._libc = None
+        self._fd: int | None = None
+        self._wake_r: int | None = None
+        self._wake_w: int | None = None
+        self._thread: threading.Thread | None = None
+        self._watches: dict[str, int] = {}
+        self._folders: dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._waiters: dict[str, list[asyncio.Future]] = {}
+
+    @property
+    def available(self) -> bool:
+        """Whether inotify is active."""
+        return self._fd is not None
+
+    def start(self) -> bool:
+        """Open inotify and start the reader thread; False if unavailable."""
+        if self._fd is not None:
+            return True
+        libc = _load_libc()
+        if libc is None:
+            _LOGGER.debug("inotify not available, file completion falls back to polling")
+            return False
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            _LOGGER.debug("inotify_init1 failed: %s", os.strerror(ctypes.get_errno()))
+            return False
+        self._libc = libc
+        self._fd = fd
+        self._wake_r, self._wake_w = os.pipe()
+        self._thread = threading.Thread(target=self._run, name="rtsp_recorder_file_watcher", daemon=True)
+        self._thread.start()
+        return True
+
+    async def async_stop(self) -> None:
+        """Stop the reader thread and cancel pending waiters."""
+        thread, self._thread = self._thread, None
+        if self._fd is None or thread is None:
+            return
+        os.write(self._wake_w, b"x")
+        # Joined in the executor so the event loop never blocks on it
+        await self._loop.run_in_executor(None, thread.join, 2)
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._fd = self._wake_r = self._wake_w = None
+        with self._lock:
+            self._watches.clear()
+            self._folders.clear()
+        for futures in self._waiters.values():
+            for future in futures:
+                if not future.done():
+                    future.cancel()
+        self._waiters.clear()
+
+    def expect(self, path: str) -> asyncio.Future | None:
+        """Register interest in path before it is written.
+
+        Returns:
+            Future resolved when path is finished, None without inotify (or
+            if its folder cannot be watched)
+        """
+        if self._fd is None:
+            return None
+        path = os.path.abspath(path)
+        if not self._watch_folder(os.path.dirname(path)):
+            return None
+        future = self._loop.create_future()
+        self._waiters.setdefault(path, []).append(future)
+        return future
+
+    async def wait(self, path: str, future: asyncio.Future, timeout: float) -> bool:
+        """Wait for a future from expect; False on timeout."""
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+            return True
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            self._discard(os.path.abspath(path), future)
+            return False
+
+    def _discard(self, path: str, future: asyncio.Future) -> None:
+        futures = self._waiters.get(path)
+        if futures and future in futures:
+            futures.remove(future)
+            if not futures:
+                del self._waiters[path]
+
+    def _watch_folder(self, folder: str) -> bool:
+        with self._lock:
+            if folder in self._watches:
+                return True
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(folder), _WATCH_MASK)
+        if wd < 0:
+            _LOGGER.debug("Cannot watch %s: %s", folder, os.strerror(ctypes.get_errno()))
+            return False
+        with self._lock:
+            self._watches[folder] = wd
+            self._folders[wd] = folder
+        return True
+
+    def _run(self) -> None:
+        while True:
+            try:
+                readable, _, _ = select.select([self._fd, self._wake_r], [], [])
+            except (OSError, ValueError):
+                return
+            if self._wake_r in readable:
+                return
+            try:
+                buffer = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                continue
+            except OSError:
+                return
+            for wd, mask, name in parse_events(buffer):
+                with self._lock:
+                    if mask & _IN_IGNORED:
+                        folder = self._folders.pop(wd, None)
+                        if folder is not None:
+                            self._watches.pop(folder, None)
+                        continue
+                    folder = self._folders.get(wd)
+                if folder is None or not name or not mask & _WATCH_MASK:
+                    continue
+                self._loop.call_soon_threadsafe(self._resolve, os.path.join(folder, name))
+
+    def _resolve(self, path: str) -> None:
+        for future in self._waiters.pop(path, []):
+            if not future.done():
+                future.set_result(True)
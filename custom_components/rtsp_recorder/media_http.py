@@ -0,0 +1,120 @@
+"""HTTP caching and byte-range helpers for the media views.
+
+v1.4.0: Validators (ETag from size + mtime, Last-Modified), conditional
+request evaluation (If-None-Match, If-Modified-Since, If-Range) and Range
+header parsing for serving recordings without buffering them in memory.
+"""
+import email.utils
+import os
+from typing import Mapping
+
+# Chunk size for incremental file reads (multi-range responses)
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# A Range header with more ranges than this is ignored (full file, 200)
+MAX_RANGES = 16
+
+
+def file_etag(stats: os.stat_result) -> str:
+    """Strong ETag derived from file size and modification time."""
+    return f'"{stats.st_mtime_ns:x}-{stats.st_size:x}"'
+
+
+def http_date(timestamp: float) -> str:
+    """Format a timestamp as an HTTP date (Last-Modified)."""
+    return email.utils.formatdate(timestamp, usegmt=True)
+
+
+def _parse_http_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def _etag_list_matches(header: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match list against etag."""
+    if header.strip() == "*":
+        return True
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == bare:
+            return True
+    return False
+
+
+def is_not_modified(headers: Mapping[str, str], etag: str, mtime: float) -> bool:
+    """Whether a GET can be answered with 304 Not Modified.
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+    """
+    if_none_match = headers.get("If-None-Match")
+    if if_none_match is not None:
+        return _etag_list_matches(if_none_match, etag)
+    since = _parse_http_date(headers.get("If-Modified-Since"))
+    return since is not None and int(mtime) <= since
+
+
+def range_applies(headers: Mapping[str, str], etag: str, mtime: float) -> bool:
+    """Whether the Range header may be honoured given If-Range."""
+    if_range = headers.get("If-Range")
+    if not if_range:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        # Strong comparison, weak validators never match
+        return if_range == etag
+    date = _parse_http_date(if_range)
+    return date is not None and int(mtime) <= date
+
+
+def parse_range_header(header: str | None, size: int) -> list[tuple[int, int]] | None:
+    """Parse a "bytes=" Range header into inclusive (start, end) pairs.
+
+    Args:
+        header: Range header value
+        size: File size in bytes
+
+    Returns:
+        Satisfiable ranges in request order, empty if none is satisfiable
+        (416), or None when the header is absent, malformed or asks for too
+        many ranges (the header is ignored, RFC 9110)
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec.strip():
+        return None
+    specs = [part.strip() for part in spec.split(",") if part.strip()]
+    if not specs or len(specs) > MAX_RANGES:
+        return None
+
+    ranges: list[tuple[int, int]] = []
+    for part in specs:
+        first, sep, last = part.partition("-")
+        if not sep:
+            return None
+        try:
+            if first:
+                start = int(first)
+                end = int(last) if last else max(start, size - 1)
+                if start < 0 or end < start:
+                    return None
+            else:
+                suffix = int(last)
+                if suffix < 0:
+                    return None
+                if suffix == 0:
+                    continue
+                start, end = max(0, size - suffix), size - 1
+        except ValueError:
+            return None
+        if start >= size:
+            continue
+        ranges.append((start, min(end, size - 1)))
+    return ranges
@@ -11,6 +11,21 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable
 
+try:
+    from .database import (
+        CREATE_ANALYSIS_INDEX_TABLE,
+        CREATE_CENTROIDS_TABLE,
+        CREATE_RECORDINGS_TABLE,
+        rebuild_person_centroids,
+    )
+except ImportError:
+    from database import (
+        CREATE_ANALYSIS_INDEX_TABLE,
+        CREATE_CENTROIDS_TABLE,
+        CREATE_RECORDINGS_TABLE,
+        rebuild_person_centroids,
+    )
+
 try:
     from .exceptions import MigrationError, DatabaseConnectionError
 except ImportError:
@@ -26,7 +41,7 @@ except ImportError:
 _LOGGER = logging.getLogger(__name__)
 
 # Current schema version
-CURRENT_SCHEMA_VERSION = 2
+CURRENT_SCHEMA_VERSION = 5
 
 
 @dataclass
@@ -96,6 +111,106 @@ def _migration_v2_down(conn: sqlite3.Connection) -> None:
     _LOGGER.info("Migration v2→v1 rollback completed")
 
 
+def _migration_v2_to_v3(conn: sqlite3.Connection) -> None:
+    """Migration from v2 to v3: Persist per-person centroids.
+    
+    Changes:
+    - Add person_centroids table (running sum, count and centroid)
+    - Backfill it from existing face_embeddings
+    """
+    cursor = conn.cursor()
+    
+    cursor.executescript(CREATE_CENTROIDS_TABLE)
+    
+    cursor.execute("""
+        SELECT name FROM sqlite_master 
+        WHERE type='table' AND name='face_embeddings'
+    """)
+    rebuilt = rebuild_person_centroids(conn) if cursor.fetchone() else 0
+    
+    # Record migration
+    cursor.execute(
+        "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+        (3, "Add persisted person centroids")
+    )
+    
+    conn.commit()
+    _LOGGER.info(f"Migration v2→v3 completed: Backfilled centroids for {rebuilt} people")
+
+
+def _migration_v3_down(conn: sqlite3.Connection) -> None:
+    """Rollback migration v3 to v2."""
+    cursor = conn.cursor()
+    
+    cursor.execute("DROP TABLE IF EXISTS person_centroids")
+    cursor.execute("DELETE FROM schema_version WHERE version = 3")
+    
+    conn.commit()
+    _LOGGER.info("Migration v3→v2 rollback completed")
+
+
+def _migration_v3_to_v4(conn: sqlite3.Connection) -> None:
+    """Migration from v3 to v4: Add the analysis result index.
+    
+    Changes:
+    - Add analysis_index table (filled by the analysis folder importer)
+    """
+    cursor = conn.cursor()
+    
+    cursor.executescript(CREATE_ANALYSIS_INDEX_TABLE)
+    
+    # Record migration
+    cursor.execute(
+        "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+        (4, "Add analysis result index")
+    )
+    
+    conn.commit()
+    _LOGGER.info("Migration v3→v4 completed: Added analysis result index")
+
+
+def _migration_v4_down(conn: sqlite3.Connection) -> None:
+    """Rollback migration v4 to v3."""
+    cursor = conn.cursor()
+    
+    cursor.execute("DROP TABLE IF EXISTS analysis_index")
+    cursor.execute("DELETE FROM schema_version WHERE version = 4")
+    
+    conn.commit()
+    _LOGGER.info("Migration v4→v3 rollback completed")
+
+
+def _migration_v4_to_v5(conn: sqlite3.Connection) -> None:
+    """Migration from v4 to v5: Add the recording catalog.
+    
+    Changes:
+    - Add recordings table (filled by the reconciling storage scan)
+    """
+    cursor = conn.cursor()
+    
+    cursor.executescript(CREATE_RECORDINGS_TABLE)
+    
+    # Record migration
+    cursor.execute(
+        "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+        (5, "Add recording catalog")
+    )
+    
+    conn.commit()
+    _LOGGER.info("Migration v4→v5 completed: Added recording catalog")
+
+
+def _migration_v5_down(conn: sqlite3.Connection) -> None:
+    """Rollback migration v5 to v4."""
+    cursor = conn.cursor()
+    
+    cursor.execute("DROP TABLE IF EXISTS recordings")
+    cursor.execute("DELETE FROM schema_version WHERE version = 5")
+    
+    conn.commit()
+    _LOGGER.info("Migration v5→v4 rollback completed")
+
+
 # Migration registry
 MIGRATIONS: list[Migration] = [
     Migration(
@@ -104,6 +219,24 @@ MIGRATIONS: list[Migration] = [
         up=_migration_v1_to_v2,
         down=_migration_v2_down,
     ),
+    Migration(
+        version=3,
+        description="Add persisted person centroids",
+        up=_migration_v2_to_v3,
+        down=_migration_v3_down,
+    ),
+    Migration(
+        version=4,
+        description="Add analysis result index",
+        up=_migration_v3_to_v4,
+        down=_migration_v4_down,
+    ),
+    Migration(
+        version=5,
+        description="Add recording catalog",
+        up=_migration_v4_to_v5,
+        down=_migration_v5_down,
+    ),
 ]
 
 
@@ -310,6 +443,10 @@ def initialize_schema(conn: sqlite3.Connection) -> None:
         ON recognition_history(camera_name, recognized_at DESC)
     """)
     
+    cursor.executescript(CREATE_CENTROIDS_TABLE)
+    cursor.executescript(CREATE_ANALYSIS_INDEX_TABLE)
+    cursor.executescript(CREATE_RECORDINGS_TABLE)
+    
     # Record current version
     cursor.execute(
         "INSERT OR REPLACE INTO schema_version (version, description) VALUES (?, ?)",
@@ -17,6 +17,7 @@ import sqlite3
 from typing import Any, Optional
 
 from .const import PEOPLE_DB_VERSION
+from .face_matching import FaceIndex
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,6 +27,17 @@ _sqlite_db = None
 # Global lock for database operations
 _people_lock = asyncio.Lock()
 
+# v1.4.0: Vector-only people snapshot for matching. Replaced wholesale (never
+# mutated) whenever DatabaseManager.people_generation moves on.
+_people_snapshot: dict[str, Any] | None = None
+_people_snapshot_generation = -1
+
+# v1.4.0: FaceIndex of the current snapshot (people and ignored embeddings),
+# shared by every analysis, re-match and ignore filter until the next write
+_face_index: FaceIndex | None = None
+_face_index_snapshot: dict[str, Any] | None = None
+_face_index_lock = asyncio.Lock()
+
 
 def _default_people_db() -> dict[str, Any]:
     """Create a new empty people database structure.
@@ -46,18 +58,118 @@ def _default_people_db() -> dict[str, Any]:
 async def _load_people_db(use_cache: bool = True) -> dict[str, Any]:
     """Load people database from SQLite.
     
+    With ``use_cache`` the shared vector-only snapshot is returned (no
+    thumbnails). It is rebuilt only after a people/embedding write bumped the
+    database generation, so concurrent readers normally get it without taking
+    the lock. The snapshot is shared and must be treated as read-only.
+    
     Args:
-        use_cache: Ignored (kept for API compatibility)
+        use_cache: Return the cached snapshot; False loads a fresh copy
+            including embedding thumbnails (UI views)
         
     Returns:
         People database dict
     """
+    global _people_snapshot, _people_snapshot_generation
+    
+    if not _sqlite_db:
+        _LOGGER.warning("SQLite database not initialized")
+        return _default_people_db()
+    
+    if not use_cache:
+        async with _people_lock:
+            return await _load_people_from_sqlite()
+    
+    snapshot = _people_snapshot
+    if snapshot is not None and _people_snapshot_generation == _sqlite_db.people_generation:
+        return snapshot
+    
     async with _people_lock:
-        if not _sqlite_db:
-            _LOGGER.warning("SQLite database not initialized")
+        # Read the generation before loading: a write racing the load bumps
+        # it again afterwards and forces the next reader to reload.
+        generation = _sqlite_db.people_generation
+        if _people_snapshot is not None and _people_snapshot_generation == generation:
+            return _people_snapshot
+        try:
+            snapshot = await asyncio.to_thread(_build_people_vectors)
+        except sqlite3.Error as e:
+            _LOGGER.error(f"Failed to load people snapshot from SQLite: {e}")
             return _default_people_db()
-        
-        return await _load_people_from_sqlite()
+        _people_snapshot = snapshot
+        _people_snapshot_generation = generation
+        return snapshot
+
+
+async def _load_people_index() -> tuple[dict[str, Any], FaceIndex]:
+    """Load the people snapshot together with its shared FaceIndex.
+    
+    The index is built once per snapshot, i.e. again only after a write
+    bumped the database generation. Its people rows follow the order of
+    ``snapshot["people"]``, so both must come from the same call.
+    
+    Returns:
+        Tuple of (people snapshot, FaceIndex of its people and ignored embeddings)
+    """
+    global _face_index, _face_index_snapshot
+    
+    snapshot = await _load_people_db()
+    index = _face_index
+    if index is not None and _face_index_snapshot is snapshot:
+        return snapshot, index
+    
+    async with _face_index_lock:
+        if _face_index is not None and _face_index_snapshot is snapshot:
+            return snapshot, _face_index
+        index = await asyncio.to_thread(
+            FaceIndex, snapshot.get("people", []), None, snapshot.get("ignored_embeddings", [])
+        )
+        # Only the shared snapshot is cached (not the empty fallback)
+        if snapshot is _people_snapshot:
+            _face_index = index
+            _face_index_snapshot = snapshot
+        return snapshot, index
+
+
+def _invalidate_people_snapshot() -> None:
+    """Drop the cached people snapshot (backend switched or closed)."""
+    global _people_snapshot, _people_snapshot_generation, _face_index, _face_index_snapshot
+    _people_snapshot = None
+    _people_snapshot_generation = -1
+    _face_index = None
+    _face_index_snapshot = None
+
+
+def _build_people_vectors() -> dict[str, Any]:
+    """Build the people dict with vectors only (runs in executor).
+    
+    Uses one query per table instead of two per person and skips thumbnails.
+    """
+    embeddings = _sqlite_db.get_all_embeddings()
+    negatives = _sqlite_db.get_all_negative_embeddings()
+    centroids = _sqlite_db.get_all_centroids()
+    
+    people_list = []
+    for p in _sqlite_db.get_all_people():
+        person_id = p.get("id")
+        people_list.append({
+            "id": person_id,
+            "name": p.get("name"),
+            "created_utc": p.get("created_at", ""),
+            "embeddings": [{"vector": v} for v in embeddings.get(person_id, [])],
+            "negative_embeddings": [{"vector": v} for v in negatives.get(person_id, [])],
+            "centroid": centroids.get(person_id),
+        })
+    
+    ignored = [{"embedding": emb} for emb in _sqlite_db.get_ignored_embeddings() if emb]
+    
+    now_utc = datetime.datetime.now(datetime.timezone.utc)
+    return {
+        "version": PEOPLE_DB_VERSION,
+        "people": people_list,
+        "ignored_embeddings": ignored,
+        "created_utc": now_utc.strftime("%Y%m%d_%H%M%S"),
+        "updated_utc": now_utc.strftime("%Y%m%d_%H%M%S"),
+    }
 
 
 async def _load_people_from_sqlite() -> dict[str, Any]:
@@ -74,6 +186,7 @@ async def _load_people_from_sqlite() -> dict[str, Any]:
     def _build_people_dict() -> dict[str, Any]:
         people_list = []
         sqlite_people = _sqlite_db.get_all_people()
+        centroids = _sqlite_db.get_all_centroids() if hasattr(_sqlite_db, 'get_all_centroids') else {}
 
         for p in sqlite_people:
             person_id = p.get("id")
@@ -96,7 +209,7 @@ async def _load_people_from_sqlite() -> dict[str, Any]:
                 "created_utc": p.get("created_at", ""),
                 "embeddings": embeddings,
                 "negative_embeddings": negative_embeddings,
-                "centroid": None,
+                "centroid": centroids.get(person_id),
             })
 
         # Get ignored embeddings
@@ -331,6 +444,7 @@ def enable_sqlite_backend(config_path: str = "/config") -> bool:
     """
     global _sqlite_db
     
+    _invalidate_people_snapshot()
     try:
         from .database import get_database
         
@@ -358,6 +472,7 @@ def disable_sqlite_backend() -> None:
         close_database()
     
     _sqlite_db = None
+    _invalidate_people_snapshot()
     _LOGGER.info("SQLite backend disabled")
 
 
@@ -0,0 +1,637 @@
+"""Pre-record ring buffer for RTSP cameras.
+
+v1.4.0: Motion-triggered clips used to miss the first seconds after the
+trigger (FFmpeg start plus RTSP handshake). Cameras with a pre-record time
+now keep one FFmpeg segmenter running that stream-copies the camera into
+short MP4 segments in a RAM backed folder (/dev/shm when available). The
+segments form a ring per camera: anything older than the pre-record time is
+deleted, and a memory budget shared by all cameras caps the total size.
+
+An event pins the buffered pre-roll plus the segments the same process writes
+until the end of the clip, so the recording starts instantly and without a
+second RTSP session. The pinned segments are spliced into the final MP4 with
+the concat demuxer (stream copy, no re-encode); the snapshot is cut from the
+buffered segment at the snapshot delay.
+
+The old HLS based proof of concept (pre_record_poc.py) is superseded by this
+module.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Requested segment length; FFmpeg cuts at the next keyframe, so the real
+# length (and the pre-roll granularity) follows the camera's GOP
+SEGMENT_SECONDS = 1
+
+# Backoff between restarts of a failed segmenter
+RESTART_DELAY_MIN = 3
+RESTART_DELAY_MAX = 60
+
+# A segmenter that ran this long before failing resets the backoff
+STABLE_RUN_SECONDS = 60
+
+# Buffers whose newest segment is older than this are not used for events
+MAX_SEGMENT_AGE = 15
+
+_BUFFER_DIR_NAME = "rtsp_recorder_prerecord"
+
+
+def default_buffer_root() -> str:
+    """RAM backed base folder for segment rings (/dev/shm, else temp dir)."""
+    shm = "/dev/shm"
+    base = shm if os.path.isdir(shm) and os.access(shm, os.W_OK) else tempfile.gettempdir()
+    return os.path.join(base, _BUFFER_DIR_NAME)
+
+
+def build_segment_command(rtsp_url: str, segment_pattern: str) -> list[str]:
+    """FFmpeg command writing the camera stream as short MP4 segments.
+
+    Finished segments are announced on stdout as CSV lines
+    (``name,start,end``).
+    """
+    return [
+        "ffmpeg",
+        "-hide_banner",
+        "-loglevel", "error",
+        "-rtsp_transport", "tcp",
+        "-timeout", "5000000",
+        "-i", rtsp_url,
+        "-c", "copy",
+        "-f", "segment",
+        "-segment_time", str(SEGMENT_SECONDS),
+        "-segment_format", "mp4",
+        "-reset_timestamps", "1",
+        "-segment_list", "pipe:1",
+        "-segment_list_type", "csv",
+        segment_pattern,
+    ]
+
+
+def parse_segment_line(line: str) -> tuple[str, float] | None:
+    """Parse a segment list CSV line into (file name, duration)."""
+    parts = line.strip().rsplit(",", 2)
+    if len(parts) != 3:
+        return None
+    name = parts[0].strip('"')
+    try:
+        start, end = float(parts[1]), float(parts[2])
+    except ValueError:
+        return None
+    if not name:
+        return None
+    return os.path.basename(name), max(0.0, end - start)
+
+
+def _file_size(path: str) -> int | None:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+def _remove_files(paths: list[str]) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+@dataclass
+class BufferedSegment:
+    """One finished segment in a camera ring (wall clock times)."""
+
+    path: str
+    start: float
+    end: float
+    size: int
+    pins: int = 0
+
+
+class PreRecordCapture:
+    """Segments of one recording: buffered pre-roll plus live segments.
+
+    Created by ``CameraBuffer.begin_capture``. Live segments are appended as
+    the segmenter finishes them until one reaches ``end_time``; all of them
+    stay pinned (never evicted) until ``release``.
+    """
+
+    def __init__(self, buffer: "CameraBuffer", event_time: float, end_time: float,
+                 segments: list[BufferedSegment]) -> None:
+        self.buffer = buffer
+        self.event_time = event_time
+        self.end_time = end_time
+        self.segments = segments
+        self._done = asyncio.Event()
+        self._progress = asyncio.Event()
+        self._released = False
+
+    @property
+    def pre_roll_seconds(self) -> float:
+        """Seconds of footage before the event."""
+        if not self.segments:
+            return 0.0
+        return max(0.0, self.event_time - self.segments[0].start)
+
+    @property
+    def done(self) -> bool:
+        """Whether all live segments have arrived."""
+        return self._done.is_set()
+
+    def extend(self, end_time: float) -> bool:
+        """Move the end of the clip (motion re-trigger).
+
+        Returns:
+            False if the clip is already complete
+        """
+        if self.done:
+            return False
+        self.end_time = max(self.end_time, end_time)
+        return True
+
+    def _add(self, segment: BufferedSegment) -> None:
+        segment.pins += 1
+        self.segments.append(segment)
+        self._notify()
+
+    def _finish(self) -> None:
+        self._done.set()
+        self._notify()
+
+    def _notify(self) -> None:
+        self._progress.set()
+        self._progress = asyncio.Event()
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait until the clip is complete; False on timeout."""
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def wait_for_segment(self, wall_time: float, timeout: float) -> BufferedSegment | None:
+        """Segment containing wall_time (the last one if the clip ends earlier)."""
+        deadline = time.monotonic() + timeout
+        while True:
+            for segment in self.segments:
+                if segment.end >= wall_time:
+                    return segment
+            if self.done:
+                return self.segments[-1] if self.segments else None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            progress = self._progress
+            try:
+                await asyncio.wait_for(progress.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return None
+
+    def release(self) -> None:
+        """Unpin the segments so the ring can evict them."""
+        if self._released:
+            return
+        self._released = True
+        self.buffer._release(self)
+
+
+class CameraBuffer:
+    """Continuous segment ring of one camera."""
+
+    def __init__(self, manager: "PreRecordManager", camera: str, rtsp_url: str,
+                 pre_seconds: float, segment_dir: str) -> None:
+        self.manager = manager
+        self.camera = camera
+        self.rtsp_url = rtsp_url
+        self.pre_seconds = float(pre_seconds)
+        self.segment_dir = segment_dir
+        self._segments: deque[BufferedSegment] = deque()
+        self._captures: list[PreRecordCapture] = []
+        self._bytes = 0
+        self._process: asyncio.subprocess.Process | None = None
+        self._task: asyncio.Task | None = None
+        self._running = False
+        self._generation = 0
+        self._restarts = 0
+        self._last_error: str | None = None
+        self._started_at: float | None = None
+
+    # ----- state -----
+
+    @property
+    def size_bytes(self) -> int:
+        """Bytes held by the ring."""
+        return self._bytes
+
+    @property
+    def buffered_seconds(self) -> float:
+        """Seconds of footage currently in the ring."""
+        if not self._segments:
+            return 0.0
+        return self._segments[-1].end - self._segments[0].start
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the segmenter is running and delivering segments."""
+        return (
+            self._running
+            and self._process is not None
+            and self._process.returncode is None
+            and bool(self._segments)
+            and time.time() - self._segments[-1].end < MAX_SEGMENT_AGE
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Buffer statistics for the UI."""
+        return {
+            "running": self._running and self._process is not None and self._process.returncode is None,
+            "ready": self.is_ready,
+            "pre_record_seconds": self.pre_seconds,
+            "buffered_seconds": round(self.buffered_seconds, 1),
+            "buffered_mb": round(self._bytes / (1024 * 1024), 2),
+            "segments": len(self._segments),
+            "active_captures": len(self._captures),
+            "restarts": self._restarts,
+            "uptime_seconds": round(time.time() - self._started_at, 0) if self._started_at else 0,
+            "last_error": self._last_error,
+        }
+
+    # ----- lifecycle -----
+
+    def start(self) -> None:
+        """Start the segmenter task."""
+        if self._running:
+            return
+        self._running = True
+        self._task = asyncio.get_running_loop().create_task(
+            self._run(), name=f"rtsp_recorder_prerecord_{self.camera}"
+        )
+
+    async def stop(self) -> None:
+        """Stop the segmenter and drop the ring."""
+        self._running = False
+        await self._terminate()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        for capture in list(self._captures):
+            capture._finish()
+        self._captures.clear()
+        self._segments.clear()
+        self._bytes = 0
+        await asyncio.get_running_loop().run_in_executor(
+            None, lambda: shutil.rmtree(self.segment_dir, ignore_errors=True)
+        )
+
+    async def _terminate(self) -> None:
+        process = self._process
+        if process is None or process.returncode is not None:
+            return
+        try:
+            process.terminate()
+            await asyncio.wait_for(process.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            process.kill()
+        except ProcessLookupError:
+            pass
+
+    async def _run(self) -> None:
+        """Run the segmenter, restarting it with backoff when it exits."""
+        delay = RESTART_DELAY_MIN
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, lambda: os.makedirs(self.segment_dir, exist_ok=True))
+        while self._running:
+            self._generation += 1
+            pattern = os.path.join(self.segment_dir, f"g{self._generation}_%06d.mp4")
+            started = time.monotonic()
+            try:
+                self._process = await asyncio.create_subprocess_exec(
+                    *build_segment_command(self.rtsp_url, pattern),
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                if self._started_at is None:
+                    self._started_at = time.time()
+                _LOGGER.info("Pre-record buffer started for %s (%ss)", self.camera, self.pre_seconds)
+                stderr_task = loop.create_task(self._read_stderr(self._process))
+                async for raw in self._process.stdout:
+                    await self._on_segment_line(raw.decode("utf-8", errors="replace"))
+                await self._process.wait()
+                await stderr_task
+                if self._running:
+                    _LOGGER.warning(
+                        "Pre-record buffer for %s exited with code %s: %s",
+                        self.camera, self._process.returncode, self._last_error,
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._last_error = str(e)
+                _LOGGER.error("Pre-record buffer for %s failed: %s", self.camera, e)
+
+            if not self._running:
+                break
+            self._restarts += 1
+            if time.monotonic() - started > STABLE_RUN_SECONDS:
+                delay = RESTART_DELAY_MIN
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RESTART_DELAY_MAX)
+
+    async def _read_stderr(self, process: asyncio.subprocess.Process) -> None:
+        async for raw in process.stderr:
+            line = raw.decode("utf-8", errors="replace").strip()
+            if line:
+                self._last_error = line[-300:]
+
+    # ----- ring -----
+
+    async def _on_segment_line(self, line: str) -> None:
+        parsed = parse_segment_line(line)
+        if parsed is None:
+            return
+        name, duration = parsed
+        path = os.path.join(self.segment_dir, name)
+        end = time.time()
+        size = await asyncio.get_running_loop().run_in_executor(None, _file_size, path)
+        if size is None:
+            return
+        self._add_segment(BufferedSegment(path=path, start=end - duration, end=end, size=size))
+
+    def _add_segment(self, segment: BufferedSegment) -> None:
+        self._segments.append(segment)
+        self._bytes += segment.size
+        for capture in list(self._captures):
+            if segment.start < capture.end_time:
+                capture._add(segment)
+            if segment.end >= capture.end_time:
+                capture._finish()
+                self._captures.remove(capture)
+        self._trim()
+        self.manager._enforce_budget()
+
+    def _trim(self) -> None:
+        """Drop unpinned segments that ended before the pre-record window."""
+        if not self._segments:
+            return
+        horizon = self._segments[-1].end - self.pre_seconds
+        while self._segments and self._segments[0].pins == 0 and self._segments[0].end <= horizon:
+            self._drop_oldest()
+
+    def oldest_evictable(self) -> BufferedSegment | None:
+        """Oldest segment the memory budget may evict (never the newest)."""
+        if len(self._segments) > 1 and self._segments[0].pins == 0:
+            return self._segments[0]
+        return None
+
+    def _drop_oldest(self) -> None:
+        segment = self._segments.popleft()
+        self._bytes -= segment.size
+        self.manager._removals.append(segment.path)
+
+    # ----- events -----
+
+    def begin_capture(self, duration: float) -> PreRecordCapture | None:
+        """Pin the pre-roll and follow the live segments for duration seconds.
+
+        Returns:
+            The capture, None if the buffer is not delivering segments (the
+            caller records directly instead)
+        """
+        if not self.is_ready:
+            return None
+        now = time.time()
+        pre_roll = [segment for segment in self._segments if segment.end > now - self.pre_seconds]
+        for segment in pre_roll:
+            segment.pins += 1
+        capture = PreRecordCapture(self, now, now + duration, pre_roll)
+        self._captures.append(capture)
+        return capture
+
+    def _release(self, capture: PreRecordCapture) -> None:
+        if capture in self._captures:
+            self._captures.remove(capture)
+        for segment in capture.segments:
+            segment.pins = max(0, segment.pins - 1)
+        self._trim()
+        self.manager._enforce_budget()
+
+
+class PreRecordManager:
+    """Pre-record buffers of all cameras and their shared memory budget."""
+
+    def __init__(self, memory_budget_mb: float, buffer_root: str | None = None) -> None:
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.buffer_root = buffer_root or default_buffer_root()
+        self.buffers: dict[str, CameraBuffer] = {}
+        self._budget_warned = False
+        self._removals: list[str] = []
+        self._removal_jobs: set[asyncio.Future] = set()
+
+    def start_camera(self, camera: str, rtsp_url: str, pre_seconds: float) -> CameraBuffer:
+        """Start (or return) the buffer of a camera."""
+        buffer = self.buffers.get(camera)
+        if buffer is None:
+            buffer = CameraBuffer(self, camera, rtsp_url, pre_seconds, os.path.join(self.buffer_root, camera))
+            self.buffers[camera] = buffer
+            buffer.start()
+        return buffer
+
+    def get_buffer(self, camera: str) -> CameraBuffer | None:
+        """Buffer of a camera if it is delivering segments."""
+        buffer = self.buffers.get(camera)
+        return buffer if buffer is not None and buffer.is_ready else None
+
+    async def async_stop(self) -> None:
+        """Stop all buffers."""
+        await self._wait_removals()
+        for buffer in list(self.buffers.values()):
+            await buffer.stop()
+        self.buffers.clear()
+
+    @property
+    def used_bytes(self) -> int:
+        """Bytes held by all rings."""
+        return sum(buffer.size_bytes for buffer in self.buffers.values())
+
+    def get_stats(self) -> dict[str, Any]:
+        """Statistics of all buffers for the UI."""
+        return {
+            "memory_budget_mb": round(self.memory_budget / (1024 * 1024), 1),
+            "memory_used_mb": round(self.used_bytes / (1024 * 1024), 2),
+            "cameras": {camera: buffer.stats() for camera, buffer in self.buffers.items()},
+        }
+
+    def _enforce_budget(self) -> None:
+        """Evict the oldest unpinned segments across cameras beyond the budget."""
+        used = self.used_bytes
+        while used > self.memory_budget:
+            candidates = [
+                (segment.start, buffer)
+                for buffer in self.buffers.values()
+                if (segment := buffer.oldest_evictable()) is not None
+            ]
+            if not candidates:
+                break
+            _, buffer = min(candidates, key=lambda item: item[0])
+            before = buffer.size_bytes
+            buffer._drop_oldest()
+            used -= before - buffer.size_bytes
+            if not self._budget_warned:
+                self._budget_warned = True
+                _LOGGER.warning(
+                    "Pre-record memory budget (%.0f MB) reached, pre-roll is shortened",
+                    self.memory_budget / (1024 * 1024),
+                )
+        self._flush_removals()
+
+    def _flush_removals(self) -> None:
+        """Delete the dropped segment files in one executor job."""
+        if not self._removals:
+            return
+        paths, self._removals = self._removals, []
+        job = asyncio.get_running_loop().run_in_executor(None, _remove_files, paths)
+        self._removal_jobs.add(job)
+        job.add_done_callback(self._removal_jobs.discard)
+
+    async def _wait_removals(self) -> None:
+        """Wait until the scheduled segment deletions finished."""
+        if self._removal_jobs:
+            await asyncio.gather(*self._removal_jobs)
+
+
+def _concat_list(segments: list[BufferedSegment]) -> str:
+    return "".join(f"file '{segment.path}'\n" for segment in segments)
+
+
+async def _run_ffmpeg(command: list[str], timeout: float) -> tuple[bool, str]:
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        _, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return False, "timeout"
+    return process.returncode == 0, (stderr or b"").decode("utf-8", errors="replace")[-300:]
+
+
+async def async_snapshot_from_capture(
+    capture: PreRecordCapture,
+    snapshot_path: str,
+    delay: float = 0,
+    preview_path: str | None = None,
+    preview_width: int = 320,
+) -> bool:
+    """Write the snapshot (and optional preview) from the buffered segments.
+
+    Args:
+        capture: Running capture
+        snapshot_path: Destination of the snapshot image
+        delay: Seconds after the event
+        preview_path: Optional downscaled preview image
+        preview_width: Width of the preview image
+
+    Returns:
+        True if the snapshot was written
+    """
+    target = capture.event_time + max(0.0, float(delay or 0))
+    timeout = max(0.0, target - time.time()) + MAX_SEGMENT_AGE
+    segment = await capture.wait_for_segment(target, timeout)
+    if segment is None:
+        return False
+    offset = min(max(0.0, target - segment.start), max(0.0, segment.end - segment.start - 0.1))
+
+    def _make_dirs() -> None:
+        for path in (snapshot_path, preview_path):
+            if path:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    await asyncio.get_running_loop().run_in_executor(None, _make_dirs)
+
+    command = [
+        "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+        "-ss", f"{offset:.3f}", "-i", segment.path,
+        "-map", "0:v:0", "-frames:v", "1", "-f", "image2", "-update", "1", snapshot_path,
+    ]
+    if preview_path:
+        command += [
+            "-map", "0:v:0", "-frames:v", "1", "-vf", f"scale={int(preview_width)}:-2",
+            "-f", "image2", "-update", "1", preview_path,
+        ]
+    ok, err = await _run_ffmpeg(command, timeout=30)
+    if not ok:
+        _LOGGER.warning("Pre-record snapshot for %s failed: %s", capture.buffer.camera, err)
+        return False
+    return await asyncio.get_running_loop().run_in_executor(None, os.path.isfile, snapshot_path)
+
+
+async def async_save_capture(capture: PreRecordCapture, output_path: str, timeout: float) -> tuple[bool, str | None]:
+    """Wait for the clip and splice its segments into output_path.
+
+    The caller releases the capture afterwards (after the snapshot, which
+    reads the same segments).
+
+    Args:
+        capture: Capture from ``CameraBuffer.begin_capture``
+        output_path: Final MP4 path
+        timeout: Maximum seconds to wait for the live segments
+
+    Returns:
+        Tuple of (success, error message)
+    """
+    tmp_path = output_path + ".tmp"
+    list_path = output_path + ".concat.txt"
+    loop = asyncio.get_running_loop()
+    try:
+        if not await capture.wait(timeout):
+            _LOGGER.warning("Pre-record capture of %s timed out, saving what was buffered", capture.buffer.camera)
+        captured = list(capture.segments)
+
+        def _write_list() -> bool:
+            segments = [segment for segment in captured if os.path.exists(segment.path)]
+            if not segments:
+                return False
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            with open(list_path, "w", encoding="utf-8") as f:
+                f.write(_concat_list(segments))
+            return True
+
+        if not await loop.run_in_executor(None, _write_list):
+            return False, "No buffered segments"
+        ok, err = await _run_ffmpeg([
+            "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+            "-f", "concat", "-safe", "0", "-i", list_path,
+            "-c", "copy",
+            "-movflags", "+faststart",
+            "-f", "mp4",
+            tmp_path,
+        ], timeout=120)
+        if not ok or not await loop.run_in_executor(None, _file_size, tmp_path):
+            return False, f"Concat failed: {err}"
+        await loop.run_in_executor(None, os.replace, tmp_path, output_path)
+        return True, None
+    except Exception as e:
+        return False, f"Pre-record save error: {e}"
+    finally:
+        await loop.run_in_executor(None, _remove_files, [tmp_path, list_path])
@@ -8,6 +8,7 @@ import asyncio
 import logging
 import os
 import shutil
+import signal
 from typing import Callable, Optional, Any
 
 from .helpers import log_to_file
@@ -18,6 +19,9 @@ _LOGGER = logging.getLogger(__name__)
 # Signature: (output_path: str, success: bool, error_msg: Optional[str]) -> None
 RecordingCallback = Callable[[str, bool, Optional[str]], None]
 
+# v1.4.0: FFmpeg exit code after SIGINT (recording ended early, file is valid)
+FFMPEG_SIGNAL_EXIT_CODE = 255
+
 # LOW-002 Fix: Cache FFmpeg availability
 _ffmpeg_available: bool | None = None
 
@@ -136,7 +140,8 @@ async def _monitor_recording(
     process: asyncio.subprocess.Process,
     tmp_path: str,
     final_path: str,
-    on_complete: Optional[RecordingCallback] = None
+    on_complete: Optional[RecordingCallback] = None,
+    read_stdout: bool = True,
 ) -> None:
     """Monitor FFmpeg process and finalize recording on completion.
     
@@ -150,6 +155,8 @@ async def _monitor_recording(
         final_path: Final destination path for the recording
         on_complete: Optional callback invoked when recording finishes.
                     Called with (output_path, success, error_msg).
+        read_stdout: False when stdout carries live frames that another
+                    reader consumes
     
     Note:
         Empty or failed recordings are automatically cleaned up.
@@ -160,10 +167,17 @@ async def _monitor_recording(
     
     try:
         # Wait for process and capture stderr for debugging
-        stdout, stderr = await process.communicate()
+        if read_stdout:
+            stdout, stderr = await process.communicate()
+        else:
+            # v1.4.0: stdout is the live analysis frame pipe
+            stderr = await process.stderr.read()
+            await process.wait()
         log_to_file(f"FFmpeg finished with code {process.returncode}")
         
-        if process.returncode != 0:
+        if process.returncode == FFMPEG_SIGNAL_EXIT_CODE:
+            log_to_file("FFmpeg stopped by signal, finalizing recording")
+        elif process.returncode != 0:
             error_msg = f"FFmpeg exited with code {process.returncode}"
             # Log last 500 chars of stderr for debugging
             if stderr:
@@ -219,12 +233,145 @@ async def _monitor_recording(
             log_to_file(f"Callback error: {cb_err}")
 
 
+def _frame_outputs(duration: int, frame_interval: int | None) -> list[str]:
+    """FFmpeg output args for sampled MJPEG frames on stdout."""
+    if not frame_interval:
+        return []
+    # Limited like the MP4, otherwise this output keeps FFmpeg running
+    return [
+        "-map", "0:v:0", "-t", str(duration),
+        "-vf", f"fps=1/{max(1, int(frame_interval))}",
+        "-f", "image2pipe", "-c:v", "mjpeg", "-q:v", "3", "pipe:1",
+    ]
+
+
+def _snapshot_outputs(
+    duration: int,
+    snapshot_path: str | None,
+    snapshot_delay: float,
+    preview_path: str | None,
+    preview_width: int,
+) -> list[str]:
+    """FFmpeg output args for the snapshot and the optional preview."""
+    if not snapshot_path:
+        return []
+    # A snapshot later than the recording would keep the session open
+    delay = max(0.0, min(float(snapshot_delay or 0), duration - 1))
+    seek = ["-ss", f"{delay:g}"] if delay > 0 else []
+    outputs = ["-map", "0:v:0", *seek, "-frames:v", "1", "-f", "image2", "-update", "1", snapshot_path]
+    if preview_path:
+        outputs += [
+            "-map", "0:v:0", *seek, "-frames:v", "1",
+            "-vf", f"scale={int(preview_width)}:-2",
+            "-f", "image2", "-update", "1", preview_path,
+        ]
+    return outputs
+
+
+def build_record_command(
+    rtsp_url: str,
+    duration: int,
+    tmp_path: str,
+    snapshot_path: str | None = None,
+    snapshot_delay: float = 0,
+    preview_path: str | None = None,
+    preview_width: int = 320,
+    frame_interval: int | None = None,
+) -> list[str]:
+    """Build the FFmpeg command line for a recording.
+    
+    v1.4.0: With snapshot_path the same process (one RTSP session) also
+    writes the snapshot JPEG, and optionally a downscaled preview, from the
+    decoded stream as additional outputs. The output-side ``-ss`` makes
+    FFmpeg decode every frame up to snapshot_delay and discard it, so a
+    later snapshot costs more decoding; each output stops after its one
+    frame. The MP4 is still a stream copy.
+    
+    Args:
+        rtsp_url: Full RTSP stream URL to record
+        duration: Recording duration in seconds
+        tmp_path: Temporary MP4 output path
+        snapshot_path: Optional snapshot image path
+        snapshot_delay: Seconds into the recording for the snapshot frame
+            (clamped to the recording duration)
+        preview_path: Optional downscaled preview image path
+        preview_width: Width of the preview image
+        frame_interval: v1.4.0: Also write one MJPEG frame every
+            frame_interval seconds to stdout (live analysis)
+    
+    Returns:
+        FFmpeg argument list
+    """
+    # FIX: Improved FFmpeg command with proper RTSP options
+    # -rtsp_transport tcp: Use TCP for more reliable streaming
+    # -timeout: Connection timeout in microseconds (5 seconds)
+    # -t after -i: Duration as output option for more reliable recording
+    command = [
+        "ffmpeg",
+        "-y",                           # Overwrite output
+        "-rtsp_transport", "tcp",       # Use TCP for RTSP (more reliable)
+        "-timeout", "5000000",          # 5 second connection timeout
+        "-i", rtsp_url,                 # Input RTSP stream
+        "-t", str(duration),            # Recording duration (as output option)
+        "-c", "copy",                   # Copy codec (no re-encoding)
+        "-f", "mp4",                    # Output format (important for .tmp extension)
+        "-movflags", "+faststart",      # Enable fast start for web playback
+        tmp_path
+    ]
+    command += _frame_outputs(duration, frame_interval)
+    command += _snapshot_outputs(duration, snapshot_path, snapshot_delay, preview_path, preview_width)
+    return command
+
+
+def build_analysis_stream_command(
+    rtsp_url: str,
+    duration: int,
+    frame_interval: int,
+    snapshot_path: str | None = None,
+    snapshot_delay: float = 0,
+    preview_path: str | None = None,
+    preview_width: int = 320,
+) -> list[str]:
+    """Build the FFmpeg command that decodes a camera's low-res substream.
+    
+    v1.4.0: Runs next to the recording of the main stream, which then stays
+    a pure stream copy: the live analysis frames and the snapshot are
+    decoded from the substream instead of the 2K/4K main stream.
+    
+    Args:
+        rtsp_url: RTSP URL of the substream
+        duration: Same duration as the recording
+        frame_interval: One MJPEG frame every frame_interval seconds to stdout
+        snapshot_path: Optional snapshot image path
+        snapshot_delay: Seconds into the recording for the snapshot frame
+        preview_path: Optional downscaled preview image path
+        preview_width: Width of the preview image
+    
+    Returns:
+        FFmpeg argument list
+    """
+    command = [
+        "ffmpeg",
+        "-y",
+        "-rtsp_transport", "tcp",
+        "-timeout", "5000000",
+        "-i", rtsp_url,
+    ]
+    command += _frame_outputs(duration, frame_interval)
+    command += _snapshot_outputs(duration, snapshot_path, snapshot_delay, preview_path, preview_width)
+    return command
+
+
 async def async_record_stream(
     hass: Any,
     rtsp_url: str,
     duration: int,
     output_path: str,
-    on_complete: Optional[RecordingCallback] = None
+    on_complete: Optional[RecordingCallback] = None,
+    snapshot_path: str | None = None,
+    snapshot_delay: float = 0,
+    preview_path: str | None = None,
+    frame_interval: int | None = None,
 ) -> asyncio.subprocess.Process:
     """Record an RTSP stream using FFmpeg.
     
@@ -239,6 +386,11 @@ async def async_record_stream(
         output_path: Final destination path for the recording (.mp4)
         on_complete: Optional callback invoked when recording finishes.
                     Signature: (path, success, error_msg) -> None
+        snapshot_path: v1.4.0: Also write the snapshot from this session
+        snapshot_delay: Seconds into the recording for the snapshot
+        preview_path: Optional downscaled preview written with the snapshot
+        frame_interval: v1.4.0: Sampled MJPEG frames on stdout for a live
+            analysis; the caller must read process.stdout
     
     Returns:
         The FFmpeg subprocess object (recording continues in background)
@@ -252,29 +404,25 @@ async def async_record_stream(
     # Use .tmp extension while recording
     tmp_path = output_path + ".tmp"
     
-    # FIX: Improved FFmpeg command with proper RTSP options
-    # -rtsp_transport tcp: Use TCP for more reliable streaming
-    # -timeout: Connection timeout in microseconds (5 seconds)
-    # -t after -i: Duration as output option for more reliable recording
-    command = [
-        "ffmpeg",
-        "-y",                           # Overwrite output
-        "-rtsp_transport", "tcp",       # Use TCP for RTSP (more reliable)
-        "-timeout", "5000000",          # 5 second connection timeout
-        "-i", rtsp_url,                 # Input RTSP stream
-        "-t", str(duration),            # Recording duration (as output option)
-        "-c", "copy",                   # Copy codec (no re-encoding)
-        "-f", "mp4",                    # Output format (important for .tmp extension)
-        "-movflags", "+faststart",      # Enable fast start for web playback
-        tmp_path
-    ]
+    command = build_record_command(
+        rtsp_url, duration, tmp_path,
+        snapshot_path=snapshot_path,
+        snapshot_delay=snapshot_delay,
+        preview_path=preview_path,
+        frame_interval=frame_interval,
+    )
     
     log_to_file(f"START RECORD: duration={duration}s, url={rtsp_url[:50]}..., output={tmp_path}")
+    if snapshot_path:
+        log_to_file(f"Single session snapshot at {snapshot_delay}s: {snapshot_path}")
     
     # Ensure directory exists
-    folder = os.path.dirname(output_path)
-    if not os.path.exists(folder):
-        os.makedirs(folder, exist_ok=True)
+    for path in (output_path, snapshot_path, preview_path):
+        if not path:
+            continue
+        folder = os.path.dirname(path)
+        if not os.path.exists(folder):
+            os.makedirs(folder, exist_ok=True)
 
     try:
         process = await asyncio.create_subprocess_exec(
@@ -288,10 +436,76 @@ async def async_record_stream(
         raise
     
     # Create background task to handle the rename when finished
-    hass.async_create_task(_monitor_recording(process, tmp_path, output_path, on_complete))
+    hass.async_create_task(_monitor_recording(
+        process, tmp_path, output_path, on_complete, read_stdout=not frame_interval
+    ))
     
     return process
 
+async def async_open_analysis_stream(
+    rtsp_url: str,
+    duration: int,
+    frame_interval: int,
+    snapshot_path: str | None = None,
+    snapshot_delay: float = 0,
+    preview_path: str | None = None,
+) -> asyncio.subprocess.Process:
+    """Start decoding a camera's substream for a running recording.
+    
+    v1.4.0: See ``build_analysis_stream_command``. The caller reads the
+    frames from process.stdout and ends the process together with the
+    recording (``async_stop_recording``).
+    
+    Returns:
+        The FFmpeg subprocess object
+    """
+    command = build_analysis_stream_command(
+        rtsp_url, duration, frame_interval,
+        snapshot_path=snapshot_path,
+        snapshot_delay=snapshot_delay,
+        preview_path=preview_path,
+    )
+    log_to_file(f"START ANALYSIS STREAM: duration={duration}s, url={rtsp_url[:50]}..., interval={frame_interval}s")
+    for path in (snapshot_path, preview_path):
+        if path:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    log_to_file(f"Analysis stream FFmpeg started with PID: {process.pid}")
+    return process
+
+
+async def async_stop_recording(process: asyncio.subprocess.Process, timeout: float = 10) -> None:
+    """End a recording before its -t duration.
+    
+    v1.4.0: Recording sessions start FFmpeg with the maximum clip length and
+    stop it at their (possibly extended) end. SIGINT lets FFmpeg write the
+    MP4 trailer; it is killed if it does not exit within timeout.
+    
+    Args:
+        process: The running FFmpeg subprocess from async_record_stream
+            or async_open_analysis_stream
+        timeout: Seconds to wait for a graceful exit
+    """
+    if process.returncode is not None:
+        return
+    try:
+        process.send_signal(signal.SIGINT)
+    except ProcessLookupError:
+        return
+    try:
+        await asyncio.wait_for(process.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        log_to_file(f"FFmpeg PID {process.pid} ignored SIGINT, killing")
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+
+
 async def async_take_snapshot(
     hass: Any,
     rtsp_url: str,
@@ -0,0 +1,281 @@
+"""Recording catalog for RTSP Recorder.
+
+v1.4.0: Batch analysis, retention cleanup and the camera health watchdog used
+to walk the whole storage tree independently (a 200k file archive took minutes
+just to list). Recordings are now cataloged in the SQLite ``recordings`` table
+(camera, start time from the ``{camera}_{YYYYMMDD_HHMMSS}.mp4`` name, mtime,
+size, duration; analysis status via the analysis index) and those consumers
+query it instead.
+
+The catalog is updated on ``rtsp_recorder_recording_saved``, by the delete
+services and by ``reconcile_recording_catalog``, a background scan picking up
+files added or removed outside the integration. Until the first scan of a
+storage path has completed, the query helpers return None and callers fall
+back to walking the folders.
+"""
+import logging
+import os
+import re
+import time
+from datetime import datetime
+from typing import Any
+
+try:
+    from .database import get_database
+except ImportError:
+    from database import get_database
+
+_LOGGER = logging.getLogger(__name__)
+
+# {camera}_{YYYYMMDD_HHMMSS}.mp4
+_RECORDING_NAME_RE = re.compile(r"^(?P<camera>.+)_(?P<start>\d{8}_\d{6})\.mp4$", re.IGNORECASE)
+
+# Folders below the storage path that never hold recordings
+_SKIPPED_DIR = "_analysis"
+
+# Storage paths whose catalog has been reconciled at least once
+_reconciled_roots: set[str] = set()
+
+
+def parse_recording_name(filename: str) -> tuple[str, str] | None:
+    """Split a recording file name into (camera, start time).
+
+    Args:
+        filename: File name like ``Front_Door_20260131_164147.mp4``
+
+    Returns:
+        Tuple of (camera from the name, YYYYMMDD_HHMMSS), None if the
+        name does not follow the recording pattern
+    """
+    match = _RECORDING_NAME_RE.match(os.path.basename(filename))
+    if not match:
+        return None
+    return match.group("camera"), match.group("start")
+
+
+def _camera_folder(storage_root: str, path: str) -> str:
+    """Top-level folder of path below storage_root (the camera folder)."""
+    rel_dir = os.path.relpath(os.path.dirname(path), storage_root)
+    return "" if rel_dir == "." else rel_dir.split(os.sep)[0]
+
+
+def _catalog_entry(storage_root: str, path: str, stats: os.stat_result,
+                   duration_sec: float | None = None) -> dict[str, Any]:
+    parsed = parse_recording_name(path)
+    return {
+        "path": path,
+        "camera": _camera_folder(storage_root, path),
+        "start_time": parsed[1] if parsed else None,
+        "mtime": stats.st_mtime,
+        "size": stats.st_size,
+        "duration_sec": duration_sec,
+    }
+
+
+def _get_catalog_db(storage_root: str):
+    """Database with a reconciled catalog for storage_root, or None."""
+    if storage_root not in _reconciled_roots:
+        return None
+    try:
+        return get_database()
+    except Exception as e:
+        _LOGGER.debug("Recording catalog unavailable: %s", e)
+        return None
+
+
+def _scan_storage(storage_root: str) -> dict[str, os.stat_result]:
+    """Stat every MP4 below storage_root (skipping analysis folders)."""
+    found: dict[str, os.stat_result] = {}
+    for root, dirs, files in os.walk(storage_root):
+        dirs[:] = [d for d in dirs if d != _SKIPPED_DIR]
+        for fname in files:
+            if not fname.lower().endswith(".mp4"):
+                continue
+            path = os.path.join(root, fname)
+            try:
+                found[path] = os.stat(path)
+            except OSError:
+                continue
+    return found
+
+
+def reconcile_recording_catalog(storage_root: str) -> dict[str, int]:
+    """Bring the recording catalog in line with the storage folders.
+
+    Adds files that are not cataloged (or changed size/mtime) and drops rows
+    whose file is gone. Runs in the background; readers keep using the
+    catalog (or the folder walk before the first run) meanwhile.
+
+    Args:
+        storage_root: Configured storage path
+
+    Returns:
+        Dict with added/updated and removed counts
+    """
+    try:
+        db = get_database()
+        on_disk = _scan_storage(storage_root) if os.path.exists(storage_root) else {}
+        cataloged = db.get_recording_stats(storage_root)
+
+        gone = [path for path in cataloged if path not in on_disk]
+        if gone:
+            db.delete_recordings(gone)
+
+        changed = [
+            _catalog_entry(storage_root, path, stats)
+            for path, stats in on_disk.items()
+            if cataloged.get(path) != (stats.st_mtime, stats.st_size)
+        ]
+        if changed:
+            db.upsert_recordings(storage_root, changed)
+
+        _reconciled_roots.add(storage_root)
+        if changed or gone:
+            _LOGGER.info("Recording catalog reconciled: %d added/updated, %d removed", len(changed), len(gone))
+        return {"updated": len(changed), "removed": len(gone)}
+    except Exception as e:
+        _LOGGER.warning("Recording catalog reconcile failed for %s: %s", storage_root, e)
+        return {"updated": 0, "removed": 0}
+
+
+def catalog_recording(storage_root: str, path: str, duration_sec: float | None = None) -> bool:
+    """Add or refresh one recording (e.g. after rtsp_recorder_recording_saved).
+
+    Returns:
+        True if the recording was cataloged
+    """
+    try:
+        stats = os.stat(path)
+    except OSError:
+        return False
+    try:
+        return get_database().upsert_recordings(
+            storage_root, [_catalog_entry(storage_root, path, stats, duration_sec)]
+        ) > 0
+    except Exception as e:
+        _LOGGER.debug("Failed to catalog %s: %s", path, e)
+        return False
+
+
+def uncatalog_recordings(paths: list[str]) -> int:
+    """Remove deleted recordings from the catalog.
+
+    Returns:
+        Number of removed rows
+    """
+    if not paths:
+        return 0
+    try:
+        return get_database().delete_recordings(paths)
+    except Exception as e:
+        _LOGGER.debug("Failed to remove recordings from catalog: %s", e)
+        return 0
+
+
+def list_recordings(
+    storage_root: str,
+    camera: str | None = None,
+    since_ts: float | None = None,
+    skip_analyzed_in: str | None = None,
+    limit: int | None = None,
+) -> list[str] | None:
+    """Recording paths from the catalog, newest (by mtime) first.
+
+    Args:
+        storage_root: Configured storage path
+        camera: Only recordings of this camera folder
+        since_ts: Only recordings modified at or after this timestamp
+        skip_analyzed_in: Leave out recordings with an analysis in this
+            analysis output directory
+        limit: Maximum number of paths
+
+    Returns:
+        List of paths, None if the catalog is not ready
+    """
+    db = _get_catalog_db(storage_root)
+    if db is None:
+        return None
+    try:
+        rows = db.get_recordings(storage_root, camera, since_ts, skip_analyzed_in, limit)
+    except Exception as e:
+        _LOGGER.warning("Recording catalog query failed: %s", e)
+        return None
+    return [row["path"] for row in rows]
+
+
+def newest_recording_times(storage_root: str) -> dict[str, datetime] | None:
+    """Start time of the newest recording per camera folder.
+
+    Returns:
+        Dict camera folder -> start time, None if the catalog is not ready
+    """
+    db = _get_catalog_db(storage_root)
+    if db is None:
+        return None
+    try:
+        starts = db.get_newest_recording_starts(storage_root)
+    except Exception as e:
+        _LOGGER.warning("Recording catalog query failed: %s", e)
+        return None
+    newest = {}
+    for camera, start in starts.items():
+        try:
+            newest[camera] = datetime.strptime(start, "%Y%m%d_%H%M%S")
+        except (TypeError, ValueError):
+            continue
+    return newest
+
+
+def cleanup_cataloged_recordings(
+    storage_root: str,
+    global_days: int,
+    global_hours: int = 0,
+    override_map: dict[str, int] | None = None,
+) -> tuple[int, float] | None:
+    """Delete cataloged recordings older than their retention period.
+
+    Same policy as ``retention.cleanup_recordings`` (per camera folder
+    overrides in hours), but the candidates come from the catalog.
+
+    Args:
+        storage_root: Configured storage path
+        global_days: Default retention period in days
+        global_hours: Additional hours to add to global retention
+        override_map: Optional dict mapping camera folders to retention hours
+
+    Returns:
+        Tuple of (files deleted, MB freed), None if the catalog is not ready
+    """
+    db = _get_catalog_db(storage_root)
+    if db is None:
+        return None
+    now = time.time()
+    overrides = override_map or {}
+    try:
+        expired = db.get_expired_recordings(
+            storage_root, now - (global_days * 86400 + global_hours * 3600),
+            exclude_cameras=list(overrides),
+        )
+        for camera, hours in overrides.items():
+            expired += db.get_expired_recordings(storage_root, now - hours * 3600, camera=camera)
+    except Exception as e:
+        _LOGGER.warning("Recording catalog query failed: %s", e)
+        return None
+
+    deleted, freed = [], 0
+    for path, size in expired:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            _LOGGER.error(f"Error deleting {path}: {e}")
+            continue
+        deleted.append(path)
+        freed += size or 0
+    uncatalog_recordings(deleted)
+
+    mb_freed = freed / (1024 * 1024)
+    if deleted:
+        _LOGGER.info(f"Cleanup Finished: Deleted {len(deleted)} recordings, freed {mb_freed:.2f} MB")
+    return len(deleted), mb_freed
@@ -0,0 +1,136 @@
+"""Per-camera recording sessions.
+
+v1.4.0: Every motion trigger used to start its own FFmpeg process and file,
+so a busy camera produced overlapping recordings and many short, redundant
+clips. A camera now has at most one running session: re-triggers while it
+records extend its end time (post-roll) instead of starting a new clip,
+capped at a maximum clip length.
+
+Whatever a re-trigger asked for beyond what the clip could take (cap reached,
+or the clip was already being finalized) is left as ``follow_up_seconds``
+for one consecutive clip after the session closes.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+# Shorter leftovers after a session are not worth a follow-up clip
+MIN_FOLLOW_UP_SECONDS = 2
+
+
+class RecordingSession:
+    """One running clip of a camera.
+
+    Args:
+        camera: Camera name
+        duration: Requested clip length in seconds
+        max_length: Cap for the clip length including extensions
+        extendable: False for recorders whose length is fixed at start
+            (re-triggers then only accumulate follow-up time)
+        now: Start time (defaults to the current time)
+    """
+
+    def __init__(self, camera: str, duration: float, max_length: float,
+                 extendable: bool = True, now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        self.camera = camera
+        self.started_at = now
+        self.max_end = now + (max(duration, max_length) if extendable else duration)
+        self.end_time = min(now + duration, self.max_end)
+        self.requested_end = now + duration
+        self.triggers = 1
+        self.closed = False
+        self._listeners: list[Callable[[float], bool | None]] = []
+
+    @property
+    def length(self) -> float:
+        """Current clip length in seconds."""
+        return self.end_time - self.started_at
+
+    def add_listener(self, listener: Callable[[float], bool | None]) -> None:
+        """Call listener(end_time) whenever a re-trigger moves the end.
+
+        A listener returning False refuses the new end (its recorder already
+        finished the clip); the session then stops extending.
+        """
+        self._listeners.append(listener)
+
+    def stop_extending(self) -> None:
+        """Freeze the end time once the recorder finished the clip.
+
+        Later re-triggers are still absorbed, but only as follow-up time.
+        """
+        self.max_end = min(self.max_end, self.end_time)
+
+    def extend(self, duration: float, now: float | None = None) -> bool:
+        """Absorb a re-trigger that asks for duration seconds from now.
+
+        Returns:
+            True if the session took the trigger, False if it is closed
+            (the caller starts a new session)
+        """
+        if self.closed:
+            return False
+        now = time.time() if now is None else now
+        self.triggers += 1
+        self.requested_end = max(self.requested_end, now + duration)
+        new_end = min(self.requested_end, self.max_end)
+        if new_end > self.end_time:
+            for listener in list(self._listeners):
+                try:
+                    accepted = listener(new_end)
+                except Exception as e:
+                    _LOGGER.debug("Recording session listener failed: %s", e)
+                    continue
+                if accepted is False:
+                    self.stop_extending()
+                    return True
+            self.end_time = new_end
+        return True
+
+    def follow_up_seconds(self, now: float | None = None) -> float:
+        """Requested time not covered by this clip (0 if below the minimum)."""
+        now = time.time() if now is None else now
+        remaining = self.requested_end - max(now, self.end_time)
+        return remaining if remaining >= MIN_FOLLOW_UP_SECONDS else 0.0
+
+    async def wait_until_end(self) -> None:
+        """Sleep until the (possibly extended) end time."""
+        while True:
+            remaining = self.end_time - time.time()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(remaining)
+
+
+class RecordingSessions:
+    """Running session per camera. Only used from the event loop."""
+
+    def __init__(self) -> None:
+        self._sessions: dict[str, RecordingSession] = {}
+
+    def get(self, camera: str) -> RecordingSession | None:
+        """The open session of a camera."""
+        session = self._sessions.get(camera)
+        return session if session is not None and not session.closed else None
+
+    def start(self, camera: str, duration: float, max_length: float,
+              extendable: bool = True) -> RecordingSession:
+        """Open a new session for a camera (replaces a closed one)."""
+        session = RecordingSession(camera, duration, max_length, extendable)
+        self._sessions[camera] = session
+        return session
+
+    def close(self, session: RecordingSession) -> None:
+        """Close a session; later triggers start a new one."""
+        session.closed = True
+        if self._sessions.get(session.camera) is session:
+            del self._sessions[session.camera]
+
+    def __len__(self) -> int:
+        return len(self._sessions)
@@ -11,7 +11,7 @@ import os
 import re
 import shutil
 import time
-from typing import Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -51,7 +51,8 @@ def cleanup_recordings(
     base_path: str,
     global_days: int,
     global_hours: int = 0,
-    override_map: Optional[Dict[str, int]] = None
+    override_map: Optional[Dict[str, int]] = None,
+    skip: Optional[Callable[[str], Any]] = None,
 ) -> None:
     """Delete files older than the retention period.
     
@@ -64,6 +65,8 @@ def cleanup_recordings(
         global_days: Default retention period in days
         global_hours: Additional hours to add to global retention
         override_map: Optional dict mapping folder names to retention hours
+        skip: v1.4.0: Leave files whose name it accepts alone without a
+            stat (recordings whose retention the catalog handles)
     
     Note:
         Override map takes precedence over global settings.
@@ -108,6 +111,8 @@ def cleanup_recordings(
                 # _LOGGER.debug(f"Using override for {top_folder}: {override_hours}h")
 
         for name in files:
+            if skip and skip(name):
+                continue
             file_path = os.path.join(root, name)
             try:
                 stats = os.stat(file_path)
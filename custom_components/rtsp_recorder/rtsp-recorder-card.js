@@ -286,6 +286,8 @@ class RtspRecorderCard extends HTMLElement {
         this._subscribeToEvent('rtsp_recorder_stats_update', (event) => {
             // Update detector stats from push event
             const stats = event.data || {};
+            // v1.4.0: Pre-record buffers are reported even without detector
+            this._preRecordStats = stats.pre_record || null;
             if (stats.available !== false) {
                 this._detectorStats = stats;
 
@@ -2052,6 +2054,8 @@ class RtspRecorderCard extends HTMLElement {
         // v1.2.3: Prefer HA host stats, fallback to detector stats
         const hostStats = stats.system_stats_ha || {};
         const sysStats = stats.system_stats || {};
+        const preRecord = this._preRecordStats || {};
+        const preRecordCams = Object.entries(preRecord.cameras || {});
 
         // Helper for gauge-style cards
         const gaugeCard = (label, value, unit, color, max = 100) => {
@@ -2186,6 +2190,33 @@ class RtspRecorderCard extends HTMLElement {
                     </div>
                 </div>
 
+                <!-- v1.4.0: Pre-Record Buffers -->
+                ${preRecordCams.length ? `
+                    <div style="margin-bottom:20px; padding-top:15px; border-top:1px solid #333;">
+                        <div style="font-weight:500; margin-bottom:12px;">
+                            Pre-Record Puffer
+                            <span style="color:#888; font-size:0.85em; font-weight:400;">(${preRecord.memory_used_mb ?? 0} / ${preRecord.memory_budget_mb ?? 0} MB)</span>
+                        </div>
+                        <div style="display:flex; gap:12px; flex-wrap:wrap;">
+                            ${preRecordCams.map(([cam, buf]) => {
+                                const ready = buf.ready;
+                                const color = ready ? (buf.buffered_seconds >= buf.pre_record_seconds ? '#4caf50' : '#ff9800') : '#f44336';
+                                return `
+                                    <div style="background:#1a1a1a; border:1px solid #333; border-radius:12px; padding:16px; min-width:160px; flex:1;">
+                                        <div style="font-size:0.85em; color:#888; margin-bottom:8px;">${this._escapeHtml(cam)}</div>
+                                        <div style="font-size:1.4em; font-weight:600; color:${color};">
+                                            ${ready ? `${buf.buffered_seconds}s / ${buf.pre_record_seconds}s` : 'Nicht verbunden'}
+                                        </div>
+                                        <div style="font-size:0.8em; color:#888; margin-top:6px;">
+                                            ${buf.buffered_mb} MB${buf.active_captures ? ` · ${buf.active_captures} Aufnahme(n)` : ''}${buf.restarts ? ` · ${buf.restarts} Neustarts` : ''}
+                                        </div>
+                                    </div>
+                                `;
+                            }).join('')}
+                        </div>
+                    </div>
+                ` : ''}
+
                 <!-- CPU History Graph -->
                 ${history.length > 5 ? `
                     <div style="padding-top:15px; border-top:1px solid #333;">
@@ -4423,6 +4454,16 @@ class RtspRecorderCard extends HTMLElement {
                 for (const d of data.detections) {
                     this._detectionsIndex[d.time_s] = d;
                 }
+                // v1.4.0: Adaptive sampling leaves grid slots out in quiet
+                // stretches; each frame holds until the next analyzed one
+                const step = this._analysisInterval;
+                const times = data.detections.map(d => d.time_s).sort((a, b) => a - b);
+                for (let i = 0; i + 1 < times.length; i++) {
+                    const d = this._detectionsIndex[times[i]];
+                    for (let k = times[i] + step; k < times[i + 1]; k += step) {
+                        if (!(k in this._detectionsIndex)) this._detectionsIndex[k] = d;
+                    }
+                }
                 this.drawOverlay();
             } else {
                 this._analysisDetections = null;
@@ -5274,7 +5315,8 @@ class RtspRecorderCard extends HTMLElement {
                                     date: dt,
                                     cam: folder.title,
                                     iso: `${d.substr(0, 4)}-${d.substr(4, 2)}-${d.substr(6, 2)}`,
-                                    thumb: `${this._thumbBase}/${folder.title}/${f.title.replace(/\.mp4$/i, '.jpg')}`
+                                    // v1.4.0: downscaled variant from the thumbnail API (timeline tiles are small)
+                                    thumb: `${this._thumbBase}/${folder.title}/${f.title.replace(/\.mp4$/i, '.jpg')}${this._thumbBase.startsWith('/api/') ? '?w=320' : ''}`
                                 });
                             }
                         });
@@ -5654,6 +5696,8 @@ class RtspRecorderCard extends HTMLElement {
             { key: "analysis_face_enabled", label: "👤 Gesichtserkennung", kind: "bool" },
             { key: "analysis_face_multiscale", label: "🔍 Multi-Scale", kind: "bool" },
             { key: "analysis_overlay_smoothing", label: "Overlay-Glättung", kind: "bool" },
+            { key: "analysis_rtsp_url", label: "📉 Analyse-Substream (RTSP-URL)", kind: "text" },
+            { key: "analysis_frame_budget", label: "🎞️ Frame-Budget pro Clip", kind: "int", min: 10, max: 600, step: 10 },
         ];
     }
     _pcBaseFields() {
@@ -5734,6 +5778,8 @@ class RtspRecorderCard extends HTMLElement {
         if (f.kind === 'bool') {
             const cur = isOv ? (eff ? 'on' : 'off') : 'global';
             ctrl = `<select class="pc-an" data-f="${f.key}" style="padding:6px;background:#222;color:#eee;border:1px solid #444;border-radius:6px;"><option value="global" ${cur === 'global' ? 'selected' : ''}>Global</option><option value="on" ${cur === 'on' ? 'selected' : ''}>An</option><option value="off" ${cur === 'off' ? 'selected' : ''}>Aus</option></select>`;
+        } else if (f.kind === 'text') {
+            ctrl = `<input type="text" class="pc-an" data-f="${f.key}" placeholder="(keiner)" value="${this._pcEsc(isOv ? eff : "")}" style="width:100%;padding:6px;background:#222;color:#eee;border:1px solid #444;border-radius:6px;">`;
         } else if (f.kind === 'list') {
             const v = isOv && Array.isArray(eff) ? eff.join(", ") : "";
             ctrl = `<input type="text" class="pc-an" data-f="${f.key}" placeholder="(global)" value="${this._pcEsc(v)}" style="width:100%;padding:6px;background:#222;color:#eee;border:1px solid #444;border-radius:6px;">`;
@@ -5750,6 +5796,9 @@ class RtspRecorderCard extends HTMLElement {
         } else if (f.kind === 'list') {
             const i = container.querySelector(`input.pc-an[data-f="${f.key}"]`);
             i.addEventListener('change', () => this._pcSetSetting(f.key, i.value.split(",").map(x => x.trim()).filter(Boolean)));
+        } else if (f.kind === 'text') {
+            const i = container.querySelector(`input.pc-an[data-f="${f.key}"]`);
+            i.addEventListener('change', () => this._pcSetSetting(f.key, i.value.trim() || null));
         } else {
             const chk = container.querySelector(`input.pc-anchk[data-f="${f.key}"]`);
             const num = container.querySelector(`input.pc-annum[data-f="${f.key}"]`);
@@ -15,6 +15,7 @@ v1.1.0k: Added automatic analysis folder cleanup when deleting videos.
 import os
 import re
 import glob
+import math
 import asyncio
 import datetime
 import time
@@ -23,20 +24,34 @@ from typing import Any, Callable
 
 from .retention import delete_analysis_for_video
 
-from homeassistant.core import ServiceCall
+from homeassistant.core import ServiceCall, callback
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    DEFAULT_RTSP_SINGLE_SESSION,
+    DEFAULT_MAX_CLIP_SECONDS,
+    DEFAULT_ANALYSIS_LIVE_ENABLED,
+    DEFAULT_ANALYSIS_ADAPTIVE_SAMPLING,
+)
 from .helpers import (
     log_to_file,
     _validate_media_path,
     _list_video_files,
     _get_analysis_semaphore,
 )
-from .recorder import async_record_stream, async_take_snapshot, _remux_to_faststart
-from .analysis import analyze_recording
-from .people_db import _load_people_db
-from .analysis_helpers import _build_analysis_index
+from .recorder import (
+    async_open_analysis_stream, async_record_stream, async_stop_recording, async_take_snapshot,
+    _remux_to_faststart,
+)
+from .analysis import LiveFrameFeed, analyze_recording
+from .people_db import _load_people_index
+from .analysis_helpers import _analysis_index_ready, _build_analysis_index, _sync_analysis_index
+from .recording_catalog import list_recordings, uncatalog_recordings
+from .thumbnail_cache import TIMELINE_PREVIEW_WIDTH, variant_path
+from .pre_record import async_save_capture, async_snapshot_from_capture
+from .recording_session import RecordingSessions
+from .file_watcher import FileWatcher
 from . import camera_settings as _cam
 
 try:
@@ -68,6 +83,28 @@ def record_metric(name: str, camera: str, start_time: float, extra_info: str = "
     return elapsed
 
 
+def _finish_preview(snapshot_path: str, preview_path: str | None) -> bool:
+    """Check the snapshot of a single session recording and settle its preview.
+    
+    The preview is written by the same FFmpeg process as the snapshot, but
+    not necessarily after it; touching it keeps the thumbnail view from
+    treating it as an outdated variant.
+    
+    Returns:
+        True if the snapshot exists
+    """
+    if not os.path.isfile(snapshot_path):
+        if preview_path and os.path.isfile(preview_path):
+            os.remove(preview_path)
+        return False
+    if preview_path and os.path.isfile(preview_path):
+        try:
+            os.utime(preview_path)
+        except OSError:
+            pass
+    return True
+
+
 # Global batch analysis progress tracking
 _batch_analysis_progress = {
     "running": False,
@@ -93,6 +130,43 @@ _single_analysis_progress = {
 # Key = video_path, Value = recording info dict
 _active_recordings = {}
 
+# v1.4.0: Running clip per camera; re-triggers extend it instead of
+# starting another recording
+_recording_sessions = RecordingSessions()
+
+_NAME_STRIP_RE = re.compile(r"[^\w\s-]")
+
+
+def _clean_friendly_name(friendly_name: str) -> str:
+    """Camera folder name from a friendly name."""
+    return _NAME_STRIP_RE.sub("", friendly_name).strip().replace(" ", "_")
+
+
+class _CameraEntityCache:
+    """Camera name -> camera entity id, cleared on entity registry changes.
+    
+    Only hits are cached: a camera whose entity has no state yet (HA
+    startup, camera integration loading late) is looked up again on the
+    next trigger instead of being stuck without ``camera.record``.
+    """
+
+    def __init__(self, states: Callable[[], list]) -> None:
+        self._states = states
+        self._entities: dict[str, str] = {}
+
+    def clear(self) -> None:
+        self._entities.clear()
+
+    def get(self, name: str) -> str | None:
+        """Camera entity whose friendly name (or entity id) matches name."""
+        found = self._entities.get(name)
+        if found is None:
+            for state in self._states():
+                if _clean_friendly_name(state.attributes.get("friendly_name", "")) == name or name in state.entity_id:
+                    found = self._entities[name] = state.entity_id
+                    break
+        return found
+
 
 def get_batch_analysis_progress() -> dict:
     """Get current batch analysis progress (for WebSocket handler)."""
@@ -144,6 +218,10 @@ def register_services(
     analysis_enabled: bool,
     analysis_auto_new: bool,
     analysis_detector_confidence: float,
+    analysis_detector_batch_size: int,
+    analysis_detector_pipeline: bool,
+    analysis_detector_transport: str,
+    analysis_pipeline_window: int,
     analysis_face_enabled: bool,
     analysis_face_confidence: float,
     analysis_face_match_threshold: float,
@@ -173,6 +251,10 @@ def register_services(
         analysis_enabled: Whether analysis is enabled
         analysis_auto_new: Auto-analyze new recordings
         analysis_detector_confidence: Detection confidence
+        analysis_detector_batch_size: Frames per detector batch request
+        analysis_detector_pipeline: Objects and faces in one detector call per frame
+        analysis_detector_transport: Frame transport to the detector (jpeg/raw/shm)
+        analysis_pipeline_window: Detector requests in flight per analysis stage
         analysis_face_enabled: Face detection enabled
         analysis_face_confidence: Face detection confidence
         analysis_face_match_threshold: Face match threshold
@@ -220,10 +302,43 @@ def register_services(
             return parts[-2]
         return ""
 
+    def _frame_budget(cam_name: str) -> int | None:
+        """v1.4.0: Frame budget for adaptive sampling, None for the fixed interval."""
+        if not config_data.get("analysis_adaptive_sampling", DEFAULT_ANALYSIS_ADAPTIVE_SAMPLING):
+            return None
+        return cam_settings.resolve(config_data, "analysis_frame_budget", cam_name)
+
+    # v1.4.0: Camera name -> RTSP URL / camera entity, built once instead of
+    # scanning all camera states on every trigger
+    rtsp_urls = {
+        key[len("rtsp_url_"):]: value.strip()
+        for key, value in config_data.items()
+        if key.startswith("rtsp_url_") and isinstance(value, str) and value.strip()
+    }
+    camera_entities = _CameraEntityCache(lambda: hass.states.async_all("camera"))
+    max_clip_seconds = int(config_data.get("max_clip_seconds", DEFAULT_MAX_CLIP_SECONDS))
+
+    @callback
+    def _invalidate_camera_entities(event=None) -> None:
+        camera_entities.clear()
+
+    entry.async_on_unload(hass.bus.async_listen("entity_registry_updated", _invalidate_camera_entities))
+
+    # v1.4.0: inotify notices finished HA camera.record files (polling fallback)
+    file_watcher = FileWatcher(hass.loop)
+    file_watcher.start()
+
+    @callback
+    def _stop_file_watcher() -> None:
+        hass.async_create_task(file_watcher.async_stop())
+
+    entry.async_on_unload(_stop_file_watcher)
+
     async def handle_save_recording(call: ServiceCall = None, camera_name: str = None, duration: int = 30, snapshot_delay: float = 0) -> None:
         """Handle recording. Can be called via Service (manual) or Internal Event (auto)."""
         # v1.1.0 METRICS: Track total pipeline time from start
         pipeline_start = time.time()
+        session = None
         
         try:
             entity_id = None
@@ -243,7 +358,7 @@ def register_services(
                     return
                 friendly_name = state.attributes.get("friendly_name", entity_id)
                 
-                clean_name_raw = re.sub(r"[^\w\s-]", "", friendly_name).strip().replace(" ", "_")
+                clean_name_raw = _clean_friendly_name(friendly_name)
                 clean_name = clean_name_raw
                 
                 duration = call.data.get("duration", duration)
@@ -254,14 +369,7 @@ def register_services(
                 log_to_file(f"Internal Motion Trigger for: {camera_name}")
                 clean_name_raw = camera_name
                 clean_name = clean_name_raw
-                found_entity = None
-                for state in hass.states.async_all("camera"):
-                    fn = re.sub(r"[^\w\s-]", "", state.attributes.get("friendly_name", "")).strip().replace(" ", "_")
-                    if fn == clean_name or clean_name in state.entity_id:
-                        found_entity = state.entity_id
-                        break
-                if found_entity:
-                    entity_id = found_entity
+                entity_id = camera_entities.get(clean_name)
 
             else:
                 return
@@ -272,19 +380,170 @@ def register_services(
             if not clean_name:
                 clean_name = "unknown"
 
-            rtsp_key = f"rtsp_url_{clean_name}"
-            legacy_rtsp_key = f"rtsp_url_{clean_name_raw}" if clean_name_raw else None
-            rtsp_url = config_data.get(rtsp_key, "")
-            if not rtsp_url and legacy_rtsp_key and legacy_rtsp_key != rtsp_key:
-                rtsp_url = config_data.get(legacy_rtsp_key, "")
-            use_rtsp = isinstance(rtsp_url, str) and rtsp_url.strip()
-            if use_rtsp:
-                rtsp_url = rtsp_url.strip()
+            rtsp_url = rtsp_urls.get(clean_name) or (rtsp_urls.get(clean_name_raw) if clean_name_raw else None)
+            use_rtsp = bool(rtsp_url)
+            # v1.4.0: Optional low-res substream for live analysis and snapshots
+            analysis_url = cam_settings.resolve(config_data, "analysis_rtsp_url", clean_name) if use_rtsp else ""
+            snapshot_url = analysis_url or rtsp_url
 
             if not entity_id and not use_rtsp:
                 log_to_file(f"ERROR: Could not find Camera Entity or RTSP URL for {clean_name}")
                 return
 
+            # v1.4.0: A re-trigger while the camera records extends the running
+            # clip (up to max_clip_seconds) instead of starting another one
+            running = _recording_sessions.get(clean_name)
+            if running is not None and running.extend(duration):
+                log_to_file(
+                    f"Re-trigger absorbed for {clean_name}: clip now {running.length:.0f}s "
+                    f"({running.triggers} triggers)"
+                )
+                return
+            # HA camera.record has a fixed length; its re-triggers become a follow-up clip
+            session = _recording_sessions.start(clean_name, duration, max_clip_seconds, extendable=use_rtsp)
+
+            async def _auto_analyze_when_ready(
+                path: str, cam_name: str, rec_duration: int, ready: bool = False, frames=None,
+                full_res_ready=None, video_ready=None,
+            ):
+                global _single_analysis_progress
+                # v1.1.0 METRICS: Track analysis duration
+                analysis_start = time.time()
+                
+                try:
+                    # v1.4.0: No stability polling when the recording signalled
+                    # a finished file
+                    if not ready:
+                        # v1.1.0 OPTIMIZED: Faster file stability check (1s intervals, 2 checks = 2s)
+                        ready = await _wait_for_file_ready(path, max_wait_s=20, stable_checks=2, interval_s=1)
+                    if not ready:
+                        log_to_file(f"Recording not ready for auto-analysis (timeout): {path}")
+                        return
+
+                    log_to_file(f"Auto-analyzing {'live ' if frames is not None else ''}recording: {path}")
+
+                    # v1.4.0: A live analysis reports every frame during the
+                    # recording (person entities, rtsp_recorder_live_detection)
+                    on_frame = None
+                    if frames is not None:
+                        # Substream frames are reported again once their faces are known
+                        reported: set[int] = set()
+
+                        def _report_live_frame(idx: int, entry: dict) -> None:
+                            if person_entities_enabled and entry.get("faces"):
+                                update_person_entities_func({"video_path": path, "detections": [entry]})
+                            if idx in reported:
+                                return
+                            reported.add(idx)
+                            labels = sorted({obj.get("label") for obj in entry.get("objects", []) if obj.get("label")})
+                            if labels:
+                                hass.bus.async_fire("rtsp_recorder_live_detection", {
+                                    "camera": cam_name,
+                                    "video_path": path,
+                                    "frame": idx,
+                                    "objects": labels,
+                                })
+
+                        on_frame = _report_live_frame
+                    
+                    # v1.1.0: Set progress for footer display
+                    analysis_started_at = datetime.datetime.now().isoformat()
+                    _single_analysis_progress = {
+                        "running": True,
+                        "media_id": "",
+                        "video_path": path,
+                        "started_at": analysis_started_at,
+                        "completed": False,
+                    }
+                    
+                    # v1.1.0f: Fire event so frontend shows analysis indicator (PUSH)
+                    log_to_file(f"PUSH: Firing analysis_started event for {cam_name}")
+                    hass.bus.async_fire("rtsp_recorder_analysis_started", {
+                        "video_path": path,
+                        "camera": cam_name,
+                        "started_at": analysis_started_at,
+                    })
+                    
+                    perf_snapshot = get_sensor_snapshot_func()
+                    semaphore = _get_analysis_semaphore()
+
+                    objects_to_use = cam_settings.resolve(config_data, "analysis_objects", cam_name)
+                    detector_conf_to_use = cam_settings.resolve(config_data, "analysis_detector_confidence", cam_name)
+                    face_conf_to_use = cam_settings.resolve(config_data, "analysis_face_confidence", cam_name)
+                    face_threshold_to_use = cam_settings.resolve(config_data, "analysis_face_match_threshold", cam_name)
+                    interval_to_use = cam_settings.resolve(config_data, "analysis_frame_interval", cam_name)
+                    face_enabled_to_use = cam_settings.resolve(config_data, "analysis_face_enabled", cam_name)
+                    face_multiscale_to_use = cam_settings.resolve(config_data, "analysis_face_multiscale", cam_name)
+                    overlay_smoothing_to_use = cam_settings.resolve(config_data, "analysis_overlay_smoothing", cam_name)
+
+                    people_data, face_index = await _load_people_index()
+                    people = people_data.get("people", [])
+                    auto_device = await resolve_auto_device_func()
+                    async with semaphore:
+                        result = await analyze_recording(
+                            video_path=path,
+                            output_root=analysis_output_path,
+                            objects=objects_to_use,
+                            device=auto_device,
+                            interval_s=interval_to_use,
+                            perf_snapshot=perf_snapshot,
+                            detector_url=analysis_detector_url,
+                            detector_confidence=detector_conf_to_use,
+                            face_enabled=face_enabled_to_use,
+                            face_confidence=face_conf_to_use,
+                            face_match_threshold=face_threshold_to_use,
+                            overlay_smoothing=overlay_smoothing_to_use,
+                            overlay_smoothing_alpha=analysis_overlay_smoothing_alpha,
+                            face_store_embeddings=analysis_face_store_embeddings,
+                            people_db=people,
+                            face_index=face_index,
+                            face_detector_url=analysis_detector_url,
+                            face_multiscale=face_multiscale_to_use,
+                            detector_batch_size=analysis_detector_batch_size,
+                            detector_pipeline=analysis_detector_pipeline,
+                            detector_transport=analysis_detector_transport,
+                            pipeline_window=analysis_pipeline_window,
+                            frames=frames,
+                            on_frame=on_frame,
+                            full_res_ready=full_res_ready,
+                            video_ready=video_ready,
+                            frame_budget=_frame_budget(cam_name),
+                        )
+                    if person_entities_enabled:
+                        try:
+                            updated = update_person_entities_func(result or {})
+                            if not updated:
+                                await update_person_entities_for_video_func(path)
+                        except Exception as e:
+                            log_to_file(f"Person entities update failed: {e}")
+                    
+                    # v1.1.0 METRICS: Record analysis duration
+                    record_metric("analysis_duration", cam_name, analysis_start)
+                    # v1.1.0 METRICS: Record total pipeline time (from pipeline_start captured in closure)
+                    record_metric("total_pipeline_time", cam_name, pipeline_start, f"rec={rec_duration}s")
+                    
+                    log_to_file(f"Auto-analysis completed for: {path}")
+                    # v1.1.0: Mark as completed
+                    _single_analysis_progress["running"] = False
+                    _single_analysis_progress["completed"] = True
+                    
+                    # v1.1.0f: Fire event so frontend updates (PUSH)
+                    log_to_file(f"PUSH: Firing analysis_completed event for {cam_name}")
+                    hass.bus.async_fire("rtsp_recorder_analysis_completed", {
+                        "video_path": path,
+                        "camera": cam_name,
+                        "completed_at": datetime.datetime.now().isoformat(),
+                    })
+                except asyncio.CancelledError:
+                    # v1.4.0: Live analysis dropped in favour of the file
+                    _single_analysis_progress["running"] = False
+                    raise
+                except Exception as ae:
+                    log_to_file(f"Auto-analysis error: {ae}")
+                    # v1.1.0: Mark as failed
+                    _single_analysis_progress["running"] = False
+                    _single_analysis_progress["completed"] = False
+
             # 1. Video Recording
             cam_folder = os.path.join(storage_path, clean_name)
             if not os.path.exists(cam_folder):
@@ -303,6 +562,10 @@ def register_services(
                 "duration": duration,
                 "started_at": datetime.datetime.now().isoformat(),
             }
+
+            def _on_session_extended(end_time: float) -> None:
+                if full_path in _active_recordings:
+                    _active_recordings[full_path]["duration"] = int(round(end_time - session.started_at))
             
             # v1.1.0: Fire event immediately so thumbnail appears in timeline
             hass.bus.async_fire("rtsp_recorder_recording_started", {
@@ -313,30 +576,150 @@ def register_services(
             })
             log_to_file(f"Fired rtsp_recorder_recording_started event for {clean_name}")
 
-            if use_rtsp:
+            # v1.4.0: Cameras with a running pre-record buffer take the clip
+            # (pre-roll + live) from the buffered segments, no new RTSP session
+            saved_duration = duration
+            # v1.4.0: Set when the recording path knows the file is final, so
+            # auto-analysis starts without polling the file size
+            recording_ready = False
+            live_feed = live_task = None
+            pre_record_manager = hass.data.get(DOMAIN, {}).get("pre_record_manager")
+            pre_buffer = pre_record_manager.get_buffer(clean_name) if use_rtsp and pre_record_manager else None
+            capture = pre_buffer.begin_capture(duration) if pre_buffer else None
+
+            # A finished capture refuses extensions, so re-triggers while the
+            # clip is finalized become follow-up time instead of getting lost
+            if capture is not None:
+                session.add_listener(capture.extend)
+            session.add_listener(_on_session_extended)
+
+            if capture is not None:
+                snap_folder = os.path.join(snapshot_path_base, clean_name)
+                snap_full_path = os.path.join(snap_folder, f"{clean_name}_{timestamp}.jpg")
+                preview_full_path = variant_path(snap_full_path, TIMELINE_PREVIEW_WIDTH, "jpeg")
+                log_to_file(f"Recording from pre-record buffer ({capture.pre_roll_seconds:.1f}s pre-roll)")
+                try:
+                    snapshot_task = hass.async_create_task(async_snapshot_from_capture(
+                        capture, snap_full_path, snapshot_delay, preview_full_path, TIMELINE_PREVIEW_WIDTH
+                    ))
+                    saved, error = await async_save_capture(
+                        capture, full_path, timeout=session.max_end - time.time() + 30
+                    )
+                    try:
+                        snapshot_ok = await asyncio.wait_for(snapshot_task, timeout=30)
+                    except asyncio.TimeoutError:
+                        snapshot_ok = False
+                finally:
+                    capture.release()
+                if not snapshot_ok or not await hass.async_add_executor_job(
+                    _finish_preview, snap_full_path, preview_full_path
+                ):
+                    log_to_file("Pre-record buffer produced no snapshot, taking one separately")
+                    try:
+                        await async_take_snapshot(hass, snapshot_url, snap_full_path, delay=0)
+                    except Exception as e:
+                        log_to_file(f"Fallback snapshot error: {e}")
+                if saved:
+                    recording_ready = True
+                    saved_duration = int(round(capture.end_time - capture.event_time + capture.pre_roll_seconds))
+                    log_to_file(f"Pre-record recording saved: {full_path}")
+                else:
+                    log_to_file(f"ERROR: Pre-record recording failed: {error}")
+            elif use_rtsp:
                 # v1.1.0 OPTIMIZED: Event-based recording completion (not polling)
                 recording_complete = asyncio.Event()
                 recording_result = {"success": False, "error": None}
                 
                 def on_recording_complete(path: str, success: bool, error_msg: str | None) -> None:
                     """Callback when FFmpeg finishes and file is renamed."""
+                    # Re-triggers after FFmpeg exited become follow-up time
+                    session.stop_extending()
                     recording_result["success"] = success
                     recording_result["error"] = error_msg
                     recording_complete.set()
                     log_to_file(f"Recording callback: success={success}, error={error_msg}")
                 
-                # Start recording with callback (returns immediately)
-                process = await async_record_stream(hass, rtsp_url, duration, full_path, on_complete=on_recording_complete)
-                log_to_file(f"Recording started, waiting for completion via callback...")
-                
-                # v1.1.0 OPTIMIZED: Start snapshot task in parallel (after snapshot_delay)
-                # Snapshot runs DURING recording, not after - saves time!
                 snap_folder = os.path.join(snapshot_path_base, clean_name)
                 if not os.path.exists(snap_folder):
                     os.makedirs(snap_folder, exist_ok=True)
                 snap_filename = f"{clean_name}_{timestamp}.jpg"
                 snap_full_path = os.path.join(snap_folder, snap_filename)
                 
+                # v1.4.0: Live analysis gets sampled frames from the same FFmpeg
+                live_interval = None
+                if analysis_enabled and analysis_auto_new and config_data.get(
+                    "analysis_live_enabled", DEFAULT_ANALYSIS_LIVE_ENABLED
+                ):
+                    live_interval = cam_settings.resolve(config_data, "analysis_frame_interval", clean_name)
+                # v1.4.0: With a substream, a second FFmpeg decodes it for the
+                # live frames and the snapshot; the main stream is only copied
+                substream = bool(analysis_url and live_interval)
+                
+                # v1.4.0: One RTSP session writes the MP4, the snapshot and the
+                # timeline preview (cameras often limit concurrent sessions)
+                single_session = bool(config_data.get("rtsp_single_session", DEFAULT_RTSP_SINGLE_SESSION))
+                stream_snapshot = single_session or substream
+                preview_full_path = variant_path(snap_full_path, TIMELINE_PREVIEW_WIDTH, "jpeg") if stream_snapshot else None
+                snapshot_at = min(float(snapshot_delay or 0), max(0, duration - 1))
+                
+                # Start recording with callback (returns immediately)
+                # v1.4.0: FFmpeg runs up to the clip cap and is stopped at the
+                # session end, which re-triggers may move
+                max_length = int(math.ceil(session.max_end - session.started_at))
+                process = await async_record_stream(
+                    hass, rtsp_url, max_length, full_path,
+                    on_complete=on_recording_complete,
+                    snapshot_path=snap_full_path if single_session and not substream else None,
+                    snapshot_delay=snapshot_at,
+                    preview_path=preview_full_path if not substream else None,
+                    frame_interval=None if substream else live_interval,
+                )
+                log_to_file("Recording started, waiting for completion via callback...")
+                frame_source = process.stdout if live_interval and not substream else None
+                analysis_process = None
+                if substream:
+                    try:
+                        analysis_process = await async_open_analysis_stream(
+                            analysis_url, max_length, live_interval,
+                            snapshot_path=snap_full_path,
+                            snapshot_delay=snapshot_at,
+                            preview_path=preview_full_path,
+                        )
+                        frame_source = analysis_process.stdout
+                    except Exception as e:
+                        # The file is analyzed after the recording instead
+                        log_to_file(f"Analysis stream failed to start: {e}")
+
+                async def recording_finished() -> bool:
+                    """Whether the main stream recording was saved."""
+                    try:
+                        await asyncio.wait_for(recording_complete.wait(), timeout=max_length + 30)
+                    except asyncio.TimeoutError:
+                        return os.path.exists(full_path)
+                    return recording_result["success"]
+
+                if frame_source is not None:
+                    live_feed = LiveFrameFeed(frame_source)
+                    live_feed.start()
+                    live_task = hass.async_create_task(_auto_analyze_when_ready(
+                        full_path, clean_name, duration, ready=True, frames=live_feed.frames(),
+                        full_res_ready=recording_finished if analysis_process is not None else None,
+                        video_ready=recording_finished,
+                    ))
+
+                async def stop_at_session_end():
+                    """Stop FFmpeg at the session end unless -t ends it first."""
+                    await session.wait_until_end()
+                    _recording_sessions.close(session)
+                    if session.end_time < session.max_end:
+                        await asyncio.gather(*(
+                            async_stop_recording(p) for p in (process, analysis_process) if p is not None
+                        ))
+
+                stop_task = hass.async_create_task(stop_at_session_end())
+                
+                # v1.1.0 OPTIMIZED: Start snapshot task in parallel (after snapshot_delay)
+                # Snapshot runs DURING recording, not after - saves time!
                 async def take_snapshot_parallel():
                     """Take snapshot after configured delay (runs parallel to recording)."""
                     try:
@@ -344,39 +727,56 @@ def register_services(
                             log_to_file(f"Snapshot scheduled in {snapshot_delay}s (parallel to recording)")
                             await asyncio.sleep(snapshot_delay)
                         log_to_file(f"Taking parallel snapshot: {snap_full_path}")
-                        await async_take_snapshot(hass, rtsp_url, snap_full_path, delay=0)
+                        await async_take_snapshot(hass, snapshot_url, snap_full_path, delay=0)
                         log_to_file(f"Parallel snapshot complete: {snap_full_path}")
                     except Exception as e:
                         log_to_file(f"Parallel snapshot error: {e}")
                 
                 # Start snapshot task (runs in parallel)
-                snapshot_task = hass.async_create_task(take_snapshot_parallel())
+                snapshot_task = None if stream_snapshot else hass.async_create_task(take_snapshot_parallel())
                 
                 # Wait for recording to complete (event-based, not polling!)
-                # Timeout = duration + 30s safety buffer
+                # Timeout = clip cap + 30s safety buffer
                 try:
-                    await asyncio.wait_for(recording_complete.wait(), timeout=duration + 30)
+                    await asyncio.wait_for(recording_complete.wait(), timeout=max_length + 30)
                     if recording_result["success"]:
-                        log_to_file(f"Recording completed successfully via callback")
+                        log_to_file("Recording completed successfully via callback")
                     else:
                         log_to_file(f"Recording completed with error: {recording_result['error']}")
                 except asyncio.TimeoutError:
-                    log_to_file(f"WARNING: Recording callback timeout after {duration + 30}s, checking file...")
+                    log_to_file(f"WARNING: Recording callback timeout after {max_length + 30}s, checking file...")
                     # Fallback: Check if file exists anyway
                     if os.path.exists(full_path):
-                        log_to_file(f"File exists despite timeout, continuing")
+                        log_to_file("File exists despite timeout, continuing")
                     else:
-                        log_to_file(f"ERROR: Recording failed - file not found")
+                        log_to_file("ERROR: Recording failed - file not found")
+                session.stop_extending()
+                if not stop_task.done():
+                    stop_task.cancel()
+                if analysis_process is not None:
+                    # Ends with the recording, also when the main stream failed
+                    await async_stop_recording(analysis_process)
+                saved_duration = int(round(session.length))
+                recording_ready = recording_result["success"]
                 
-                # Wait for snapshot to complete (if still running)
-                try:
-                    await asyncio.wait_for(asyncio.shield(snapshot_task), timeout=10)
-                except asyncio.TimeoutError:
-                    log_to_file(f"Snapshot task still running, continuing without waiting")
-                except Exception:
-                    pass  # Snapshot task may have completed already
+                if stream_snapshot:
+                    # Snapshot missing (e.g. no decodable frame): separate session now
+                    if not await hass.async_add_executor_job(_finish_preview, snap_full_path, preview_full_path):
+                        log_to_file("Single session produced no snapshot, taking one separately")
+                        try:
+                            await async_take_snapshot(hass, snapshot_url, snap_full_path, delay=0)
+                        except Exception as e:
+                            log_to_file(f"Fallback snapshot error: {e}")
+                else:
+                    # Wait for snapshot to complete (if still running)
+                    try:
+                        await asyncio.wait_for(asyncio.shield(snapshot_task), timeout=10)
+                    except asyncio.TimeoutError:
+                        log_to_file("Snapshot task still running, continuing without waiting")
+                    except Exception:
+                        pass  # Snapshot task may have completed already
                 
-                log_to_file(f"Recording and snapshot complete")
+                log_to_file("Recording and snapshot complete")
             else:
                 # v1.1.0 OPTIMIZED: Parallel snapshot for HA Camera entities too
                 snap_folder = os.path.join(snapshot_path_base, clean_name)
@@ -403,36 +803,47 @@ def register_services(
                 # Start snapshot task in parallel
                 snapshot_task = hass.async_create_task(take_ha_snapshot_parallel())
                 
+                # v1.4.0: Registered before recording so the rename of the
+                # finished file cannot be missed
+                file_done = file_watcher.expect(full_path)
                 await hass.services.async_call("camera", "record", {
                     "entity_id": entity_id,
                     "filename": full_path,
                     "duration": duration,
                     "lookback": 0
                 })
-                # HA camera.record returns immediately, wait for recording duration
-                # v1.1.0 OPTIMIZED: Reduced from +2s to +1s - files are usually ready sooner
-                log_to_file(f"HA camera recording started, waiting {duration}s...")
-                await asyncio.sleep(duration + 1)
-                
-                # v1.1.0 OPTIMIZED: Faster file check - 0.5s intervals, max 10s wait
-                max_wait_file = 20  # 20 * 0.5s = 10s max
-                for i in range(max_wait_file):
-                    if os.path.exists(full_path):
+                # HA camera.record returns immediately
+                if file_done is not None:
+                    log_to_file(f"HA camera recording started, waiting for the file (up to {duration + 30}s)...")
+                    recording_ready = await file_watcher.wait(full_path, file_done, timeout=duration + 30)
+                    if recording_ready:
                         log_to_file(f"Recording file ready: {full_path}")
-                        break
-                    await asyncio.sleep(0.5)
+                    else:
+                        log_to_file(f"WARNING: Recording file not finished after {duration + 30}s: {full_path}")
                 else:
-                    log_to_file(f"WARNING: File not found after {max_wait_file * 0.5}s: {full_path}")
+                    # v1.1.0 OPTIMIZED: Reduced from +2s to +1s - files are usually ready sooner
+                    log_to_file(f"HA camera recording started, waiting {duration}s...")
+                    await asyncio.sleep(duration + 1)
+                    
+                    # v1.1.0 OPTIMIZED: Faster file check - 0.5s intervals, max 10s wait
+                    max_wait_file = 20  # 20 * 0.5s = 10s max
+                    for i in range(max_wait_file):
+                        if os.path.exists(full_path):
+                            log_to_file(f"Recording file ready: {full_path}")
+                            break
+                        await asyncio.sleep(0.5)
+                    else:
+                        log_to_file(f"WARNING: File not found after {max_wait_file * 0.5}s: {full_path}")
                 
                 # Wait for snapshot to complete (if still running)
                 try:
                     await asyncio.wait_for(asyncio.shield(snapshot_task), timeout=10)
                 except asyncio.TimeoutError:
-                    log_to_file(f"HA Snapshot task still running, continuing")
+                    log_to_file("HA Snapshot task still running, continuing")
                 except Exception as e:
                     log_to_file(f"HA Snapshot task exception: {e}")
                     
-                log_to_file(f"HA camera recording and snapshot complete")
+                log_to_file("HA camera recording and snapshot complete")
 
                 # v1.3.3: Remux fMP4 to regular MP4 for mobile compatibility
                 # HA camera.record produces fragmented MP4 from RTSP streams
@@ -444,13 +855,15 @@ def register_services(
                     else:
                         log_to_file(f"REMUX SKIP: {remux_err} (keeping original)")
 
+            _recording_sessions.close(session)
+
             # v1.1.0: Recording + Snapshot finished - NOW remove from active recordings
             # This triggers the frontend to refresh the timeline
             if full_path in _active_recordings:
                 del _active_recordings[full_path]
             
             # v1.1.0 METRICS: Record time from start to saved
-            record_metric("recording_to_saved", clean_name, pipeline_start, f"duration={duration}s")
+            record_metric("recording_to_saved", clean_name, pipeline_start, f"duration={saved_duration}s")
             
             # v1.1.0: Fire event so frontend can refresh
             hass.bus.async_fire("rtsp_recorder_recording_saved", {
@@ -458,113 +871,37 @@ def register_services(
                 "video_path": full_path,
                 "snapshot_path": snap_full_path,
                 "timestamp": timestamp,
+                "duration": saved_duration,
             })
             log_to_file(f"Fired rtsp_recorder_recording_saved event for {clean_name}")
 
-            # 3. Auto-Analyze after recording
-            if analysis_enabled and analysis_auto_new:
-                async def _auto_analyze_when_ready(path: str, cam_name: str, rec_duration: int):
-                    global _single_analysis_progress
-                    # v1.1.0 METRICS: Track analysis duration
-                    analysis_start = time.time()
-                    
-                    try:
-                        # v1.1.0 OPTIMIZED: Faster file stability check (1s intervals, 2 checks = 2s)
-                        ready = await _wait_for_file_ready(path, max_wait_s=20, stable_checks=2, interval_s=1)
-                        if not ready:
-                            log_to_file(f"Recording not ready for auto-analysis (timeout): {path}")
-                            return
-
-                        log_to_file(f"Auto-analyzing new recording: {path}")
-                        
-                        # v1.1.0: Set progress for footer display
-                        analysis_started_at = datetime.datetime.now().isoformat()
-                        _single_analysis_progress = {
-                            "running": True,
-                            "media_id": "",
-                            "video_path": path,
-                            "started_at": analysis_started_at,
-                            "completed": False,
-                        }
-                        
-                        # v1.1.0f: Fire event so frontend shows analysis indicator (PUSH)
-                        log_to_file(f"PUSH: Firing analysis_started event for {cam_name}")
-                        hass.bus.async_fire("rtsp_recorder_analysis_started", {
-                            "video_path": path,
-                            "camera": cam_name,
-                            "started_at": analysis_started_at,
-                        })
-                        
-                        perf_snapshot = get_sensor_snapshot_func()
-                        semaphore = _get_analysis_semaphore()
-
-                        objects_to_use = cam_settings.resolve(config_data, "analysis_objects", cam_name)
-                        detector_conf_to_use = cam_settings.resolve(config_data, "analysis_detector_confidence", cam_name)
-                        face_conf_to_use = cam_settings.resolve(config_data, "analysis_face_confidence", cam_name)
-                        face_threshold_to_use = cam_settings.resolve(config_data, "analysis_face_match_threshold", cam_name)
-                        interval_to_use = cam_settings.resolve(config_data, "analysis_frame_interval", cam_name)
-                        face_enabled_to_use = cam_settings.resolve(config_data, "analysis_face_enabled", cam_name)
-                        face_multiscale_to_use = cam_settings.resolve(config_data, "analysis_face_multiscale", cam_name)
-                        overlay_smoothing_to_use = cam_settings.resolve(config_data, "analysis_overlay_smoothing", cam_name)
-
-                        people_data = await _load_people_db()
-                        people = people_data.get("people", [])
-                        auto_device = await resolve_auto_device_func()
-                        async with semaphore:
-                            result = await analyze_recording(
-                                video_path=path,
-                                output_root=analysis_output_path,
-                                objects=objects_to_use,
-                                device=auto_device,
-                                interval_s=interval_to_use,
-                                perf_snapshot=perf_snapshot,
-                                detector_url=analysis_detector_url,
-                                detector_confidence=detector_conf_to_use,
-                                face_enabled=face_enabled_to_use,
-                                face_confidence=face_conf_to_use,
-                                face_match_threshold=face_threshold_to_use,
-                                overlay_smoothing=overlay_smoothing_to_use,
-                                overlay_smoothing_alpha=analysis_overlay_smoothing_alpha,
-                                face_store_embeddings=analysis_face_store_embeddings,
-                                people_db=people,
-                                face_detector_url=analysis_detector_url,
-                                face_multiscale=face_multiscale_to_use,
-                            )
-                        if person_entities_enabled:
-                            try:
-                                updated = update_person_entities_func(result or {})
-                                if not updated:
-                                    await update_person_entities_for_video_func(path)
-                            except Exception as e:
-                                log_to_file(f"Person entities update failed: {e}")
-                        
-                        # v1.1.0 METRICS: Record analysis duration
-                        record_metric("analysis_duration", cam_name, analysis_start)
-                        # v1.1.0 METRICS: Record total pipeline time (from pipeline_start captured in closure)
-                        record_metric("total_pipeline_time", cam_name, pipeline_start, f"rec={rec_duration}s")
-                        
-                        log_to_file(f"Auto-analysis completed for: {path}")
-                        # v1.1.0: Mark as completed
-                        _single_analysis_progress["running"] = False
-                        _single_analysis_progress["completed"] = True
-                        
-                        # v1.1.0f: Fire event so frontend updates (PUSH)
-                        log_to_file(f"PUSH: Firing analysis_completed event for {cam_name}")
-                        hass.bus.async_fire("rtsp_recorder_analysis_completed", {
-                            "video_path": path,
-                            "camera": cam_name,
-                            "completed_at": datetime.datetime.now().isoformat(),
-                        })
-                    except Exception as ae:
-                        log_to_file(f"Auto-analysis error: {ae}")
-                        # v1.1.0: Mark as failed
-                        _single_analysis_progress["running"] = False
-                        _single_analysis_progress["completed"] = False
+            # v1.4.0: Motion that outlasted the clip (cap reached or re-trigger
+            # while finalizing) continues in one consecutive clip
+            follow_up = session.follow_up_seconds()
+            if follow_up:
+                log_to_file(f"Motion continued after clip on {clean_name}, recording {follow_up:.0f}s more")
+                hass.async_create_task(handle_save_recording(
+                    camera_name=clean_name, duration=int(math.ceil(follow_up)), snapshot_delay=snapshot_delay
+                ))
 
-                hass.async_create_task(_auto_analyze_when_ready(full_path, clean_name, int(duration or 0)))
+            # 3. Auto-Analyze after recording
+            if live_task is not None:
+                if recording_ready and not live_feed.overflowed:
+                    log_to_file(f"Live analysis finishing for: {full_path}")
+                else:
+                    # Incomplete live frames: analyze the file instead
+                    log_to_file(f"Live analysis incomplete, analyzing the file: {full_path}")
+                    live_task.cancel()
+                    live_task = None
+            if analysis_enabled and analysis_auto_new and live_task is None:
+                hass.async_create_task(_auto_analyze_when_ready(
+                    full_path, clean_name, int(saved_duration or 0), ready=recording_ready
+                ))
             
         except Exception as e:
             log_to_file(f"Error in save_recording: {e}")
+            if session is not None:
+                _recording_sessions.close(session)
 
     hass.services.async_register(DOMAIN, "save_recording", handle_save_recording)
     
@@ -588,17 +925,27 @@ def register_services(
         if since_days is not None and since_days > 0:
             cutoff = now_ts - (since_days * 86400)
 
-        files = await hass.async_add_executor_job(_list_video_files, storage_path, camera)
-        if cutoff is not None:
-            files = [f for f in files if os.path.getmtime(f) >= cutoff]
-
-        if skip_existing:
-            existing = await hass.async_add_executor_job(_build_analysis_index, analysis_output_path)
-            files = [f for f in files if f not in existing]
-
-        files.sort(key=lambda p: os.path.getmtime(p), reverse=True)
-        if limit and limit > 0:
-            files = files[:limit]
+        # v1.4.0: Filtered, sorted and limited by the recording catalog
+        # (skip_existing needs the analysis index as well)
+        files = None
+        if not skip_existing or _analysis_index_ready(analysis_output_path):
+            files = await hass.async_add_executor_job(
+                list_recordings, storage_path, camera, cutoff,
+                analysis_output_path if skip_existing else None,
+                limit if limit and limit > 0 else None,
+            )
+        if files is None:
+            files = await hass.async_add_executor_job(_list_video_files, storage_path, camera)
+            if cutoff is not None:
+                files = [f for f in files if os.path.getmtime(f) >= cutoff]
+
+            if skip_existing:
+                existing = await hass.async_add_executor_job(_build_analysis_index, analysis_output_path)
+                files = [f for f in files if f not in existing]
+
+            files.sort(key=lambda p: os.path.getmtime(p), reverse=True)
+            if limit and limit > 0:
+                files = files[:limit]
 
         # Initialize progress tracking
         _batch_analysis_progress = {
@@ -632,7 +979,7 @@ def register_services(
             "current_file": "",
         })
 
-        people_data = await _load_people_db()
+        people_data, face_index = await _load_people_index()
         people = people_data.get("people", [])
 
         semaphore = _get_analysis_semaphore()
@@ -682,8 +1029,14 @@ def register_services(
                         overlay_smoothing_alpha=analysis_overlay_smoothing_alpha,
                         face_store_embeddings=analysis_face_store_embeddings,
                         people_db=people,
+                        face_index=face_index,
                         face_detector_url=analysis_detector_url,
                         face_multiscale=face_multiscale_to_use,
+                        detector_batch_size=analysis_detector_batch_size,
+                        detector_pipeline=analysis_detector_pipeline,
+                        detector_transport=analysis_detector_transport,
+                        pipeline_window=analysis_pipeline_window,
+                        frame_budget=_frame_budget(cam_name),
                     )
                     if person_entities_enabled and result:
                         updated = update_person_entities_func(result)
@@ -792,7 +1145,7 @@ def register_services(
                 
                 try:
                     perf_snapshot = get_sensor_snapshot_func()
-                    people_data = await _load_people_db()
+                    people_data, face_index = await _load_people_index()
                     people = people_data.get("people", [])
                     semaphore = _get_analysis_semaphore()
                     async with semaphore:
@@ -812,8 +1165,14 @@ def register_services(
                             overlay_smoothing_alpha=analysis_overlay_smoothing_alpha,
                             face_store_embeddings=analysis_face_store_embeddings,
                             people_db=people,
+                            face_index=face_index,
                             face_detector_url=analysis_detector_url,
                             face_multiscale=face_multiscale_to_use,
+                            detector_batch_size=analysis_detector_batch_size,
+                            detector_pipeline=analysis_detector_pipeline,
+                            detector_transport=analysis_detector_transport,
+                            pipeline_window=analysis_pipeline_window,
+                            frame_budget=_frame_budget(cam_name),
                         )
                     if person_entities_enabled and result:
                         updated = update_person_entities_func(result)
@@ -894,12 +1253,14 @@ def register_services(
                 )
                 if deleted_analysis:
                     log_to_file(f"Deleted analysis for: {video_path}")
+                    await hass.async_add_executor_job(_sync_analysis_index, analysis_output_path)
 
             if os.path.exists(video_path):
                 await hass.async_add_executor_job(os.remove, video_path)
                 log_to_file(f"Deleted video: {video_path}")
             else:
                 log_to_file(f"Video not found: {video_path}")
+            await hass.async_add_executor_job(uncatalog_recordings, [video_path])
 
             filename = os.path.basename(video_path).replace('.mp4', '.jpg')
             parts = video_path.split('/')
@@ -930,6 +1291,7 @@ def register_services(
         log_to_file(f"Delete all recordings: camera={camera}, older_than_days={older_than_days}, include_analysis={include_analysis}")
         
         deleted_videos = 0
+        deleted_video_paths = []
         deleted_thumbs = 0
         deleted_analysis = 0
         errors = []
@@ -960,6 +1322,7 @@ def register_services(
                     
                     os.remove(video_path)
                     deleted_videos += 1
+                    deleted_video_paths.append(video_path)
                     
                     filename = os.path.basename(video_path).replace('.mp4', '.jpg')
                     cam_folder = os.path.basename(os.path.dirname(video_path))
@@ -993,6 +1356,10 @@ def register_services(
                             errors.append(f"{analysis_dir}: {str(e)}")
             
             log_to_file(f"Deleted: {deleted_videos} videos, {deleted_thumbs} thumbs, {deleted_analysis} analysis folders. Errors: {len(errors)}")
+            if deleted_analysis:
+                await hass.async_add_executor_job(_sync_analysis_index, analysis_output_path)
+            if deleted_video_paths:
+                await hass.async_add_executor_job(uncatalog_recordings, deleted_video_paths)
             
         except Exception as e:
             log_to_file(f"Error in delete_all_recordings: {e}")
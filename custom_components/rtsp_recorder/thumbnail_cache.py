@@ -0,0 +1,192 @@
+"""Thumbnail caching for the thumbnail view.
+
+v1.4.0: The timeline card requests dozens of snapshots at once and every
+request used to read the full-size JPEG from disk. Served thumbnails are now
+kept in an in-memory LRU bounded by bytes, and ``?w=<width>`` returns a
+downscaled variant (WebP when the client accepts it, JPEG otherwise; an
+existing JPEG variant such as the recorder's timeline preview is reused).
+
+Variants are generated once in an executor and stored next to the snapshot
+in ``.variants/`` (aged out by the snapshot retention like the originals).
+Requested widths are snapped to ``VARIANT_WIDTHS`` so clients cannot create
+an unbounded number of files.
+"""
+import logging
+import os
+from collections import OrderedDict
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+    features = None
+
+_LOGGER = logging.getLogger(__name__)
+
+# Widths a ?w= request is rounded up to; wider requests get the original
+VARIANT_WIDTHS = (160, 320, 640)
+
+# Width the timeline card requests; single session recordings write this
+# variant (as JPEG) directly with the snapshot
+TIMELINE_PREVIEW_WIDTH = 320
+
+VARIANT_DIR = ".variants"
+VARIANT_QUALITY = 80
+
+# Memory budget of the LRU (all cached thumbnails and variants together)
+DEFAULT_CACHE_BYTES = 32 * 1024 * 1024
+
+_CONTENT_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+}
+
+
+def thumbnail_content_type(filename: str) -> str:
+    """Content type of a snapshot by file extension (JPEG by default)."""
+    return _CONTENT_TYPES.get(os.path.splitext(filename)[1].lower(), "image/jpeg")
+
+
+class ThumbnailCache:
+    """LRU of served thumbnails, bounded by the total size of the bodies.
+
+    Entries carry the ETag of the file they were read from; a lookup with a
+    different ETag (file replaced) is a miss and drops the stale entry.
+    Only used from the event loop, so no locking.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, tuple[str, bytes, str]] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the cached bodies."""
+        return self._bytes
+
+    def get(self, key: tuple, etag: str) -> tuple[bytes, str] | None:
+        """Cached (body, content type) for key if it is still current."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] != etag:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1], entry[2]
+
+    def put(self, key: tuple, etag: str, data: bytes, content_type: str) -> None:
+        """Store a body, evicting least recently used entries beyond the budget."""
+        if len(data) > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = (etag, data, content_type)
+        self._bytes += len(data)
+        while self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+
+def variant_width(requested: str | int | None) -> int | None:
+    """Snap a requested ?w= width to one of VARIANT_WIDTHS.
+
+    Returns:
+        Variant width, None for the original (missing, invalid or wider
+        than the largest variant)
+    """
+    try:
+        width = int(requested)
+    except (TypeError, ValueError):
+        return None
+    if width <= 0:
+        return None
+    for candidate in VARIANT_WIDTHS:
+        if width <= candidate:
+            return candidate
+    return None
+
+
+def webp_supported() -> bool:
+    """Whether Pillow can encode WebP."""
+    if features is None:
+        return False
+    try:
+        return bool(features.check("webp"))
+    except Exception:
+        return False
+
+
+def variant_path(source_path: str, width: int, image_format: str) -> str:
+    """Disk cache location of a resized variant."""
+    folder, filename = os.path.split(source_path)
+    stem = os.path.splitext(filename)[0]
+    ext = "webp" if image_format == "webp" else "jpg"
+    return os.path.join(folder, VARIANT_DIR, f"{stem}_w{width}.{ext}")
+
+
+def load_variant(source_path: str, width: int, image_format: str = "jpeg") -> tuple[bytes, str] | None:
+    """Read (or create) a downscaled variant of a snapshot. Blocking.
+
+    Args:
+        source_path: Full-size snapshot
+        width: Target width from VARIANT_WIDTHS
+        image_format: "webp" or "jpeg"
+
+    Returns:
+        Tuple of (body, content type), None when the original should be
+        served (Pillow missing, image not wider than width, or an error)
+    """
+    if image_format == "webp" and not webp_supported():
+        image_format = "jpeg"
+    content_type = "image/webp" if image_format == "webp" else "image/jpeg"
+    target = variant_path(source_path, width, image_format)
+
+    # An up to date JPEG variant (e.g. the recorder's preview) also serves
+    # WebP requests instead of encoding another file
+    candidates = [(target, content_type)]
+    if image_format == "webp":
+        candidates.append((variant_path(source_path, width, "jpeg"), "image/jpeg"))
+    try:
+        source_mtime = os.path.getmtime(source_path)
+        for path, path_type in candidates:
+            if os.path.isfile(path) and os.path.getmtime(path) >= source_mtime:
+                with open(path, "rb") as f:
+                    return f.read(), path_type
+    except OSError:
+        return None
+
+    if Image is None:
+        return None
+    try:
+        with Image.open(source_path) as img:
+            if img.width <= width:
+                return None
+            height = max(1, round(img.height * width / img.width))
+            resized = img.convert("RGB").resize((width, height), Image.LANCZOS)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp_path = f"{target}.tmp"
+        if image_format == "webp":
+            resized.save(tmp_path, "WEBP", quality=VARIANT_QUALITY)
+        else:
+            resized.save(tmp_path, "JPEG", quality=VARIANT_QUALITY, optimize=True)
+        os.replace(tmp_path, target)
+        with open(target, "rb") as f:
+            return f.read(), content_type
+    except Exception as e:
+        _LOGGER.debug("Could not create thumbnail variant of %s: %s", source_path, e)
+        return None
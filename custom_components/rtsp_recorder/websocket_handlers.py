@@ -15,11 +15,12 @@ from homeassistant.components import websocket_api
 
 from .helpers import log_to_file, get_system_stats, get_inference_stats
 from .const import DEFAULT_STORAGE_PATH, DEFAULT_SNAPSHOT_PATH, DOMAIN
-from .face_matching import _normalize_embedding_simple, _cosine_similarity_simple
+from .face_matching import _normalize_embedding_simple
+from .face_sidecar import inline_face_thumb
 from .people_db import (
     _load_people_db, 
+    _load_people_index,
     _public_people_view, 
-    get_ignored_embeddings,
     is_sqlite_enabled,
     _save_person_to_sqlite,
     _delete_person_from_sqlite,
@@ -30,6 +31,7 @@ from .analysis_helpers import (
     _read_analysis_results,
     _find_analysis_for_video,
     _summarize_analysis,
+    _update_all_face_matches,
 )
 from .analysis import detect_available_devices
 from .services import get_batch_analysis_progress, get_single_analysis_progress, get_recording_progress, cancel_batch_analysis
@@ -296,30 +298,24 @@ def register_websocket_handlers(
             return
         relative_path = media_id.split("local/", 1)[1]
         video_path = f"/media/{relative_path}"
-        result = await hass.async_add_executor_job(_find_analysis_for_video, analysis_output_path, video_path)
+        result = await hass.async_add_executor_job(
+            _find_analysis_for_video, analysis_output_path, video_path, True
+        )
         if result:
             result.pop("frames", None)
             # Filter out ignored embeddings from face results using similarity matching
-            ignored_embs = await get_ignored_embeddings()
-            if ignored_embs and "detections" in result:
+            people_data, face_index = await _load_people_index()
+            if people_data.get("ignored_embeddings") and "detections" in result:
                 # Use same threshold as face matching (0.85 = very high similarity)
                 IGNORE_THRESHOLD = 0.85
                 
-                def is_ignored(face_emb):
-                    """Check if embedding matches any ignored embedding."""
-                    if not face_emb:
-                        return False
-                    for ign_emb in ignored_embs:
-                        if ign_emb and _cosine_similarity_simple(face_emb, ign_emb) >= IGNORE_THRESHOLD:
-                            return True
-                    return False
-                
-                for detection in result["detections"]:
-                    if "faces" in detection:
-                        detection["faces"] = [
-                            f for f in detection["faces"]
-                            if not is_ignored(f.get("embedding"))
-                        ]
+                faced = [d for d in result["detections"] if "faces" in d]
+                ignored_flags = face_index.is_ignored(
+                    [f.get("embedding") for d in faced for f in d["faces"]], IGNORE_THRESHOLD
+                )
+                flags = iter(ignored_flags)
+                for detection in faced:
+                    detection["faces"] = [f for f in detection["faces"] if not next(flags)]
         connection.send_result(msg["id"], result or {})
 
     websocket_api.async_register_command(hass, ws_get_analysis_result)
@@ -778,6 +774,8 @@ def register_websocket_handlers(
         "analysis_enabled", "analysis_device", "analysis_objects",
         "analysis_output_path", "analysis_frame_interval", "analysis_max_concurrent",
         "analysis_detector_url", "analysis_detector_confidence",
+        "analysis_detector_batch_size", "analysis_detector_pipeline",
+        "analysis_detector_transport", "analysis_pipeline_window",
         "analysis_face_enabled", "analysis_face_confidence",
         "analysis_face_match_threshold", "analysis_face_multiscale",
         "analysis_overlay_smoothing", "analysis_overlay_smoothing_alpha",
@@ -1002,13 +1000,29 @@ def register_people_websocket_handlers(
     """
     import uuid
 
+    def _schedule_face_rematch(person_ids: list[str]) -> None:
+        """v1.4.0: Update face matches of past analyses after a people edit."""
+        async def _rematch():
+            try:
+                data, face_index = await _load_people_index()
+                updated = await _update_all_face_matches(
+                    analysis_output_path, data.get("people", []),
+                    analysis_face_match_threshold, person_ids, face_index,
+                )
+                if updated:
+                    log_to_file(f"Face re-match after edit of {person_ids}: {updated} analyses updated")
+            except Exception as e:
+                _LOGGER.warning("Face re-match failed: %s", e)
+
+        hass.async_create_task(_rematch())
+
     @websocket_api.websocket_command({
         vol.Required("type"): "rtsp_recorder/get_people",
     })
     @websocket_api.async_response
     async def ws_get_people(hass, connection, msg):
         """Get all people from database."""
-        data = await _load_people_db()
+        data = await _load_people_db(use_cache=False)
         people_view = _public_people_view(data.get("people", []))
         log_to_file(f"WS get_people -> {people_view}")
         connection.send_result(msg["id"], {"people": people_view})
@@ -1066,8 +1080,9 @@ def register_people_websocket_handlers(
             if not success:
                 connection.send_error(msg["id"], "not_found", "Person nicht gefunden")
                 return
+            _schedule_face_rematch([person_id])
             # Reload to get updated view
-            data = await _load_people_db()
+            data = await _load_people_db(use_cache=False)
             people = data.get("people", [])
             updated = next((p for p in people if str(p.get("id")) == person_id), None)
             if updated:
@@ -1097,6 +1112,7 @@ def register_people_websocket_handlers(
         if is_sqlite_enabled():
             success = await _delete_person_from_sqlite(person_id)
             if success:
+                _schedule_face_rematch([person_id])
                 connection.send_result(msg["id"], {"deleted": True})
             else:
                 connection.send_error(msg["id"], "not_found", "Person nicht gefunden")
@@ -1122,7 +1138,8 @@ def register_people_websocket_handlers(
             person_id = str(msg.get("person_id"))
             name = (msg.get("name") or "").strip()
             created_utc = (msg.get("created_utc") or "").strip()
-            thumb = msg.get("thumb")
+            # v1.4.0: Store analysis face thumbnails self-contained
+            thumb = await hass.async_add_executor_job(inline_face_thumb, analysis_output_path, msg.get("thumb"))
             embedding = msg.get("embedding") or []
             try:
                 embedding = [float(v) for v in embedding]
@@ -1138,8 +1155,9 @@ def register_people_websocket_handlers(
             if is_sqlite_enabled():
                 success = await _add_embedding_to_sqlite(person_id, embedding, thumb)
                 if success:
+                    _schedule_face_rematch([person_id])
                     # Reload to get updated view
-                    data = await _load_people_db()
+                    data = await _load_people_db(use_cache=False)
                     people = data.get("people", [])
                     updated = next((p for p in people if str(p.get("id")) == person_id), None)
                     if updated:
@@ -1171,7 +1189,7 @@ def register_people_websocket_handlers(
         try:
             person_id = str(msg.get("person_id"))
             embedding = msg.get("embedding") or []
-            thumb = msg.get("thumb")
+            thumb = await hass.async_add_executor_job(inline_face_thumb, analysis_output_path, msg.get("thumb"))
             source = msg.get("source", "manual")
             
             try:
@@ -1199,6 +1217,7 @@ def register_people_websocket_handlers(
                 connection.send_error(msg["id"], "db_error", "Failed to add negative embedding")
                 return
 
+            _schedule_face_rematch([person_id])
             neg_count = await hass.async_add_executor_job(db.get_negative_count_for_person, person_id)
 
             # Get person name for logging
@@ -1423,12 +1442,16 @@ def register_people_websocket_handlers(
                 connection.send_error(msg["id"], "db_error", "Database not available")
                 return
             
+            owners = await hass.async_add_executor_job(
+                db.get_embedding_owners, [embedding_id], embedding_type
+            )
             if embedding_type == "positive":
                 success = await hass.async_add_executor_job(db.delete_positive_embedding, embedding_id)
             else:
                 success = await hass.async_add_executor_job(db.delete_negative_embedding, embedding_id)
             
             if success:
+                _schedule_face_rematch(owners)
                 log_to_file(f"INIT: Deleted {embedding_type} embedding {embedding_id}")
                 connection.send_result(msg["id"], {"success": True, "deleted_id": embedding_id})
             else:
@@ -1492,9 +1515,14 @@ def register_people_websocket_handlers(
         try:
             from .database import get_database
             db = get_database()
+            owners = await hass.async_add_executor_job(
+                db.get_embedding_owners, embedding_ids, embedding_type
+            )
             result = await hass.async_add_executor_job(
                 db.bulk_delete_embeddings, embedding_ids, embedding_type
             )
+            if result.get("success_count"):
+                _schedule_face_rematch(owners)
 
             log_to_file(f"INIT: bulk_delete_embeddings result: {result['success_count']} deleted, {result['failure_count']} failed")
             connection.send_result(msg["id"], result)
@@ -115,7 +115,7 @@ class TestCentroidComputation:
     
     def test_compute_centroid_single(self):
         """Test centroid of single embedding."""
-        from analysis import _compute_centroid
+        from face_matching import _compute_centroid
         
         embeddings = [[0.6, 0.8]]
         result = _compute_centroid(embeddings)
@@ -126,7 +126,7 @@ class TestCentroidComputation:
     
     def test_compute_centroid_multiple(self):
         """Test centroid of multiple embeddings."""
-        from analysis import _compute_centroid
+        from face_matching import _compute_centroid
         
         embeddings = [[1.0, 0.0], [0.0, 1.0]]
         result = _compute_centroid(embeddings)
@@ -138,14 +138,14 @@ class TestCentroidComputation:
     
     def test_compute_centroid_empty(self):
         """Test centroid of empty list."""
-        from analysis import _compute_centroid
+        from face_matching import _compute_centroid
         
         result = _compute_centroid([])
         assert result is None
     
     def test_compute_centroid_dict_format(self):
         """Test centroid with dict-formatted embeddings."""
-        from analysis import _compute_centroid
+        from face_matching import _compute_centroid
         
         embeddings = [{"vector": [0.6, 0.8]}, {"vector": [0.8, 0.6]}]
         result = _compute_centroid(embeddings)
@@ -293,5 +293,524 @@ class TestMatchFace:
         assert result is None
 
 
+class _FakeResponse:
+    def __init__(self, status, payload):
+        self.status = status
+        self._payload = payload
+
+    async def json(self):
+        return self._payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeDetectorSession:
+    """Minimal aiohttp session stand-in recording which endpoints were hit."""
+
+    def __init__(self, batch_supported=True, pipeline_supported=True, raw_shape=None, raw_accepted=True):
+        self.batch_supported = batch_supported
+        self.pipeline_supported = pipeline_supported
+        self.raw_shape = raw_shape
+        self.raw_accepted = raw_accepted
+        self.calls = []
+        self.stream_ids = []
+
+    def get(self, url, params=None, timeout=None):
+        if url.endswith("/input_spec") and self.raw_shape:
+            return _FakeResponse(200, {"shape": self.raw_shape, "dtype": "uint8", "max_frames": 32, "shm_dir": None})
+        return _FakeResponse(404, {})
+
+    def post(self, url, data=None, headers=None, params=None, timeout=None):
+        endpoint = url.rsplit("/", 1)[-1]
+        obj = {"label": "person", "score": 0.9, "box": {"x": 1, "y": 2, "w": 3, "h": 4}}
+        if endpoint == "detect_raw":
+            count, h, w, c = (int(v) for v in headers["X-Frame-Shape"].split(","))
+            self.calls.append((endpoint, count))
+            if not self.raw_accepted:
+                return _FakeResponse(422, {"error": "shape mismatch"})
+            assert len(data) == count * h * w * c
+            fw, fh = (int(v) for v in headers["X-Frame-Size"].split("x"))
+            results = [{"objects": [obj], "frame_width": fw, "frame_height": fh} for _ in range(count)]
+            return _FakeResponse(200, {"results": results, "device": "cpu"})
+        frames = [f for f in data._fields if f[0]["name"] in ("file", "files")]
+        self.calls.append((endpoint, len(frames)))
+        self.stream_ids.extend(f[2] for f in data._fields if f[0]["name"] == "stream_id")
+        if endpoint == "detect_batch":
+            if not self.batch_supported:
+                return _FakeResponse(404, {})
+            results = [{"objects": [obj], "frame_width": 640, "frame_height": 360} for _ in frames]
+            return _FakeResponse(200, {"results": results, "device": "cpu"})
+        if endpoint == "analyze_frame":
+            if not self.pipeline_supported:
+                return _FakeResponse(404, {})
+            face = {"score": 0.8, "box": {"x": 1, "y": 2, "w": 3, "h": 4}, "embedding": [0.6, 0.8]}
+            return _FakeResponse(200, {"objects": [obj], "faces": [face], "face_stage": "frame",
+                                       "frame_width": 640, "frame_height": 360, "device": "cpu"})
+        return _FakeResponse(200, {"objects": [obj], "frame_width": 640, "frame_height": 360, "device": "cpu"})
+
+
+def _fake_frames(count):
+    return [b"\xff\xd8\xff" + bytes([i]) * 16 + b"\xff\xd9" for i in range(count)]
+
+
+def _detect_remote(session, frames, interval_s, **kwargs):
+    """Open a _RemoteObjectDetector and run it over frames in chunks, like the pipeline."""
+    import asyncio
+    from analysis import _RemoteObjectDetector
+
+    async def run():
+        detector = _RemoteObjectDetector(session, "http://detector:5000", ["person"], "cpu", 0.4, interval_s, **kwargs)
+        await detector.open()
+        detections = []
+        frame_w = frame_h = None
+        for start in range(0, len(frames), detector.chunk_size):
+            chunk = frames[start:start + detector.chunk_size]
+            entries, fw, fh = await detector.detect(chunk, list(range(start, start + len(chunk))))
+            detections.extend(entries)
+            if fw:
+                frame_w, frame_h = fw, fh
+        return detections, frame_w, frame_h
+
+    return asyncio.run(run())
+
+
+class TestFrameStream:
+    """Tests for splitting ffmpeg's MJPEG pipe output into frames."""
+
+    def test_split_mjpeg_across_reads(self):
+        pytest.importorskip("aiohttp")
+        from analysis import _split_mjpeg
+
+        frames = _fake_frames(3)
+        stream = b"".join(frames)
+        buffer = bytearray()
+        scan_from = 0
+        out = []
+        for i in range(0, len(stream), 7):
+            buffer += stream[i:i + 7]
+            images, scan_from = _split_mjpeg(buffer, scan_from)
+            out.extend(images)
+        assert out == frames
+        assert not buffer
+
+    def test_live_feed_drains_pipe(self, monkeypatch):
+        pytest.importorskip("aiohttp")
+        import asyncio
+        import analysis
+
+        async def run(max_bytes):
+            monkeypatch.setattr(analysis, "LIVE_FEED_MAX_BYTES", max_bytes)
+            reader = asyncio.StreamReader()
+            reader.feed_data(b"".join(_fake_frames(4)))
+            reader.feed_eof()
+            feed = analysis.LiveFrameFeed(reader)
+            feed.start()
+            return [frame async for frame in feed.frames()], feed
+
+        frames, feed = asyncio.run(run(1024))
+        assert frames == _fake_frames(4)
+        assert not feed.overflowed
+
+        # A consumer that falls behind never blocks the pipe
+        frames, feed = asyncio.run(run(50))
+        assert frames == _fake_frames(2)
+        assert feed.overflowed
+
+
+class TestRemoteDetectionBatching:
+    """Tests for batched remote object detection."""
+
+    def _frames(self, tmp_path, count):
+        return _fake_frames(count)
+
+    def test_frames_sent_in_batches(self, tmp_path):
+        pytest.importorskip("aiohttp")
+
+        session = _FakeDetectorSession()
+        detections, fw, fh = _detect_remote(session, self._frames(tmp_path, 5), 2, batch_size=2)
+        assert session.calls == [("detect_batch", 2), ("detect_batch", 2), ("detect_batch", 1)]
+        assert [d["time_s"] for d in detections] == [0, 2, 4, 6, 8]
+        assert (fw, fh) == (640, 360)
+        assert session.stream_ids == []
+
+    def test_stream_id_sent_for_motion_gate(self):
+        pytest.importorskip("aiohttp")
+        import asyncio
+        from analysis import _RemoteObjectDetector
+
+        async def run(batch_size):
+            session = _FakeDetectorSession()
+            detector = _RemoteObjectDetector(
+                session, "http://detector:5000", ["person"], "cpu", 0.4, 2,
+                batch_size=batch_size, stream_id="Front_20260101_080000.mp4",
+            )
+            await detector.detect(_fake_frames(2), [0, 1])
+            return session
+
+        session = asyncio.run(run(2))
+        assert session.calls == [("detect_batch", 2)]
+        assert session.stream_ids == ["Front_20260101_080000.mp4"]
+        session = asyncio.run(run(1))
+        assert session.stream_ids == ["Front_20260101_080000.mp4"] * 2
+
+    def test_falls_back_to_single_frames_without_batch_endpoint(self, tmp_path):
+        pytest.importorskip("aiohttp")
+
+        session = _FakeDetectorSession(batch_supported=False)
+        detections, _, _ = _detect_remote(session, self._frames(tmp_path, 3), 1, batch_size=4)
+        assert session.calls == [("detect_batch", 3), ("detect", 1), ("detect", 1), ("detect", 1)]
+        assert [d["time_s"] for d in detections] == [0, 1, 2]
+
+
+class TestRawFrameTransport:
+    """Tests for sending pre-resized raw frames to the detector."""
+
+    def _frames(self, tmp_path, count):
+        Image = pytest.importorskip("PIL.Image")
+        import io
+        frames = []
+        for i in range(count):
+            buf = io.BytesIO()
+            Image.new("RGB", (64, 48), (i * 40, 0, 0)).save(buf, format="JPEG")
+            frames.append(buf.getvalue())
+        return frames
+
+    def test_frames_sent_as_model_sized_tensors(self, tmp_path):
+        pytest.importorskip("aiohttp")
+
+        session = _FakeDetectorSession(raw_shape=[16, 16, 3])
+        detections, fw, fh = _detect_remote(session, self._frames(tmp_path, 3), 2, batch_size=2, transport="raw")
+        assert session.calls == [("detect_raw", 2), ("detect_raw", 1)]
+        assert [d["time_s"] for d in detections] == [0, 2, 4]
+        assert (fw, fh) == (64, 48)
+
+    def test_rejected_frames_fall_back_to_jpeg(self, tmp_path):
+        pytest.importorskip("aiohttp")
+
+        session = _FakeDetectorSession(raw_shape=[16, 16, 3], raw_accepted=False)
+        detections, _, _ = _detect_remote(session, self._frames(tmp_path, 3), 2, batch_size=4, transport="raw")
+        assert session.calls == [("detect_raw", 3), ("detect_batch", 3)]
+        assert len(detections) == 3
+
+
+class TestRemoteFramePipeline:
+    """Tests for the combined /analyze_frame detector pipeline."""
+
+    def _frames(self, tmp_path, count):
+        return _fake_frames(count)
+
+    def _pipeline(self, session, people=None, fallback=None):
+        from analysis import _RemoteFramePipeline
+
+        return _RemoteFramePipeline(
+            session, "http://detector:5000", ["person"], "cpu", 0.4, 0.5, False, people, 0.7, None, 2,
+            fallback=fallback,
+        )
+
+    def test_one_request_per_frame_with_matched_faces(self, tmp_path):
+        pytest.importorskip("aiohttp")
+        import asyncio
+
+        session = _FakeDetectorSession()
+        people = [{"id": "1", "name": "Test", "centroid": [0.6, 0.8]}]
+        pipeline = self._pipeline(session, people)
+        detections, fw, fh = asyncio.run(pipeline.detect(self._frames(tmp_path, 3), [0, 1, 2]))
+        assert session.calls == [("analyze_frame", 1)] * 3
+        assert (pipeline.faces_detected, pipeline.faces_matched) == (3, 3)
+        assert detections[0]["faces"][0]["match"]["name"] == "Test"
+        assert (fw, fh) == (640, 360)
+
+    def test_falls_back_without_pipeline_endpoint(self, tmp_path):
+        pytest.importorskip("aiohttp")
+        import asyncio
+        from analysis import _RemoteObjectDetector
+
+        session = _FakeDetectorSession(pipeline_supported=False)
+        fallback = _RemoteObjectDetector(session, "http://detector:5000", ["person"], "cpu", 0.4, 2, batch_size=4)
+        pipeline = self._pipeline(session, fallback=fallback)
+        detections, _, _ = asyncio.run(pipeline.detect(self._frames(tmp_path, 2), [0, 1]))
+        assert session.calls == [("analyze_frame", 1), ("detect_batch", 2)]
+        assert [d["time_s"] for d in detections] == [0, 2]
+        # Later chunks go straight to the fallback
+        asyncio.run(pipeline.detect(self._frames(tmp_path, 1), [2]))
+        assert session.calls[-1] == ("detect_batch", 1)
+
+        pipeline = self._pipeline(_FakeDetectorSession(pipeline_supported=False))
+        with pytest.raises(RuntimeError):
+            asyncio.run(pipeline.detect(self._frames(tmp_path, 1), [0]))
+
+
+class _SlowDetector:
+    """Object detector stand-in answering chunks out of order."""
+
+    def __init__(self, chunk_size=2, fail_at=None):
+        self.chunk_size = chunk_size
+        self.fail_at = fail_at
+        self.calls = []
+
+    async def detect(self, frames, indices):
+        import asyncio
+        self.calls.append(list(indices))
+        if self.fail_at in indices:
+            raise RuntimeError("detector down")
+        await asyncio.sleep(0.01 * (len(self.calls) % 3))
+        entries = [{"time_s": idx * 2, "objects": [{"label": "person", "box": {}}]} for idx in indices]
+        return entries, 640, 360
+
+
+class TestAnalysisPipeline:
+    """Tests for the overlapping extraction/detection/face/annotation stages."""
+
+    def _patch_frames(self, monkeypatch, count):
+        import analysis
+
+        async def fake_stream(video_path, interval_s=2, size=None, select=None):
+            for frame in _fake_frames(count):
+                yield frame
+
+        monkeypatch.setattr(analysis, "stream_frames", fake_stream)
+
+    def test_detections_stay_in_frame_order(self, monkeypatch):
+        pytest.importorskip("aiohttp")
+        import asyncio
+        from analysis import _run_analysis_pipeline
+
+        self._patch_frames(monkeypatch, 9)
+        detector = _SlowDetector()
+        outcome = asyncio.run(_run_analysis_pipeline("video.mp4", 2, detector, None, None, window=3))
+        assert outcome["frame_count"] == 9
+        assert [d["time_s"] for d in outcome["detections"]] == list(range(0, 18, 2))
+        assert sorted(i for call in detector.calls for i in call) == list(range(9))
+        assert set(outcome["stages"]) == {"extract", "detect", "faces", "annotate"}
+        assert outcome["stages"]["detect"]["items"] == 9
+        assert outcome["stages"]["detect"]["workers"] == 3
+        assert outcome["frame_width"] == 640
+
+    def test_detection_error_still_counts_all_frames(self, monkeypatch):
+        pytest.importorskip("aiohttp")
+        import asyncio
+        from analysis import _run_analysis_pipeline
+
+        self._patch_frames(monkeypatch, 6)
+        outcome = asyncio.run(_run_analysis_pipeline(
+            "video.mp4", 2, _SlowDetector(chunk_size=1, fail_at=0), None, None, window=1,
+        ))
+        assert outcome["frame_count"] == 6
+        assert outcome["errors"]["detect"] == "detector down"
+
+    def test_live_frames_and_callback(self):
+        pytest.importorskip("aiohttp")
+        import asyncio
+        from analysis import _run_analysis_pipeline
+
+        async def live_frames():
+            for frame in _fake_frames(5):
+                yield frame
+
+        seen = []
+        outcome = asyncio.run(_run_analysis_pipeline(
+            "not_recorded_yet.mp4", 2, _SlowDetector(), None, None, window=2,
+            frames=live_frames(), on_frame=lambda idx, entry: seen.append((idx, entry["time_s"])),
+        ))
+        assert outcome["frame_count"] == 5
+        assert seen == [(i, i * 2) for i in range(5)]
+
+    def test_without_detector_only_counts_frames(self, monkeypatch):
+        pytest.importorskip("aiohttp")
+        import asyncio
+        from analysis import _run_analysis_pipeline
+
+        self._patch_frames(monkeypatch, 4)
+        outcome = asyncio.run(_run_analysis_pipeline("video.mp4", 2, None, None, None))
+        assert outcome["frame_count"] == 4
+        assert outcome["detections"] == []
+        assert set(outcome["stages"]) == {"extract"}
+
+    def test_downscaled_objects_full_res_faces(self, monkeypatch):
+        pytest.importorskip("aiohttp")
+        import asyncio
+        import analysis
+
+        sizes = []
+
+        async def fake_stream(video_path, interval_s=2, size=None, select=None):
+            sizes.append(size)
+            for frame in _fake_frames(3):
+                yield frame
+
+        async def fake_frame(video_path, time_s):
+            return b"full-res"
+
+        class _FullResFaces:
+            def __init__(self):
+                self.person_boxes = []
+
+            async def process(self, idx, frame, entry, crops_only=False):
+                assert frame == b"full-res"
+                self.person_boxes.append(entry["objects"][0]["box"])
+                entry["faces"] = [{"box": {"x": 400, "y": 200, "w": 80, "h": 80}}]
+
+        class _PersonAtOne(_SlowDetector):
+            async def detect(self, frames, indices):
+                entries, _, _ = await super().detect(frames, indices)
+                for idx, entry in zip(indices, entries):
+                    entry["objects"] = [{"label": "person" if idx == 1 else "car",
+                                         "box": {"x": 100, "y": 50, "w": 20, "h": 60}}]
+                return entries, 640, 360
+
+        monkeypatch.setattr(analysis, "stream_frames", fake_stream)
+        monkeypatch.setattr(analysis, "_read_video_frame", fake_frame)
+        faces = _FullResFaces()
+        outcome = asyncio.run(analysis._run_analysis_pipeline(
+            "clip.mp4", 2, _PersonAtOne(chunk_size=1), faces, None, window=1, video_size=(2560, 1440),
+        ))
+        assert sizes == [(640, 360)]
+        # Crops use person boxes in full-resolution coordinates
+        assert faces.person_boxes == [{"x": 400, "y": 200, "w": 80, "h": 240}]
+        assert (outcome["frame_width"], outcome["frame_height"]) == (2560, 1440)
+        assert outcome["analysis_stream"] == {"frame_width": 640, "frame_height": 360}
+        assert [d["objects"][0]["box"]["x"] for d in outcome["detections"]] == [400, 400, 400]
+        assert outcome["detections"][1]["faces"][0]["box"] == {"x": 400, "y": 200, "w": 80, "h": 80}
+        assert "faces" not in outcome["detections"][0]
+
+    def test_detection_frame_size(self):
+        pytest.importorskip("aiohttp")
+        from analysis import _detection_frame_size
+
+        assert _detection_frame_size((3840, 2160)) == (640, 360)
+        assert _detection_frame_size((1080, 1920)) == (360, 640)
+        assert _detection_frame_size((640, 480)) is None
+
+    def test_adaptive_sampling_times_and_person_neighbors(self, monkeypatch):
+        pytest.importorskip("aiohttp")
+        import asyncio
+        import analysis
+        from frame_sampler import SamplingPlan
+
+        streamed = []
+
+        async def fake_stream(video_path, interval_s=2, size=None, select=None):
+            streamed.append((interval_s, select))
+            for frame in _fake_frames(3):
+                yield frame
+
+        read_at = []
+
+        async def fake_frame(video_path, time_s):
+            read_at.append(time_s)
+            return b"neighbour"
+
+        class _PersonAtFour(_SlowDetector):
+            async def detect(self, frames, indices):
+                entries, _, _ = await super().detect(frames, indices)
+                for entry in entries:
+                    entry["objects"] = []
+                if indices == [1]:
+                    entries[0]["objects"] = [{"label": "person", "box": {}}]
+                return entries, 640, 360
+
+        monkeypatch.setattr(analysis, "stream_frames", fake_stream)
+        monkeypatch.setattr(analysis, "_read_video_frame", fake_frame)
+        plan = SamplingPlan(step=1, times=[0, 4, 8], duration=10, budget=5)
+        detector = _PersonAtFour(chunk_size=1)
+
+        async def run():
+            outcome = await analysis._run_analysis_pipeline(
+                "clip.mp4", 2, detector, None, None, window=1, sampling=plan,
+            )
+            await analysis._sample_person_neighbors("clip.mp4", outcome, plan, detector, None)
+            return outcome
+
+        outcome = asyncio.run(run())
+        assert streamed == [(1, "eq(n,0)+eq(n,4)+eq(n,8)")]
+        # Two frames left in the budget go to the slots around the person
+        assert read_at == [3, 5]
+        assert [d["time_s"] for d in outcome["detections"]] == [0, 3, 4, 5, 8]
+        assert outcome["frame_count"] == 5
+        assert outcome["person_frames_added"] == 2
+
+    def test_live_annotation_encoded_at_recorded_fps(self, monkeypatch, tmp_path):
+        pytest.importorskip("aiohttp")
+        Image = pytest.importorskip("PIL.Image")
+        import asyncio
+        import io
+        import analysis
+
+        buf = io.BytesIO()
+        Image.new("RGB", (64, 48)).save(buf, format="JPEG")
+        encoded = []
+
+        class _Done:
+            async def wait(self):
+                return 0
+
+        async def fake_encode(self, source):
+            with open(source, "rb") as f:
+                encoded.append((source, self.output_fps, f.read().count(b"\xff\xd8")))
+            open(self.output_video, "wb").close()
+            return _Done()
+
+        async def fps_source():
+            return 25.0
+
+        monkeypatch.setattr(analysis._AnnotatedVideoWriter, "_encode", fake_encode)
+        writer = analysis._AnnotatedVideoWriter(str(tmp_path), 2, analysis.DEFAULT_VIDEO_FPS, fps_source=fps_source)
+
+        async def run():
+            await writer.write(buf.getvalue(), {"objects": []})
+            await writer.write(buf.getvalue(), {"objects": []}, repeat=2)
+            return await writer.close()
+
+        asyncio.run(run())
+        # Frames are spooled during the recording and encoded at its FPS
+        assert encoded == [(str(tmp_path / "annotated.mjpeg"), 25.0, 3)]
+        assert not (tmp_path / "annotated.mjpeg").exists()
+
+    def test_substream_result_mapped_to_recording(self, monkeypatch):
+        pytest.importorskip("aiohttp")
+        import asyncio
+        import analysis
+
+        async def fake_size(video_path):
+            return 2560, 1440
+
+        read_at = []
+
+        async def fake_frame(video_path, time_s):
+            read_at.append(time_s)
+            return b"full-res"
+
+        class _CropFaces:
+            async def process(self, idx, frame, entry, crops_only=False):
+                assert crops_only and frame == b"full-res"
+                entry["faces"] = [{"box": {"x": 1, "y": 1, "w": 1, "h": 1}}]
+
+        monkeypatch.setattr(analysis, "_get_video_size", fake_size)
+        monkeypatch.setattr(analysis, "_read_video_frame", fake_frame)
+        outcome = {
+            "frame_width": 640, "frame_height": 360, "errors": {},
+            "detections": [
+                {"time_s": 0, "objects": [{"label": "car", "box": {"x": 10, "y": 20, "w": 30, "h": 40}}]},
+                {"time_s": 2, "objects": [{"label": "person", "box": {"x": 100, "y": 50, "w": 20, "h": 60}}]},
+            ],
+        }
+        reported = []
+        asyncio.run(analysis._apply_full_resolution(
+            "clip.mp4", outcome, _CropFaces(), on_frame=lambda idx, entry: reported.append(idx),
+        ))
+        assert (outcome["frame_width"], outcome["frame_height"]) == (2560, 1440)
+        assert outcome["analysis_stream"] == {"frame_width": 640, "frame_height": 360}
+        assert outcome["detections"][0]["objects"][0]["box"] == {"x": 40, "y": 80, "w": 120, "h": 160}
+        assert outcome["detections"][1]["objects"][0]["box"] == {"x": 400, "y": 200, "w": 80, "h": 240}
+        # Only the frame with a person is decoded at full resolution
+        assert read_at == [2]
+        assert reported == [1]
+        assert "faces" not in outcome["detections"][0]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -94,6 +94,14 @@ class TestResolveNewFields:
         cfg = {"analysis_face_enabled": True}
         assert cs.resolve(cfg, "analysis_face_enabled", "Wohnzimmer") is True
 
+    def test_analysis_rtsp_url_per_cam_only(self):
+        cfg = {"analysis_rtsp_url_Garten_vorne": " rtsp://cam/sub "}
+        assert cs.resolve(cfg, "analysis_rtsp_url", "Garten vorne") == "rtsp://cam/sub"
+        assert cs.resolve(cfg, "analysis_rtsp_url", "Wohnzimmer") == ""
+        d = dict(cfg)
+        cs.set_override(d, "analysis_rtsp_url", "Garten vorne", "  ")
+        assert d == {}
+
 
 class TestSetClearOverride:
     def test_set_writes_key(self):
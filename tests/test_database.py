@@ -124,6 +124,118 @@ class TestDatabaseManager:
         # Note: This may or may not delete depending on timing
         assert isinstance(deleted, int)
     
+    def test_people_generation_bumped_by_writes(self, db_manager):
+        """Test that people/embedding writes invalidate cached snapshots."""
+        seen = [db_manager.people_generation]
+
+        def bumped():
+            seen.append(db_manager.people_generation)
+            return seen[-1] > seen[-2]
+
+        db_manager.add_person("test-1", "John")
+        assert bumped()
+        emb_id = db_manager.add_embedding("test-1", [0.1, 0.2, 0.3])
+        assert bumped()
+        neg_id = db_manager.add_negative_embedding("test-1", [0.3, 0.2, 0.1])
+        assert bumped()
+        db_manager.add_ignored_embedding([0.5, 0.5, 0.5])
+        assert bumped()
+        db_manager.delete_negative_embedding(neg_id)
+        assert bumped()
+        db_manager.delete_embedding(emb_id)
+        assert bumped()
+        db_manager.update_person("test-1", name="Johnny")
+        assert bumped()
+        db_manager.clear_ignored_embeddings()
+        assert bumped()
+
+        # Reads and recognition history leave the generation alone
+        db_manager.get_all_embeddings()
+        db_manager.add_recognition(camera_name="Camera1", person_id="test-1")
+        assert db_manager.people_generation == seen[-1]
+
+    def test_get_all_negative_embeddings(self, db_manager):
+        """Test negative vectors are grouped per active person."""
+        db_manager.add_person("test-1", "John")
+        db_manager.add_person("test-2", "Jane")
+        db_manager.add_negative_embedding("test-1", [1.0, 0.0], thumb="a.jpg")
+        db_manager.add_negative_embedding("test-2", [0.0, 1.0])
+        db_manager.delete_person("test-2")
+
+        negatives = db_manager.get_all_negative_embeddings()
+        assert list(negatives) == ["test-1"]
+        assert negatives["test-1"] == [pytest.approx([1.0, 0.0])]
+
+    def test_centroid_maintained_incrementally(self, db_manager):
+        """Test stored centroids follow embedding adds and deletes."""
+        db_manager.add_person("test-1", "John")
+        first = db_manager.add_embedding("test-1", [1.0, 0.0])
+        second = db_manager.add_embedding("test-1", [0.0, 1.0])
+        db_manager.add_embedding("test-1", [1.0, 0.0, 0.0])  # other dim, ignored
+
+        half = 0.5 ** 0.5
+        assert db_manager.get_all_centroids()["test-1"] == pytest.approx([half, half])
+
+        db_manager.delete_positive_embedding(first)
+        assert db_manager.get_all_centroids()["test-1"] == pytest.approx([0.0, 1.0])
+
+        # Last 2-dim embedding gone: centroid falls back to the remaining one
+        result = db_manager.bulk_delete_embeddings([second, 99999])
+        assert result == {"success_count": 1, "failure_count": 1}
+        assert db_manager.get_all_centroids()["test-1"] == pytest.approx([1.0, 0.0, 0.0])
+
+        db_manager.delete_person("test-1", hard_delete=True)
+        assert db_manager.get_all_centroids() == {}
+
+    def test_centroid_backfilled_on_schema_upgrade(self, db_path):
+        """Test that upgrading a v1 database backfills centroids."""
+        from database import DatabaseManager
+
+        manager = DatabaseManager(db_path)
+        manager.initialize()
+        manager.add_person("test-1", "John")
+        manager.add_embedding("test-1", [3.0, 4.0])
+        manager.conn.execute("DROP TABLE person_centroids")
+        manager.conn.execute("DELETE FROM schema_version")
+        manager.conn.execute(
+            "INSERT INTO schema_version (version, applied_at) VALUES (1, ?)",
+            (datetime.now().isoformat(),)
+        )
+        manager.conn.commit()
+        manager.close()
+
+        upgraded = DatabaseManager(db_path)
+        assert upgraded.initialize() is True
+        assert upgraded.get_all_centroids()["test-1"] == pytest.approx([0.6, 0.8])
+        upgraded.close()
+
+    def test_analysis_index_queries(self, db_manager):
+        """Test the analysis result index pages, lookups and pruning."""
+        entries = [
+            (f"/out/analysis_2026010{i}_000000", {
+                "video_path": f"/media/Cam/v{i % 2}.mp4",
+                "created_utc": f"2026010{i}_000000",
+                "detections": [{"faces": []}],
+                "frames": [],
+            })
+            for i in range(5)
+        ]
+        assert db_manager.upsert_analysis_index("/out", entries) == 5
+
+        items, total = db_manager.get_analysis_index_page("/out", 2, offset=1)
+        assert total == 5
+        assert [it["created_utc"] for it in items] == ["20260103_000000", "20260102_000000"]
+        assert "detections" not in items[0] and "frames" not in items[0]
+
+        assert db_manager.get_analysis_paths_for_video("/out", "/media/Cam/v1.mp4") == [
+            "/out/analysis_20260103_000000", "/out/analysis_20260101_000000"
+        ]
+        assert db_manager.get_indexed_video_paths("/out") == {"/media/Cam/v0.mp4", "/media/Cam/v1.mp4"}
+        assert db_manager.get_indexed_video_paths("/other") == set()
+
+        db_manager.delete_analysis_index_entries(["/out/analysis_20260103_000000"])
+        assert len(db_manager.get_indexed_analysis_paths("/out")) == 4
+
     def test_close_connection(self, db_manager):
         """Test closing database connection."""
         db_manager.close()
@@ -369,3 +369,82 @@ class TestFindBestMatch:
         match = find_best_match(face_embedding, people, threshold=0.5)
         
         assert match is None
+
+
+try:
+    from face_matching import FaceIndex, _match_face_simple
+except ImportError:
+    FaceIndex = None
+
+
+@pytest.mark.unit
+class TestFaceIndex:
+    """Tests for batch matching with the FaceIndex."""
+    
+    @pytest.fixture
+    def people(self):
+        import random
+        random.seed(7)
+        
+        def vec():
+            return [random.gauss(0, 1) for _ in range(16)]
+        
+        people = []
+        for i in range(6):
+            base = vec()
+            person = {
+                "id": f"person_{i}",
+                "name": f"P{i}",
+                "embeddings": [{"vector": [v + random.gauss(0, 0.2) for v in base]} for _ in range(4)],
+                "negative_embeddings": [{"vector": vec()}],
+            }
+            if i % 2:
+                person["centroid"] = base
+            people.append(person)
+        return people
+    
+    def test_matches_loop_implementation(self, people):
+        """Batch results equal _match_face_simple for every query."""
+        if FaceIndex is None:
+            pytest.skip("Module not available")
+        import random
+        random.seed(11)
+        
+        queries = [
+            [v + random.gauss(0, 0.3) for v in p["embeddings"][0]["vector"]] for p in people
+        ]
+        queries.append(people[2]["negative_embeddings"][0]["vector"])
+        queries.append([])
+        
+        index = FaceIndex(people)
+        results = index.match(queries, 0.5)
+        
+        expected = [_match_face_simple(q, people, 0.5) if q else None for q in queries]
+        assert [r and r["person_id"] for r in results] == [e and e["person_id"] for e in expected]
+        for r, e in zip(results, expected):
+            if r:
+                assert abs(r["similarity"] - e["similarity"]) < 1e-3
+    
+    def test_negative_sample_blocks_person(self):
+        """A face resembling a negative sample is not matched to that person."""
+        if FaceIndex is None:
+            pytest.skip("Module not available")
+        
+        people = [{
+            "id": "p1", "name": "Alice", "centroid": [1.0, 0.0, 0.0],
+            "negative_embeddings": [{"vector": [0.9, 0.1, 0.0]}],
+        }]
+        assert FaceIndex(people).match([[0.9, 0.1, 0.0]], 0.5) == [None]
+        assert FaceIndex(people).match([[0.9, 0.1, 0.0]], 0.5, check_negatives=False)[0]["name"] == "Alice"
+    
+    def test_no_face_and_ignored(self):
+        """Known false positives and ignored embeddings are recognised."""
+        if FaceIndex is None:
+            pytest.skip("Module not available")
+        
+        people = [{"id": "p1", "name": "Alice", "centroid": [1.0, 0.0, 0.0]}]
+        index = FaceIndex(people, no_face_embeddings=[{"vector": [0.0, 1.0, 0.0]}])
+        assert index.match([[0.0, 1.0, 0.0], [1.0, 0.0, 0.0]], 0.5)[0] == {"is_no_face": True}
+        
+        ignored = FaceIndex(ignored_embeddings=[[0.0, 0.0, 1.0]])
+        assert ignored.is_ignored([[0.0, 0.1, 1.0], [1.0, 0.0, 0.0], None]) == [True, False, False]
@@ -0,0 +1,90 @@
+"""Unit tests for the face re-match store.
+
+Tests for:
+- Loading historical faces into the contiguous store
+- Incremental re-matching after people edits
+- face_matches.json deltas
+"""
+import json
+import pytest
+import shutil
+import sys
+from pathlib import Path
+
+# Add parent path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "custom_components" / "rtsp_recorder"))
+
+try:
+    import face_rematch
+    import face_sidecar
+except ImportError as e:
+    face_rematch = None
+    print(f"Import error: {e}")
+
+ALICE = {"id": "a", "name": "Alice", "centroid": [1.0, 0.0]}
+BOB = {"id": "b", "name": "Bob", "centroid": [0.0, 1.0]}
+
+
+def _write_result(job_dir: Path, faces: list[dict]) -> None:
+    job_dir.mkdir()
+    detections = [{"time_s": 0, "faces": faces}]
+    face_sidecar.externalize_face_data(str(job_dir), detections)
+    (job_dir / "result.json").write_text(json.dumps({"detections": detections}))
+
+
+@pytest.fixture
+def output_dir(tmp_path):
+    """Two results: one face matched to Alice, one unmatched face."""
+    if face_rematch is None or face_rematch.np is None:
+        pytest.skip("Module or NumPy not available")
+    _write_result(tmp_path / "analysis_1", [
+        {"embedding": [0.9, 0.1], "match": {"person_id": "a", "name": "Alice", "similarity": 0.9939}},
+    ])
+    _write_result(tmp_path / "analysis_2", [{"embedding": [0.1, 0.9]}])
+    return tmp_path
+
+
+def _job_dirs(output_dir: Path) -> list[str]:
+    return sorted(str(p) for p in output_dir.iterdir())
+
+
+@pytest.mark.unit
+class TestFaceHistoryStore:
+    """Tests for FaceHistoryStore."""
+
+    def test_incremental_rematch_writes_deltas(self, output_dir):
+        """Test only results affected by the edited person get a delta."""
+        store = face_rematch.FaceHistoryStore()
+        assert store.sync(_job_dirs(output_dir)) == {"loaded": 2, "dropped": 0}
+        assert len(store) == 2
+
+        # First pass checks everything, existing matches are already correct
+        assert store.rematch([ALICE], 0.6) == 0
+
+        # Bob added: only the unmatched face resembles him
+        assert store.rematch([ALICE, BOB], 0.6, ["b"]) == 1
+        assert not (output_dir / "analysis_1" / "face_matches.json").exists()
+        deltas = face_sidecar.load_face_match_deltas(str(output_dir / "analysis_2"))
+        assert deltas == {"0/0": {"person_id": "b", "name": "Bob", "similarity": 0.9939}}
+
+        # Alice renamed: her face changes, Bob's does not
+        renamed = dict(ALICE, name="Alicia")
+        assert store.rematch([renamed, BOB], 0.6, ["a"]) == 1
+        detections = json.loads((output_dir / "analysis_1" / "result.json").read_text())["detections"]
+        face_sidecar.apply_face_match_deltas(str(output_dir / "analysis_1"), detections)
+        assert detections[0]["faces"][0]["match"]["name"] == "Alicia"
+
+        # Bob deleted: his match is removed again
+        assert store.rematch([renamed], 0.6, ["b"]) == 1
+        deltas = face_sidecar.load_face_match_deltas(str(output_dir / "analysis_2"))
+        assert deltas == {"0/0": None}
+
+    def test_sync_drops_deleted_results(self, output_dir):
+        """Test removed analysis folders leave the store."""
+        store = face_rematch.FaceHistoryStore()
+        store.sync(_job_dirs(output_dir))
+        shutil.rmtree(output_dir / "analysis_1")
+
+        assert store.sync(_job_dirs(output_dir)) == {"loaded": 0, "dropped": 1}
+        assert len(store) == 1
+        assert store.rematch([ALICE, BOB], 0.6) == 1
@@ -0,0 +1,69 @@
+"""Unit tests for the face data sidecar module.
+
+Tests for:
+- Moving embeddings/thumbnails out of result detections
+- Lazy hydration for the result viewer
+- Thumbnail URL resolution for the analysis face view
+"""
+import base64
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "custom_components" / "rtsp_recorder"))
+
+try:
+    import face_sidecar
+except ImportError as e:
+    face_sidecar = None
+    print(f"Import error: {e}")
+
+THUMB = "data:image/jpeg;base64," + base64.b64encode(b"\xff\xd8jpeg").decode()
+
+
+def _detections():
+    return [
+        {"time_s": 0, "faces": [{"score": 0.9, "embedding": [0.6, 0.8], "thumb": THUMB}]},
+        {"time_s": 2, "faces": [{"score": 0.8, "embedding": [1.0, 0.0]}, {"score": 0.7}]},
+    ]
+
+
+@pytest.mark.unit
+class TestFaceSidecar:
+    """Tests for externalize/hydrate round trips."""
+
+    def test_externalize_and_hydrate_round_trip(self, tmp_path):
+        """Test faces lose inline data on disk and get it back on hydrate."""
+        if face_sidecar is None or face_sidecar.np is None:
+            pytest.skip("Module or NumPy not available")
+        detections = _detections()
+
+        counts = face_sidecar.externalize_face_data(str(tmp_path), detections)
+
+        assert counts == {"embeddings": 2, "thumbs": 1}
+        first = detections[0]["faces"][0]
+        assert "embedding" not in first and "thumb" not in first
+        assert (tmp_path / "faces" / first["thumb_file"]).read_bytes() == b"\xff\xd8jpeg"
+        assert face_sidecar.load_embedding_rows(str(tmp_path), [1]) == [pytest.approx([1.0, 0.0])]
+
+        face_sidecar.hydrate_face_data(str(tmp_path), detections)
+
+        assert first["embedding"] == pytest.approx([0.6, 0.8])
+        assert first["thumb"] == f"/api/rtsp_recorder/analysis_face/{tmp_path.name}/0.jpg"
+        assert detections[1]["faces"][1] == {"score": 0.7}
+
+    def test_inline_face_thumb(self, tmp_path):
+        """Test view URLs are turned back into data URLs for the people DB."""
+        if face_sidecar is None:
+            pytest.skip("Module not available")
+        job = tmp_path / "analysis_20260101_000000"
+        job.mkdir()
+        detections = _detections()
+        face_sidecar.externalize_face_data(str(job), detections)
+        url = face_sidecar.face_thumb_url(str(job), detections[0]["faces"][0]["thumb_file"])
+
+        assert face_sidecar.inline_face_thumb(str(tmp_path), url) == THUMB
+        assert face_sidecar.inline_face_thumb(str(tmp_path), THUMB) == THUMB
+        assert face_sidecar.resolve_face_thumb_path(str(tmp_path), "..", "0.jpg") is None
+        assert face_sidecar.resolve_face_thumb_path(str(tmp_path), job.name, "../x.jpg") is None
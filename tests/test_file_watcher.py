@@ -0,0 +1,71 @@
+"""Unit tests for the inotify file watcher.
+
+Tests for:
+- Parsing raw inotify events
+- Waiters resolved by rename into place and by close after writing
+- Timeouts and unrelated files
+"""
+import asyncio
+import os
+import struct
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "custom_components" / "rtsp_recorder"))
+
+try:
+    import file_watcher
+except ImportError as e:
+    file_watcher = None
+    print(f"Import error: {e}")
+
+
+def _event(wd, mask, name):
+    raw = name.encode() + b"\0" * (16 - len(name))
+    return struct.pack("iIII", wd, mask, 0, len(raw)) + raw
+
+
+@pytest.mark.unit
+class TestFileWatcher:
+    """Tests for FileWatcher."""
+
+    def test_parse_events(self):
+        """Test names are split from their NUL padding."""
+        if file_watcher is None:
+            pytest.skip("Module not available")
+        buffer = _event(1, 0x80, "Front_1.mp4") + _event(2, 0x8, "x.tmp")
+        assert file_watcher.parse_events(buffer) == [(1, 0x80, "Front_1.mp4"), (2, 0x8, "x.tmp")]
+
+    def test_rename_and_close_write(self, tmp_path):
+        """Test waiters resolve on rename into place and on close after write."""
+        if file_watcher is None:
+            pytest.skip("Module not available")
+
+        async def run():
+            watcher = file_watcher.FileWatcher(asyncio.get_running_loop())
+            if not watcher.start():
+                return None
+            try:
+                renamed = str(tmp_path / "Front_20260101_080000.mp4")
+                written = str(tmp_path / "Back_20260101_080000.mp4")
+                other = str(tmp_path / "Side_20260101_080000.mp4")
+                futures = {path: watcher.expect(path) for path in (renamed, written, other)}
+
+                Path(renamed + ".tmp").write_bytes(b"x" * 10)
+                os.replace(renamed + ".tmp", renamed)
+                Path(written).write_bytes(b"y" * 10)
+
+                return (
+                    await watcher.wait(renamed, futures[renamed], timeout=2),
+                    await watcher.wait(written, futures[written], timeout=2),
+                    await watcher.wait(other, futures[other], timeout=0.2),
+                )
+            finally:
+                await watcher.async_stop()
+
+        result = asyncio.run(run())
+        if result is None:
+            pytest.skip("inotify not available")
+        assert result == (True, True, False)
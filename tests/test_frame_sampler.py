@@ -0,0 +1,98 @@
+"""Unit tests for adaptive frame sampling.
+
+Tests for:
+- Parsing scene scores from ffmpeg metadata output
+- Motion windows from changed keyframes
+- Planning sample times within a frame budget
+- Select expression, frame repeats and person neighbours of a plan
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "custom_components" / "rtsp_recorder"))
+
+try:
+    import frame_sampler
+except ImportError as e:
+    frame_sampler = None
+    print(f"Import error: {e}")
+
+
+METADATA_OUTPUT = """frame:0    pts:0       pts_time:0
+lavfi.scene_score=0.000000
+frame:1    pts:92160   pts_time:4
+lavfi.scene_score=0.002100
+frame:2    pts:184320  pts_time:8
+lavfi.scene_score=0.081000
+frame:3    pts:276480  pts_time:12
+lavfi.scene_score=0.004000
+"""
+
+
+@pytest.mark.unit
+class TestFrameSampler:
+    """Tests for the frame sampler."""
+
+    def test_parse_scene_scores(self):
+        """Test pts_time and score lines are paired."""
+        if frame_sampler is None:
+            pytest.skip("Module not available")
+        scores = frame_sampler.parse_scene_scores(METADATA_OUTPUT)
+        assert scores == [(0.0, 0.0), (4.0, 0.0021), (8.0, 0.081), (12.0, 0.004)]
+        assert frame_sampler.parse_scene_scores("garbage\n") == []
+
+    def test_motion_windows(self):
+        """Test a changed keyframe marks the range since the previous one."""
+        if frame_sampler is None:
+            pytest.skip("Module not available")
+        scores = frame_sampler.parse_scene_scores(METADATA_OUTPUT)
+        assert frame_sampler.motion_windows(scores, pad=2) == [(2.0, 10.0)]
+        # Overlapping ranges are merged
+        scores = [(4.0, 0.5), (8.0, 0.5), (20.0, 0.0), (24.0, 0.5)]
+        assert frame_sampler.motion_windows(scores, pad=1) == [(0.0, 9.0), (19.0, 25.0)]
+
+    def test_plan_dense_in_motion_sparse_elsewhere(self):
+        """Test motion gets every grid slot and quiet stretches every 2 intervals."""
+        if frame_sampler is None:
+            pytest.skip("Module not available")
+        plan = frame_sampler.plan_samples(30, 2, [(10.0, 14.0)], budget=100)
+        assert plan.step == 1
+        assert plan.times == [0, 4, 8, 10, 11, 12, 13, 14, 16, 20, 24, 28]
+        assert plan.as_dict()["motion_seconds"] == 4.0
+
+    def test_plan_budget(self):
+        """Test quiet frames are thinned before motion frames."""
+        if frame_sampler is None:
+            pytest.skip("Module not available")
+        plan = frame_sampler.plan_samples(100, 2, [(50.0, 54.0)], budget=8)
+        assert len(plan.times) == 8
+        assert set(range(50, 55)) <= set(plan.times)
+
+        plan = frame_sampler.plan_samples(100, 2, [(0.0, 100.0)], budget=10)
+        assert len(plan.times) == 10
+
+    def test_select_and_repeats(self):
+        """Test the select expression picks grid frames and repeats fill the gaps."""
+        if frame_sampler is None:
+            pytest.skip("Module not available")
+        plan = frame_sampler.SamplingPlan(step=2, times=[2, 4, 10], duration=12, budget=10)
+        assert plan.select_expression() == "eq(n,1)+eq(n,2)+eq(n,5)"
+        assert plan.repeats() == [2, 3, 1]
+        assert sum(plan.repeats()) == 10 // 2 + 1
+
+    def test_person_neighbors(self):
+        """Test unsampled slots next to persons are added within the budget."""
+        if frame_sampler is None:
+            pytest.skip("Module not available")
+        plan = frame_sampler.SamplingPlan(step=1, times=[0, 4, 8, 9], duration=12, budget=6)
+        detections = [
+            {"time_s": 0, "objects": []},
+            {"time_s": 4, "objects": [{"label": "person"}]},
+            {"time_s": 8, "objects": [{"label": "car"}]},
+            {"time_s": 9, "objects": [{"label": "person"}]},
+        ]
+        assert plan.person_neighbors(detections) == [3, 5]
+        plan.budget = 10
+        assert plan.person_neighbors(detections) == [3, 5, 10]
@@ -0,0 +1,100 @@
+"""Unit tests for the media HTTP helpers.
+
+Tests for:
+- Range header parsing
+- Conditional requests (ETag, Last-Modified, If-Range)
+"""
+import os
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "custom_components" / "rtsp_recorder"))
+
+try:
+    import media_http
+except ImportError as e:
+    media_http = None
+    print(f"Import error: {e}")
+
+
+@pytest.fixture
+def video(tmp_path):
+    """Small file with its stat result."""
+    if media_http is None:
+        pytest.skip("Module not available")
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(b"x" * 1000)
+    os.utime(path, (1_700_000_000, 1_700_000_000))
+    return os.stat(path)
+
+
+@pytest.mark.unit
+class TestParseRangeHeader:
+    """Tests for parse_range_header."""
+
+    def test_single_and_suffix_ranges(self):
+        """Test explicit, open-ended and suffix ranges."""
+        if media_http is None:
+            pytest.skip("Module not available")
+        assert media_http.parse_range_header("bytes=10-19", 1000) == [(10, 19)]
+        assert media_http.parse_range_header("bytes=990-", 1000) == [(990, 999)]
+        assert media_http.parse_range_header("bytes=-5", 1000) == [(995, 999)]
+        assert media_http.parse_range_header("bytes=900-5000", 1000) == [(900, 999)]
+
+    def test_multiple_ranges(self):
+        """Test several ranges keep request order and skip unsatisfiable parts."""
+        if media_http is None:
+            pytest.skip("Module not available")
+        assert media_http.parse_range_header("bytes=500-509, 0-1, 2000-", 1000) == [(500, 509), (0, 1)]
+
+    def test_invalid_ranges(self):
+        """Test malformed, unsatisfiable and oversized headers."""
+        if media_http is None:
+            pytest.skip("Module not available")
+        assert media_http.parse_range_header(None, 1000) is None
+        assert media_http.parse_range_header("items=0-1", 1000) is None
+        assert media_http.parse_range_header("bytes=5-1", 1000) is None
+        assert media_http.parse_range_header("bytes=a-b", 1000) is None
+        assert media_http.parse_range_header("bytes=2000-", 1000) == []
+        too_many = "bytes=" + ",".join(f"{i}-{i}" for i in range(media_http.MAX_RANGES + 1))
+        assert media_http.parse_range_header(too_many, 1000) is None
+
+
+@pytest.mark.unit
+class TestConditionalRequests:
+    """Tests for the validators and precondition checks."""
+
+    def test_etag_changes_with_file(self, video):
+        """Test the ETag depends on size and mtime."""
+        etag = media_http.file_etag(video)
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag == media_http.file_etag(video)
+        assert media_http.http_date(video.st_mtime) == "Tue, 14 Nov 2023 22:13:20 GMT"
+
+    def test_is_not_modified(self, video):
+        """Test If-None-Match wins over If-Modified-Since."""
+        etag = media_http.file_etag(video)
+        last_modified = media_http.http_date(video.st_mtime)
+        assert media_http.is_not_modified({"If-None-Match": etag}, etag, video.st_mtime)
+        assert media_http.is_not_modified({"If-None-Match": f'"other", W/{etag}'}, etag, video.st_mtime)
+        assert media_http.is_not_modified({"If-Modified-Since": last_modified}, etag, video.st_mtime)
+        assert not media_http.is_not_modified(
+            {"If-None-Match": '"other"', "If-Modified-Since": last_modified}, etag, video.st_mtime
+        )
+        assert not media_http.is_not_modified({}, etag, video.st_mtime)
+
+    def test_range_applies(self, video):
+        """Test If-Range with entity tags and dates."""
+        etag = media_http.file_etag(video)
+        assert media_http.range_applies({}, etag, video.st_mtime)
+        assert media_http.range_applies({"If-Range": etag}, etag, video.st_mtime)
+        assert not media_http.range_applies({"If-Range": '"stale"'}, etag, video.st_mtime)
+        assert not media_http.range_applies({"If-Range": f"W/{etag}"}, etag, video.st_mtime)
+        assert media_http.range_applies(
+            {"If-Range": media_http.http_date(video.st_mtime)}, etag, video.st_mtime
+        )
+        assert not media_http.range_applies(
+            {"If-Range": media_http.http_date(video.st_mtime - 60)}, etag, video.st_mtime
+        )
@@ -284,3 +284,48 @@ class TestInitializeSchema:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+@pytest.mark.unit
+class TestCentroidMigration:
+    """Tests for the v3 centroid backfill."""
+    
+    def test_backfills_centroids(self, tmp_path):
+        """Test that migrating a v2 database computes stored centroids."""
+        if CURRENT_SCHEMA_VERSION is None:
+            pytest.skip("Module not available")
+        import struct
+        
+        db_path = tmp_path / "test.db"
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("CREATE TABLE people (id TEXT PRIMARY KEY, name TEXT)")
+        conn.execute(
+            "CREATE TABLE face_embeddings (id INTEGER PRIMARY KEY, person_id TEXT, embedding BLOB)"
+        )
+        conn.execute("""
+            CREATE TABLE schema_version (
+                version INTEGER PRIMARY KEY,
+                applied_at TIMESTAMP,
+                description TEXT
+            )
+        """)
+        conn.execute("INSERT INTO schema_version (version, description) VALUES (2, 'v2')")
+        conn.execute("INSERT INTO people VALUES ('p1', 'Alice')")
+        for vec in ([1.0, 0.0], [0.0, 1.0]):
+            conn.execute(
+                "INSERT INTO face_embeddings (person_id, embedding) VALUES (?, ?)",
+                ("p1", struct.pack("2f", *vec))
+            )
+        conn.commit()
+        conn.close()
+        
+        result = run_migrations(db_path)
+        
+        assert 3 in [m["version"] for m in result["migrations_run"]]
+        conn = sqlite3.connect(str(db_path))
+        count, blob = conn.execute(
+            "SELECT embedding_count, centroid FROM person_centroids WHERE person_id = 'p1'"
+        ).fetchone()
+        conn.close()
+        assert count == 2
+        assert list(struct.unpack("2f", blob)) == pytest.approx([0.5 ** 0.5] * 2)
@@ -0,0 +1,110 @@
+"""Unit tests for the recording catalog.
+
+Tests for:
+- Recording file name parsing
+- Reconciling the catalog with the storage folders
+- Catalog-based batch listing, watchdog lookup and retention
+"""
+import os
+import time
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "custom_components" / "rtsp_recorder"))
+
+try:
+    import database
+    import recording_catalog
+    import retention
+except ImportError as e:
+    recording_catalog = None
+    print(f"Import error: {e}")
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """Storage path with two cameras and a catalog database."""
+    if recording_catalog is None:
+        pytest.skip("Module not available")
+    manager = database.DatabaseManager(str(tmp_path / "catalog.db"))
+    manager.initialize()
+    monkeypatch.setattr(database, "_db_instance", manager)
+    monkeypatch.setattr(recording_catalog, "_reconciled_roots", set())
+
+    root = tmp_path / "recordings"
+    old = time.time() - 5 * 86400
+    for camera, stamps in (("Front", ["20260101_080000", "20260102_080000"]), ("Back", ["20260103_090000"])):
+        (root / camera).mkdir(parents=True)
+        for stamp in stamps:
+            video = root / camera / f"{camera}_{stamp}.mp4"
+            video.write_bytes(b"x" * 10)
+            os.utime(video, (old, old))
+    (root / "_analysis" / "analysis_1").mkdir(parents=True)
+    (root / "_analysis" / "analysis_1" / "annotated.mp4").write_bytes(b"x")
+    yield str(root)
+    manager.close()
+
+
+@pytest.mark.unit
+class TestRecordingCatalog:
+    """Tests for recording_catalog."""
+
+    def test_parse_recording_name(self):
+        """Test camera and start time come from the file name."""
+        if recording_catalog is None:
+            pytest.skip("Module not available")
+        assert recording_catalog.parse_recording_name("/x/Front_Door_20260131_164147.mp4") == (
+            "Front_Door", "20260131_164147"
+        )
+        assert recording_catalog.parse_recording_name("clip.mp4") is None
+
+    def test_reconcile_and_queries(self, storage):
+        """Test the catalog mirrors the folders and answers the consumers."""
+        assert recording_catalog.list_recordings(storage) is None
+
+        assert recording_catalog.reconcile_recording_catalog(storage) == {"updated": 3, "removed": 0}
+        assert recording_catalog.reconcile_recording_catalog(storage) == {"updated": 0, "removed": 0}
+
+        assert sorted(os.path.basename(p) for p in recording_catalog.list_recordings(storage)) == [
+            "Back_20260103_090000.mp4", "Front_20260101_080000.mp4", "Front_20260102_080000.mp4"
+        ]
+        assert len(recording_catalog.list_recordings(storage, camera="Front")) == 2
+        assert recording_catalog.list_recordings(storage, since_ts=time.time() - 86400) == []
+        newest = recording_catalog.newest_recording_times(storage)
+        assert newest["Front"].strftime("%Y%m%d_%H%M%S") == "20260102_080000"
+
+        removed = os.path.join(storage, "Back", "Back_20260103_090000.mp4")
+        os.remove(removed)
+        assert recording_catalog.reconcile_recording_catalog(storage) == {"updated": 0, "removed": 1}
+
+    def test_cleanup_uses_overrides(self, storage):
+        """Test catalog retention honours per-camera overrides."""
+        recording_catalog.reconcile_recording_catalog(storage)
+        new_video = os.path.join(storage, "Back", "Back_20260104_090000.mp4")
+        Path(new_video).write_bytes(b"x" * 10)
+        assert recording_catalog.catalog_recording(storage, new_video, duration_sec=30)
+
+        # Front keeps 10 days, everything else 2 days
+        deleted, _ = recording_catalog.cleanup_cataloged_recordings(storage, 2, 0, {"Front": 240})
+
+        assert deleted == 1
+        assert not os.path.exists(os.path.join(storage, "Back", "Back_20260103_090000.mp4"))
+        assert os.path.exists(new_video)
+        assert len(recording_catalog.list_recordings(storage)) == 3
+
+    def test_sweep_skips_cataloged_recordings(self, storage):
+        """Test leftovers of killed recordings age out next to the catalog."""
+        old = time.time() - 5 * 86400
+        leftovers = [os.path.join(storage, "Front", name) for name in (
+            "Front_20260101_090000.mp4.tmp", "Front_20260101_090000.mp4.concat.txt"
+        )]
+        for path in leftovers:
+            Path(path).write_bytes(b"x")
+            os.utime(path, (old, old))
+
+        retention.cleanup_recordings(storage, 2, 0, None, recording_catalog.parse_recording_name)
+
+        assert not any(os.path.exists(path) for path in leftovers)
+        assert os.path.exists(os.path.join(storage, "Front", "Front_20260101_080000.mp4"))
@@ -0,0 +1,114 @@
+"""Unit tests for per-camera recording sessions.
+
+Tests for:
+- Extending a running clip on re-trigger, capped at the maximum length
+- Follow-up time for re-triggers the clip could not take
+- One open session per camera
+"""
+import asyncio
+import time
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "custom_components" / "rtsp_recorder"))
+
+try:
+    import recording_session
+except ImportError as e:
+    recording_session = None
+    print(f"Import error: {e}")
+
+
+@pytest.mark.unit
+class TestRecordingSession:
+    """Tests for RecordingSession and RecordingSessions."""
+
+    def test_extend_and_cap(self):
+        """Test re-triggers move the end, never beyond the cap."""
+        if recording_session is None:
+            pytest.skip("Module not available")
+        session = recording_session.RecordingSession("Front", 30, 60, now=1000)
+        ends = []
+        session.add_listener(ends.append)
+
+        assert session.extend(30, now=1010)
+        assert session.end_time == 1040
+        assert session.extend(30, now=1015)
+        assert session.length == 45
+        # Earlier end than the current one changes nothing
+        assert session.extend(5, now=1016)
+        assert ends == [1040, 1045]
+
+        assert session.extend(30, now=1050)
+        assert session.end_time == 1060
+        assert session.triggers == 5
+        assert session.follow_up_seconds(now=1060) == 20
+
+    def test_fixed_length_session(self):
+        """Test a non-extendable session leaves re-triggers as follow-up."""
+        if recording_session is None:
+            pytest.skip("Module not available")
+        session = recording_session.RecordingSession("Door", 30, 600, extendable=False, now=0)
+        assert session.extend(30, now=10)
+        assert session.end_time == 30
+        assert session.follow_up_seconds(now=31) == 9
+        # A re-trigger just before the end is not worth a clip
+        session = recording_session.RecordingSession("Door", 30, 600, extendable=False, now=0)
+        session.extend(31, now=0)
+        assert session.follow_up_seconds(now=30) == 0
+
+    def test_retrigger_while_finalizing(self):
+        """Test re-triggers after the recorder finished become follow-up time."""
+        if recording_session is None:
+            pytest.skip("Module not available")
+        # Pre-record capture already complete: its listener refuses the end
+        session = recording_session.RecordingSession("Front", 30, 120, now=0)
+        ends = []
+        session.add_listener(lambda end_time: False)
+        session.add_listener(ends.append)
+        assert session.extend(20, now=35)
+        assert session.end_time == 30
+        assert ends == []
+        assert session.follow_up_seconds(now=40) == 15
+        # Later re-triggers do not ask the recorder again
+        assert session.extend(20, now=40)
+        assert session.follow_up_seconds(now=40) == 20
+
+        # FFmpeg exited early
+        session = recording_session.RecordingSession("Back", 30, 120, now=0)
+        session.stop_extending()
+        assert session.extend(20, now=25)
+        assert session.end_time == 30
+        assert session.follow_up_seconds(now=30) == 15
+
+    def test_registry(self):
+        """Test one open session per camera and closed sessions reject triggers."""
+        if recording_session is None:
+            pytest.skip("Module not available")
+        sessions = recording_session.RecordingSessions()
+        first = sessions.start("Front", 30, 60)
+        assert sessions.get("Front") is first
+        assert sessions.get("Back") is None
+
+        sessions.close(first)
+        assert sessions.get("Front") is None
+        assert not first.extend(30)
+        second = sessions.start("Front", 30, 60)
+        sessions.close(first)
+        assert sessions.get("Front") is second
+
+    def test_wait_until_extended_end(self):
+        """Test waiting follows an extension made while sleeping."""
+        if recording_session is None:
+            pytest.skip("Module not available")
+
+        async def run():
+            session = recording_session.RecordingSession("Front", 0.05, 10)
+            asyncio.get_running_loop().call_later(0.02, session.extend, 0.1)
+            started = time.monotonic()
+            await session.wait_until_end()
+            return time.monotonic() - started
+
+        assert asyncio.run(run()) >= 0.1
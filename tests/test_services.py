@@ -18,11 +18,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "custom_components" / "rts
 
 try:
     from services import (
+        _CameraEntityCache,
         async_setup_services,
         async_unload_services,
     )
 except ImportError as e:
     async_setup_services = None
+    _CameraEntityCache = None
     print(f"Import error: {e}")
 
 
@@ -66,6 +68,31 @@ class TestServiceRegistration:
         # This depends on implementation
 
 
+@pytest.mark.unit
+class TestCameraEntityCache:
+    """Tests for the camera name -> entity lookup."""
+
+    def test_entity_appearing_after_first_lookup(self):
+        """Test a camera without state yet is found once its entity exists."""
+        if _CameraEntityCache is None:
+            pytest.skip("Module not available")
+        states = []
+        cache = _CameraEntityCache(lambda: list(states))
+        assert cache.get("Front_Door") is None
+
+        camera = MagicMock()
+        camera.entity_id = "camera.front_door"
+        camera.attributes = {"friendly_name": "Front Door"}
+        states.append(camera)
+        assert cache.get("Front_Door") == "camera.front_door"
+
+        # Hits are cached until the registry changes
+        states.clear()
+        assert cache.get("Front_Door") == "camera.front_door"
+        cache.clear()
+        assert cache.get("Front_Door") is None
+
+
 @pytest.mark.unit
 class TestServiceValidation:
     """Tests for service call validation."""
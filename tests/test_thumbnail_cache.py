@@ -0,0 +1,80 @@
+"""Unit tests for the thumbnail cache.
+
+Tests for:
+- Byte-bounded LRU behaviour
+- ?w= width snapping
+- Resized variants on disk
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "custom_components" / "rtsp_recorder"))
+
+try:
+    import thumbnail_cache
+except ImportError as e:
+    thumbnail_cache = None
+    print(f"Import error: {e}")
+
+
+@pytest.mark.unit
+class TestThumbnailCache:
+    """Tests for ThumbnailCache and the variant helpers."""
+
+    def test_lru_evicts_by_bytes(self):
+        """Test least recently used entries go first once the budget is exceeded."""
+        if thumbnail_cache is None:
+            pytest.skip("Module not available")
+        cache = thumbnail_cache.ThumbnailCache(max_bytes=25)
+        cache.put(("a",), '"1"', b"x" * 10, "image/jpeg")
+        cache.put(("b",), '"1"', b"x" * 10, "image/jpeg")
+        assert cache.get(("a",), '"1"') == (b"x" * 10, "image/jpeg")
+
+        cache.put(("c",), '"1"', b"x" * 10, "image/jpeg")
+
+        assert cache.get(("b",), '"1"') is None
+        assert cache.get(("a",), '"1"') is not None
+        assert cache.size_bytes == 20
+        cache.put(("huge",), '"1"', b"x" * 100, "image/jpeg")
+        assert len(cache) == 2
+
+    def test_stale_etag_is_a_miss(self):
+        """Test a replaced file is not served from the cache."""
+        if thumbnail_cache is None:
+            pytest.skip("Module not available")
+        cache = thumbnail_cache.ThumbnailCache()
+        cache.put(("a",), '"old"', b"old", "image/jpeg")
+        assert cache.get(("a",), '"new"') is None
+        assert len(cache) == 0 and cache.size_bytes == 0
+
+    def test_variant_width(self):
+        """Test requested widths snap up to the variant sizes."""
+        if thumbnail_cache is None:
+            pytest.skip("Module not available")
+        assert thumbnail_cache.variant_width("100") == 160
+        assert thumbnail_cache.variant_width(320) == 320
+        assert thumbnail_cache.variant_width("321") == 640
+        assert thumbnail_cache.variant_width("5000") is None
+        assert thumbnail_cache.variant_width("abc") is None
+        assert thumbnail_cache.variant_width(None) is None
+        assert thumbnail_cache.variant_width("0") is None
+
+    def test_load_variant(self, tmp_path):
+        """Test a variant is resized once and then read from disk."""
+        if thumbnail_cache is None or thumbnail_cache.Image is None:
+            pytest.skip("Pillow not available")
+        source = tmp_path / "cam_20260101_080000.jpg"
+        thumbnail_cache.Image.new("RGB", (1280, 720), (10, 20, 30)).save(source)
+
+        data, content_type = thumbnail_cache.load_variant(str(source), 320, "jpeg")
+
+        assert content_type == "image/jpeg"
+        target = Path(thumbnail_cache.variant_path(str(source), 320, "jpeg"))
+        assert target.read_bytes() == data
+        with thumbnail_cache.Image.open(target) as img:
+            assert img.size == (320, 180)
+        assert thumbnail_cache.load_variant(str(source), 320, "jpeg") == (data, "image/jpeg")
+        # Not wider than the requested width: serve the original
+        assert thumbnail_cache.load_variant(str(source), 1280 * 2, "jpeg") is None